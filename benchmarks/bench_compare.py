@@ -0,0 +1,83 @@
+"""构建对比基准测试
+
+在临时目录中生成一个有大量文件的 .dist 目录 (稀疏文件，不占实际磁盘空间)，
+测量扫描产物保存清单、读取清单和比较两份清单的耗时。不需要Qt。
+
+    python benchmarks/bench_compare.py --files 50000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "nuitka_packager"))
+
+from build_compare import save_manifest, load_manifest, diff_manifests
+
+
+def make_tree(root, file_count, packages):
+    """按包和子目录分布文件，大小随机"""
+    rng = random.Random(1)
+    for i in range(file_count):
+        directory = os.path.join(root, f"pkg{i % packages}", f"sub{i % 37}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"mod{i}.so"), 'wb') as f:
+            f.truncate(rng.randint(100, 200000))
+
+
+def change_tree(root, file_count, packages):
+    """模拟第二次构建: 删除一个包，增加一个包，改变部分文件的大小"""
+    shutil.rmtree(os.path.join(root, "pkg0"))
+    added = os.path.join(root, "pkg_new")
+    os.makedirs(added)
+    for i in range(file_count // 100):
+        with open(os.path.join(added, f"mod{i}.so"), 'wb') as f:
+            f.truncate(50000)
+    for i in range(1, file_count, 50):
+        path = os.path.join(root, f"pkg{i % packages}", f"sub{i % 37}", f"mod{i}.so")
+        if os.path.exists(path):
+            with open(path, 'ab') as f:
+                f.truncate(os.path.getsize(path) + 4096)
+
+
+def measure(name, func, files):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"step": name, "files": files, "seconds": round(elapsed, 3)}, ensure_ascii=False))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--packages", type=int, default=40)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_compare_")
+    try:
+        dist = os.path.join(work_dir, "app.dist")
+        manifest_dir = os.path.join(work_dir, "manifests")
+        os.makedirs(manifest_dir)
+        make_tree(dist, args.files, args.packages)
+        before_name, _ = measure("scan+save", lambda: save_manifest([dist], manifest_dir), args.files)
+        change_tree(dist, args.files, args.packages)
+        after_name, _ = save_manifest([dist], manifest_dir)
+
+        before = measure("load", lambda: load_manifest(before_name, manifest_dir), args.files)
+        after = load_manifest(after_name, manifest_dir)
+        report = measure("diff", lambda: diff_manifests(before, after), args.files)
+        print(json.dumps({"added": report["added"]["count"], "removed": report["removed"]["count"],
+                          "changed": report["changed"]["count"], "packages": len(report["packages"])},
+                         ensure_ascii=False))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
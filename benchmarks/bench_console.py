@@ -0,0 +1,105 @@
+"""控制台输出吞吐量基准测试
+
+用合成的Nuitka日志模拟 readyRead 事件，测量每秒处理的行数和最长帧时间
+(两次事件循环迭代之间的最大间隔)。
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_console.py --lines 1000000
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_console.py --mode legacy --lines 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nuitka_packager"))
+
+from PyQt5.QtWidgets import QApplication, QTextEdit, QPlainTextEdit
+from PyQt5.QtCore import QTimer, QDateTime, Qt
+from PyQt5.QtGui import QTextCursor, QColor
+
+from console_view import ConsoleRenderer
+
+SAMPLE_LINES = [
+    "Nuitka-Progress: Optimizing module 'numpy.core._methods', {} modules of 1845 done.",
+    "Nuitka-Memory: Total memory usage before generating C code: RSS: 812.45 MB",
+    "Nuitka-Scons: Compiling C files: {}/1845 module_{}.c",
+    "Nuitka-Plugins:anti-bloat: Not including 'unittest' automatically in order to avoid bloat."
+]
+
+
+def synthetic_chunk(start, count):
+    return "\n".join(SAMPLE_LINES[i % len(SAMPLE_LINES)].format(i, i)
+                     for i in range(start, start + count))
+
+
+def legacy_append(console, text, level="INFO"):
+    """旧版 append_to_console 的实现，作为对照"""
+    timestamp = QDateTime.currentDateTime().toString("[hh:mm:ss] ")
+    console.moveCursor(QTextCursor.End)
+    console.setTextColor(Qt.gray)
+    console.insertPlainText(timestamp)
+    console.setTextColor(Qt.blue if level == "INFO" else QColor(255, 165, 0))
+    console.insertPlainText(text)
+    console.ensureCursorVisible()
+
+
+def run(total_lines, chunk_lines, mode):
+    app = QApplication.instance() or QApplication(sys.argv)
+    # 旧版使用 QTextEdit 逐段插入，新版使用 QPlainTextEdit 按帧批量插入
+    console = QPlainTextEdit() if mode == "batched" else QTextEdit()
+    console.setReadOnly(True)
+    console.resize(900, 400)
+    console.show()
+
+    renderer = ConsoleRenderer(console) if mode == "batched" else None
+    state = {"sent": 0, "last_tick": None, "max_frame": 0.0}
+    started = time.perf_counter()
+
+    def feed():
+        now = time.perf_counter()
+        if state["last_tick"] is not None:
+            state["max_frame"] = max(state["max_frame"], now - state["last_tick"])
+        state["last_tick"] = now
+
+        if state["sent"] >= total_lines:
+            if renderer is None or not renderer.pending:
+                timer.stop()
+                app.quit()
+            return
+
+        count = min(chunk_lines, total_lines - state["sent"])
+        text = synthetic_chunk(state["sent"], count) + "\n"
+        if renderer is not None:
+            renderer.append(text)
+        else:
+            legacy_append(console, text)
+        state["sent"] += count
+
+    timer = QTimer()
+    timer.timeout.connect(feed)
+    timer.start(0)
+    app.exec_()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "lines": total_lines,
+        "chunk_lines": chunk_lines,
+        "seconds": round(elapsed, 3),
+        "lines_per_sec": round(total_lines / elapsed),
+        "max_frame_ms": round(state["max_frame"] * 1000, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--chunk", type=int, default=50, help="每次 readyRead 的行数")
+    parser.add_argument("--mode", choices=["batched", "legacy"], default="batched")
+    args = parser.parse_args()
+    print(json.dumps(run(args.lines, args.chunk, args.mode), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""输出解析器基准测试
+
+把记录的Nuitka日志按 readyRead 的粒度切块，比较旧的逐行逐阶段查找与
+预编译匹配器每秒处理的行数，以及加上 ProgressTracker 读取计数器、FailureClassifier 识别失败原因后的开销。不需要Qt。
+
+    python benchmarks/bench_parser.py --lines 1000000
+    python benchmarks/bench_parser.py --log my_build.log
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "nuitka_packager"))
+
+from output_parser import DEFAULT_STAGES, OutputParser
+from progress_tracker import ProgressTracker
+from failure_classifier import FailureClassifier
+
+DEFAULT_LOG = os.path.join(BENCH_DIR, "data", "nuitka_sample.log")
+
+
+def legacy_parse(stages, output):
+    """旧版 handle_process_output 的匹配逻辑，作为对照"""
+    current_stage = 0
+    stage_progress = 0
+    for line in output.split('\n'):
+        for stage in stages:
+            if stage["pattern"] in line:
+                current_stage = stages.index(stage)
+                stage_progress = 0
+                break
+        if "Progress" in line:
+            stage_progress = min(stage_progress + 5, 100)
+        if "输出文件:" in line:
+            current_stage = len(stages) - 1
+    return current_stage, stage_progress
+
+
+def load_chunks(log_path, total_lines, chunk_lines):
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        sample = f.read().splitlines()
+    lines = (sample * (total_lines // len(sample) + 1))[:total_lines]
+    return ["\n".join(lines[i:i + chunk_lines]) for i in range(0, total_lines, chunk_lines)]
+
+
+def measure(name, func, chunks, total_lines):
+    started = time.perf_counter()
+    for chunk in chunks:
+        func(chunk)
+    elapsed = time.perf_counter() - started
+    return {"parser": name, "lines": total_lines, "seconds": round(elapsed, 3),
+            "lines_per_sec": round(total_lines / elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", default=DEFAULT_LOG, help="记录的Nuitka输出日志")
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--chunk", type=int, default=50, help="每次 readyRead 的行数")
+    args = parser.parse_args()
+
+    chunks = load_chunks(args.log, args.lines, args.chunk)
+    compiled = OutputParser(DEFAULT_STAGES)
+    tracker = ProgressTracker(DEFAULT_STAGES)
+
+    def tracked(chunk):
+        for kind, value in compiled.parse(chunk):
+            if kind == "stage":
+                tracker.enter_stage(value)
+        tracker.feed(chunk)
+        tracker.percent()
+
+    results = [
+        measure("legacy", lambda chunk: legacy_parse(DEFAULT_STAGES, chunk), chunks, args.lines),
+        measure("compiled", compiled.parse, chunks, args.lines),
+        measure("compiled+tracker", tracked, chunks, args.lines),
+        measure("failure-classifier", FailureClassifier().feed, chunks, args.lines)
+    ]
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""启动速度基准测试
+
+在全新的子进程中多次启动主窗口，记录导入 ui 模块的时间、创建主窗口的时间和
+从进程启动到首次绘制的时间，输出各项的中位数。
+指定 --baseline 时与之前保存的结果比较，首次绘制时间超出容差则以退出代码1结束。
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py --runs 5
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py --save baseline.json
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py --baseline baseline.json
+"""
+import time
+
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nuitka_packager")
+
+
+def measure_child():
+    """在当前进程中启动主窗口并输出各阶段耗时 (毫秒)"""
+    sys.path.insert(0, PACKAGE_DIR)
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QObject, QEvent, QTimer
+
+    app = QApplication(sys.argv)
+    import_started = time.perf_counter()
+    import ui
+    imported = time.perf_counter()
+    window = ui.NuitkaPackager()
+    constructed = time.perf_counter()
+    result = {}
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and "first_paint_ms" not in result:
+                result["first_paint_ms"] = (time.perf_counter() - PROCESS_STARTED) * 1000
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(10000, app.quit)
+    app.exec_()
+
+    result.update({
+        "import_ui_ms": (imported - import_started) * 1000,
+        "construct_ms": (constructed - imported) * 1000
+    })
+    print(json.dumps(result))
+
+
+def run(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"],
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: round(statistics.median(sample[key] for sample in samples), 1)
+            for key in ("import_ui_ms", "construct_ms", "first_paint_ms")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save", help="把结果保存为JSON文件")
+    parser.add_argument("--baseline", help="与之前保存的结果比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的相对退化 (默认20%%)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child()
+        return 0
+
+    result = run(args.runs)
+    print(json.dumps(result, ensure_ascii=False))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        limit = baseline["first_paint_ms"] * (1 + args.tolerance)
+        if result["first_paint_ms"] > limit:
+            print(f"首次绘制时间退化: {result['first_paint_ms']} ms > {limit:.1f} ms", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""打包工具热点路径的基准测试套件
+
+在无界面模式下创建主窗口，用 fake_nuitka.py 模拟的Nuitka完成真实的打包流程 (QProcess、输出解析、
+控制台、进度条、构建日志和构建记录)，测量:
+
+- command: generate_nuitka_command 和 get_current_config + build_command 每次调用的耗时
+- build: start_packaging 的耗时、输出吞吐量、最长帧间隔，handle_process_output、append_to_console、
+  ProgressTracker.feed 和 update_progress 的平均耗时；另以 --rate 限速运行一次，测量正常输出速度下的最长帧间隔
+- config: ConfigManager 保存、读取配置和把配置载入界面的耗时
+- startup: 启动主窗口的耗时 (与 main.py 相同的创建和显示过程，见 bench_startup.py)
+
+测试使用临时的数据目录，不会读写用户的配置、构建记录和缓存。
+结果保存为JSON；指定 --baseline 时逐项与之前保存的结果比较，超出容差的退化以退出代码1结束。
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py --save baseline.json
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py --baseline baseline.json --tolerance 0.25
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py --only build --lines 200000
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.join(BENCH_DIR, "..", "nuitka_packager")
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, PACKAGE_DIR)
+
+GROUPS = ("command", "build", "config", "startup")
+RESULT_VERSION = 1
+
+
+def metric(value, unit, better="lower"):
+    return {"value": round(value, 3), "unit": unit, "better": better}
+
+
+class CallTimer:
+    """替换对象上的一个方法，累计调用次数和耗时；信号连接时通过属性取得方法，因此也能计入由信号触发的调用"""
+
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+        self.func = getattr(target, name)
+        self.calls = 0
+        self.seconds = 0.0
+        setattr(target, name, self)
+
+    def __call__(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.calls += 1
+
+    def mean_us(self):
+        return self.seconds / self.calls * 1e6 if self.calls else 0.0
+
+    def restore(self):
+        delattr(self.target, self.name)
+
+
+def time_calls(func, iterations, repeats=5):
+    """每次调用的耗时 (微秒)，取多轮平均值的中位数"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+def prepare_window(work_dir, nuitka_path):
+    from ui import NuitkaPackager
+    window = NuitkaPackager()
+    # 只测量本地打包流程: 不提交给构建服务，也不从构建缓存恢复
+    window.settings["use_build_daemon"] = False
+    window.settings["build_cache_enabled"] = False
+    window.get_nuitka_path = lambda: nuitka_path
+    window.show()
+
+    script_dir = os.path.join(work_dir, "src")
+    os.makedirs(script_dir, exist_ok=True)
+    script_path = os.path.join(script_dir, "app.py")
+    with open(script_path, 'w', encoding='utf-8') as f:
+        f.write("print('hello')\n")
+    window.script_path.setText(script_path)
+    window.output_dir.setText(os.path.join(work_dir, "out"))
+    return window
+
+
+def bench_command(window, args):
+    from command_builder import build_command
+    nuitka_path = window.get_nuitka_path()
+    return {
+        "generate_nuitka_command_us": metric(time_calls(window.generate_nuitka_command, args.iterations), "us"),
+        "build_command_us": metric(time_calls(lambda: build_command(window.get_current_config(), nuitka_path),
+                                              args.iterations), "us")
+    }
+
+
+def run_build(app, window, lines, rate, chunk, timeout):
+    """用模拟的Nuitka执行一次打包，直到输出全部显示、构建记录写完为止"""
+    from PyQt5.QtCore import QEventLoop, QTimer, Qt
+
+    os.environ["FAKE_NUITKA_LINES"] = str(lines)
+    os.environ["FAKE_NUITKA_RATE"] = str(rate)
+    os.environ["FAKE_NUITKA_CHUNK"] = str(chunk)
+    timers = {
+        "handle_process_output": CallTimer(window, "handle_process_output"),
+        "append_to_console": CallTimer(window, "append_to_console"),
+        "update_progress": CallTimer(window, "update_progress"),
+        "progress_feed": CallTimer(window.progress_tracker, "feed")
+    }
+
+    # 界面线程被阻塞的最长时间: 1毫秒定时器两次触发之间的最大间隔
+    frames = {"last": None, "max": 0.0}
+
+    def tick():
+        now = time.perf_counter()
+        if frames["last"] is not None:
+            frames["max"] = max(frames["max"], now - frames["last"])
+        frames["last"] = now
+
+    ticker = QTimer()
+    ticker.setTimerType(Qt.PreciseTimer)
+    ticker.timeout.connect(tick)
+
+    loop = QEventLoop()
+    started = time.perf_counter()
+    try:
+        window.start_packaging()
+        start_seconds = time.perf_counter() - started
+        if window.process is None:
+            raise RuntimeError("start_packaging 没有启动打包进程")
+        ticker.start(1)
+        # 在窗口自己的 process_finished 之后触发
+        window.process.finished.connect(loop.quit)
+        QTimer.singleShot(int(timeout * 1000), loop.quit)
+        loop.exec_()
+        while window.console_renderer.pending and time.perf_counter() - started < timeout:
+            app.processEvents(QEventLoop.AllEvents, 50)
+        elapsed = time.perf_counter() - started
+        ticker.stop()
+        exit_code = window.process.exitCode()
+        # 等待构建记录等后台任务结束，避免影响下一次测量
+        while window.background_tasks and time.perf_counter() - started < timeout:
+            app.processEvents(QEventLoop.AllEvents, 50)
+    finally:
+        for timer in timers.values():
+            timer.restore()
+    if exit_code != 0:
+        raise RuntimeError(f"模拟的打包失败，退出代码 {exit_code}")
+    return {
+        "start_packaging_ms": start_seconds * 1000,
+        "lines_per_sec": lines / elapsed,
+        "max_frame_ms": frames["max"] * 1000,
+        "handle_output_us_per_line": timers["handle_process_output"].seconds / lines * 1e6,
+        "append_to_console_us": timers["append_to_console"].mean_us(),
+        "progress_feed_us": timers["progress_feed"].mean_us(),
+        "update_progress_us": timers["update_progress"].mean_us(),
+        "update_progress_calls": timers["update_progress"].calls
+    }
+
+
+def bench_build(app, window, args):
+    runs = [run_build(app, window, args.lines, 0, args.chunk, args.timeout) for _ in range(args.runs)]
+
+    def median(key):
+        return statistics.median(run[key] for run in runs)
+
+    results = {
+        "start_packaging_ms": metric(median("start_packaging_ms"), "ms"),
+        "ingest_lines_per_sec": metric(median("lines_per_sec"), "lines/s", "higher"),
+        "ingest_max_frame_ms": metric(median("max_frame_ms"), "ms"),
+        "handle_process_output_us_per_line": metric(median("handle_output_us_per_line"), "us"),
+        "append_to_console_us": metric(median("append_to_console_us"), "us"),
+        "progress_feed_us": metric(median("progress_feed_us"), "us"),
+        "update_progress_us": metric(median("update_progress_us"), "us"),
+        "update_progress_calls": metric(median("update_progress_calls"), "calls")
+    }
+    if args.rate > 0:
+        paced_lines = max(args.chunk, int(args.rate * args.paced_seconds))
+        paced = run_build(app, window, paced_lines, args.rate, args.chunk, args.timeout)
+        results["paced_max_frame_ms"] = metric(paced["max_frame_ms"], "ms")
+    return results
+
+
+def bench_config(window, args):
+    manager = window.config_manager
+    config = window.get_current_config()
+    names = [f"bench_{i:05d}" for i in range(args.configs)]
+
+    started = time.perf_counter()
+    for i, name in enumerate(names):
+        manager.save_config(dict(config, include_packages_list=f"pkg{i},numpy,requests"), name, ["bench"])
+    save_ms = (time.perf_counter() - started) / len(names) * 1000
+
+    started = time.perf_counter()
+    for name in names:
+        manager.load_config(name)
+    load_ms = (time.perf_counter() - started) / len(names) * 1000
+
+    # 载入界面: 读取配置并设置所有控件，再从控件取回配置
+    sample = names[::max(1, len(names) // 50)]
+    started = time.perf_counter()
+    for name in sample:
+        window.load_config(name)
+        window.get_current_config()
+    apply_ms = (time.perf_counter() - started) / len(sample) * 1000
+    return {
+        "config_save_ms": metric(save_ms, "ms"),
+        "config_load_ms": metric(load_ms, "ms"),
+        "config_apply_ms": metric(apply_ms, "ms")
+    }
+
+
+def bench_startup(args):
+    import bench_startup
+    result = bench_startup.run(args.startup_runs)
+    return {f"startup_{key}": metric(value, "ms") for key, value in result.items()}
+
+
+def run_suite(args, work_dir):
+    from PyQt5.QtWidgets import QApplication
+    from fake_nuitka import make_stub
+
+    results = {}
+    groups = args.only or GROUPS
+    if set(groups) & {"command", "build", "config"}:
+        app = QApplication.instance() or QApplication(sys.argv)
+        window = prepare_window(work_dir, make_stub(work_dir))
+        if "command" in groups:
+            results.update(bench_command(window, args))
+        if "build" in groups:
+            results.update(bench_build(app, window, args))
+        if "config" in groups:
+            results.update(bench_config(window, args))
+        window.close()
+    if "startup" in groups:
+        results.update(bench_startup(args))
+    return results
+
+
+def compare(metrics, baseline, tolerance):
+    """逐项与基准比较，返回 (说明文字列表, 是否有退化)"""
+    lines = []
+    regressed = False
+    for name, current in metrics.items():
+        previous = baseline.get(name)
+        if previous is None:
+            lines.append(f"  {name:<36} {current['value']:>12} {current['unit']}  (基准中没有)")
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"] if previous["value"] else 0.0
+        worse = change > tolerance if current["better"] == "lower" else change < -tolerance
+        regressed |= worse
+        lines.append(f"  {name:<36} {previous['value']:>12} -> {current['value']:>12} {current['unit']:<8}"
+                     f" {change:+.1%}{'  退化' if worse else ''}")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", choices=GROUPS, help="只运行指定的一组测试，可重复指定")
+    parser.add_argument("--lines", type=int, default=50000, help="每次模拟打包输出的行数")
+    parser.add_argument("--chunk", type=int, default=50, help="模拟的Nuitka每次写入的行数")
+    parser.add_argument("--rate", type=float, default=2000, help="限速运行时每秒输出的行数，0 为不运行")
+    parser.add_argument("--paced-seconds", type=float, default=3.0, help="限速运行的时长 (秒)")
+    parser.add_argument("--runs", type=int, default=3, help="不限速打包的次数，结果取中位数")
+    parser.add_argument("--iterations", type=int, default=500, help="命令生成每轮调用的次数")
+    parser.add_argument("--configs", type=int, default=500, help="保存和读取的配置数")
+    parser.add_argument("--startup-runs", type=int, default=5, help="启动测试的次数")
+    parser.add_argument("--timeout", type=float, default=300, help="每次模拟打包的超时时间 (秒)")
+    parser.add_argument("--save", help="把结果保存为JSON文件")
+    parser.add_argument("--baseline", help="与之前保存的结果比较")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的相对退化 (默认25%%)")
+    args = parser.parse_args()
+
+    # 在导入打包工具的模块之前切换数据目录 (启动测试的子进程也会继承)
+    work_dir = tempfile.mkdtemp(prefix="nuitka_packager_bench_")
+    os.environ["HOME"] = os.environ["USERPROFILE"] = os.environ["LOCALAPPDATA"] = work_dir
+    try:
+        metrics = run_suite(args, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "version": RESULT_VERSION,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {key: getattr(args, key) for key in ("lines", "chunk", "rate", "runs", "iterations", "configs")},
+        "metrics": metrics
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=4))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("params") != result["params"]:
+            print("注意: 基准结果使用的参数不同，比较结果仅供参考", file=sys.stderr)
+        lines, regressed = compare(metrics, baseline.get("metrics", {}), args.tolerance)
+        print("与基准比较:", file=sys.stderr)
+        print("\n".join(lines), file=sys.stderr)
+        if regressed:
+            print(f"有指标的退化超过 {args.tolerance:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""模拟Nuitka的可执行文件，供基准测试在没有安装Nuitka和C编译器时运行完整的打包流程
+
+按 data/nuitka_sample.log 的结构输出逼真的Nuitka输出: 两个带计数器的阶段 (PASS 1 和 C compiling)
+按需要的总行数拉长并重新编号，其余各行原样输出，最后按命令行中的 --output-dir 和脚本名生成 .dist 目录。
+Nuitka的参数由打包工具决定，输出量和速度用环境变量控制:
+
+    FAKE_NUITKA_LINES      输出的总行数 (默认 20000)
+    FAKE_NUITKA_RATE       每秒输出的行数，0 为不限速 (默认)
+    FAKE_NUITKA_CHUNK      每次写入的行数 (默认 50)
+    FAKE_NUITKA_EXIT_CODE  退出代码 (默认 0，非0时不生成产物)
+
+    FAKE_NUITKA_LINES=100000 python benchmarks/fake_nuitka.py --standalone main.py
+"""
+import os
+import re
+import stat
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_LOG = os.path.join(BENCH_DIR, "data", "nuitka_sample.log")
+VERSION = "2.4.8"
+COUNTER_PATTERN = re.compile(r"\d+%\| \d+/\d+")
+# 会被拉长的两个阶段，各自的计数器行以此开头
+STRETCHED_MARKERS = ("Nuitka-Progress: PASS 1:", "Nuitka-Progress: C compiling:")
+
+
+def split_sample(lines):
+    """把样本日志拆成固定部分和两个要拉长的阶段: [固定, 阶段1, 固定, 阶段2, 固定]"""
+    parts = []
+    rest = lines
+    for marker in STRETCHED_MARKERS:
+        indexes = [i for i, line in enumerate(rest) if line.startswith(marker)]
+        if not indexes:
+            parts.extend([rest, []])
+            rest = []
+            continue
+        parts.extend([rest[:indexes[0]], rest[indexes[0]:indexes[-1] + 1]])
+        rest = rest[indexes[-1] + 1:]
+    parts.append(rest)
+    return parts
+
+
+def stretch(segment, count):
+    """循环重复一个阶段的输出到 count 行，并把计数器重新编号为 1..N"""
+    if not segment or count <= 0:
+        return []
+    lines = [segment[i % len(segment)] for i in range(count)]
+    total = sum(1 for line in lines if COUNTER_PATTERN.search(line))
+    result = []
+    done = 0
+    for line in lines:
+        if COUNTER_PATTERN.search(line):
+            done += 1
+            line = COUNTER_PATTERN.sub(f"{done * 100 // total}%| {done}/{total}", line)
+        result.append(line)
+    return result
+
+
+def generate_lines(total_lines, sample_path=SAMPLE_LOG):
+    with open(sample_path, 'r', encoding='utf-8') as f:
+        sample = f.read().splitlines()
+    head, first, middle, second, tail = split_sample(sample)
+    body = max(0, total_lines - len(head) - len(middle) - len(tail))
+    return head + stretch(first, body // 2) + middle + stretch(second, body - body // 2) + tail
+
+
+def create_artifact(args):
+    """像 Nuitka --standalone 一样在输出目录中生成 <脚本名>.dist/<脚本名>.bin"""
+    output_dir = "."
+    script = "main.py"
+    for arg in args:
+        if arg.startswith("--output-dir="):
+            output_dir = arg[len("--output-dir="):]
+        elif not arg.startswith("-"):
+            script = arg
+    stem = os.path.splitext(os.path.basename(script))[0]
+    dist = os.path.join(output_dir, stem + ".dist")
+    os.makedirs(dist, exist_ok=True)
+    with open(os.path.join(dist, stem + ".bin"), 'wb') as f:
+        f.write(b"\0" * 4096)
+
+
+def make_stub(directory):
+    """在 directory 中生成可以交给 QProcess 直接启动的包装脚本，返回其路径"""
+    script = os.path.abspath(__file__)
+    if sys.platform == "win32":
+        path = os.path.join(directory, "nuitka.cmd")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'@"{sys.executable}" "{script}" %*\n')
+    else:
+        path = os.path.join(directory, "nuitka")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def main(args):
+    if "--version" in args:
+        print(VERSION)
+        print(f"Python: {sys.version.split()[0]}")
+        return 0
+
+    total_lines = int(os.environ.get("FAKE_NUITKA_LINES", "20000"))
+    rate = float(os.environ.get("FAKE_NUITKA_RATE", "0"))
+    chunk = max(1, int(os.environ.get("FAKE_NUITKA_CHUNK", "50")))
+    exit_code = int(os.environ.get("FAKE_NUITKA_EXIT_CODE", "0"))
+
+    lines = generate_lines(total_lines)
+    started = time.perf_counter()
+    for i in range(0, len(lines), chunk):
+        if rate > 0:
+            delay = started + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        sys.stdout.write("\n".join(lines[i:i + chunk]) + "\n")
+        sys.stdout.flush()
+
+    if exit_code == 0:
+        create_artifact(args)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
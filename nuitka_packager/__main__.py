@@ -0,0 +1,10 @@
+import os
+import sys
+
+# 模块之间使用同目录导入，与 main.py 的运行方式保持一致
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import inspect
+import threading
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class BackgroundTask(QThread):
+    """在后台线程中执行一个函数，完成后在界面线程中通过 result_ready 信号返回结果
+
+    用于工具链检测、ccache统计等需要启动子进程的操作，避免阻塞界面。
+    函数抛出的异常作为结果返回。
+    """
+
+    result_ready = pyqtSignal(object)
+
+    def __init__(self, func, *args, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            result = e
+        self.result_ready.emit(result)
+
+
+class BackgroundStream(QThread):
+    """在后台线程中遍历 func(*args) 返回的迭代器，每一项通过 item_ready 信号交给界面线程
+
+    遍历中抛出的异常通过 failed 信号返回。func 返回的对象有 close 方法 (例如构建服务的事件流) 时，
+    可以用 stop 从界面线程中断阻塞的读取，让线程自行结束。
+    """
+
+    item_ready = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, func, *args, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.lock = threading.Lock()
+        self.iterable = None
+        self.stopped = False
+
+    def run(self):
+        try:
+            iterable = self.func(*self.args)
+            with self.lock:
+                self.iterable = iterable
+                stopped = self.stopped
+            if stopped:
+                self.close_iterable(iterable)
+                return
+            for item in iterable:
+                if self.stopped:
+                    break
+                self.item_ready.emit(item)
+        except Exception as e:
+            if not self.stopped:
+                self.failed.emit(e)
+
+    def stop(self):
+        """请求结束遍历，之后用 wait 等待线程退出"""
+        with self.lock:
+            self.stopped = True
+            iterable = self.iterable
+        self.close_iterable(iterable)
+
+    @staticmethod
+    def close_iterable(iterable):
+        # 生成器只能在遍历它的线程中关闭，这里只关闭事件流这类可以跨线程关闭的对象
+        if iterable is None or inspect.isgenerator(iterable):
+            return
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            close()
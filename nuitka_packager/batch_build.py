@@ -0,0 +1,304 @@
+import os
+import shutil
+import sqlite3
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                            QPlainTextEdit, QProgressBar, QGroupBox, QSpinBox, QScrollArea,
+                            QWidget)
+from PyQt5.QtCore import QProcess, QProcessEnvironment
+from PyQt5.QtGui import QFont
+
+from background import BackgroundTask
+from console_view import ConsoleRenderer
+from output_parser import OutputParser
+from progress_tracker import ProgressTracker
+from failure_classifier import FailureClassifier, format_match, format_diagnosis
+from command_builder import build_command, format_command, split_jobs, get_artifact_paths
+from staging import StagingStore, supports_staging, format_stage_stats
+import incremental
+import job_tuner
+from build_logs import open_build_log
+
+
+class BuildPane(QGroupBox):
+    """批量打包中单个任务的控制台和进度条"""
+
+    def __init__(self, name, config, stages, parent=None):
+        super().__init__(name, parent)
+        self.name = name
+        self.config = config
+        self.stages = stages
+        self.output_parser = OutputParser(stages, config.get("output_patterns"))
+        self.progress_tracker = ProgressTracker(stages)
+        self.failure_classifier = FailureClassifier()
+        self.abort_on_fatal = False
+        self.process = None
+        self.exit_code = None
+        self.build_root = None
+        self.staging = None
+        self.stage_task = None
+        self.job_slot = job_tuner.JobSlot()
+        self.build_log = None
+
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel("等待中")
+        layout.addWidget(self.status_label)
+
+        self.console = QPlainTextEdit()
+        self.console.setReadOnly(True)
+        self.console.setFont(QFont("Courier New", 9))
+        self.console.setMinimumHeight(150)
+        self.console_renderer = ConsoleRenderer(self.console, parent=self)
+        layout.addWidget(self.console)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+
+    def start(self, nuitka_path, jobs, env, finished_callback, staging_root=None, settings=None):
+        if settings:
+            self.abort_on_fatal = settings["abort_on_fatal_failure"]
+            self.build_log = open_build_log(self.name, settings, {"script_path": self.config.get("script_path", "")})
+            self.console_renderer.build_log = self.build_log
+        config = self.config
+        if not job_tuner.is_auto(config):
+            config = dict(config, parallel=True, parallel_count=jobs)
+        self.job_slot.acquire()
+        # 从登记名额到启动进程之间的任何失败都要释放名额并结束任务，否则批量打包会一直等待这个任务
+        try:
+            self.launch(config, nuitka_path, env, finished_callback, staging_root, settings)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            self.fail_start(f"启动打包失败: {str(e)}\n", finished_callback)
+
+    def launch(self, config, nuitka_path, env, finished_callback, staging_root, settings):
+        records = job_tuner.load_records(self.name) if job_tuner.is_auto(config) else []
+        config, plan = job_tuner.tune_config(config, self.job_slot, records)
+        if plan:
+            self.append(job_tuner.format_plan(plan) + "\n")
+        # 每个任务使用独立的实例，避免多个线程同时修改同一个哈希缓存
+        if staging_root and supports_staging(config):
+            self.staging = StagingStore(staging_root, bool(settings and settings["staging_hardlinks"]))
+        if config.get("incremental"):
+            self.build_root = incremental.get_build_root(config, self.name)
+            reason = incremental.prepare(self.build_root, None)
+            if reason:
+                self.append(f"{reason}，已清空增量构建目录\n")
+        command = build_command(config, nuitka_path, output_dir=self.build_root,
+                                stage_data=self.staging is not None)
+        self.append(f"=== 执行命令 ===\n{format_command(command)}\n\n", level="COMMAND")
+
+        output_dir = self.build_root or config.get("output_dir")
+        if output_dir:
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+            except OSError as e:
+                raise OSError(f"无法创建输出目录: {str(e)}") from e
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        process_env = QProcessEnvironment.systemEnvironment()
+        for key, value in env.items():
+            process_env.insert(key, value)
+        self.process.setProcessEnvironment(process_env)
+        self.process.readyReadStandardOutput.connect(self.handle_output)
+        self.process.finished.connect(
+            lambda exit_code, exit_status: self.handle_finished(exit_code, finished_callback))
+        self.process.errorOccurred.connect(lambda error: self.handle_error(error, finished_callback))
+        if output_dir:
+            self.process.setWorkingDirectory(output_dir)
+
+        self.status_label.setText(f"运行中 (--jobs={config['parallel_count']})")
+        self.process.start(command[0], command[1:])
+
+    def stop(self):
+        if self.process and self.process.state() == QProcess.Running:
+            self.process.terminate()
+            self.append("\n打包过程已终止\n", level="WARNING")
+
+    def handle_output(self):
+        output = self.process.readAllStandardOutput().data().decode(errors="replace")
+        if not output:
+            return
+        self.append(output)
+
+        changed = False
+        for kind, value in self.output_parser.parse(output):
+            if kind == "stage":
+                changed |= self.progress_tracker.enter_stage(value)
+        if self.progress_tracker.feed(output) or changed:
+            self.update_progress()
+
+        for result in self.failure_classifier.feed(output):
+            self.append(f"\n[诊断] {format_match(result)}\n", level="ERROR" if result["fatal"] else "WARNING")
+            if (result is self.failure_classifier.fatal and self.abort_on_fatal
+                    and self.process.state() != QProcess.NotRunning):
+                self.append("=== 检测到无法恢复的错误，提前终止打包 ===\n", level="ERROR")
+                self.process.terminate()
+
+    def handle_error(self, error, finished_callback):
+        # 运行中崩溃等错误之后仍会发出 finished，只有无法启动时需要在这里结束任务
+        if error == QProcess.FailedToStart:
+            self.fail_start(f"启动Nuitka进程失败: {self.process.errorString()}\n", finished_callback)
+
+    def fail_start(self, message, finished_callback):
+        """打包进程没有启动: 释放名额，让批量打包继续调度其余任务"""
+        if self.exit_code is not None:
+            return
+        self.exit_code = -1
+        self.job_slot.release()
+        self.append(message, level="ERROR")
+        self.status_label.setText("启动失败")
+        self.notify_finished(finished_callback)
+
+    def update_progress(self):
+        self.progress.setValue(self.progress_tracker.percent())
+        self.progress.setFormat(f"%p% - {self.progress_tracker.describe()}")
+
+    def handle_finished(self, exit_code, finished_callback):
+        self.exit_code = exit_code
+        self.job_slot.release()
+        if exit_code != 0:
+            self.failure_classifier.finish()
+            failure = self.failure_classifier.diagnose()
+            self.append(format_diagnosis(failure) + "\n", level="ERROR")
+            reason = f": {failure['title']}" if failure else ""
+            self.status_label.setText(f"打包失败 (退出代码 {exit_code}){reason}")
+            self.notify_finished(finished_callback)
+            return
+        if self.build_root:
+            copy_function = self.staging.make_copy_function() if self.staging else shutil.copy2
+            for path in incremental.publish_artifacts(self.config, self.build_root, copy_function):
+                self.append(f"产物已复制到: {path}\n")
+        if self.staging:
+            self.status_label.setText("正在放置数据文件")
+            self.stage_task = BackgroundTask(self.staging.stage, self.config,
+                                             get_artifact_paths(self.config)[0], parent=self)
+            self.stage_task.result_ready.connect(
+                lambda stats: self.handle_staged(stats, finished_callback))
+            self.stage_task.start()
+            return
+        self.finish_success(finished_callback)
+
+    def handle_staged(self, stats, finished_callback):
+        if isinstance(stats, Exception):
+            self.exit_code = 1
+            self.append(f"放置数据文件失败: {str(stats)}\n", level="ERROR")
+            self.status_label.setText("放置数据文件失败")
+            self.notify_finished(finished_callback)
+            return
+        self.append(format_stage_stats(stats) + "\n")
+        self.finish_success(finished_callback)
+
+    def finish_success(self, finished_callback):
+        self.progress_tracker.finish()
+        self.update_progress()
+        self.status_label.setText("打包成功")
+        self.notify_finished(finished_callback)
+
+    def notify_finished(self, finished_callback):
+        if self.build_log:
+            self.console_renderer.build_log = None
+            self.build_log.close(self.exit_code)
+        finished_callback(self)
+
+    def append(self, text, level="INFO"):
+        self.console_renderer.append(text, level)
+
+
+class BatchBuildDialog(QDialog):
+    """在有界的进程池中并行打包多个保存的配置"""
+
+    def __init__(self, named_configs, stages, nuitka_path, env=None, staging_root=None, settings=None,
+                 parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("批量打包")
+        self.resize(900, 700)
+        self.nuitka_path = nuitka_path
+        self.env = env or {}
+        self.staging_root = staging_root
+        self.settings = settings
+        self.pending = []
+        self.running = []
+
+        layout = QVBoxLayout(self)
+
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel("同时运行的打包任务数:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(1, len(named_configs)))
+        self.workers_spin.setValue(min(len(named_configs), max(1, (os.cpu_count() or 1) // 4)))
+        control_layout.addWidget(self.workers_spin)
+        self.jobs_label = QLabel()
+        control_layout.addWidget(self.jobs_label)
+        control_layout.addStretch()
+        layout.addLayout(control_layout)
+        self.workers_spin.valueChanged.connect(self.update_jobs_label)
+        self.update_jobs_label()
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        panes_widget = QWidget()
+        panes_layout = QVBoxLayout(panes_widget)
+        self.panes = []
+        for name, config in named_configs:
+            pane = BuildPane(name, config, stages)
+            panes_layout.addWidget(pane)
+            self.panes.append(pane)
+        scroll.setWidget(panes_widget)
+        layout.addWidget(scroll)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("开始批量打包")
+        self.start_button.setObjectName("run_button")
+        self.start_button.clicked.connect(self.start)
+        self.stop_button = QPushButton("全部停止")
+        self.stop_button.setObjectName("stop_button")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop)
+        button_layout.addWidget(self.start_button)
+        button_layout.addWidget(self.stop_button)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+    def update_jobs_label(self):
+        self.jobs_label.setText(f"每个任务 --jobs={split_jobs(self.workers_spin.value())}")
+
+    def start(self):
+        self.start_button.setEnabled(False)
+        self.workers_spin.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.pending = list(self.panes)
+        self.schedule()
+
+    def schedule(self):
+        """在空闲名额内启动排队中的任务"""
+        workers = self.workers_spin.value()
+        jobs = split_jobs(workers)
+        while self.pending and len(self.running) < workers:
+            pane = self.pending.pop(0)
+            self.running.append(pane)
+            pane.start(self.nuitka_path, jobs, self.env, self.pane_finished, self.staging_root, self.settings)
+
+        if not self.pending and not self.running:
+            self.stop_button.setEnabled(False)
+            failed = [pane.name for pane in self.panes if pane.exit_code != 0]
+            self.setWindowTitle(f"批量打包 - 完成 ({len(self.panes) - len(failed)}/{len(self.panes)} 成功)")
+
+    def pane_finished(self, pane):
+        if pane in self.running:
+            self.running.remove(pane)
+        self.schedule()
+
+    def stop(self):
+        self.pending.clear()
+        for pane in list(self.running):
+            pane.stop()
+
+    def closeEvent(self, event):
+        self.stop()
+        # 放置数据文件的线程无法中途停止，等待其完成后再关闭
+        for pane in self.panes:
+            if pane.stage_task:
+                pane.stage_task.wait()
+        super().closeEvent(event)
@@ -0,0 +1,164 @@
+import fnmatch
+import statistics
+
+from command_builder import split_list
+from import_graph import ImportGraph, reachable, STATIC, DYNAMIC, OPTIONAL
+
+# Nuitka会跟随的导入类型 (if TYPE_CHECKING 分支在编译时被优化掉，不会跟随)
+FOLLOWED_KINDS = (STATIC, DYNAMIC, OPTIONAL)
+
+# 没有可用的构建记录时，每个模块 (平均代码行数) 的估算编译耗时
+DEFAULT_SECONDS_PER_MODULE = 0.4
+
+# 校准时使用的最近构建记录数
+CALIBRATION_RECORDS = 20
+
+# 已知会显著增加编译时间、而程序运行时通常用不到的模块
+# nofollow: 加入 --nofollow-import-to 的模式；noinclude: Nuitka anti-bloat 插件的 --noinclude-<名称>-mode
+HEAVY_RULES = [
+    {"name": "测试套件", "patterns": ["*.tests", "*.test", "*.conftest"],
+     "nofollow": ["*.tests", "*.test", "*.conftest"],
+     "description": "第三方包自带的测试代码 (scipy、pandas、numpy等)"},
+    {"name": "pytest", "patterns": ["pytest", "_pytest", "pluggy"], "noinclude": "pytest",
+     "description": "测试框架，通常由第三方包的测试辅助代码引入"},
+    {"name": "setuptools", "patterns": ["setuptools", "pkg_resources", "_distutils_hack"],
+     "noinclude": "setuptools", "description": "打包工具，运行时一般只用到其中很少的部分"},
+    {"name": "IPython", "patterns": ["IPython", "ipykernel", "ipywidgets", "jupyter_client"],
+     "noinclude": "IPython", "description": "交互式环境的集成代码"},
+    {"name": "dask", "patterns": ["dask"], "noinclude": "dask", "description": "可选的并行计算后端"},
+    {"name": "numba", "patterns": ["numba", "llvmlite"], "noinclude": "numba",
+     "description": "JIT编译器，通常作为可选加速后端被引入"},
+]
+
+
+def matches(name, patterns):
+    """模块或它的任一上级包符合其中一个模式 (与 --nofollow-import-to 的语义一致)"""
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        prefix = ".".join(parts[:i])
+        if any(fnmatch.fnmatchcase(prefix, pattern) for pattern in patterns):
+            return True
+    return False
+
+
+def get_seconds_per_module(records):
+    """用历史构建记录中的耗时和Nuitka报告的模块数估算每个模块的编译耗时
+
+    只使用成功的构建；没有可用记录时返回 None。
+    """
+    samples = [record["elapsed"] / record["module_count"] for record in records
+               if record.get("exit_code") == 0 and record.get("module_count") and record.get("elapsed")]
+    return statistics.median(samples) if samples else None
+
+
+class CostModel:
+    """按模块估算编译耗时: 一半按模块数、一半按代码行数分摊"""
+
+    def __init__(self, module_lines, seconds_per_module):
+        self.module_lines = module_lines
+        self.seconds_per_module = seconds_per_module
+        counted = [lines for lines in module_lines.values() if lines]
+        self.average_lines = statistics.mean(counted) if counted else 1
+
+    def cost(self, names):
+        weight = sum(0.5 + 0.5 * self.module_lines.get(name, 0) / self.average_lines for name in names)
+        return weight * self.seconds_per_module
+
+
+def get_applied_patterns(config):
+    """配置中已经生效的不跟随模式 (包括 anti-bloat 选项对应的模块)"""
+    patterns = split_list(config.get("nofollow_imports_list", ""))
+    modes = set(split_list(config.get("noinclude_modes_list", "")))
+    for rule in HEAVY_RULES:
+        if rule.get("noinclude") in modes:
+            patterns += rule["patterns"]
+    return patterns
+
+
+def advise(report, config=None, seconds_per_module=None):
+    """根据导入分析报告估算各第三方包的编译耗时，并给出可排除的重量级模块
+
+    返回 {"seconds_per_module", "calibrated", "total", "packages": {包: 秒},
+          "suggestions": [{"name", "description", "nofollow", "noinclude", "modules", "seconds"}]}，
+    建议按预计节省的时间从多到少排序。
+    """
+    config = config or {}
+    calibrated = seconds_per_module is not None
+    model = CostModel(report["module_lines"], seconds_per_module or DEFAULT_SECONDS_PER_MODULE)
+    edges = report["edges"]
+
+    # 预先算出每组模式排除的模块集合，遍历图时只做集合查找
+    names = list(report["module_lines"])
+    applied = get_applied_patterns(config)
+    excluded = {name for name in names if matches(name, applied)}
+    followed = reachable(edges, FOLLOWED_KINDS, excluded.__contains__)
+
+    local_modules = set(report["local_modules"])
+    packages = {}
+    for name in followed:
+        if name != "__main__" and name not in local_modules:
+            top = name.split(".")[0]
+            packages[top] = packages.get(top, 0) + model.cost([name])
+
+    candidates = [dict(rule) for rule in HEAVY_RULES]
+    heavy_tops = {pattern for rule in HEAVY_RULES for pattern in rule["patterns"]}
+    for top in report["nofollow_imports"]:
+        if top not in heavy_tops:
+            candidates.append({"name": top, "patterns": [top], "nofollow": [top],
+                               "description": "只在可选导入 (try/except ImportError) 中使用"})
+
+    suggestions = []
+    for rule in candidates:
+        rule_excluded = {name for name in followed if matches(name, rule["patterns"])}
+        if not rule_excluded:
+            continue
+        remaining = reachable(edges, FOLLOWED_KINDS, (excluded | rule_excluded).__contains__)
+        removed = followed - remaining
+        suggestions.append({
+            "name": rule["name"],
+            "description": rule["description"],
+            "nofollow": rule.get("nofollow", []),
+            "noinclude": rule.get("noinclude"),
+            "modules": len(removed),
+            "seconds": model.cost(removed)
+        })
+    suggestions.sort(key=lambda suggestion: suggestion["seconds"], reverse=True)
+
+    return {
+        "seconds_per_module": model.seconds_per_module,
+        "calibrated": calibrated,
+        "total": model.cost(followed),
+        "packages": packages,
+        "suggestions": suggestions
+    }
+
+
+def format_option(suggestion):
+    if suggestion["noinclude"]:
+        return f"--noinclude-{suggestion['noinclude']}-mode=nofollow"
+    return " ".join(f"--nofollow-import-to={pattern}" for pattern in suggestion["nofollow"])
+
+
+def format_advice(advice):
+    """编译成本估算的文本形式，用于控制台和命令行输出"""
+    source = "根据构建记录校准" if advice["calibrated"] else "未校准，使用默认系数"
+    lines = [f"预计编译耗时: 约 {advice['total'] / 60:.1f} 分钟 "
+             f"({source}，每个模块约 {advice['seconds_per_module']:.2f} 秒)"]
+    heaviest = sorted(advice["packages"].items(), key=lambda item: item[1], reverse=True)[:10]
+    if heaviest:
+        lines.append("编译耗时最多的第三方包:")
+        for top, seconds in heaviest:
+            lines.append(f"  {top:<30} 约 {seconds:>7.0f} 秒")
+    if advice["suggestions"]:
+        lines.append("可以排除的模块:")
+        for suggestion in advice["suggestions"]:
+            lines.append(f"  {suggestion['name']}: {suggestion['modules']} 个模块，预计节省 {suggestion['seconds']:.0f} 秒"
+                         f"  ({format_option(suggestion)})")
+    return "\n".join(lines)
+
+
+def analyze_and_advise(script_path, config=None, seconds_per_module=None):
+    """分析入口脚本的导入并附上编译成本估算 (报告的 "advice" 项)"""
+    report = ImportGraph().analyze(script_path)
+    report["advice"] = advise(report, config, seconds_per_module)
+    return report
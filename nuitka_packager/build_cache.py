@@ -0,0 +1,346 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+from settings import get_data_dir
+from data_files import walk_dir_entry
+
+# 不影响打包产物内容的配置项，不参与缓存键计算
+CACHE_NEUTRAL_KEYS = {"output_dir", "parallel", "parallel_count", "low_memory", "show_progress", "remove_output"}
+
+# 扫描源码树时跳过的目录
+SKIP_DIRS = {"__pycache__", ".git", ".hg", ".svn", ".venv", "venv", ".tox", ".mypy_cache",
+             ".pytest_cache", "node_modules"}
+
+SOURCE_SUFFIXES = (".py", ".pyi", ".pyw")
+
+# 已安装发行包的元数据目录，目录名中包含包名和版本
+DIST_INFO_SUFFIXES = (".dist-info", ".egg-info")
+
+
+class FileHasher:
+    """按 (路径, 修改时间, 大小) 缓存文件内容哈希，未变化的文件不会重复读取"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def hash_file(self, path):
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        result = digest.hexdigest()
+        self.entries[path] = [stat.st_mtime_ns, stat.st_size, result]
+        self.dirty = True
+        return result
+
+    def save(self):
+        if not self.dirty:
+            return
+        # 多个线程或进程可能同时保存同一个缓存文件
+        tmp_path = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # 共用的实例可能正被其他线程加入新的哈希，写出当时的副本
+        entries = dict(self.entries)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+def iter_tree(root, suffixes=None, skip_dirs=()):
+    """按稳定顺序遍历目录下的文件"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames
+                             if d not in SKIP_DIRS and d not in skip_dirs
+                             and not d.endswith((".build", ".dist", ".onefile-build")))
+        for filename in sorted(filenames):
+            if suffixes is None or filename.endswith(suffixes):
+                yield os.path.join(dirpath, filename)
+
+
+def get_installed_distributions(search_paths=None):
+    """列出模块搜索路径中已安装的发行包: (目录名, 修改时间) 按名称排序
+
+    只读取目录项，不打开元数据文件；pip 安装、升级或重新安装某个包时其 .dist-info 目录会被重新创建。
+    """
+    found = []
+    for directory in search_paths if search_paths is not None else sys.path:
+        try:
+            with os.scandir(directory or ".") as iterator:
+                found.extend((entry.name, entry.stat().st_mtime_ns) for entry in iterator
+                             if entry.name.endswith(DIST_INFO_SUFFIXES))
+        except OSError:
+            continue
+    return sorted(found)
+
+
+class IndexLock:
+    """保护缓存索引和缓存目录的锁，可以在同一线程中嵌套
+
+    线程锁协调同一进程中的多个任务 (构建服务的工作线程)，锁文件协调GUI、命令行和构建服务等多个进程。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+    def __enter__(self):
+        self.lock.acquire()
+        if self.depth == 0:
+            try:
+                self.file = open(self.path, 'a+b')
+                lock_file(self.file)
+            except OSError:
+                if self.file:
+                    self.file.close()
+                    self.file = None
+                self.lock.release()
+                raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            unlock_file(self.file)
+            self.file.close()
+            self.file = None
+        self.lock.release()
+
+
+def lock_file(f):
+    """阻塞直到取得文件的排他锁"""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        while True:
+            try:
+                # LK_LOCK 重试约 10 秒后仍失败时抛出 OSError，继续等待
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def unlock_file(f):
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class BuildCache:
+    """以打包输入内容的哈希为键的构建产物缓存，按LRU在磁盘配额内淘汰
+
+    同一个实例可以在多个线程中共用；修改索引的操作都在 IndexLock 中先重新读取磁盘上的索引再写回，
+    其他进程 (GUI、命令行、构建服务) 同时使用同一个缓存目录时不会丢失彼此的缓存项。
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(get_data_dir(), "build_cache")
+        os.makedirs(self.root, exist_ok=True)
+        self.index_path = os.path.join(self.root, "index.json")
+        self.hasher = FileHasher(os.path.join(self.root, "file_hashes.json"))
+        self.lock = IndexLock(os.path.join(self.root, "index.lock"))
+        self.index = {}
+        self.load_index()
+
+    def compute_key(self, config, nuitka_version, python_executable=None, search_paths=None):
+        """计算缓存键: 配置、脚本所在源码树、数据文件、Nuitka版本、解释器和已安装的第三方包
+
+        第三方包按当前解释器的模块搜索路径 (或 search_paths) 中的发行包名称、版本计入，
+        升级依赖后不会恢复用旧版本打包的产物。会遍历源码树，不要在界面线程中调用。
+        """
+        digest = hashlib.sha256()
+
+        relevant = {k: v for k, v in config.items() if k not in CACHE_NEUTRAL_KEYS}
+        digest.update(json.dumps(relevant, sort_keys=True).encode())
+        digest.update(f"\0nuitka={nuitka_version}\0python={python_executable or sys.executable}\0".encode())
+        for name, mtime in get_installed_distributions(search_paths):
+            digest.update(f"{name}:{mtime}\0".encode())
+
+        # 脚本所在目录中的全部源码都可能被导入
+        script_path = os.path.abspath(config["script_path"])
+        source_root = os.path.dirname(script_path)
+        output_dir = os.path.abspath(config.get("output_dir") or os.getcwd())
+        skip = {os.path.basename(output_dir)} if os.path.dirname(output_dir) == source_root else set()
+        for path in iter_tree(source_root, SOURCE_SUFFIXES, skip):
+            digest.update(os.path.relpath(path, source_root).encode())
+            digest.update(self.hasher.hash_file(path).encode())
+
+        for data_path in config.get("included_files", []):
+            paths = iter_tree(data_path) if os.path.isdir(data_path) else [data_path]
+            for path in paths:
+                digest.update(path.encode())
+                if os.path.exists(path):
+                    digest.update(self.hasher.hash_file(path).encode())
+
+        for entry in config.get("included_dirs", []):
+            for path, _, _ in walk_dir_entry(entry):
+                digest.update(path.encode())
+                digest.update(self.hasher.hash_file(path).encode())
+
+        self.hasher.save()
+        return digest.hexdigest()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def lookup(self, key):
+        """查找缓存项，命中且产物完整时返回缓存项"""
+        with self.lock:
+            self.load_index()
+            entry = self.index.get(key)
+            if not entry:
+                return None
+            entry_dir = os.path.join(self.root, key)
+            if not all(os.path.exists(os.path.join(entry_dir, name)) for name in entry["artifacts"]):
+                self.remove(key)
+                return None
+            return entry
+
+    def restore(self, key, artifact_paths, copy_function=shutil.copy2):
+        """把缓存的产物恢复到输出位置，返回是否成功
+
+        copy_function 用于复制目录中的文件 (见 staging.StagingStore.make_copy_function)。
+        复制期间持有锁，缓存项不会被其他任务替换或淘汰。
+        """
+        with self.lock:
+            entry = self.lookup(key)
+            if entry is None:
+                return False
+
+            entry_dir = os.path.join(self.root, key)
+            targets = {os.path.basename(path): path for path in artifact_paths}
+            for name in entry["artifacts"]:
+                target = targets.get(name)
+                if target is None:
+                    return False
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                source = os.path.join(entry_dir, name)
+                if os.path.isdir(target):
+                    shutil.rmtree(target)
+                if os.path.isdir(source):
+                    shutil.copytree(source, target, copy_function=copy_function)
+                else:
+                    shutil.copy2(source, target)
+
+            entry["last_used"] = time.time()
+            self.save_index()
+            return True
+
+    def store(self, key, artifact_paths, quota_bytes, copy_function=shutil.copy2):
+        """把一次成功打包的产物放入缓存，然后按配额淘汰最久未使用的缓存项
+
+        产物先复制到本任务独有的临时目录 (不持有锁)，再在锁内替换缓存项，
+        同一个键的两个任务同时存入时后完成的一个生效。
+        """
+        artifact_paths = [path for path in artifact_paths if os.path.exists(path)]
+        if not artifact_paths:
+            return False
+
+        tmp_dir = os.path.join(self.root, f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        try:
+            os.makedirs(tmp_dir)
+            size = 0
+            for path in artifact_paths:
+                target = os.path.join(tmp_dir, os.path.basename(path))
+                if os.path.isdir(path):
+                    shutil.copytree(path, target, copy_function=copy_function)
+                    size += sum(os.path.getsize(p) for p in iter_tree(target))
+                else:
+                    shutil.copy2(path, target)
+                    size += os.path.getsize(target)
+
+            with self.lock:
+                self.load_index()
+                self.discard(key)
+                os.rename(tmp_dir, os.path.join(self.root, key))
+                self.index[key] = {
+                    "artifacts": [os.path.basename(path) for path in artifact_paths],
+                    "size": size,
+                    "created": time.time(),
+                    "last_used": time.time()
+                }
+                self.evict(quota_bytes)
+                self.save_index()
+                return key in self.index
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def evict(self, quota_bytes):
+        """按最近使用时间淘汰缓存项，直到总大小不超过配额
+
+        同时删除索引中没有的缓存目录 (例如旧版本并发写入索引时丢失的缓存项)，它们同样占用磁盘。
+        调用方负责保存索引。
+        """
+        with self.lock:
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if name not in self.index and not name.startswith(".") and os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+            total = sum(entry["size"] for entry in self.index.values())
+            for key in sorted(self.index, key=lambda k: self.index[k]["last_used"]):
+                if total <= quota_bytes:
+                    break
+                total -= self.index[key]["size"]
+                self.discard(key)
+
+    def discard(self, key):
+        """从内存中的索引和磁盘上删除缓存项，调用方持有锁并负责保存索引"""
+        self.index.pop(key, None)
+        shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+    def remove(self, key):
+        with self.lock:
+            self.load_index()
+            self.discard(key)
+            self.save_index()
+
+    def clear(self):
+        with self.lock:
+            self.load_index()
+            for key in list(self.index):
+                self.discard(key)
+            self.save_index()
+
+    def total_size(self):
+        with self.lock:
+            self.load_index()
+            return sum(entry["size"] for entry in self.index.values())
+
+    def save_index(self):
+        """写入索引，调用方持有锁；临时文件名区分进程和线程"""
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=4)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,416 @@
+import gzip
+import heapq
+import json
+import os
+import re
+import time
+from collections import Counter
+
+from settings import get_data_dir
+from build_history import TREND_METRICS, get_metric
+from build_logs import BuildLogReader, get_log_dir
+from command_builder import build_command
+from data_files import format_size
+
+# 最多保留的产物清单数，超出时删除最旧的
+MAX_MANIFESTS = 200
+MANIFEST_SUFFIX = ".json.gz"
+# 报告中每类文件变化最多列出的条数 (按大小排序)，总数和总大小仍按全部文件统计
+MAX_LISTED_FILES = 50
+# 每个日志最多收集的不同警告数
+MAX_WARNINGS = 2000
+# 产物根目录下的文件 (主程序、Python运行库等) 归入的分组
+ROOT_GROUP = "(根目录)"
+# 相对变化小于此比例的指标不写入结论
+MIN_HIGHLIGHT_RATIO = 0.005
+# 警告中的行号、地址等数字每次构建都可能不同，比较时忽略
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def get_manifest_dir():
+    manifest_dir = os.path.join(get_data_dir(), "manifests")
+    os.makedirs(manifest_dir, exist_ok=True)
+    return manifest_dir
+
+
+def scan_tree(root):
+    """返回目录下全部文件的 {相对路径: 字节数}，路径统一使用 /
+
+    使用 os.scandir 逐层遍历，目录项自带类型信息，五万个文件的产物也只需要一次遍历。
+    """
+    files = {}
+    stack = [(root, "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, prefix + entry.name + "/"))
+                else:
+                    files[prefix + entry.name] = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+    return files
+
+
+def scan_artifacts(artifact_paths):
+    """产物 (.dist 目录或单文件) 的文件清单，单文件以文件名为键"""
+    files = {}
+    for path in artifact_paths:
+        if os.path.isdir(path):
+            files.update(scan_tree(path))
+        elif os.path.isfile(path):
+            files[os.path.basename(path)] = os.path.getsize(path)
+    return files
+
+
+def save_manifest(artifact_paths, manifest_dir=None):
+    """扫描产物并保存清单，返回 (清单文件名, 产物总字节数)，没有产物时返回 (None, None)
+
+    清单与构建记录分开保存，记录中只保存文件名，构建记录列表不会因为大量文件而变慢。
+    """
+    files = scan_artifacts(artifact_paths)
+    if not files:
+        return None, None
+    manifest_dir = manifest_dir or get_manifest_dir()
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}{MANIFEST_SUFFIX}"
+    data = json.dumps({"version": 1, "roots": list(artifact_paths), "files": files}, ensure_ascii=False)
+    with open(os.path.join(manifest_dir, name), 'wb') as f:
+        f.write(gzip.compress(data.encode("utf-8"), mtime=0))
+    prune_manifests(manifest_dir)
+    return name, sum(files.values())
+
+
+def load_manifest(name, manifest_dir=None):
+    """读取清单中的 {相对路径: 字节数}，清单不存在或已损坏时返回 None"""
+    if not name:
+        return None
+    path = os.path.join(manifest_dir or get_manifest_dir(), name)
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(gzip.decompress(f.read()).decode("utf-8"))["files"]
+    except (OSError, ValueError, KeyError, EOFError):
+        return None
+
+
+def prune_manifests(manifest_dir, keep_count=MAX_MANIFESTS):
+    """文件名以时间开头，按名称排序即按时间排序，删除最旧的清单"""
+    try:
+        names = sorted(name for name in os.listdir(manifest_dir) if name.endswith(MANIFEST_SUFFIX))
+    except OSError:
+        return
+    for name in names[:max(0, len(names) - keep_count)]:
+        try:
+            os.remove(os.path.join(manifest_dir, name))
+        except OSError:
+            pass
+
+
+def get_group(path):
+    """文件所属的包: 产物中的第一级目录，根目录下的文件归入同一组"""
+    cut = path.find("/")
+    return path[:cut] if cut != -1 else ROOT_GROUP
+
+
+def diff_manifests(before, after, limit=MAX_LISTED_FILES):
+    """比较两份清单，只遍历每份清单一次 (字典查找)，文件数很多时同样很快
+
+    新增、删除和大小变化的文件各取最大的 limit 个，按包汇总的大小变化按增大量排序，增大最多的在前。
+    """
+    added = []
+    changed = []
+    groups = {}
+    for path, size in after.items():
+        old_size = before.get(path)
+        key = get_group(path)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [0, 0, 0, 0]
+        group[1] += size
+        if old_size is None:
+            added.append((size, path))
+            group[2] += 1
+        elif old_size != size:
+            changed.append((size - old_size, path, old_size, size))
+    removed = []
+    for path, size in before.items():
+        key = get_group(path)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [0, 0, 0, 0]
+        group[0] += size
+        if path not in after:
+            removed.append((size, path))
+            group[3] += 1
+
+    packages = [{"name": name, "before": values[0], "after": values[1], "delta": values[1] - values[0],
+                 "added": values[2], "removed": values[3]}
+                for name, values in groups.items() if values[0] != values[1] or values[2] or values[3]]
+    packages.sort(key=lambda package: package["delta"], reverse=True)
+    return {
+        "before_size": sum(before.values()),
+        "after_size": sum(after.values()),
+        "before_count": len(before),
+        "after_count": len(after),
+        "packages": packages,
+        "added": {"count": len(added), "size": sum(size for size, _ in added),
+                  "files": [[path, size] for size, path in heapq.nlargest(limit, added)]},
+        "removed": {"count": len(removed), "size": sum(size for size, _ in removed),
+                    "files": [[path, size] for size, path in heapq.nlargest(limit, removed)]},
+        "changed": {"count": len(changed), "size": sum(item[0] for item in changed),
+                    "files": [[path, old_size, size] for _, path, old_size, size
+                              in heapq.nlargest(limit, changed, key=lambda item: abs(item[0]))]}
+    }
+
+
+def diff_metrics(before, after):
+    """趋势图中各项指标的变化，相对增幅最大的 (退步最明显的) 在前"""
+    metrics = []
+    for metric, (label, unit) in TREND_METRICS.items():
+        old_value = get_metric(before, metric)
+        new_value = get_metric(after, metric)
+        if old_value is None or new_value is None:
+            continue
+        delta = new_value - old_value
+        metrics.append({"metric": metric, "name": label, "unit": unit, "before": old_value,
+                        "after": new_value, "delta": delta,
+                        "ratio": delta / old_value if old_value else None})
+    metrics.sort(key=lambda item: item["ratio"] if item["ratio"] is not None else 0, reverse=True)
+    return metrics
+
+
+def diff_stages(before, after):
+    """各阶段耗时的变化，没有经过的阶段按0秒计，增加最多的在前"""
+    old_times = before.get("stage_times") or {}
+    new_times = after.get("stage_times") or {}
+    stages = []
+    for name in list(old_times) + [name for name in new_times if name not in old_times]:
+        old_value = old_times.get(name, 0)
+        new_value = new_times.get(name, 0)
+        stages.append({"name": name, "before": old_value, "after": new_value,
+                       "delta": round(new_value - old_value, 2)})
+    stages.sort(key=lambda stage: stage["delta"], reverse=True)
+    return stages
+
+
+def diff_configs(before, after):
+    """两份配置中取值不同的项，按名称排序"""
+    keys = sorted(set(before) | set(after))
+    return [{"key": key, "before": before.get(key), "after": after.get(key)}
+            for key in keys if before.get(key) != after.get(key)]
+
+
+def diff_options(before, after):
+    """由两份配置生成的Nuitka命令行中增加和去掉的参数"""
+    old_options = Counter(build_command(before, "nuitka")[1:])
+    new_options = Counter(build_command(after, "nuitka")[1:])
+    return {"added": sorted((new_options - old_options).elements()),
+            "removed": sorted((old_options - new_options).elements())}
+
+
+def read_warnings(log_name):
+    """日志中的警告行，返回 {忽略数字后的文本: 原文}；日志不存在时返回 None"""
+    if not log_name:
+        return None
+    path = os.path.join(get_log_dir(), log_name)
+    if not os.path.exists(path):
+        return None
+    try:
+        reader = BuildLogReader(path)
+        warnings = {}
+        for number in range(len(reader.blocks)):
+            for line in reader.read_block(number):
+                if "WARNING" not in line:
+                    continue
+                line = line.strip()
+                warnings.setdefault(NUMBER_PATTERN.sub("#", line), line)
+                if len(warnings) >= MAX_WARNINGS:
+                    return warnings
+        return warnings
+    except (OSError, ValueError, EOFError):
+        return None
+
+
+def diff_warnings(before, after):
+    return {"added": [text for key, text in after.items() if key not in before],
+            "removed": [text for key, text in before.items() if key not in after]}
+
+
+def describe_record(record):
+    return {"time": record.get("time"), "config": record.get("config"), "exit_code": record.get("exit_code"),
+            "nuitka_version": record.get("nuitka_version"), "log": record.get("log")}
+
+
+def compare_builds(before, after):
+    """比较两条构建记录，返回结构化的差异报告
+
+    报告包括指标、阶段耗时、按包汇总的产物大小、新增/删除/变化的文件、配置项、Nuitka命令行参数和日志中的警告，
+    每一部分都按退步程度排序。旧版本写入的记录没有配置快照或产物清单，对应部分为 None，并在 missing 中说明。
+    """
+    missing = []
+    report = {
+        "before": describe_record(before),
+        "after": describe_record(after),
+        "metrics": diff_metrics(before, after),
+        "stages": diff_stages(before, after),
+        "artifacts": None,
+        "config": None,
+        "options": None,
+        "warnings": None,
+        "missing": missing
+    }
+
+    if before.get("nuitka_version") != after.get("nuitka_version"):
+        report["nuitka_version"] = [before.get("nuitka_version"), after.get("nuitka_version")]
+
+    old_manifest = load_manifest(before.get("manifest"))
+    new_manifest = load_manifest(after.get("manifest"))
+    if old_manifest is not None and new_manifest is not None:
+        report["artifacts"] = diff_manifests(old_manifest, new_manifest)
+    else:
+        missing.append("产物文件: 记录中没有产物清单 (打包失败、旧版本的记录或清单已被清理)")
+
+    old_config = before.get("build_config")
+    new_config = after.get("build_config")
+    if old_config is not None and new_config is not None:
+        report["config"] = diff_configs(old_config, new_config)
+        try:
+            report["options"] = diff_options(old_config, new_config)
+        except (KeyError, TypeError, ValueError, OSError):
+            pass
+    else:
+        missing.append("配置: 记录中没有配置快照 (旧版本的记录)")
+
+    old_warnings = read_warnings(before.get("log"))
+    new_warnings = read_warnings(after.get("log"))
+    if old_warnings is not None and new_warnings is not None:
+        report["warnings"] = diff_warnings(old_warnings, new_warnings)
+    else:
+        missing.append("警告: 没有保存日志或日志已按保留期限删除")
+
+    report["highlights"] = summarize(report)
+    return report
+
+
+def format_delta(value, unit):
+    if unit == "秒":
+        return f"{value:+.1f}秒"
+    if unit == "MB":
+        return f"{value:+.1f} MB"
+    return f"{value:+g}{unit}"
+
+
+def format_size_delta(size):
+    return ("+" if size >= 0 else "-") + format_size(abs(size))
+
+
+def summarize(report):
+    """报告开头的几句结论，退步最明显的在前"""
+    highlights = []
+    for metric in report["metrics"]:
+        if not metric["delta"] or (metric["ratio"] is not None and abs(metric["ratio"]) < MIN_HIGHLIGHT_RATIO):
+            continue
+        if metric["metric"] == "artifact_size":
+            text = f"{metric['name']} {format_size_delta(metric['delta'] * 1024 * 1024)}"
+        else:
+            text = f"{metric['name']} {format_delta(metric['delta'], metric['unit'])}"
+        if metric["ratio"] is not None:
+            text += f" ({metric['ratio']:+.0%})"
+        if metric["metric"] == "elapsed" and report["stages"]:
+            stage = report["stages"][0] if metric["delta"] > 0 else report["stages"][-1]
+            if stage["delta"] and (stage["delta"] > 0) == (metric["delta"] > 0):
+                text += f"，主要来自阶段\"{stage['name']}\" ({stage['delta']:+.1f}秒)"
+        if metric["metric"] == "artifact_size" and report["artifacts"] and report["artifacts"]["packages"]:
+            packages = report["artifacts"]["packages"]
+            package = packages[0] if metric["delta"] > 0 else packages[-1]
+            if package["delta"] and (package["delta"] > 0) == (metric["delta"] > 0):
+                text += f"，主要来自 {package['name']} ({format_size_delta(package['delta'])})"
+        highlights.append(text)
+
+    artifacts = report["artifacts"]
+    if artifacts:
+        parts = [f"{label} {artifacts[key]['count']} 个文件 ({format_size(artifacts[key]['size'])})"
+                 for key, label in (("added", "新增"), ("removed", "删除")) if artifacts[key]["count"]]
+        if parts:
+            highlights.append("，".join(parts))
+    if report["warnings"] and report["warnings"]["added"]:
+        highlights.append(f"新出现 {len(report['warnings']['added'])} 条警告")
+    if report["options"] and (report["options"]["added"] or report["options"]["removed"]):
+        highlights.append(f"Nuitka参数增加 {len(report['options']['added'])} 个，"
+                          f"去掉 {len(report['options']['removed'])} 个")
+    if report.get("nuitka_version"):
+        old_version, new_version = report["nuitka_version"]
+        highlights.append(f"Nuitka版本 {old_version or '未知'} -> {new_version or '未知'}")
+    return highlights
+
+
+def format_value(value):
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def format_report(report):
+    """比较报告的文本形式，用于命令行输出和导出"""
+    before, after = report["before"], report["after"]
+    lines = [f"之前: {before['time']}  {before['config']}  退出代码 {before['exit_code']}",
+             f"之后: {after['time']}  {after['config']}  退出代码 {after['exit_code']}", ""]
+    lines.append("结论:")
+    lines.extend(f"  {text}" for text in report["highlights"] or ["没有明显变化"])
+
+    if report["metrics"]:
+        lines.append("")
+        lines.append("指标:")
+        for metric in report["metrics"]:
+            lines.append(f"  {metric['name']:<10} {metric['before']:>12.1f} -> {metric['after']:>12.1f} {metric['unit']}"
+                         f"  {format_delta(metric['delta'], metric['unit'])}")
+    if any(stage["delta"] for stage in report["stages"]):
+        lines.append("")
+        lines.append("阶段耗时:")
+        for stage in report["stages"]:
+            if stage["delta"]:
+                lines.append(f"  {stage['name']:<16} {stage['before']:>8.1f} -> {stage['after']:>8.1f} 秒"
+                             f"  {stage['delta']:+.1f}秒")
+
+    artifacts = report["artifacts"]
+    if artifacts:
+        lines.append("")
+        lines.append(f"产物: {artifacts['before_count']} 个文件 {format_size(artifacts['before_size'])} -> "
+                     f"{artifacts['after_count']} 个文件 {format_size(artifacts['after_size'])}")
+        for package in artifacts["packages"]:
+            lines.append(f"  {package['name']:<30} {format_size_delta(package['delta']):>12}"
+                         f"  新增 {package['added']}  删除 {package['removed']}")
+        for key, label in (("added", "新增文件"), ("removed", "删除文件")):
+            if artifacts[key]["count"]:
+                lines.append(f"{label} ({artifacts[key]['count']} 个):")
+                lines.extend(f"  {path}  {format_size(size)}" for path, size in artifacts[key]["files"])
+        if artifacts["changed"]["count"]:
+            lines.append(f"大小变化的文件 ({artifacts['changed']['count']} 个):")
+            lines.extend(f"  {path}  {format_size(old_size)} -> {format_size(size)}"
+                         for path, old_size, size in artifacts["changed"]["files"])
+
+    if report["config"]:
+        lines.append("")
+        lines.append("配置变化:")
+        lines.extend(f"  {item['key']}: {format_value(item['before'])} -> {format_value(item['after'])}"
+                     for item in report["config"])
+    if report["options"]:
+        for key, label in (("added", "增加的Nuitka参数"), ("removed", "去掉的Nuitka参数")):
+            if report["options"][key]:
+                lines.append(f"{label}:")
+                lines.extend(f"  {option}" for option in report["options"][key])
+    if report["warnings"]:
+        for key, label in (("added", "新出现的警告"), ("removed", "消失的警告")):
+            if report["warnings"][key]:
+                lines.append("")
+                lines.append(f"{label}:")
+                lines.extend(f"  {text}" for text in report["warnings"][key])
+    if report["missing"]:
+        lines.append("")
+        lines.append("未比较:")
+        lines.extend(f"  {text}" for text in report["missing"])
+    return "\n".join(lines)
@@ -0,0 +1,80 @@
+import json
+import os
+
+from settings import get_data_dir
+from config_store import connect, get_meta, set_meta
+
+# 可在趋势图中查看的指标: 记录中的键 -> (显示名称, 单位)
+TREND_METRICS = {
+    "elapsed": ("总耗时", "秒"),
+    "peak_memory_mb": ("峰值内存", "MB"),
+    "module_count": ("模块数量", "个"),
+    "c_file_count": ("C文件数量", "个"),
+    "artifact_size": ("产物大小", "MB")
+}
+
+
+def get_metric(record, metric):
+    """从构建记录中取出指标值，阶段耗时用 "stage:阶段名" 表示，缺失时返回 None"""
+    if metric.startswith("stage:"):
+        return (record.get("stage_times") or {}).get(metric[len("stage:"):])
+    value = record.get(metric)
+    if metric == "artifact_size" and value is not None:
+        return value / (1024 * 1024)
+    return value
+
+
+class BuildHistory:
+    """保存每次打包的结果记录，与配置共用本地SQLite数据库
+
+    每条记录包括退出代码、总耗时，以及 ProgressTracker.telemetry 提供的
+    各阶段耗时、峰值内存、模块数量、C文件数量和产物大小，以及用于比较两次构建的配置快照和产物清单文件名 (见 build_compare)。
+    旧版本的 build_history.jsonl 会在首次打开时导入。
+    """
+
+    def __init__(self, path=None, legacy_path=None):
+        self.connection = connect(path)
+        self.migrate_legacy_records(legacy_path or os.path.join(get_data_dir(), "build_history.jsonl"))
+
+    def migrate_legacy_records(self, legacy_path):
+        if get_meta(self.connection, "legacy_records_migrated"):
+            return
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.append(json.loads(line), commit=False)
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        set_meta(self.connection, "legacy_records_migrated", "1")
+        self.connection.commit()
+
+    def append(self, record, commit=True):
+        self.connection.execute("INSERT INTO build_records (config, data) VALUES (?, ?)",
+                                (record.get("config"), json.dumps(record, ensure_ascii=False)))
+        if commit:
+            self.connection.commit()
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM build_records").fetchone()[0]
+
+    def get_records(self, limit=None, offset=0):
+        """返回记录列表，最新的在前"""
+        rows = self.connection.execute(
+            "SELECT data FROM build_records ORDER BY id DESC LIMIT ? OFFSET ?",
+            (limit or -1, offset)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_config_names(self):
+        rows = self.connection.execute(
+            "SELECT config FROM build_records GROUP BY config ORDER BY MAX(id) DESC").fetchall()
+        return [row[0] for row in rows if row[0] is not None]
+
+    def get_trend(self, config_name, limit=None):
+        """返回某个配置的记录，最早的在前，用于绘制趋势图"""
+        rows = self.connection.execute(
+            "SELECT data FROM build_records WHERE config = ? ORDER BY id DESC LIMIT ?",
+            (config_name, limit or -1)).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
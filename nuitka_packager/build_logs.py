@@ -0,0 +1,340 @@
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from settings import get_data_dir
+
+# 每个压缩块至少包含的未压缩字节数，块越大压缩率越高，随机读取时需要解压的数据也越多
+BLOCK_SIZE = 256 * 1024
+# 输出较少时，缓冲的文本最多等待这么多秒后写入磁盘
+MAX_BLOCK_AGE = 5.0
+# 查看日志时在内存中保留的已解压块数
+CACHED_BLOCKS = 8
+INDEX_SUFFIX = ".idx"
+LOG_SUFFIX = ".log.gz"
+
+
+def get_log_dir():
+    log_dir = os.path.join(get_data_dir(), "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    return log_dir
+
+
+def make_log_path(name, log_dir=None):
+    """为一次打包生成日志文件路径，文件名以开始时间开头，按名称排序即按时间排序"""
+    safe_name = re.sub(r'[^\w.-]+', '_', name or "build")[:60]
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(log_dir or get_log_dir(), f"{stamp}-{safe_name}-{os.urandom(3).hex()}{LOG_SUFFIX}")
+
+
+class BuildLogWriter:
+    """把一次打包的合并输出写入压缩日志
+
+    write 只把文本追加到内存缓冲区，压缩和磁盘写入都在后台线程中进行，不会阻塞界面线程。
+    文件由多个独立的 gzip 成员组成 (仍是普通的 .gz 文件，可以直接用 gzip/zcat 读取)，
+    每个成员从行首开始，旁边的 .idx 索引记录每个成员的偏移和起始行号，查看时只解压需要的部分。
+    关闭后按设置的保留期限和总大小清理旧日志。
+    index 为真时写入的每一块同时加入全文索引 (见 log_index)，索引也在后台线程中进行。
+    """
+
+    def __init__(self, path, meta=None, retention_days=0, max_total_mb=0, index=False):
+        self.path = path
+        self.meta = dict(meta or {}, started=time.strftime("%Y-%m-%d %H:%M:%S"))
+        self.retention_days = retention_days
+        self.max_total_mb = max_total_mb
+        self.index = index
+        self.log_index = None
+        self.log_id = None
+        self.blocks = []
+        self.lines = 0
+        self.size = 0
+        self.offset = 0
+        self.ends_with_newline = True
+        self.pending = []
+        self.pending_size = 0
+        self.closed = False
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        # 非守护线程: 命令行进程退出前会等待最后一块写完
+        self.thread = threading.Thread(target=self.run, name="build-log-writer")
+        self.thread.start()
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def write(self, text):
+        if not text:
+            return
+        with self.lock:
+            self.pending.append(text)
+            self.pending_size += len(text)
+            full = self.pending_size >= BLOCK_SIZE
+        if full:
+            self.wake.set()
+
+    def flush(self):
+        pass
+
+    def close(self, exit_code=None, wait=False):
+        """结束日志；wait 为真时等待后台线程写完索引"""
+        with self.lock:
+            if self.closed:
+                return
+            self.meta["exit_code"] = exit_code
+            self.meta["finished"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            self.closed = True
+        self.wake.set()
+        if wait:
+            self.thread.join()
+
+    def take_block(self, closing):
+        """取出缓冲区中到最后一个换行为止的文本，关闭时取出全部"""
+        with self.lock:
+            text = "".join(self.pending)
+            cut = len(text) if closing else text.rfind("\n") + 1
+            # 没有换行的超长输出也必须写出，避免缓冲区无限增长
+            if cut == 0 and len(text) >= BLOCK_SIZE * 4:
+                cut = len(text)
+            rest = text[cut:]
+            self.pending = [rest] if rest else []
+            self.pending_size = len(rest)
+        return text[:cut]
+
+    def run(self):
+        last_write = time.monotonic()
+        if self.index:
+            self.open_index()
+        try:
+            with open(self.path, 'wb') as f:
+                while True:
+                    self.wake.wait(MAX_BLOCK_AGE)
+                    self.wake.clear()
+                    closing = self.closed
+                    if closing or self.pending_size >= BLOCK_SIZE or time.monotonic() - last_write >= MAX_BLOCK_AGE:
+                        self.write_block(f, self.take_block(closing))
+                        last_write = time.monotonic()
+                    if closing:
+                        break
+            self.save_index()
+        except OSError:
+            return
+        removed = []
+        if self.retention_days or self.max_total_mb:
+            removed = prune_logs(os.path.dirname(self.path), self.retention_days, self.max_total_mb, keep=self.path)
+        self.update_index(lambda: self.log_index.finish(self.log_id, self.meta))
+        self.update_index(lambda: self.log_index.remove(removed))
+        if self.log_index:
+            self.log_index.close()
+
+    def open_index(self):
+        from log_index import LogIndex
+        try:
+            self.log_index = LogIndex()
+            self.log_id = self.log_index.begin(self.name, self.meta)
+        except sqlite3.Error:
+            self.log_index = None
+
+    def update_index(self, func):
+        """索引出错时只停止索引，不影响日志写入"""
+        if self.log_index is None:
+            return
+        try:
+            func()
+        except sqlite3.Error:
+            self.log_index.close()
+            self.log_index = None
+
+    def write_block(self, f, text):
+        data = text.encode("utf-8", errors="replace")
+        if not data:
+            return
+        compressed = gzip.compress(data, mtime=0)
+        f.write(compressed)
+        f.flush()
+        line_count = data.count(b"\n")
+        self.update_index(lambda: self.log_index.add_lines(self.log_id, self.lines, text))
+        self.blocks.append([self.offset, len(compressed), self.lines, line_count])
+        self.offset += len(compressed)
+        self.lines += line_count
+        self.size += len(data)
+        self.ends_with_newline = data.endswith(b"\n")
+
+    def save_index(self):
+        index = dict(self.meta, version=1, lines=self.lines, size=self.size, blocks=self.blocks,
+                     partial=not self.ends_with_newline)
+        with open(self.path + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+
+def rebuild_index(path):
+    """日志写入中途中断 (没有索引) 时逐个解压 gzip 成员重建索引，截断的最后一个成员被忽略"""
+    blocks = []
+    lines = size = 0
+    last = b""
+    with open(path, 'rb') as f:
+        data = memoryview(f.read())
+    offset = 0
+    while offset < len(data):
+        decompressor = zlib.decompressobj(31)
+        try:
+            text = decompressor.decompress(data[offset:])
+        except zlib.error:
+            break
+        if not decompressor.eof:
+            break
+        length = len(data) - offset - len(decompressor.unused_data)
+        line_count = text.count(b"\n")
+        blocks.append([offset, length, lines, line_count])
+        offset += length
+        lines += line_count
+        size += len(text)
+        last = text
+    return {"version": 1, "lines": lines, "size": size, "blocks": blocks,
+            "partial": bool(last) and not last.endswith(b"\n")}
+
+
+def load_index(path):
+    try:
+        with open(path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        index = rebuild_index(path)
+        try:
+            with open(path + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+        except OSError:
+            pass
+        return index
+
+
+class BuildLogReader:
+    """按需读取压缩日志，接口与 ConsoleLog 相同，可以直接交给 ConsolePagerDialog
+
+    只解压包含所需行的块，并缓存最近使用的几个块。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index = load_index(path)
+        self.blocks = self.index["blocks"]
+        self.cache = OrderedDict()
+
+    def total_lines(self):
+        return self.index["lines"] + (1 if self.index.get("partial") else 0)
+
+    def read_block(self, number):
+        if number in self.cache:
+            self.cache.move_to_end(number)
+            return self.cache[number]
+        offset, length, _, _ = self.blocks[number]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            text = gzip.decompress(f.read(length)).decode("utf-8", errors="replace")
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        self.cache[number] = lines
+        if len(self.cache) > CACHED_BLOCKS:
+            self.cache.popitem(last=False)
+        return lines
+
+    def find_block(self, line):
+        """包含第 line 行的块序号"""
+        low, high = 0, len(self.blocks) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.blocks[middle][2] <= line:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def read_lines(self, start, count):
+        start = max(0, start)
+        if not self.blocks or start >= self.total_lines():
+            return []
+        lines = []
+        number = self.find_block(start)
+        skip = start - self.blocks[number][2]
+        while number < len(self.blocks) and len(lines) < count:
+            block_lines = self.read_block(number)
+            lines.extend(block_lines[skip:skip + count - len(lines)])
+            skip = 0
+            number += 1
+        return lines
+
+    def search_backward(self, needle, before_line):
+        needle = needle.lower()
+        before_line = min(before_line, self.total_lines())
+        if not self.blocks or before_line <= 0:
+            return -1
+        for number in range(self.find_block(before_line - 1), -1, -1):
+            first_line = self.blocks[number][2]
+            block_lines = self.read_block(number)[:before_line - first_line]
+            for i in range(len(block_lines) - 1, -1, -1):
+                if needle in block_lines[i].lower():
+                    return first_line + i
+        return -1
+
+
+def list_logs(log_dir=None):
+    """返回日志文件路径列表，最新的在前"""
+    log_dir = log_dir or get_log_dir()
+    try:
+        names = [name for name in os.listdir(log_dir) if name.endswith(LOG_SUFFIX)]
+    except OSError:
+        return []
+    return [os.path.join(log_dir, name) for name in sorted(names, reverse=True)]
+
+
+def prune_logs(log_dir, retention_days=0, max_total_mb=0, keep=None):
+    """删除超过保留天数的日志，然后从最旧的开始删除直到总大小不超过上限，返回删除的文件名列表
+
+    keep 指定的日志 (刚写完的一个) 不会被删除。
+    """
+    entries = []
+    for path in list_logs(log_dir):
+        if path == keep:
+            continue
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+    entries.sort()
+
+    removed = []
+    total = sum(size for _, size, _ in entries)
+    cutoff = time.time() - retention_days * 86400
+    for mtime, size, path in entries:
+        expired = retention_days and mtime < cutoff
+        over_quota = max_total_mb and total > max_total_mb * 1024 * 1024
+        if not expired and not over_quota:
+            break
+        for target in (path, path + INDEX_SUFFIX):
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+        total -= size
+        removed.append(os.path.basename(path))
+    return removed
+
+
+def open_build_log(name, settings, meta=None):
+    """按工具设置为一次打包创建日志，设置中关闭时返回 None"""
+    if not settings["build_logs_enabled"]:
+        return None
+    try:
+        return BuildLogWriter(make_log_path(name), dict(meta or {}, name=name),
+                              settings["log_retention_days"], settings["log_max_total_mb"],
+                              settings["log_index_enabled"])
+    except OSError:
+        return None
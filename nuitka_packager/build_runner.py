@@ -0,0 +1,307 @@
+import os
+import sys
+import json
+import shutil
+import signal
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from command_builder import (build_command, format_command, split_jobs,
+                             get_artifact_paths)
+from output_parser import OutputParser
+from config_store import ConfigStore
+from progress_tracker import ProgressTracker
+from failure_classifier import FailureClassifier, format_match, format_diagnosis
+import incremental
+import toolchain
+import job_tuner
+from build_logs import open_build_log
+from staging import StagingStore, supports_staging, format_stage_stats
+
+
+def load_config_file(path):
+    """读取导出的 JSON 配置文件；文件不存在时按名称查找GUI中保存的配置"""
+    if not os.path.exists(path):
+        config = ConfigStore().load(path)
+        if config is not None:
+            return config
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_build(config, nuitka_path=None, stream=None, cache=None, quota_bytes=0, env=None,
+              name=None, clean=False, staging=None, on_process=None):
+    """在当前进程之外运行一次Nuitka打包，把合并后的输出写入 stream
+
+    传入 cache (BuildCache) 时，输入未变化则直接恢复上次的产物；
+    env 中的环境变量会追加到Nuitka进程的环境中。
+    配置启用增量模式时，在以 name 区分的持久构建目录中编译，clean 为真则先清空该目录。
+    传入 staging (StagingStore) 时，数据文件在打包完成后从暂存库链接到产物中，不再由Nuitka复制。
+    on_process 在Nuitka进程启动后以 Popen 对象调用，便于调用方中途终止。
+    返回Nuitka进程的退出代码。
+    """
+    stream = stream or sys.stdout
+    nuitka_path = nuitka_path or toolchain.resolve_toolchain()["nuitka_path"]
+    if not nuitka_path:
+        stream.write("错误: 无法定位nuitka可执行文件\n")
+        stream.flush()
+        return 127
+
+    nuitka_version = None
+    if cache is not None or config.get("incremental"):
+        nuitka_version = toolchain.get_nuitka_version(nuitka_path)
+        if nuitka_version == "未知版本":
+            nuitka_version = None
+
+    cache_key = None
+    if cache is not None:
+        if nuitka_version:
+            cache_key = cache.compute_key(config, nuitka_version)
+            copy_function = staging.make_copy_function() if staging else shutil.copy2
+            if cache.restore(cache_key, get_artifact_paths(config), copy_function):
+                stream.write("=== 命中构建缓存，已恢复上次的打包产物 ===\n")
+                stream.flush()
+                return 0
+
+    build_root = None
+    if config.get("incremental"):
+        build_root = incremental.get_build_root(config, name)
+        if clean:
+            incremental.clean(build_root)
+            stream.write("已清空增量构建目录，将完整编译\n")
+        reason = incremental.prepare(build_root, nuitka_version)
+        if reason:
+            stream.write(f"{reason}，已清空增量构建目录\n")
+
+    stage_data = staging is not None and supports_staging(config)
+    # 运行期间登记名额，让同时运行的其他打包自动选择 --jobs 时能够避开已占用的核心
+    with job_tuner.JobSlot() as slot:
+        records = job_tuner.load_records(name) if job_tuner.is_auto(config) else []
+        config, plan = job_tuner.tune_config(config, slot, records)
+        if plan:
+            stream.write(job_tuner.format_plan(plan) + "\n")
+        exit_code = run_nuitka(config, nuitka_path, build_root, stage_data, stream, env, on_process)
+    if exit_code != 0:
+        return exit_code
+    if build_root:
+        copy_function = staging.make_copy_function() if staging else shutil.copy2
+        for path in incremental.publish_artifacts(config, build_root, copy_function):
+            stream.write(f"输出文件: {path}\n")
+        stream.flush()
+    if stage_data:
+        try:
+            stats = staging.stage(config, get_artifact_paths(config)[0])
+        except OSError as e:
+            stream.write(f"放置数据文件失败: {str(e)}\n")
+            stream.flush()
+            return 1
+        stream.write(format_stage_stats(stats) + "\n")
+        stream.flush()
+    if cache_key:
+        copy_function = staging.make_copy_function() if staging else shutil.copy2
+        # 打包本身已经成功，存入缓存失败只提示，不影响退出代码
+        try:
+            if cache.store(cache_key, get_artifact_paths(config), quota_bytes, copy_function):
+                stream.write("打包产物已加入构建缓存\n")
+        except OSError as e:
+            stream.write(f"警告: 无法加入构建缓存: {str(e)}\n")
+        stream.flush()
+    return exit_code
+
+
+def run_nuitka(config, nuitka_path, build_root, stage_data, stream, env, on_process):
+    """启动Nuitka进程并把输出写入 stream，返回退出代码"""
+    command = build_command(config, nuitka_path, output_dir=build_root, stage_data=stage_data)
+    stream.write("=== 执行命令 ===\n")
+    stream.write(format_command(command) + "\n\n")
+    stream.flush()
+
+    # 与GUI保持一致: 指定输出目录时在输出目录中运行
+    cwd = None
+    output_dir = build_root or config.get("output_dir")
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        cwd = output_dir
+
+    try:
+        process = subprocess.Popen(
+            command,
+            cwd=cwd,
+            env=dict(os.environ, **(env or {})),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # 独立的进程组，终止时可以连同 scons 和编译器子进程一起结束 (见 kill_process_tree)
+            start_new_session=os.name != "nt"
+        )
+    except OSError as e:
+        stream.write(f"启动进程失败: {str(e)}\n")
+        stream.flush()
+        return 127
+    if on_process:
+        on_process(process)
+
+    try:
+        for line in iter(process.stdout.readline, b""):
+            stream.write(line.decode(errors="replace"))
+            stream.flush()
+            # 提前终止后Nuitka的子进程 (scons、编译器) 可能仍持有输出管道，不再等待它们的输出
+            if getattr(stream, "aborted", False):
+                break
+    except KeyboardInterrupt:
+        # 独立的进程组收不到终端的 Ctrl+C，由这里结束
+        kill_process_tree(process)
+        raise
+    finally:
+        process.stdout.close()
+
+    return process.wait()
+
+
+def kill_process_tree(process):
+    """终止Nuitka进程及其启动的 scons、编译器等子进程
+
+    只终止Nuitka本身时，子进程继承的输出管道不会关闭，读取输出的线程要等到它们全部退出。
+    """
+    # Windows 上进程退出后无法再按进程树找到子进程；POSIX 上进程组在组长退出后仍然存在
+    if process.poll() is not None and os.name == "nt":
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+    except OSError:
+        pass
+    if process.poll() is None:
+        process.terminate()
+
+
+class PrefixedStream:
+    """给每行输出加上任务名前缀的线程安全输出流，用于批量打包"""
+
+    def __init__(self, prefix, stream, lock):
+        self.prefix = prefix
+        self.stream = stream
+        self.lock = lock
+        self.pending = ""
+
+    def write(self, text):
+        self.pending += text
+        *lines, self.pending = self.pending.split("\n")
+        if lines:
+            with self.lock:
+                for line in lines:
+                    self.stream.write(f"[{self.prefix}] {line}\n")
+
+    def flush(self):
+        with self.lock:
+            if self.pending:
+                self.stream.write(f"[{self.prefix}] {self.pending}\n")
+                self.pending = ""
+            self.stream.flush()
+
+
+class TeeStream:
+    """把输出同时写入多个流，用于在打印的同时保存构建日志"""
+
+    def __init__(self, *streams):
+        self.streams = [stream for stream in streams if stream is not None]
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+
+class TelemetryStream:
+    """把输出原样转发给 stream，同时交给 ProgressTracker 统计本次打包的数据
+
+    输出还会交给 FailureClassifier 识别已知的失败原因；abort_on_fatal 为真时，
+    出现致命错误后立即终止 attach_process 登记的Nuitka进程，不再等待注定失败的打包结束。
+    """
+
+    def __init__(self, stream, config=None, abort_on_fatal=False):
+        self.stream = stream
+        self.output_parser = OutputParser(custom_patterns=(config or {}).get("output_patterns"))
+        self.tracker = ProgressTracker(self.output_parser.stages)
+        self.classifier = FailureClassifier()
+        self.abort_on_fatal = abort_on_fatal
+        self.process = None
+        self.aborted = False
+
+    def attach_process(self, process):
+        self.process = process
+
+    def write(self, text):
+        self.stream.write(text)
+        for kind, value in self.output_parser.parse(text):
+            if kind == "stage":
+                self.tracker.enter_stage(value)
+        self.tracker.feed(text)
+        for result in self.classifier.feed(text):
+            self.stream.write(f"[诊断] {format_match(result)}\n")
+            if result["fatal"] and self.abort_on_fatal:
+                self.abort()
+
+    def abort(self, message="=== 检测到无法恢复的错误，提前终止打包 ===\n"):
+        """终止Nuitka进程树，run_nuitka 随之停止读取输出；也用于构建服务取消任务"""
+        if self.aborted or self.process is None:
+            return
+        self.aborted = True
+        self.stream.write(message)
+        kill_process_tree(self.process)
+
+    def diagnose(self):
+        """打包结束后输出诊断并返回写入构建记录的失败原因"""
+        self.classifier.finish()
+        self.stream.write(format_diagnosis(self.classifier.diagnose()) + "\n")
+        self.stream.flush()
+        return self.classifier.summarize()
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_batch(named_configs, max_workers, nuitka_path=None, stream=None, env=None, staging_root=None,
+              settings=None):
+    """在有界的进程池中并行运行多个打包任务
+
+    named_configs 为 (名称, 配置字典) 列表，CPU核心会在同时运行的任务之间平均分配。
+    指定 staging_root 时各任务共用该暂存库放置数据文件；传入工具设置时每个任务的输出另存为构建日志。
+    返回 {名称: 退出代码}。
+    """
+    stream = stream or sys.stdout
+    nuitka_path = nuitka_path or toolchain.resolve_toolchain()["nuitka_path"]
+    max_workers = max(1, min(max_workers, len(named_configs)))
+    jobs = split_jobs(max_workers)
+    lock = threading.Lock()
+    meta = {"nuitka_version": toolchain.get_nuitka_version(nuitka_path) if settings and nuitka_path else None}
+
+    def run_one(name, config):
+        # 自动模式的任务在启动时按同时运行的打包选择 --jobs
+        if not job_tuner.is_auto(config):
+            config = dict(config, parallel=True, parallel_count=jobs)
+        build_log = open_build_log(name, settings, dict(meta, script_path=config.get("script_path", ""))) if settings else None
+        task_stream = TelemetryStream(TeeStream(PrefixedStream(name, stream, lock), build_log), config,
+                                      bool(settings and settings["abort_on_fatal_failure"]))
+        # 每个任务使用独立的实例，避免多个线程同时修改同一个哈希缓存
+        staging = (StagingStore(staging_root, bool(settings and settings["staging_hardlinks"]))
+                   if staging_root else None)
+        exit_code = run_build(config, nuitka_path=nuitka_path, stream=task_stream, env=env,
+                              name=name, staging=staging, on_process=task_stream.attach_process)
+        if exit_code != 0:
+            task_stream.diagnose()
+        task_stream.flush()
+        if build_log:
+            build_log.close(exit_code)
+        return exit_code
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(run_one, name, config)
+                   for name, config in named_configs}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,329 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from build_runner import load_config_file, run_build, run_batch, TelemetryStream, TeeStream
+from build_logs import open_build_log
+from build_cache import BuildCache
+from build_history import BuildHistory
+from build_compare import save_manifest
+from command_builder import get_artifact_paths
+from settings import load_settings
+import compiler_cache
+import toolchain
+from staging import StagingStore, get_staging_dir
+import import_graph
+import bloat_advisor
+import daemon
+
+
+def cmd_build(args):
+    """执行 build 子命令"""
+    try:
+        config = load_config_file(args.config)
+    except (OSError, ValueError) as e:
+        print(f"无法加载配置: {str(e)}", file=sys.stderr)
+        return 2
+
+    if args.output_dir:
+        config["output_dir"] = args.output_dir
+
+    if not config.get("script_path"):
+        print("配置中缺少 script_path", file=sys.stderr)
+        return 2
+
+    settings = load_settings()
+    cache = None
+    if settings["build_cache_enabled"] and not args.no_cache:
+        cache = BuildCache()
+
+    staging = None
+    if settings["staging_enabled"] and not args.no_staging:
+        staging = StagingStore(get_staging_dir(settings), settings["staging_hardlinks"])
+
+    name = os.path.splitext(os.path.basename(args.config))[0]
+    nuitka_path = args.nuitka or toolchain.resolve_toolchain()["nuitka_path"]
+    nuitka_version = toolchain.get_nuitka_version(nuitka_path) if nuitka_path else None
+    build_log = open_build_log(name, settings, {"script_path": config["script_path"], "nuitka_version": nuitka_version})
+    stream = TelemetryStream(TeeStream(sys.stdout, build_log), config, settings["abort_on_fatal_failure"])
+    ccache_before = compiler_cache.read_stats(settings)
+    started = time.time()
+    exit_code = run_build(config, nuitka_path=nuitka_path, stream=stream, cache=cache,
+                          quota_bytes=settings["build_cache_quota_mb"] * 1024 * 1024,
+                          env=compiler_cache.build_env(settings),
+                          name=name, clean=args.clean, staging=staging, on_process=stream.attach_process)
+    elapsed = int(time.time() - started)
+    failure = stream.diagnose() if exit_code != 0 else None
+    if build_log:
+        build_log.close(exit_code)
+        print(f"构建日志: {build_log.path}")
+
+    ccache_delta = compiler_cache.diff_stats(ccache_before, compiler_cache.read_stats(settings))
+    if ccache_delta:
+        print(compiler_cache.format_stats(ccache_delta))
+
+    # 与GUI共用构建记录，便于在趋势图中比较
+    record = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": name,
+        "script_path": config["script_path"],
+        "exit_code": exit_code,
+        "elapsed": elapsed,
+        "ccache": ccache_delta,
+        "log": build_log.name if build_log else None,
+        "failure": failure,
+        "build_config": config
+    }
+    if exit_code == 0:
+        stream.tracker.finish()
+        try:
+            record["manifest"], record["artifact_size"] = save_manifest(get_artifact_paths(config))
+        except OSError as e:
+            print(f"无法保存产物清单: {str(e)}", file=sys.stderr)
+    record.update(stream.tracker.telemetry())
+    try:
+        BuildHistory().append(record)
+    except (OSError, sqlite3.Error) as e:
+        print(f"无法写入构建记录: {str(e)}", file=sys.stderr)
+    return exit_code
+
+
+def cmd_batch(args):
+    """执行 batch 子命令"""
+    named_configs = []
+    for path in args.config:
+        try:
+            config = load_config_file(path)
+        except (OSError, ValueError) as e:
+            print(f"无法加载配置 {path}: {str(e)}", file=sys.stderr)
+            return 2
+        name = os.path.splitext(os.path.basename(path))[0]
+        named_configs.append((name, config))
+
+    settings = load_settings()
+    staging_root = None
+    if settings["staging_enabled"] and not args.no_staging:
+        staging_root = get_staging_dir(settings)
+    results = run_batch(named_configs, args.workers, nuitka_path=args.nuitka,
+                        env=compiler_cache.build_env(settings), staging_root=staging_root,
+                        settings=settings)
+
+    print("\n=== 批量打包结果 ===")
+    for name, exit_code in results.items():
+        print(f"{name}: {'成功' if exit_code == 0 else f'失败 (退出代码 {exit_code})'}")
+
+    return 0 if all(code == 0 for code in results.values()) else 1
+
+
+def cmd_analyze(args):
+    """执行 analyze 子命令"""
+    try:
+        config = load_config_file(args.config)
+    except (OSError, ValueError) as e:
+        print(f"无法加载配置: {str(e)}", file=sys.stderr)
+        return 2
+
+    if not config.get("script_path") or not os.path.isfile(config["script_path"]):
+        print("配置中缺少 script_path 或脚本不存在", file=sys.stderr)
+        return 2
+
+    # 用同名配置最近的构建记录校准编译耗时估算
+    name = os.path.splitext(os.path.basename(args.config))[0]
+    try:
+        records = BuildHistory().get_trend(name, limit=bloat_advisor.CALIBRATION_RECORDS)
+    except (OSError, sqlite3.Error):
+        records = []
+
+    report = import_graph.ImportGraph().analyze(config["script_path"], max_workers=args.workers)
+    report["advice"] = bloat_advisor.advise(report, config, bloat_advisor.get_seconds_per_module(records))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+    else:
+        print(import_graph.format_report(report))
+        print(bloat_advisor.format_advice(report["advice"]))
+    return 0
+
+
+def cmd_daemon(args):
+    """执行 daemon 子命令"""
+    return daemon.serve(workers=args.workers, port=args.port, nuitka_path=args.nuitka, verbose=args.verbose)
+
+
+def cmd_submit(args):
+    """执行 submit 子命令: 把任务提交给运行中的构建服务，默认等待完成并输出日志"""
+    try:
+        config = load_config_file(args.config)
+    except (OSError, ValueError) as e:
+        print(f"无法加载配置: {str(e)}", file=sys.stderr)
+        return 2
+    if args.output_dir:
+        config["output_dir"] = args.output_dir
+
+    client = daemon.DaemonClient.connect()
+    if client is None:
+        print("没有运行中的构建服务，请先执行 daemon 子命令", file=sys.stderr)
+        return 2
+
+    name = os.path.splitext(os.path.basename(args.config))[0]
+    try:
+        job = client.submit(config, name=name, clean=args.clean, use_cache=not args.no_cache)
+        print(f"已提交任务 {job['id']}", file=sys.stderr)
+        if args.detach:
+            return 0
+        exit_code = 1
+        for event in client.iter_events(job["id"]):
+            if event["type"] == "log":
+                sys.stdout.write(event["text"])
+                sys.stdout.flush()
+            elif event["type"] == "finished":
+                for path in event["artifacts"]:
+                    print(f"产物: {path}")
+                exit_code = 1 if event["exit_code"] is None else event["exit_code"]
+    except OSError as e:
+        print(f"与构建服务通信失败: {str(e)}", file=sys.stderr)
+        return 1
+    return exit_code
+
+
+def cmd_jobs(args):
+    """执行 jobs 子命令"""
+    client = daemon.DaemonClient.connect()
+    if client is None:
+        print("没有运行中的构建服务", file=sys.stderr)
+        return 2
+    try:
+        if args.cancel:
+            client.cancel(args.cancel)
+        jobs = client.list_jobs()
+    except OSError as e:
+        print(f"与构建服务通信失败: {str(e)}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(jobs, ensure_ascii=False, indent=4))
+        return 0
+    for job in jobs:
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job["created"]))
+        print(f"{job['id']}  {created}  {job['state']:<10} {job['progress']['percent']:>3}%  {job['name']}")
+    return 0
+
+
+def cmd_logs(args):
+    """执行 logs 子命令: 在所有构建日志中查找文本"""
+    from log_index import search_logs
+    try:
+        results = search_logs(args.search, args.limit)
+    except (OSError, sqlite3.Error) as e:
+        print(f"无法读取日志索引: {str(e)}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=4))
+        return 0
+    for result in results:
+        status = "-" if result["exit_code"] is None else result["exit_code"]
+        print(f"{result['started']}  {result['config']}  Nuitka {result['nuitka_version'] or '?'}  "
+              f"退出代码 {status}  {result['log']}:{result['line'] + 1}")
+        print(f"    {result['text']}")
+    if not results:
+        print("没有找到匹配的日志", file=sys.stderr)
+    return 0
+
+
+def cmd_compare(args):
+    """执行 compare 子命令: 比较两次构建，位置 0 为最近一次"""
+    from build_compare import compare_builds, format_report
+    try:
+        history = BuildHistory()
+        if args.config:
+            records = list(reversed(history.get_trend(args.config)))
+        else:
+            records = history.get_records()
+    except (OSError, sqlite3.Error) as e:
+        print(f"无法读取构建记录: {str(e)}", file=sys.stderr)
+        return 1
+    after_index = args.second
+    before_index = args.first if args.first is not None else after_index + 1
+    if max(before_index, after_index) >= len(records) or min(before_index, after_index) < 0:
+        print(f"没有足够的构建记录 (共 {len(records)} 条)", file=sys.stderr)
+        return 2
+
+    report = compare_builds(records[before_index], records[after_index])
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+    else:
+        print(format_report(report))
+    return 0
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        prog="nuitka_packager",
+        description="Nuitka 高级打包工具 (无界面模式)")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    build_parser = subparsers.add_parser("build", help="按保存的配置执行一次打包")
+    build_parser.add_argument("--config", required=True, help="配置文件路径 (JSON) 或GUI中保存的配置名称")
+    build_parser.add_argument("--nuitka", help="nuitka可执行文件路径，默认自动查找")
+    build_parser.add_argument("--output-dir", help="覆盖配置中的输出目录")
+    build_parser.add_argument("--no-cache", action="store_true", help="忽略构建缓存，强制完整编译")
+    build_parser.add_argument("--clean", action="store_true", help="增量模式下先清空构建目录再编译")
+    build_parser.add_argument("--no-staging", action="store_true", help="由Nuitka直接复制数据文件，不使用暂存库")
+    build_parser.set_defaults(func=cmd_build)
+
+    batch_parser = subparsers.add_parser("batch", help="并行打包多个保存的配置")
+    batch_parser.add_argument("--config", required=True, action="append",
+                              help="配置文件路径 (JSON) 或GUI中保存的配置名称，可重复指定")
+    batch_parser.add_argument("--workers", type=int, default=2, help="同时运行的打包进程数")
+    batch_parser.add_argument("--nuitka", help="nuitka可执行文件路径，默认自动查找")
+    batch_parser.add_argument("--no-staging", action="store_true", help="由Nuitka直接复制数据文件，不使用暂存库")
+    batch_parser.set_defaults(func=cmd_batch)
+
+    analyze_parser = subparsers.add_parser("analyze", help="静态分析主脚本的导入，估算编译耗时并给出包含和排除的建议")
+    analyze_parser.add_argument("--config", required=True, help="配置文件路径 (JSON) 或GUI中保存的配置名称")
+    analyze_parser.add_argument("--workers", type=int, help="解析文件的进程数，默认为CPU核心数")
+    analyze_parser.add_argument("--json", action="store_true", help="以JSON格式输出分析结果")
+    analyze_parser.set_defaults(func=cmd_analyze)
+
+    daemon_parser = subparsers.add_parser("daemon", help="启动本机构建服务，通过HTTP接口接收打包任务")
+    daemon_parser.add_argument("--workers", type=int, default=2, help="同时运行的打包任务数")
+    daemon_parser.add_argument("--port", type=int, default=0, help="监听端口，默认由系统分配")
+    daemon_parser.add_argument("--nuitka", help="nuitka可执行文件路径，默认自动查找")
+    daemon_parser.add_argument("--verbose", action="store_true", help="输出每个HTTP请求")
+    daemon_parser.set_defaults(func=cmd_daemon)
+
+    submit_parser = subparsers.add_parser("submit", help="把打包任务提交给运行中的构建服务")
+    submit_parser.add_argument("--config", required=True, help="配置文件路径 (JSON) 或GUI中保存的配置名称")
+    submit_parser.add_argument("--output-dir", help="覆盖配置中的输出目录")
+    submit_parser.add_argument("--no-cache", action="store_true", help="忽略构建缓存，强制完整编译")
+    submit_parser.add_argument("--clean", action="store_true", help="增量模式下先清空构建目录再编译")
+    submit_parser.add_argument("--detach", action="store_true", help="提交后立即返回，不等待任务完成")
+    submit_parser.set_defaults(func=cmd_submit)
+
+    jobs_parser = subparsers.add_parser("jobs", help="列出构建服务中的任务")
+    jobs_parser.add_argument("--cancel", metavar="ID", help="取消指定的任务")
+    jobs_parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    jobs_parser.set_defaults(func=cmd_jobs)
+
+    logs_parser = subparsers.add_parser("logs", help="在所有构建日志中查找文本")
+    logs_parser.add_argument("--search", required=True, metavar="TEXT", help="要查找的文本")
+    logs_parser.add_argument("--limit", type=int, default=200, help="最多输出的结果数")
+    logs_parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    logs_parser.set_defaults(func=cmd_logs)
+
+    compare_parser = subparsers.add_parser("compare", help="比较两次构建的耗时、产物、配置和警告")
+    compare_parser.add_argument("--config", help="只在该配置名称的构建记录中选择")
+    compare_parser.add_argument("--first", type=int, help="作为基准的记录位置，默认为 --second 的上一次")
+    compare_parser.add_argument("--second", type=int, default=0, help="要比较的记录位置，0 为最近一次 (默认)")
+    compare_parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    compare_parser.set_defaults(func=cmd_compare)
+
+    return parser
+
+
+def main(argv=None):
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,184 @@
+import os
+import re
+import sys
+import shutil
+import subprocess
+
+from data_files import build_data_options
+
+# 目标平台名称到 --assume-platform 取值的映射
+PLATFORM_MAP = {
+    "Windows": "win",
+    "Linux": "linux",
+    "macOS": "macos"
+}
+
+
+def find_nuitka_path():
+    """获取nuitka可执行文件路径，不依赖Qt"""
+    # 尝试标准路径
+    if sys.platform == "win32":
+        possible_paths = [
+            os.path.join(sys.prefix, "Scripts", "nuitka.exe"),
+            os.path.join(sys.prefix, "Scripts", "nuitka.cmd"),
+            os.path.join(sys.prefix, "Scripts", "nuitka-script.py"),
+            os.path.join(os.environ.get("APPDATA", ""), "Python", "Scripts", "nuitka.cmd"),
+            os.path.join(os.path.dirname(sys.executable), "Scripts", "nuitka.cmd")
+        ]
+    else:
+        possible_paths = [
+            os.path.join(sys.prefix, "bin", "nuitka"),
+            "/usr/local/bin/nuitka",
+            "/usr/bin/nuitka"
+        ]
+
+    # 检查可能的路径
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+
+    # 在PATH中查找
+    return shutil.which("nuitka")
+
+
+def parse_nuitka_version(output):
+    """从 `nuitka --version` 的输出中提取版本号"""
+    for line in output.split('\n'):
+        if line.startswith("Nuitka") or line.startswith("nuitka"):
+            # 更健壮的版本号提取逻辑
+            version_match = re.search(r'(\d+\.\d+\.\d+)', line)
+            if version_match:
+                return version_match.group(1)
+            # 处理不同格式的版本号输出
+            version_match = re.search(r'version\s*([\d\.]+)', line, re.IGNORECASE)
+            if version_match:
+                return version_match.group(1)
+            parts = line.split()
+            if len(parts) >= 2:
+                return parts[1].lstrip('v')
+    # 新版本的第一行只有版本号本身
+    version_match = re.match(r'\s*v?(\d+\.\d+(\.\d+)?)', output)
+    if version_match:
+        return version_match.group(1)
+    return "未知版本"
+
+
+def detect_nuitka_version(nuitka_path):
+    """同步运行 `nuitka --version` 并返回版本号，失败时返回 None"""
+    try:
+        result = subprocess.run([nuitka_path, "--version"], capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return parse_nuitka_version(result.stdout.strip())
+
+
+def split_list(text):
+    """把逗号分隔的配置项拆分为列表，忽略空项"""
+    return [item.strip() for item in (text or "").split(",") if item.strip()]
+
+
+def build_command(config, nuitka_path, output_dir=None, stage_data=False):
+    """根据配置字典生成Nuitka命令参数列表
+
+    config 与 ConfigManager.save_config 保存的 JSON 格式一致，
+    GUI 和命令行共用此函数，保证两者执行的命令完全相同。
+    output_dir 用于覆盖配置中的输出目录 (如增量构建目录)。
+    stage_data 为真时不把数据文件交给Nuitka，由打包完成后的暂存步骤放入产物 (见 staging)。
+    """
+    command = [nuitka_path]
+
+    if config.get("standalone", True):
+        command.append("--standalone")
+
+    if config.get("onefile", False):
+        command.append("--onefile")
+
+    # 增量模式需要保留 .build 目录供下次复用
+    if config.get("remove_output", False) and not config.get("incremental", False):
+        command.append("--remove-output")
+
+    if config.get("show_progress", True):
+        command.append("--show-progress")
+
+    # 内存占用输出用于构建记录中的峰值内存统计
+    if config.get("show_memory", True):
+        command.append("--show-memory")
+
+    output_dir = output_dir or config.get("output_dir")
+    if output_dir:
+        command.append(f"--output-dir={output_dir}")
+
+    if not stage_data:
+        command.extend(build_data_options(config.get("included_files", []), config.get("included_dirs", [])))
+
+    platform = PLATFORM_MAP.get(config.get("platform", "自动检测"))
+    if platform:
+        command.append(f"--assume-platform={platform}")
+
+    if config.get("follow_imports", False):
+        command.append("--follow-imports")
+
+    if config.get("include_packages", True):
+        for pkg in split_list(config.get("include_packages_list", "")):
+            command.append(f"--include-package={pkg}")
+
+    for pkg in split_list(config.get("nofollow_imports_list", "")):
+        command.append(f"--nofollow-import-to={pkg}")
+
+    # Nuitka anti-bloat 插件: 不跟随这些重量级模块的导入
+    for mode in split_list(config.get("noinclude_modes_list", "")):
+        command.append(f"--noinclude-{mode}-mode=nofollow")
+
+    if config.get("enable_plugin", True):
+        for plugin in split_list(config.get("plugins_list", "")):
+            command.append(f"--enable-plugin={plugin}")
+
+    if config.get("icon_path"):
+        command.append(f"--windows-icon-from-ico={config['icon_path']}")
+
+    if config.get("company_name"):
+        command.append(f"--windows-company-name={config['company_name']}")
+
+    if config.get("product_name"):
+        command.append(f"--windows-product-name={config['product_name']}")
+
+    if config.get("version"):
+        command.append(f"--windows-product-version={config['version']}")
+
+    if not config.get("console_window", True):
+        command.append("--windows-disable-console")
+
+    # 自动模式 (parallel_count 为 0) 在运行前由 job_tuner 替换为具体的任务数，未替换时 (如预览) 不指定
+    if config.get("parallel", True) and config.get("parallel_count", 4) not in (0, "auto"):
+        command.append(f"--jobs={config.get('parallel_count', 4)}")
+
+    if config.get("low_memory", False):
+        command.append("--low-memory")
+
+    command.append(config["script_path"])
+
+    return command
+
+
+def format_command(command):
+    """把命令列表格式化为便于显示的字符串"""
+    return " ".join(command).replace("\\", "/")
+
+
+def split_jobs(concurrency, cpu_count=None):
+    """把本机CPU核心平均分配给同时运行的多个打包任务，返回每个任务的 --jobs 值"""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, cpu_count // max(1, concurrency))
+
+
+def get_artifact_paths(config):
+    """返回一次打包按配置应当生成的产物路径 (.dist 目录或单文件)"""
+    output_dir = os.path.abspath(config.get("output_dir") or os.getcwd())
+    stem = os.path.splitext(os.path.basename(config["script_path"]))[0]
+    binary = stem + (".exe" if sys.platform == "win32" else ".bin")
+
+    if config.get("onefile", False) or not config.get("standalone", True):
+        return [os.path.join(output_dir, binary)]
+    return [os.path.join(output_dir, stem + ".dist")]
@@ -0,0 +1,130 @@
+import json
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
+                             QHeaderView, QPushButton, QFileDialog, QMessageBox)
+from PyQt5.QtGui import QColor
+
+from background import BackgroundTask
+from build_compare import compare_builds, format_report, format_delta, format_size_delta, format_value
+from data_files import format_size
+
+# 变大、变慢用红色，变小、变快用绿色
+WORSE_COLOR = QColor(192, 0, 0)
+BETTER_COLOR = QColor(0, 128, 0)
+
+
+class BuildCompareDialog(QDialog):
+    """比较两条构建记录并按退步程度列出差异
+
+    比较 (读取产物清单和两份日志) 在后台线程中进行，打开对话框不会阻塞界面。
+    """
+
+    def __init__(self, before, after, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"构建对比 - {before.get('time')} / {after.get('time')}")
+        self.resize(960, 640)
+        self.report = None
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"之前: {before.get('time')}  {before.get('config')}\n"
+                                f"之后: {after.get('time')}  {after.get('config')}"))
+        self.summary_label = QLabel("比较中...")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["项目", "之前", "之后", "变化"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.tree)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.export_button = QPushButton("导出报告")
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export_report)
+        button_layout.addWidget(self.export_button)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.task = BackgroundTask(compare_builds, before, after, parent=self)
+        self.task.result_ready.connect(self.show_report)
+        self.task.start()
+
+    def add_section(self, title, rows):
+        """rows 为 (名称, 之前, 之后, 变化, 变化量) 列表，变化量的正负决定颜色"""
+        if not rows:
+            return
+        section = QTreeWidgetItem(self.tree, [f"{title} ({len(rows)})"])
+        for name, before, after, change, delta in rows:
+            item = QTreeWidgetItem(section, [name, before, after, change])
+            if delta:
+                item.setForeground(3, WORSE_COLOR if delta > 0 else BETTER_COLOR)
+        section.setExpanded(True)
+
+    def show_report(self, report):
+        self.task = None
+        if isinstance(report, Exception):
+            self.summary_label.setText(f"比较失败: {str(report)}")
+            return
+        self.report = report
+        self.export_button.setEnabled(True)
+        self.summary_label.setText("\n".join(report["highlights"]) or "两次构建没有明显变化")
+
+        self.add_section("指标", [(metric["name"], f"{metric['before']:.1f}", f"{metric['after']:.1f}",
+                                   format_delta(metric["delta"], metric["unit"]), metric["delta"])
+                                  for metric in report["metrics"]])
+        self.add_section("阶段耗时", [(stage["name"], f"{stage['before']:.1f}", f"{stage['after']:.1f}",
+                                       f"{stage['delta']:+.1f}秒", stage["delta"])
+                                      for stage in report["stages"] if stage["delta"]])
+
+        artifacts = report["artifacts"]
+        if artifacts:
+            self.add_section("按包统计的产物大小", [
+                (package["name"], format_size(package["before"]), format_size(package["after"]),
+                 f"{format_size_delta(package['delta'])}  新增 {package['added']} 删除 {package['removed']}",
+                 package["delta"])
+                for package in artifacts["packages"]])
+            self.add_section("新增文件", [(path, "", format_size(size), format_size_delta(size), size)
+                                          for path, size in artifacts["added"]["files"]])
+            self.add_section("删除文件", [(path, format_size(size), "", format_size_delta(-size), -size)
+                                          for path, size in artifacts["removed"]["files"]])
+            self.add_section("大小变化的文件", [
+                (path, format_size(old_size), format_size(size), format_size_delta(size - old_size),
+                 size - old_size)
+                for path, old_size, size in artifacts["changed"]["files"]])
+
+        if report["config"]:
+            self.add_section("配置", [(item["key"], format_value(item["before"]), format_value(item["after"]), "", 0)
+                                      for item in report["config"]])
+        if report["options"]:
+            self.add_section("Nuitka参数", [(option, "", option, "增加", 0) for option in report["options"]["added"]]
+                             + [(option, option, "", "去掉", 0) for option in report["options"]["removed"]])
+        if report["warnings"]:
+            self.add_section("警告", [(text, "", "", "新出现", 1) for text in report["warnings"]["added"]]
+                             + [(text, "", "", "消失", -1) for text in report["warnings"]["removed"]])
+        if report["missing"]:
+            self.add_section("未比较", [(text, "", "", "", 0) for text in report["missing"]])
+
+        for column in range(1, 4):
+            self.tree.resizeColumnToContents(column)
+
+    def export_report(self):
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "导出对比报告", "", "Text Files (*.txt);;JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                if file_path.endswith(".json") or selected_filter.startswith("JSON"):
+                    json.dump(self.report, f, ensure_ascii=False, indent=4)
+                else:
+                    f.write(format_report(self.report))
+        except OSError as e:
+            QMessageBox.warning(self, "错误", f"无法导出报告: {str(e)}")
+
+    def closeEvent(self, event):
+        if self.task is not None:
+            self.task.wait()
+        super().closeEvent(event)
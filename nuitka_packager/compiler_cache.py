@@ -0,0 +1,127 @@
+import os
+import re
+import shutil
+import subprocess
+
+from settings import get_data_dir
+
+# ccache 4.x `--print-stats` 的字段
+HIT_KEYS = ("direct_cache_hit", "preprocessed_cache_hit")
+MISS_KEYS = ("cache_miss",)
+
+# ccache 3.x `-s` 的可读输出
+LEGACY_PATTERNS = {
+    "hits_direct": re.compile(r'^cache hit \(direct\)\s+(\d+)', re.MULTILINE),
+    "hits_preprocessed": re.compile(r'^cache hit \(preprocessed\)\s+(\d+)', re.MULTILINE),
+    "misses": re.compile(r'^cache miss\s+(\d+)', re.MULTILINE),
+    "files": re.compile(r'^files in cache\s+(\d+)', re.MULTILINE),
+    "size": re.compile(r'^cache size\s+([\d.]+)\s*([kMGT]?B)', re.MULTILINE)
+}
+
+SIZE_UNITS = {"B": 1, "kB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4}
+
+
+def find_ccache():
+    """查找ccache可执行文件"""
+    return shutil.which("ccache")
+
+
+def get_cache_dir(settings):
+    return settings.get("ccache_dir") or os.path.join(get_data_dir(), "ccache")
+
+
+def build_env(settings):
+    """返回让所有打包任务共用同一个编译缓存所需的环境变量"""
+    if not settings.get("ccache_enabled"):
+        return {}
+
+    env = {
+        "CCACHE_DIR": get_cache_dir(settings),
+        "CCACHE_MAXSIZE": f"{settings.get('ccache_max_size_gb', 10)}G"
+    }
+    ccache_path = find_ccache()
+    if ccache_path:
+        env["NUITKA_CCACHE_BINARY"] = ccache_path
+    return env
+
+
+def read_stats(settings):
+    """读取共享编译缓存的统计数据，ccache不可用时返回 None"""
+    ccache_path = find_ccache()
+    if not settings.get("ccache_enabled") or not ccache_path:
+        return None
+
+    env = dict(os.environ, **build_env(settings))
+    try:
+        result = subprocess.run([ccache_path, "--print-stats"], capture_output=True,
+                                text=True, env=env)
+        if result.returncode == 0:
+            return parse_print_stats(result.stdout)
+
+        result = subprocess.run([ccache_path, "-s"], capture_output=True, text=True, env=env)
+        if result.returncode == 0:
+            return parse_legacy_stats(result.stdout)
+    except OSError:
+        pass
+    return None
+
+
+def parse_print_stats(output):
+    """解析 `ccache --print-stats` 的制表符分隔输出"""
+    values = {}
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 2 and parts[1].strip().isdigit():
+            values[parts[0].strip()] = int(parts[1])
+
+    return {
+        "hits": sum(values.get(key, 0) for key in HIT_KEYS),
+        "misses": sum(values.get(key, 0) for key in MISS_KEYS),
+        "files": values.get("files_in_cache", 0),
+        "size_bytes": values.get("cache_size_kibibyte", 0) * 1024
+    }
+
+
+def parse_legacy_stats(output):
+    """解析 ccache 3.x `ccache -s` 的输出"""
+    def number(name):
+        match = LEGACY_PATTERNS[name].search(output)
+        return int(match.group(1)) if match else 0
+
+    size_bytes = 0
+    match = LEGACY_PATTERNS["size"].search(output)
+    if match:
+        size_bytes = int(float(match.group(1)) * SIZE_UNITS.get(match.group(2), 1))
+
+    return {
+        "hits": number("hits_direct") + number("hits_preprocessed"),
+        "misses": number("misses"),
+        "files": number("files"),
+        "size_bytes": size_bytes
+    }
+
+
+def diff_stats(before, after):
+    """计算一次打包期间的缓存命中情况
+
+    ccache 不记录节省的字节数，按缓存中对象的平均大小乘以命中次数估算。
+    """
+    if not before or not after:
+        return None
+
+    hits = max(0, after["hits"] - before["hits"])
+    misses = max(0, after["misses"] - before["misses"])
+    average_size = after["size_bytes"] / after["files"] if after["files"] else 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+        "bytes_saved": int(hits * average_size)
+    }
+
+
+def format_stats(delta):
+    """把缓存命中情况格式化为一行文本"""
+    return (f"编译缓存: 命中 {delta['hits']}, 未命中 {delta['misses']}, "
+            f"命中率 {delta['hit_rate']:.0%}, 约节省 {delta['bytes_saved'] / (1024 * 1024):.1f} MB")
@@ -1,28 +1,24 @@
 import json
-import os
+import sqlite3
 from datetime import datetime
-from PyQt5.QtWidgets import QFileDialog
+from PyQt5.QtWidgets import QFileDialog, QMessageBox
+
+from config_store import ConfigStore
 
 class ConfigManager:
-    def __init__(self, app):
+    """保存的打包配置，存放在本地SQLite数据库中 (见 ConfigStore)"""
+    
+    def __init__(self, app, store=None):
         self.app = app
-        self.config_dir = "resources/saved_configs"
-        os.makedirs(self.config_dir, exist_ok=True)
-        
-    def get_config_path(self, name):
-        """获取配置文件的完整路径"""
-        return os.path.join(self.config_dir, f"{name}.json")
+        self.store = store or ConfigStore()
     
-    def save_config(self, config_data, name=None):
+    def save_config(self, config_data, name=None, tags=None):
         """保存当前配置"""
         if name is None:
             name = f"config_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        config_path = self.get_config_path(name)
-        
         try:
-            with open(config_path, 'w') as f:
-                json.dump(config_data, f, indent=4)
+            self.store.save(name, config_data, tags)
             return True
         except Exception as e:
             QMessageBox.warning(self.app, "保存配置错误", f"无法保存配置: {str(e)}")
@@ -30,29 +26,43 @@ class ConfigManager:
     
     def load_config(self, name):
         """加载指定配置"""
-        config_path = self.get_config_path(name)
-        
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            config_data = self.store.load(name)
+            if config_data is None:
+                raise ValueError(f"配置 '{name}' 不存在")
+            return config_data
         except Exception as e:
             QMessageBox.warning(self.app, "加载配置错误", f"无法加载配置: {str(e)}")
             return None
     
     def get_saved_configs(self):
         """获取所有保存的配置列表"""
-        configs = []
-        for filename in os.listdir(self.config_dir):
-            if filename.endswith('.json'):
-                name = filename[:-5]  # 去掉.json后缀
-                configs.append(name)
-        return sorted(configs)
+        return [name for name, _ in self.store.list_configs()]
+    
+    def count_configs(self, query=None):
+        """符合搜索文本的配置数量"""
+        return self.store.count(query)
+    
+    def list_configs(self, query=None, offset=0, limit=-1):
+        """分页获取符合搜索文本的 (配置名称, 标签列表)"""
+        return self.store.list_configs(query, offset, limit)
+    
+    def get_tags(self, name):
+        return self.store.get_tags(name)
+    
+    def set_tags(self, name, tags):
+        try:
+            self.store.set_tags(name, tags)
+            return True
+        except sqlite3.Error as e:
+            QMessageBox.warning(self.app, "保存标签错误", f"无法保存标签: {str(e)}")
+            return False
     
     def delete_config(self, name):
         """删除指定配置"""
-        config_path = self.get_config_path(name)
         try:
-            os.remove(config_path)
+            if not self.store.delete(name):
+                raise ValueError(f"配置 '{name}' 不存在")
             return True
         except Exception as e:
             QMessageBox.warning(self.app, "删除配置错误", f"无法删除配置: {str(e)}")
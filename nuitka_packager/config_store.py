@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+import time
+
+from settings import get_data_dir
+
+# 旧版本每个配置一个JSON文件的保存目录，首次打开数据库时导入
+LEGACY_CONFIG_DIR = "resources/saved_configs"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '',
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS build_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    config TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS build_records_config ON build_records (config, id);
+"""
+
+
+def get_database_path():
+    return os.path.join(get_data_dir(), "nuitka_packager.db")
+
+
+def connect(path=None):
+    """打开工具的本地数据库 (配置和构建记录)，不存在的表会被创建"""
+    connection = sqlite3.connect(path or get_database_path())
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def has_fts5(connection):
+    try:
+        connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS configs_fts USING fts5(name, tags, content)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def get_meta(connection, key):
+    row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(connection, key, value):
+    connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def split_tags(text):
+    return [tag.strip() for tag in (text or "").replace("，", ",").split(",") if tag.strip()]
+
+
+def get_search_text(config_data):
+    """配置中所有文本字段拼接成的全文索引内容"""
+    values = []
+    for value in config_data.values():
+        if isinstance(value, str):
+            values.append(value)
+        elif isinstance(value, list):
+            values.extend(item for item in value if isinstance(item, str))
+    return "\n".join(values)
+
+
+def build_match_query(text):
+    """把用户输入转换为FTS5查询: 每个词按前缀匹配，词之间为"与"的关系"""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class ConfigStore:
+    """保存打包配置的SQLite数据库
+
+    配置按名称唯一保存，可以附加标签；名称、标签和配置中的文本字段
+    (脚本路径、包含的包、插件等) 建立了FTS5全文索引，SQLite不支持FTS5时退回LIKE查找。
+    """
+
+    def __init__(self, path=None, legacy_dir=LEGACY_CONFIG_DIR):
+        self.connection = connect(path)
+        self.fts_enabled = has_fts5(self.connection)
+        self.migrate_legacy_configs(legacy_dir)
+
+    def migrate_legacy_configs(self, legacy_dir):
+        """一次性导入旧版本保存的JSON配置文件，导入后原文件保留不动
+
+        旧目录是相对于工作目录的路径，因此按绝对路径分别记录是否已导入。
+        """
+        if not legacy_dir or not os.path.isdir(legacy_dir):
+            return
+        meta_key = f"legacy_configs_migrated:{os.path.abspath(legacy_dir)}"
+        if get_meta(self.connection, meta_key):
+            return
+        for filename in sorted(os.listdir(legacy_dir)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(legacy_dir, filename), 'r') as f:
+                    config_data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if self.load(filename[:-5]) is None:
+                self.save(filename[:-5], config_data, commit=False)
+        set_meta(self.connection, meta_key, "1")
+        self.connection.commit()
+
+    def save(self, name, config_data, tags=None, commit=True):
+        """保存配置，tags 为 None 时保留原有标签"""
+        row = self.connection.execute("SELECT id, tags FROM configs WHERE name = ?", (name,)).fetchone()
+        tags_text = ",".join(tags) if tags is not None else (row[1] if row else "")
+        data = json.dumps(config_data, ensure_ascii=False)
+        if row:
+            config_id = row[0]
+            self.connection.execute("UPDATE configs SET data = ?, tags = ?, updated = ? WHERE id = ?",
+                                    (data, tags_text, time.time(), config_id))
+        else:
+            config_id = self.connection.execute(
+                "INSERT INTO configs (name, data, tags, updated) VALUES (?, ?, ?, ?)",
+                (name, data, tags_text, time.time())).lastrowid
+        if self.fts_enabled:
+            self.connection.execute("DELETE FROM configs_fts WHERE rowid = ?", (config_id,))
+            self.connection.execute("INSERT INTO configs_fts (rowid, name, tags, content) VALUES (?, ?, ?, ?)",
+                                    (config_id, name, tags_text, get_search_text(config_data)))
+        if commit:
+            self.connection.commit()
+
+    def load(self, name):
+        """读取配置，不存在时返回 None"""
+        row = self.connection.execute("SELECT data FROM configs WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, name):
+        """删除配置，返回是否存在该配置"""
+        row = self.connection.execute("SELECT id FROM configs WHERE name = ?", (name,)).fetchone()
+        if not row:
+            return False
+        self.connection.execute("DELETE FROM configs WHERE id = ?", (row[0],))
+        if self.fts_enabled:
+            self.connection.execute("DELETE FROM configs_fts WHERE rowid = ?", (row[0],))
+        self.connection.commit()
+        return True
+
+    def get_tags(self, name):
+        row = self.connection.execute("SELECT tags FROM configs WHERE name = ?", (name,)).fetchone()
+        return split_tags(row[0]) if row else []
+
+    def set_tags(self, name, tags):
+        config_data = self.load(name)
+        if config_data is not None:
+            self.save(name, config_data, tags)
+
+    def query_filter(self, query):
+        """返回按搜索文本筛选配置的 (SQL条件, 参数)"""
+        if not query or not query.strip():
+            return "", ()
+        if self.fts_enabled:
+            return ("WHERE configs.id IN (SELECT rowid FROM configs_fts WHERE configs_fts MATCH ?)",
+                    (build_match_query(query),))
+        pattern = f"%{query.strip()}%"
+        return "WHERE name LIKE ? OR tags LIKE ? OR data LIKE ?", (pattern, pattern, pattern)
+
+    def count(self, query=None):
+        where, params = self.query_filter(query)
+        try:
+            return self.connection.execute(f"SELECT COUNT(*) FROM configs {where}", params).fetchone()[0]
+        except sqlite3.OperationalError:
+            # 无法解析的搜索文本
+            return 0
+
+    def list_configs(self, query=None, offset=0, limit=-1):
+        """按名称排序返回 (名称, 标签列表)，可按搜索文本筛选并分页读取"""
+        where, params = self.query_filter(query)
+        try:
+            rows = self.connection.execute(
+                f"SELECT name, tags FROM configs {where} ORDER BY name LIMIT ? OFFSET ?",
+                params + (limit, offset)).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        return [(name, split_tags(tags)) for name, tags in rows]
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,93 @@
+import os
+from array import array
+
+from settings import get_data_dir
+
+# 每隔多少行记录一次文件偏移，稀疏索引让内存占用与日志长度基本无关
+INDEX_STRIDE = 256
+
+
+class ConsoleLog:
+    """控制台输出的磁盘副本
+
+    控制台控件只保留最近的若干行，完整输出写入此文件，
+    通过稀疏的行偏移索引按需读取任意范围。
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            log_dir = os.path.join(get_data_dir(), "console")
+            os.makedirs(log_dir, exist_ok=True)
+            path = os.path.join(log_dir, f"session-{os.getpid()}.log")
+        self.path = path
+        self.file = open(path, 'w+b')
+        self.reset_index()
+
+    def reset_index(self):
+        self.offsets = array('q', [0])
+        self.line_count = 0
+        self.size = 0
+        self.partial = False
+
+    def write(self, text):
+        data = text.encode("utf-8", errors="replace")
+        position = data.find(b"\n")
+        while position != -1:
+            self.line_count += 1
+            if self.line_count % INDEX_STRIDE == 0:
+                self.offsets.append(self.size + position + 1)
+            position = data.find(b"\n", position + 1)
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(data)
+        self.size += len(data)
+        if data:
+            self.partial = not data.endswith(b"\n")
+
+    def total_lines(self):
+        """已写入的行数 (包括末尾未换行的一行)"""
+        return self.line_count + (1 if self.partial else 0)
+
+    def read_lines(self, start, count):
+        """读取从第 start 行 (从0开始) 起的 count 行"""
+        self.file.flush()
+        start = max(0, start)
+        block = start // INDEX_STRIDE
+        if block >= len(self.offsets):
+            return []
+        self.file.seek(self.offsets[block])
+        for _ in range(start - block * INDEX_STRIDE):
+            if not self.file.readline():
+                return []
+
+        lines = []
+        for _ in range(count):
+            line = self.file.readline()
+            if not line:
+                break
+            lines.append(line.decode("utf-8", errors="replace").rstrip("\n"))
+        return lines
+
+    def search_backward(self, needle, before_line):
+        """从 before_line 行之前向前查找包含 needle 的行，返回行号，未找到返回 -1"""
+        needle = needle.lower()
+        block_start = min(before_line, self.total_lines())
+        while block_start > 0:
+            start = max(0, block_start - INDEX_STRIDE * 4)
+            lines = self.read_lines(start, block_start - start)
+            for i in range(len(lines) - 1, -1, -1):
+                if needle in lines[i].lower():
+                    return start + i
+            block_start = start
+        return -1
+
+    def clear(self):
+        self.file.seek(0)
+        self.file.truncate()
+        self.reset_index()
+
+    def close(self):
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,258 @@
+import time
+from collections import deque
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                            QPushButton, QPlainTextEdit)
+from PyQt5.QtCore import QObject, QTimer, QDateTime, Qt
+from PyQt5.QtGui import QTextCursor, QTextCharFormat, QColor, QFont
+
+# 完整日志查看器每次载入的行数
+PAGE_LINES = 2000
+
+# 控制台各输出级别对应的颜色
+LEVEL_COLORS = {
+    "INFO": QColor(Qt.blue),
+    "WARNING": QColor(255, 165, 0),  # 橙色
+    "ERROR": QColor(Qt.red),
+    "STAGE": QColor(Qt.darkGreen),
+    "COMMAND": QColor(128, 0, 128)  # 紫色
+}
+
+
+def make_format(color):
+    char_format = QTextCharFormat()
+    char_format.setForeground(color)
+    return char_format
+
+
+class ConsoleRenderer(QObject):
+    """缓冲控制台输出，每帧只向控制台 (QPlainTextEdit) 批量插入一次
+
+    大量输出时逐段设置颜色和滚动会让界面卡顿，这里把一帧内的所有文本
+    按级别合并，在一个编辑块中插入，并且只在插入后滚动一次。
+    传入 log (ConsoleLog) 时控件只保留最近 max_lines 行，完整输出写入磁盘。
+    打包期间 build_log (BuildLogWriter) 另外保存本次打包的输出。
+    """
+
+    def __init__(self, console, log=None, max_lines=0, interval_ms=16, frame_budget=0.008,
+                 batch_size=200, batch_chars=4096, parent=None):
+        super().__init__(parent)
+        self.console = console
+        self.console.document().setUndoRedoEnabled(False)
+        self.console.setMaximumBlockCount(max_lines)
+        self.log = log
+        self.build_log = None
+        self.pending = deque()
+        self.frame_budget = frame_budget
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        self.max_frame_chars = batch_chars * 8
+        self.frame_chars = batch_chars * 4
+        self.timestamp_format = make_format(QColor(Qt.gray))
+        self.formats = {level: make_format(color) for level, color in LEVEL_COLORS.items()}
+        self.default_format = make_format(QColor(Qt.black))
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(interval_ms)
+        self.flush_timer.timeout.connect(self.flush)
+
+        # 性能统计，供基准测试使用
+        self.lines_flushed = 0
+        self.max_flush_time = 0.0
+
+    def append(self, text, level="INFO"):
+        timestamp = QDateTime.currentDateTime().toString("[hh:mm:ss] ")
+        self.pending.append((level, timestamp, text))
+        if self.log is not None:
+            self.log.write(timestamp + text)
+        if self.build_log is not None:
+            self.build_log.write(timestamp + text)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """把缓冲区中的文本批量写入控制台
+
+        每帧最多占用 frame_budget 秒，剩余的文本留到下一帧，避免大量输出时界面卡住。
+        控件在编辑块结束时才排版并删除超出 max_lines 的旧行，这部分耗时在插入时无法测量，
+        因此每帧写入的字符数不超过 frame_chars，并按本帧每个字符的实际耗时调整下一帧的上限。
+        """
+        if not self.pending:
+            return
+        started = time.perf_counter()
+
+        scrollbar = self.console.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        cursor = QTextCursor(self.console.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        inserted = 0
+        while (self.pending and inserted < self.frame_chars
+               and time.perf_counter() - started < self.frame_budget):
+            batch = self.take_batch()
+            for char_format, texts in self.merge(batch):
+                cursor.insertText("".join(texts), char_format)
+            self.lines_flushed += sum(text.count("\n") for _, _, text in batch)
+            inserted += sum(len(timestamp) + len(text) for _, timestamp, text in batch)
+        cursor.endEditBlock()
+
+        # 用户向上翻看历史输出时不强制滚动到底部
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+        if self.pending:
+            self.flush_timer.start()
+        elapsed = time.perf_counter() - started
+        self.max_flush_time = max(self.max_flush_time, elapsed)
+        # 控件未满 max_lines 时不删除旧行，写入很快，估计值不能超过 max_frame_chars，
+        # 否则控件写满后的第一帧会严重超时
+        estimate = int(inserted * self.frame_budget / elapsed) if elapsed > 0 else self.max_frame_chars
+        self.frame_chars = max(self.batch_chars, min(self.max_frame_chars, estimate))
+
+    def take_batch(self):
+        """取出最多 batch_size 项、约 batch_chars 个字符的文本
+
+        一次读到的进程输出可能有几百KB，过长的一项在换行处拆开，剩余部分 (不再带时间戳) 放回队首。
+        """
+        batch = []
+        size = 0
+        while self.pending and len(batch) < self.batch_size and size < self.batch_chars:
+            level, timestamp, text = self.pending.popleft()
+            room = self.batch_chars - size
+            if len(text) > room:
+                cut = text.rfind("\n", 0, room) + 1 or room
+                self.pending.appendleft((level, "", text[cut:]))
+                text = text[:cut]
+            batch.append((level, timestamp, text))
+            size += len(timestamp) + len(text)
+        return batch
+
+    def merge(self, batch):
+        """合并相邻的同格式文本，减少格式切换次数"""
+        merged = []
+        for level, timestamp, text in batch:
+            char_format = self.formats.get(level, self.default_format)
+            for segment_format, segment in ((self.timestamp_format, timestamp), (char_format, text)):
+                if not segment:
+                    continue
+                if merged and merged[-1][0] is segment_format:
+                    merged[-1][1].append(segment)
+                else:
+                    merged.append((segment_format, [segment]))
+        return merged
+
+    def clear(self):
+        self.pending.clear()
+        self.flush_timer.stop()
+        self.console.clear()
+        if self.log is not None:
+            self.log.clear()
+
+
+class ConsolePagerDialog(QDialog):
+    """按需分页浏览磁盘上的完整控制台日志
+
+    每次只载入 PAGE_LINES 行，滚动到顶部或底部时载入相邻的范围。
+    """
+
+    def __init__(self, log, parent=None, title="完整日志"):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(900, 650)
+        self.log = log
+        self.window_start = 0
+        self.loading = False
+
+        layout = QVBoxLayout(self)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("输入要查找的文本")
+        self.search_edit.returnPressed.connect(self.search_backward)
+        search_layout.addWidget(self.search_edit)
+        search_button = QPushButton("向前查找")
+        search_button.clicked.connect(self.search_backward)
+        search_layout.addWidget(search_button)
+        layout.addLayout(search_layout)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setFont(QFont("Courier New", 10))
+        self.view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.view.verticalScrollBar().valueChanged.connect(self.handle_scroll)
+        layout.addWidget(self.view)
+
+        nav_layout = QHBoxLayout()
+        self.position_label = QLabel()
+        nav_layout.addWidget(self.position_label)
+        nav_layout.addStretch()
+        for text, handler in (("最早", self.show_first), ("上一页", self.show_previous),
+                              ("下一页", self.show_next), ("最新", self.show_last)):
+            button = QPushButton(text)
+            button.clicked.connect(handler)
+            nav_layout.addWidget(button)
+        layout.addLayout(nav_layout)
+
+        self.show_last()
+
+    def show_window(self, start, first_visible=0):
+        """载入从 start 行开始的一页，并把第 first_visible 行滚动到顶部"""
+        total = self.log.total_lines()
+        start = max(0, min(start, total - PAGE_LINES))
+        self.loading = True
+        self.window_start = start
+        self.view.setPlainText("\n".join(self.log.read_lines(start, PAGE_LINES)))
+        self.view.verticalScrollBar().setValue(first_visible)
+        self.loading = False
+        end = min(total, start + PAGE_LINES)
+        self.position_label.setText(f"第 {start + 1}-{end} 行 / 共 {total} 行")
+
+    def handle_scroll(self, value):
+        if self.loading:
+            return
+        scrollbar = self.view.verticalScrollBar()
+        if value == scrollbar.minimum() and self.window_start > 0:
+            new_start = max(0, self.window_start - PAGE_LINES // 2)
+            self.show_window(new_start, self.window_start - new_start)
+        elif value == scrollbar.maximum() and self.window_start + PAGE_LINES < self.log.total_lines():
+            new_start = self.window_start + PAGE_LINES // 2
+            self.show_window(new_start, value - (new_start - self.window_start))
+
+    def show_first(self):
+        self.show_window(0)
+
+    def show_previous(self):
+        self.show_window(self.window_start - PAGE_LINES)
+
+    def show_next(self):
+        self.show_window(self.window_start + PAGE_LINES)
+
+    def show_last(self):
+        self.show_window(self.log.total_lines() - PAGE_LINES, PAGE_LINES)
+
+    def search_backward(self):
+        needle = self.search_edit.text()
+        if not needle:
+            return
+        # 不换行时滚动条的值就是第一个可见行
+        top_line = self.window_start + self.view.verticalScrollBar().value()
+        current = self.view.textCursor()
+        if current.hasSelection():
+            top_line = self.window_start + current.blockNumber()
+
+        line = self.log.search_backward(needle, top_line)
+        if line < 0:
+            self.position_label.setText(f"未找到: {needle}")
+            return
+
+        self.show_line(line)
+
+    def show_line(self, line):
+        """载入第 line 行所在的一页，选中该行并滚动到中间"""
+        self.show_window(line - PAGE_LINES // 2, PAGE_LINES // 2)
+        block = self.view.document().findBlockByNumber(line - self.window_start)
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        self.view.setTextCursor(cursor)
+        self.view.centerCursor()
@@ -0,0 +1,543 @@
+import hmac
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import request as urllib_request
+from urllib.parse import urlsplit, parse_qs
+
+from build_runner import run_build, TelemetryStream
+from build_cache import BuildCache
+from build_history import BuildHistory
+from build_compare import save_manifest
+from command_builder import get_artifact_paths, split_jobs
+from settings import load_settings, get_data_dir
+from staging import StagingStore, get_staging_dir
+from build_logs import open_build_log
+import compiler_cache
+import toolchain
+import job_tuner
+
+# 服务只监听本机回环地址，客户端通过数据目录中的 daemon.json 找到端口和访问令牌
+DAEMON_HOST = "127.0.0.1"
+DAEMON_FILE = "daemon.json"
+# 内存中保留的已结束任务数，更早的任务 (包括日志) 被丢弃
+MAX_FINISHED_JOBS = 100
+# 事件流在没有新事件时发送空行的间隔 (秒)，用于发现已断开的客户端
+KEEPALIVE_SECONDS = 15
+FINISHED_STATES = ("succeeded", "failed", "cancelled")
+
+
+def get_daemon_file():
+    return os.path.join(get_data_dir(), DAEMON_FILE)
+
+
+class BuildJob:
+    """构建服务中的一个打包任务，保存状态和按顺序编号的事件 (日志、进度、结束)"""
+
+    def __init__(self, name, config, clean=False, use_cache=True):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.config = config
+        self.clean = clean
+        self.use_cache = use_cache
+        self.state = "queued"
+        self.exit_code = None
+        self.artifacts = []
+        self.progress = {"percent": 0, "stage": ""}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.process = None
+        self.stream = None
+        self.log = None
+        self.failure = None
+        self.events = []
+        self.condition = threading.Condition()
+
+    @property
+    def done(self):
+        return self.state in FINISHED_STATES
+
+    def emit(self, event):
+        with self.condition:
+            self.events.append(event)
+            self.condition.notify_all()
+
+    def write(self, text):
+        """作为 run_build 的输出流使用"""
+        if text:
+            self.emit({"type": "log", "text": text})
+            if self.log:
+                self.log.write(text)
+
+    def flush(self):
+        pass
+
+    def attach_process(self, process):
+        """run_build 启动Nuitka进程后调用；进程启动前已请求取消时立即终止"""
+        with self.condition:
+            self.process = process
+            if self.state == "cancelling":
+                self.stop_process()
+
+    def stop_process(self):
+        """终止Nuitka进程树并让 run_nuitka 停止读取输出，调用方持有 condition"""
+        if self.stream is not None:
+            self.stream.abort("=== 任务已取消，终止打包 ===\n")
+        elif self.process and self.process.poll() is None:
+            self.process.terminate()
+
+    def wait_events(self, since, timeout):
+        """返回 (序号 since 之后的事件, 任务是否已结束)，没有新事件时最多等待 timeout 秒"""
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.events) > since or self.done, timeout)
+            return self.events[since:], self.done
+
+    def set_finished(self, state, exit_code=None):
+        with self.condition:
+            self.state = state
+            self.exit_code = exit_code
+            self.finished = time.time()
+            self.events.append({"type": "finished", "state": state, "exit_code": exit_code,
+                                "artifacts": self.artifacts, "failure": self.failure})
+            self.condition.notify_all()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "script_path": self.config.get("script_path", ""),
+            "state": self.state,
+            "exit_code": self.exit_code,
+            "artifacts": self.artifacts,
+            "progress": self.progress,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "events": len(self.events),
+            "log": self.log.path if self.log else None,
+            "failure": self.failure
+        }
+
+
+class JobStream(TelemetryStream):
+    """把打包输出写入任务事件，进度变化时追加进度事件"""
+
+    def __init__(self, job, abort_on_fatal=False):
+        super().__init__(job, job.config, abort_on_fatal)
+        self.job = job
+        job.stream = self
+
+    def attach_process(self, process):
+        super().attach_process(process)
+        self.job.attach_process(process)
+
+    def write(self, text):
+        super().write(text)
+        self.update_progress()
+
+    def update_progress(self):
+        progress = {"percent": self.tracker.percent(), "stage": self.tracker.describe()}
+        if progress != self.job.progress:
+            self.job.progress = progress
+            self.job.emit(dict(progress, type="progress"))
+
+
+class BuildDaemon:
+    """常驻的打包服务: 在有界的线程池中运行提交的任务
+
+    工具链只在启动时查找一次，构建缓存、暂存库和编译缓存在所有任务之间共用，
+    省去每次从命令行启动时的检测开销。任务结果与命令行和GUI一样写入构建记录。
+    """
+
+    def __init__(self, workers=2, nuitka_path=None, settings=None):
+        self.settings = settings or load_settings()
+        self.workers = max(1, workers)
+        self.nuitka_path = nuitka_path or toolchain.resolve_toolchain()["nuitka_path"]
+        self.nuitka_version = toolchain.get_nuitka_version(self.nuitka_path) if self.nuitka_path else None
+        self.env = compiler_cache.build_env(self.settings)
+        # 所有任务共用一个构建缓存实例，索引的读写由 BuildCache 内部的锁保护
+        self.build_cache = BuildCache() if self.settings["build_cache_enabled"] else None
+        self.token = secrets.token_hex(16)
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.history_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def submit(self, config, name=None, clean=False, use_cache=True):
+        if not config.get("script_path"):
+            raise ValueError("配置中缺少 script_path")
+        name = name or os.path.splitext(os.path.basename(config["script_path"]))[0]
+        job = BuildJob(name, config, clean, use_cache)
+        with self.lock:
+            self.jobs[job.id] = job
+            self.discard_old_jobs()
+        self.executor.submit(self.run_job, job)
+        return job
+
+    def discard_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self.lock:
+            return [job.to_dict() for job in self.jobs.values()]
+
+    def cancel(self, job_id):
+        """取消排队中的任务或终止运行中的任务，返回任务是否存在"""
+        job = self.get_job(job_id)
+        if job is None:
+            return False
+        with job.condition:
+            if job.state == "queued":
+                job.state = "cancelling"
+            elif job.state == "running":
+                job.state = "cancelling"
+                if job.process:
+                    job.stop_process()
+        return True
+
+    def run_job(self, job):
+        with job.condition:
+            if job.state == "cancelling":
+                job.set_finished("cancelled")
+                return
+            job.state = "running"
+            job.started = time.time()
+
+        # 准备缓存、暂存库或日志时出错也必须结束任务，否则任务会一直停留在 running 状态
+        exit_code = 1
+        try:
+            exit_code = self.execute_job(job)
+        except Exception as e:
+            job.write(f"打包出错: {str(e)}\n")
+        finally:
+            if job.log:
+                job.log.close(exit_code)
+            if job.state == "cancelling":
+                job.set_finished("cancelled", exit_code)
+            else:
+                job.set_finished("succeeded" if exit_code == 0 else "failed", exit_code)
+
+    def execute_job(self, job):
+        """运行一个任务并写入构建记录，返回退出代码"""
+        # 与批量打包一样在同时运行的任务之间平均分配CPU核心，自动模式的任务启动时再选择
+        config = job.config
+        if not job_tuner.is_auto(config):
+            config = dict(config, parallel=True, parallel_count=split_jobs(self.workers))
+        cache = self.build_cache if job.use_cache else None
+        # 每个任务使用独立的实例，避免多个线程同时修改同一个哈希缓存
+        staging = None
+        if self.settings["staging_enabled"]:
+            staging = StagingStore(get_staging_dir(self.settings), self.settings["staging_hardlinks"])
+
+        job.log = open_build_log(job.name, self.settings, {"script_path": config["script_path"],
+                                                           "nuitka_version": self.nuitka_version})
+        stream = JobStream(job, self.settings["abort_on_fatal_failure"])
+        try:
+            exit_code = run_build(config, nuitka_path=self.nuitka_path, stream=stream, cache=cache,
+                                  quota_bytes=self.settings["build_cache_quota_mb"] * 1024 * 1024,
+                                  env=self.env, name=job.name, clean=job.clean, staging=staging,
+                                  on_process=stream.attach_process)
+        except Exception as e:
+            stream.write(f"打包出错: {str(e)}\n")
+            exit_code = 1
+
+        if exit_code == 0:
+            stream.tracker.finish()
+            stream.update_progress()
+            job.artifacts = [path for path in get_artifact_paths(config) if os.path.exists(path)]
+        elif job.state != "cancelling":
+            job.failure = stream.diagnose()
+        self.record_build(job, config, exit_code, stream.tracker)
+        return exit_code
+
+    def record_build(self, job, config, exit_code, tracker):
+        # 多个任务同时运行，ccache的统计差值无法归属到单个任务，不写入记录
+        record = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "config": job.name,
+            "script_path": config["script_path"],
+            "exit_code": exit_code,
+            "elapsed": int(time.time() - job.started),
+            "log": job.log.name if job.log else None,
+            "failure": job.failure,
+            "build_config": config
+        }
+        if exit_code == 0:
+            try:
+                record["manifest"], record["artifact_size"] = save_manifest(job.artifacts)
+            except OSError as e:
+                job.write(f"无法保存产物清单: {str(e)}\n")
+        record.update(tracker.telemetry())
+        try:
+            with self.history_lock:
+                BuildHistory().append(record)
+        except (OSError, sqlite3.Error) as e:
+            job.write(f"无法写入构建记录: {str(e)}\n")
+
+    def shutdown(self):
+        """取消所有排队和运行中的任务并等待工作线程退出"""
+        with self.lock:
+            job_ids = [job_id for job_id, job in self.jobs.items() if not job.done]
+        for job_id in job_ids:
+            self.cancel(job_id)
+        self.executor.shutdown(wait=True)
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """构建服务的HTTP接口
+
+    GET  /status                    服务状态
+    GET  /jobs                      全部任务
+    POST /jobs                      提交任务 {"config": {...}, "name", "clean", "use_cache"}
+    GET  /jobs/<id>                 任务状态和产物
+    GET  /jobs/<id>/events?since=N  从第 N 个事件开始的事件流 (每行一个JSON)，任务结束后关闭连接
+    POST /jobs/<id>/cancel          取消或终止任务
+
+    每个请求都需要在 X-Token 头中携带 daemon.json 中的访问令牌。
+    """
+
+    server_version = "NuitkaPackagerDaemon"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        self.send_json({"error": message}, status)
+
+    def check_token(self):
+        if hmac.compare_digest(self.headers.get("X-Token", ""), self.server.daemon.token):
+            return True
+        self.send_error_json(403, "访问令牌无效")
+        return False
+
+    def parse_path(self):
+        url = urlsplit(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def do_GET(self):
+        if not self.check_token():
+            return
+        daemon = self.server.daemon
+        parts, query = self.parse_path()
+        if parts == ["status"]:
+            jobs = daemon.list_jobs()
+            self.send_json({
+                "pid": os.getpid(),
+                "workers": daemon.workers,
+                "nuitka_path": daemon.nuitka_path,
+                "queued": sum(1 for job in jobs if job["state"] == "queued"),
+                "running": sum(1 for job in jobs if job["state"] in ("running", "cancelling"))
+            })
+        elif parts == ["jobs"]:
+            self.send_json({"jobs": daemon.list_jobs()})
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = daemon.get_job(parts[1])
+            if job is None:
+                self.send_error_json(404, "任务不存在")
+            elif len(parts) == 2:
+                self.send_json(job.to_dict())
+            elif parts[2] == "events":
+                try:
+                    since = int(query.get("since", ["0"])[0])
+                except ValueError:
+                    since = -1
+                if since < 0:
+                    self.send_error_json(400, "since 必须是非负整数")
+                else:
+                    self.stream_events(job, since)
+            else:
+                self.send_error_json(404, "未知的接口")
+        else:
+            self.send_error_json(404, "未知的接口")
+
+    def do_POST(self):
+        if not self.check_token():
+            return
+        daemon = self.server.daemon
+        parts, _ = self.parse_path()
+        if parts == ["jobs"]:
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length).decode("utf-8"))
+                job = daemon.submit(data["config"], name=data.get("name"),
+                                    clean=data.get("clean", False), use_cache=data.get("use_cache", True))
+            except (ValueError, KeyError, TypeError) as e:
+                self.send_error_json(400, f"无效的任务: {str(e)}")
+                return
+            self.send_json(job.to_dict(), 201)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            if daemon.cancel(parts[1]):
+                self.send_json(daemon.get_job(parts[1]).to_dict())
+            else:
+                self.send_error_json(404, "任务不存在")
+        else:
+            self.send_error_json(404, "未知的接口")
+
+    def stream_events(self, job, since):
+        # HTTP/1.0 连接在响应结束时关闭，事件流不需要预先知道长度
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        try:
+            while True:
+                events, done = job.wait_events(since, KEEPALIVE_SECONDS)
+                since += len(events)
+                data = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+                self.wfile.write(data.encode("utf-8") or b"\n")
+                self.wfile.flush()
+                if done and since >= len(job.events):
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class DaemonServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, daemon, port=0, verbose=False):
+        super().__init__((DAEMON_HOST, port), DaemonRequestHandler)
+        self.daemon = daemon
+        self.verbose = verbose
+
+
+def serve(workers=2, port=0, nuitka_path=None, verbose=False):
+    """启动构建服务并阻塞直到被中断，port 为 0 时使用系统分配的端口"""
+    daemon = BuildDaemon(workers, nuitka_path)
+    server = DaemonServer(daemon, port, verbose)
+    port = server.server_address[1]
+
+    daemon_file = get_daemon_file()
+    with open(daemon_file, 'w', encoding='utf-8') as f:
+        json.dump({"port": port, "pid": os.getpid(), "token": daemon.token}, f)
+    if os.name != "nt":
+        os.chmod(daemon_file, 0o600)
+
+    print(f"构建服务已启动: http://{DAEMON_HOST}:{port} (工作线程 {daemon.workers}，Nuitka: {daemon.nuitka_path})",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(daemon_file)
+        except OSError:
+            pass
+        daemon.shutdown()
+    return 0
+
+
+class EventStream:
+    """任务事件流，可以在其他线程中调用 close 中断正在等待的读取
+
+    关闭窗口时用 close 结束读取事件的线程，而不必强行终止可能正在读取套接字的线程。
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.closed = False
+
+    def __iter__(self):
+        try:
+            for line in self.response:
+                if line.strip():
+                    yield json.loads(line.decode("utf-8"))
+        except OSError:
+            # close 关闭连接后读取失败是预期的结果
+            if not self.closed:
+                raise
+        finally:
+            self.response.close()
+
+    def close(self):
+        """关闭连接；正在等待数据的读取立即返回，遍历随之结束"""
+        self.closed = True
+        try:
+            # 关闭文件对象不会唤醒阻塞在 recv 中的线程，shutdown 会
+            sock = socket.fromfd(self.response.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+        except (OSError, ValueError):
+            return
+        with sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class DaemonClient:
+    """构建服务的客户端，连接或请求失败时抛出 OSError"""
+
+    def __init__(self, port, token, host=DAEMON_HOST):
+        self.base_url = f"http://{host}:{port}"
+        self.token = token
+
+    @classmethod
+    def connect(cls, timeout=1):
+        """按 daemon.json 连接本机运行中的构建服务，没有可用的服务时返回 None"""
+        try:
+            with open(get_daemon_file(), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            client = cls(info["port"], info["token"])
+            client.request("GET", "/status", timeout=timeout)
+        except (OSError, ValueError, KeyError):
+            return None
+        return client
+
+    def open(self, method, path, data=None, timeout=None):
+        body = json.dumps(data).encode("utf-8") if data is not None else None
+        request = urllib_request.Request(self.base_url + path, data=body, method=method,
+                                         headers={"X-Token": self.token, "Content-Type": "application/json"})
+        return urllib_request.urlopen(request, timeout=timeout)
+
+    def request(self, method, path, data=None, timeout=10):
+        with self.open(method, path, data, timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def status(self):
+        return self.request("GET", "/status")
+
+    def submit(self, config, name=None, clean=False, use_cache=True):
+        return self.request("POST", "/jobs", {"config": config, "name": name,
+                                              "clean": clean, "use_cache": use_cache})
+
+    def list_jobs(self):
+        return self.request("GET", "/jobs")["jobs"]
+
+    def get_job(self, job_id):
+        return self.request("GET", f"/jobs/{job_id}")
+
+    def cancel(self, job_id):
+        return self.request("POST", f"/jobs/{job_id}/cancel")
+
+    def iter_events(self, job_id, since=0):
+        """返回任务的事件流，遍历时逐个返回事件，直到任务结束
+
+        服务每隔 KEEPALIVE_SECONDS 秒发送一次空行，超过两倍间隔没有收到任何数据时视为服务已失去响应。
+        """
+        return EventStream(self.open("GET", f"/jobs/{job_id}/events?since={since}",
+                                     timeout=KEEPALIVE_SECONDS * 2))
@@ -0,0 +1,163 @@
+import fnmatch
+import os
+
+
+def make_dir_entry(path, target=None, include=None, exclude=None):
+    """包含目录的配置项: 目录路径、在产物中的目标目录、包含和排除的通配符模式
+
+    模式按相对于目录的路径匹配 (使用 / 分隔)，不含 / 的模式也按文件名匹配；
+    没有包含模式时包含目录中的全部文件。
+    """
+    return {
+        "path": path,
+        "target": target or os.path.basename(os.path.normpath(path)),
+        "include": list(include or []),
+        "exclude": list(exclude or [])
+    }
+
+
+def get_entry_key(entry):
+    """目录配置项的去重键"""
+    return (os.path.normcase(os.path.abspath(entry["path"])), entry["target"],
+            tuple(entry["include"]), tuple(entry["exclude"]))
+
+
+def split_patterns(text):
+    return [pattern.strip() for pattern in (text or "").replace(";", ",").split(",") if pattern.strip()]
+
+
+def match_patterns(relative_path, patterns):
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(relative_path, pattern) or ("/" not in pattern and fnmatch.fnmatch(name, pattern))
+               for pattern in patterns)
+
+
+def walk_dir_entry(entry):
+    """按包含和排除模式遍历目录配置项，逐个返回 (绝对路径, 相对路径, 大小)
+
+    被排除模式匹配的子目录整个跳过。使用 os.scandir，不会为每个文件单独调用 stat。
+    """
+    include = entry["include"]
+    exclude = entry["exclude"]
+    stack = [(entry["path"], "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                children = sorted(iterator, key=lambda child: child.name)
+        except OSError:
+            continue
+        for child in reversed(children):
+            relative_path = prefix + child.name
+            if exclude and match_patterns(relative_path, exclude):
+                continue
+            try:
+                if child.is_dir():
+                    stack.append((child.path, relative_path + "/"))
+                elif not include or match_patterns(relative_path, include):
+                    yield child.path, relative_path, child.stat().st_size
+            except OSError:
+                continue
+
+
+def summarize_entries(included_files, included_dirs):
+    """统计每个条目包含的文件数和总大小 (会遍历目录，不要在界面线程中调用)
+
+    返回 {"files": {路径: 大小或 None}, "dirs": [(文件数, 总大小)], "count": 总文件数, "size": 总大小}，
+    不存在的文件大小为 None。
+    """
+    result = {"files": {}, "dirs": [], "count": 0, "size": 0}
+    for path in included_files:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = None
+        result["files"][path] = size
+        if size is not None:
+            result["count"] += 1
+            result["size"] += size
+    for entry in included_dirs:
+        count = total = 0
+        for _, _, size in walk_dir_entry(entry):
+            count += 1
+            total += size
+        result["dirs"].append((count, total))
+        result["count"] += count
+        result["size"] += total
+    return result
+
+
+def iter_data_files(included_files, included_dirs):
+    """逐个返回 (源文件, 在产物中的相对路径)，与 build_data_options 生成的参数包含相同的文件"""
+    for entry in included_dirs:
+        target = entry["target"].strip("/")
+        for path, relative_path, _ in walk_dir_entry(entry):
+            yield path, os.path.join(target, *relative_path.split("/"))
+    for path in included_files:
+        if os.path.isdir(path):
+            yield from iter_data_files([], [make_dir_entry(path)])
+        else:
+            yield path, os.path.basename(path)
+
+
+def to_pattern_path(path):
+    """Nuitka 的数据文件模式中使用 / 作为分隔符"""
+    return path.replace(os.sep, "/")
+
+
+def build_data_options(included_files, included_dirs):
+    """把包含的文件和目录转换为尽量少的Nuitka参数
+
+    - 没有过滤条件的目录: 一个 --include-data-dir
+    - 带包含模式的目录: 每个模式一个三段式的 --include-data-files=<目录>=<目标>=<模式>，
+      Nuitka按相对于<目录>的路径放置匹配的文件，保留子目录结构 (两段式会把文件全部放到目标目录下)
+    - 排除模式: 对目标目录使用 --noinclude-data-files，不逐个列出文件
+    - 同一目录下的文件正好是该目录中的全部文件时合并为一个 --include-data-files=<目录>/*
+    """
+    options = []
+    for entry in included_dirs:
+        source = to_pattern_path(os.path.abspath(entry["path"]))
+        target = entry["target"].strip("/") or "."
+        if entry["include"]:
+            for pattern in entry["include"]:
+                # 不含 / 的模式在任意层级 (包括顶层) 的子目录中匹配
+                pattern = pattern if "/" in pattern else f"**/{pattern}"
+                options.append(f"--include-data-files={source}={target}={pattern}")
+        else:
+            options.append(f"--include-data-dir={entry['path']}={target}")
+        # Nuitka用 fnmatch 匹配产物中的相对路径，其中的 **/ 至少要匹配一层子目录，顶层的文件需要单独列出
+        prefix = "" if target == "." else f"{target}/"
+        for pattern in entry["exclude"]:
+            patterns = [pattern] if "/" in pattern else [pattern, f"**/{pattern}"]
+            for pattern in patterns:
+                # 模式也可能匹配子目录，此时排除其中的全部文件
+                options.append(f"--noinclude-data-files={prefix}{pattern}")
+                options.append(f"--noinclude-data-files={prefix}{pattern}/**")
+
+    groups = {}
+    for path in included_files:
+        if os.path.isdir(path):
+            # 旧版本的配置中可能直接列出了目录
+            options.append(f"--include-data-dir={path}={os.path.basename(os.path.normpath(path))}")
+        else:
+            groups.setdefault(os.path.dirname(os.path.abspath(path)), []).append(path)
+
+    for directory, paths in groups.items():
+        if len(paths) > 1:
+            try:
+                names = {entry.name for entry in os.scandir(directory) if entry.is_file()}
+            except OSError:
+                names = None
+            if names == {os.path.basename(path) for path in paths}:
+                options.append(f"--include-data-files={to_pattern_path(directory)}/*=./")
+                continue
+        for path in paths:
+            options.append(f"--include-data-file={path}={os.path.basename(path)}")
+    return options
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,139 @@
+from PyQt5.QtWidgets import (QDialog, QFormLayout, QLineEdit, QLabel, QDialogButtonBox)
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from data_files import make_dir_entry, get_entry_key, split_patterns, format_size
+
+
+class DataFilesModel(QAbstractListModel):
+    """包含的目录和文件列表，目录在前
+
+    用字典和集合去重，添加上万个文件也不需要逐项比较；配合 QListView 只绘制可见的行。
+    每个条目的文件数和大小由后台统计后通过 set_summary() 填入。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.dirs = []
+        self.dir_keys = set()
+        # 字典保持添加顺序，同时用于O(1)去重
+        self.files = {}
+        self.file_list = []
+        self.summary = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.dirs) + len(self.file_list)
+
+    def get_included_files(self):
+        return list(self.files)
+
+    def get_included_dirs(self):
+        return [dict(entry) for entry in self.dirs]
+
+    def set_entries(self, included_files, included_dirs):
+        self.beginResetModel()
+        self.dirs = []
+        self.dir_keys = set()
+        for entry in included_dirs:
+            entry = make_dir_entry(entry["path"], entry.get("target"), entry.get("include"), entry.get("exclude"))
+            if get_entry_key(entry) not in self.dir_keys:
+                self.dir_keys.add(get_entry_key(entry))
+                self.dirs.append(entry)
+        self.files = dict.fromkeys(included_files)
+        self.file_list = list(self.files)
+        self.summary = None
+        self.endResetModel()
+
+    def add_files(self, paths):
+        """添加文件，返回实际新增的数量"""
+        new_paths = [path for path in dict.fromkeys(paths) if path not in self.files]
+        if new_paths:
+            first = self.rowCount()
+            self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+            self.files.update(dict.fromkeys(new_paths))
+            self.file_list.extend(new_paths)
+            self.endInsertRows()
+        return len(new_paths)
+
+    def add_dir(self, entry):
+        """添加目录配置项，相同的配置项已存在时返回 False"""
+        key = get_entry_key(entry)
+        if key in self.dir_keys:
+            return False
+        row = len(self.dirs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.dir_keys.add(key)
+        self.dirs.append(entry)
+        self.endInsertRows()
+        return True
+
+    def remove_rows(self, rows):
+        rows = set(rows)
+        if not rows:
+            return
+        dir_count = len(self.dirs)
+        self.beginResetModel()
+        self.dirs = [entry for i, entry in enumerate(self.dirs) if i not in rows]
+        self.dir_keys = {get_entry_key(entry) for entry in self.dirs}
+        self.file_list = [path for i, path in enumerate(self.file_list, dir_count) if i not in rows]
+        self.files = dict.fromkeys(self.file_list)
+        # 行号已经变化，统计结果需要重新计算
+        self.summary = None
+        self.endResetModel()
+
+    def clear(self):
+        self.set_entries([], [])
+
+    def set_summary(self, summary):
+        self.summary = summary
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = index.row()
+        if row < len(self.dirs):
+            entry = self.dirs[row]
+            text = f"[目录] {entry['path']} → {entry['target']}"
+            if entry["include"]:
+                text += f"  包含: {', '.join(entry['include'])}"
+            if entry["exclude"]:
+                text += f"  排除: {', '.join(entry['exclude'])}"
+            if self.summary and row < len(self.summary["dirs"]):
+                count, size = self.summary["dirs"][row]
+                text += f"  ({count} 个文件, {format_size(size)})"
+            return text
+        path = self.file_list[row - len(self.dirs)]
+        if self.summary and path in self.summary["files"]:
+            size = self.summary["files"][path]
+            return f"{path}  ({format_size(size) if size is not None else '文件不存在'})"
+        return path
+
+
+class DirEntryDialog(QDialog):
+    """添加包含目录时设置目标目录和包含、排除的通配符模式"""
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("包含目录")
+        self.path = path
+
+        layout = QFormLayout(self)
+        layout.addRow("目录:", QLabel(path))
+        self.target_edit = QLineEdit(make_dir_entry(path)["target"])
+        layout.addRow("产物中的位置:", self.target_edit)
+        self.include_edit = QLineEdit()
+        self.include_edit.setPlaceholderText("例如 *.png, *.json，留空包含全部文件")
+        layout.addRow("包含:", self.include_edit)
+        self.exclude_edit = QLineEdit()
+        self.exclude_edit.setPlaceholderText("例如 *.psd, raw, docs/*")
+        layout.addRow("排除:", self.exclude_edit)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_entry(self):
+        return make_dir_entry(self.path, self.target_edit.text().strip() or None,
+                              split_patterns(self.include_edit.text()), split_patterns(self.exclude_edit.text()))
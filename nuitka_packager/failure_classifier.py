@@ -0,0 +1,185 @@
+import json
+import os
+import re
+
+from settings import get_data_dir
+
+# 随程序发布的失败特征库
+BUILTIN_SIGNATURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources",
+                                       "failure_signatures.json")
+# 没有换行的超长输出最多保留的字符数，超出部分不参与匹配
+MAX_PENDING = 64 * 1024
+
+
+def get_user_signatures_path():
+    """用户自定义的特征库，格式与内置库相同，id 相同的特征覆盖内置特征"""
+    return os.path.join(get_data_dir(), "failure_signatures.json")
+
+
+def load_knowledge_base(paths=None):
+    """读取内置和用户的失败特征库并按 id 合并
+
+    返回 {"version": 内置库版本, "user_version": 用户库版本或 None, "signatures": [...]}。
+    """
+    paths = paths or [BUILTIN_SIGNATURES_PATH, get_user_signatures_path()]
+    signatures = {}
+    versions = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            versions.append(None)
+            continue
+        versions.append(data.get("version"))
+        for signature in data.get("signatures", []):
+            if isinstance(signature, dict) and signature.get("id"):
+                signatures[signature["id"]] = signature
+    return {
+        "version": versions[0],
+        "user_version": versions[1] if len(versions) > 1 else None,
+        "signatures": list(signatures.values())
+    }
+
+
+def find_line(text, start, end):
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    return text[line_start:line_end if line_end != -1 else len(text)]
+
+
+class FailureClassifier:
+    """按失败特征库逐块识别打包输出中的已知错误
+
+    每块输出先用 str 的子串查找 (在C层面进行，比合并几十个关键字的正则表达式快得多) 检查各特征的关键字，
+    只有包含关键字的行才用特征自己的正则确认并取出模块名等信息。
+    每个特征只报告第一次出现。fatal 为真的特征出现后打包已经不可能成功，调用方可以据此提前终止。
+    """
+
+    def __init__(self, knowledge_base=None):
+        knowledge_base = knowledge_base or load_knowledge_base()
+        self.version = knowledge_base.get("version")
+        self.signatures = []
+        self.keyword_actions = {}
+        for signature in knowledge_base["signatures"]:
+            try:
+                regex = re.compile(signature["pattern"]) if signature.get("pattern") else None
+            except (re.error, TypeError):
+                continue
+            keywords = [keyword for keyword in signature.get("keywords", []) if keyword]
+            if not keywords:
+                continue
+            index = len(self.signatures)
+            self.signatures.append(dict(signature, regex=regex))
+            for keyword in keywords:
+                self.keyword_actions.setdefault(keyword, []).append(index)
+        self.reset()
+
+    def reset(self):
+        self.pending = ""
+        self.matches = []
+        self.matched_ids = set()
+        self.fatal = None
+        self.update_active_keywords()
+
+    def update_active_keywords(self):
+        """还有未识别特征的关键字；大部分输出块不含任何关键字，只需逐个做子串查找"""
+        self.active_keywords = []
+        for keyword, indexes in self.keyword_actions.items():
+            indexes = [index for index in indexes if self.signatures[index]["id"] not in self.matched_ids]
+            if indexes:
+                self.active_keywords.append((keyword, indexes))
+
+    def feed(self, text):
+        """处理一块输出，返回其中新识别出的失败原因列表；不完整的最后一行留到下一块"""
+        text = self.pending + text
+        cut = text.rfind("\n") + 1
+        self.pending = text[cut:][-MAX_PENDING:]
+        return self.scan(text[:cut])
+
+    def finish(self):
+        """处理最后一个不完整的行，返回新识别出的失败原因列表"""
+        text, self.pending = self.pending, ""
+        return self.scan(text)
+
+    def scan(self, text):
+        # 特征序号 -> (位置, 结果)，同一特征在一块输出中出现多次时取最早的一处
+        hits = {}
+        for keyword, indexes in self.active_keywords:
+            start = text.find(keyword)
+            if start == -1:
+                continue
+            indexes = list(indexes)
+            while start != -1 and indexes:
+                line = find_line(text, start, start + len(keyword))
+                for index in indexes[:]:
+                    if index in hits and hits[index][0] <= start:
+                        indexes.remove(index)
+                        continue
+                    result = self.match_line(self.signatures[index], line)
+                    if result:
+                        hits[index] = (start, result)
+                        indexes.remove(index)
+                start = text.find(keyword, start + len(keyword))
+
+        # 按在输出中出现的顺序登记，"第一个致命错误"与实际输出顺序一致
+        found = []
+        for _, result in sorted(hits.values(), key=lambda hit: hit[0]):
+            if result["id"] in self.matched_ids:
+                continue
+            self.matched_ids.add(result["id"])
+            self.matches.append(result)
+            if result["fatal"] and self.fatal is None:
+                self.fatal = result
+            found.append(result)
+        if found:
+            self.update_active_keywords()
+        return found
+
+    def match_line(self, signature, line):
+        """用特征确认包含其关键字的一行，返回结果字典，不匹配时返回 None"""
+        values = {}
+        if signature["regex"] is not None:
+            detail = signature["regex"].search(line)
+            if not detail:
+                return None
+            values = {key: value for key, value in detail.groupdict().items() if value}
+        try:
+            suggestion = signature.get("suggestion", "").format(**values)
+        except (KeyError, IndexError, ValueError):
+            suggestion = signature.get("suggestion", "")
+        return {
+            "id": signature["id"],
+            "category": signature.get("category", ""),
+            "title": signature.get("title", signature["id"]),
+            "fatal": bool(signature.get("fatal")),
+            "priority": signature.get("priority", 0),
+            "suggestion": suggestion,
+            "line": line.strip()
+        }
+
+    def diagnose(self):
+        """最可能的失败原因: 第一个致命错误，否则为优先级最高的匹配；没有匹配时返回 None"""
+        if self.fatal:
+            return self.fatal
+        if not self.matches:
+            return None
+        return max(self.matches, key=lambda result: result["priority"])
+
+    def summarize(self):
+        """写入构建记录的失败原因"""
+        result = self.diagnose()
+        if result is None:
+            return None
+        return {"id": result["id"], "title": result["title"], "signatures_version": self.version}
+
+
+def format_match(result):
+    return f"[{result['category']}] {result['title']}: {result['suggestion']}"
+
+
+def format_diagnosis(result):
+    """打包失败后输出的诊断文字"""
+    if result is None:
+        return "未能识别失败原因，可以在\"历史记录\"中搜索日志，查看以前是否出现过相同的错误"
+    return f"失败原因: {result['title']}\n相关输出: {result['line']}\n建议: {result['suggestion']}"
@@ -0,0 +1,416 @@
+import ast
+import json
+import os
+import sys
+import sysconfig
+from concurrent.futures import ProcessPoolExecutor
+from importlib.machinery import EXTENSION_SUFFIXES
+
+from settings import get_data_dir
+from build_cache import FileHasher, iter_tree
+
+# 导入语句的类型: 普通导入、可选导入 (try/except ImportError 中)、
+# 仅类型检查 (if TYPE_CHECKING 中) 和字符串形式的动态导入 (importlib.import_module)
+STATIC = "static"
+OPTIONAL = "optional"
+TYPING = "typing"
+DYNAMIC = "dynamic"
+
+IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"}
+
+# 需要解析的文件数超过此值时才使用进程池，避免少量文件时的进程启动开销
+PARALLEL_THRESHOLD = 32
+
+STDLIB_NAMES = set(getattr(sys, "stdlib_module_names", ())) | set(sys.builtin_module_names)
+STDLIB_DIR = os.path.normcase(os.path.abspath(sysconfig.get_paths()["stdlib"]))
+
+
+class ImportVisitor(ast.NodeVisitor):
+    """收集一个模块中的导入语句及其类型"""
+
+    def __init__(self):
+        self.imports = []
+        self.kinds = [STATIC]
+
+    def add(self, name, level=0):
+        self.imports.append((name, level, self.kinds[-1]))
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.add(alias.name)
+
+    def visit_ImportFrom(self, node):
+        base = node.module or ""
+        for alias in node.names:
+            if alias.name == "*":
+                self.add(base, node.level)
+            else:
+                # 导入的名称可能是子模块，也可能只是属性，解析时再区分
+                self.add(f"{base}.{alias.name}" if base else alias.name, node.level)
+
+    def visit_Try(self, node):
+        optional = handler_catches_import_error(node.handlers)
+        self.kinds.append(OPTIONAL if optional else self.kinds[-1])
+        for statement in node.body:
+            self.visit(statement)
+        self.kinds.pop()
+        for statement in node.handlers + node.orelse + node.finalbody:
+            self.visit(statement)
+
+    visit_TryStar = visit_Try
+
+    def visit_If(self, node):
+        test = node.test
+        name = getattr(test, "id", getattr(test, "attr", None))
+        if name == "TYPE_CHECKING":
+            self.kinds.append(TYPING)
+            for statement in node.body:
+                self.visit(statement)
+            self.kinds.pop()
+            for statement in node.orelse:
+                self.visit(statement)
+        else:
+            self.generic_visit(node)
+
+    def visit_Call(self, node):
+        # importlib.import_module("x") / __import__("x")，只有参数是字符串常量时才能确定模块名
+        func = node.func
+        name = getattr(func, "attr", getattr(func, "id", None))
+        if name in ("import_module", "__import__") and node.args:
+            argument = node.args[0]
+            if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+                self.imports.append((argument.value, 0, DYNAMIC))
+        self.generic_visit(node)
+
+
+def handler_catches_import_error(handlers):
+    for handler in handlers:
+        if handler.type is None:
+            return True
+        names = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+        for name in names:
+            if getattr(name, "id", getattr(name, "attr", None)) in IMPORT_ERRORS:
+                return True
+    return False
+
+
+def scan_file(path):
+    """解析一个Python文件，返回 {"imports": [(模块名, 相对层级, 类型)], "lines": 代码行数}
+
+    无法读取或解析时导入列表为空。
+    """
+    try:
+        with open(path, 'rb') as f:
+            source = f.read()
+    except OSError:
+        return {"imports": [], "lines": 0}
+    lines = sum(1 for line in source.splitlines() if line.strip())
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return {"imports": [], "lines": lines}
+    visitor = ImportVisitor()
+    visitor.visit(tree)
+    return {"imports": visitor.imports, "lines": lines}
+
+
+def get_default_search_paths(project_root):
+    """模块查找路径: 项目目录 + 解释器的 sys.path (不含本工具自身的目录)"""
+    own_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = [project_root]
+    for path in sys.path:
+        if path and os.path.isdir(path) and os.path.abspath(path) != own_dir:
+            paths.append(os.path.abspath(path))
+    return paths
+
+
+def find_module(name, search_paths):
+    """按 sys.path 的规则查找模块，返回 (文件路径或 None, 是否为包) ；找不到时返回 None
+
+    命名空间包没有对应文件，返回 (None, True)。
+    """
+    paths = search_paths
+    result = None
+    for part in name.split("."):
+        if not part:
+            return None
+        found = None
+        namespace_paths = []
+        for base in paths:
+            package_dir = os.path.join(base, part)
+            init_file = os.path.join(package_dir, "__init__.py")
+            if os.path.isfile(init_file):
+                found = (init_file, [package_dir])
+                break
+            module_file = next((os.path.join(base, part + suffix)
+                                for suffix in [".py"] + EXTENSION_SUFFIXES
+                                if os.path.isfile(os.path.join(base, part + suffix))), None)
+            if module_file:
+                found = (module_file, None)
+                break
+            if os.path.isdir(package_dir):
+                namespace_paths.append(package_dir)
+        if found is None and namespace_paths:
+            found = (None, namespace_paths)
+        if found is None:
+            return None
+        result = (found[0], found[1] is not None)
+        paths = found[1]
+        if paths is None:
+            # 普通模块下不会再有子模块
+            paths = []
+    return result
+
+
+def is_stdlib(name, path=None):
+    """有文件时按所在目录判断 (项目中与标准库重名的模块不算)，否则按模块名判断"""
+    if path:
+        normalized = os.path.normcase(os.path.abspath(path))
+        return normalized.startswith(STDLIB_DIR) and "site-packages" not in normalized
+    return name.split(".")[0] in STDLIB_NAMES
+
+
+def get_package_size(top_name, search_paths):
+    """顶层包 (目录或单个模块文件) 占用的字节数"""
+    found = find_module(top_name, search_paths)
+    if not found:
+        return 0
+    path, is_package = found
+    if path is None or not is_package:
+        return os.path.getsize(path) if path else 0
+    return sum(os.path.getsize(p) for p in iter_tree(os.path.dirname(path)))
+
+
+class ImportGraph:
+    """从入口脚本出发，静态分析程序实际能到达的模块和第三方包
+
+    每个文件的导入列表按内容哈希缓存在数据目录中，未变化的文件不会重复解析；
+    需要解析的文件较多时使用进程池并行解析。不执行任何被分析的代码。
+    """
+
+    def __init__(self, cache_dir=None):
+        cache_dir = cache_dir or get_data_dir()
+        self.hasher = FileHasher(os.path.join(cache_dir, "import_file_hashes.json"))
+        self.cache_path = os.path.join(cache_dir, "import_cache.json")
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+        self.cache_dirty = False
+
+    def scan_files(self, paths, max_workers=None):
+        """返回 {路径: scan_file 的结果}，使用内容哈希缓存"""
+        results = {}
+        pending = {}
+        for path in paths:
+            try:
+                digest = self.hasher.hash_file(path)
+            except OSError:
+                results[path] = {"imports": [], "lines": 0}
+                continue
+            if isinstance(self.cache.get(digest), dict):
+                results[path] = self.cache[digest]
+            else:
+                pending[path] = digest
+
+        if len(pending) > PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                parsed = dict(zip(pending, executor.map(scan_file, pending, chunksize=16)))
+        else:
+            parsed = {path: scan_file(path) for path in pending}
+
+        for path, info in parsed.items():
+            info["imports"] = [list(item) for item in info["imports"]]
+            self.cache[pending[path]] = info
+            results[path] = info
+        if parsed:
+            self.cache_dirty = True
+        return results
+
+    def save(self):
+        self.hasher.save()
+        if not self.cache_dirty:
+            return
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_path)
+        self.cache_dirty = False
+
+    def analyze(self, script_path, search_paths=None, max_workers=None):
+        """分析入口脚本，返回分析报告 (见 build_report)"""
+        script_path = os.path.abspath(script_path)
+        project_root = os.path.dirname(script_path)
+        search_paths = search_paths or get_default_search_paths(project_root)
+
+        # 模块名 -> (文件, 是否为包)；边: (来源模块, 目标模块, 类型)
+        modules = {"__main__": (script_path, False)}
+        edges = []
+        lines = {}
+        missing = {}
+        stdlib = set()
+        visited = {"__main__"}
+        frontier = ["__main__"]
+
+        while frontier:
+            files = {modules[name][0]: name for name in frontier
+                     if modules[name][0] and modules[name][0].endswith(".py")}
+            scanned = self.scan_files(list(files), max_workers)
+            next_frontier = []
+            for path, info in scanned.items():
+                source = files[path]
+                lines[source] = info["lines"]
+                for name, level, kind in info["imports"]:
+                    target = self.resolve(source, modules[source][1], name, level, search_paths, modules)
+                    if target is None:
+                        if is_stdlib(name):
+                            stdlib.add(name.split(".")[0])
+                        elif kind in (STATIC, DYNAMIC) and level == 0:
+                            missing.setdefault(name, source)
+                        continue
+                    if is_stdlib(target, modules[target][0]):
+                        stdlib.add(target.split(".")[0])
+                        continue
+                    edges.append((source, target, kind))
+                    # 导入子模块时父包也会被执行，父包的导入同样需要分析
+                    parent = target
+                    while parent in modules and parent not in visited:
+                        visited.add(parent)
+                        next_frontier.append(parent)
+                        parent = parent.rpartition(".")[0]
+            frontier = next_frontier
+
+        report = build_report(script_path, project_root, modules, edges, lines, missing, stdlib,
+                              search_paths)
+        self.save()
+        return report
+
+    def resolve(self, source, source_is_package, name, level, search_paths, modules):
+        """把导入语句中的名称解析为已找到的模块名，找不到时返回 None"""
+        if level:
+            if source == "__main__":
+                return None
+            package = source if source_is_package else source.rpartition(".")[0]
+            for _ in range(level - 1):
+                package = package.rpartition(".")[0]
+            name = f"{package}.{name}".strip(".") if name else package
+            if not name:
+                return None
+
+        # from a import b 中 b 可能只是属性，此时退回到 a
+        candidates = [name]
+        while "." in candidates[-1]:
+            candidates.append(candidates[-1].rpartition(".")[0])
+        for candidate in candidates[:2]:
+            if candidate in modules:
+                return candidate
+            found = find_module(candidate, search_paths)
+            if found:
+                modules[candidate] = found
+                # 导入子模块时也会执行其父包
+                parent = candidate.rpartition(".")[0]
+                while parent and parent not in modules:
+                    parent_found = find_module(parent, search_paths)
+                    if not parent_found:
+                        break
+                    modules[parent] = parent_found
+                    parent = parent.rpartition(".")[0]
+                return candidate
+        return None
+
+
+def reachable(edges, kinds, excluded=None):
+    """只沿指定类型的边能从入口到达的模块集合
+
+    excluded 为判断函数时，不跟随被它排除的模块 (相当于 --nofollow-import-to)。
+    """
+    graph = {}
+    for source, target, kind in edges:
+        if kind in kinds and not (excluded and excluded(target)):
+            graph.setdefault(source, []).append(target)
+    seen = {"__main__"}
+    stack = ["__main__"]
+    while stack:
+        for target in graph.get(stack.pop(), ()):
+            if target not in seen:
+                seen.add(target)
+                # 子模块会连带导入父包
+                parent = target.rpartition(".")[0]
+                while parent and parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+                    parent = parent.rpartition(".")[0]
+                stack.append(target)
+    return seen
+
+
+def build_report(script_path, project_root, modules, edges, lines, missing, stdlib, search_paths):
+    """汇总分析结果并给出 --include-package 和 --nofollow-import-to 建议
+
+    - 只通过字符串动态导入才能到达的包，Nuitka无法自动跟随，建议 --include-package
+    - 只通过可选导入 (try/except ImportError) 或类型检查导入才能到达的第三方包，
+      程序不依赖它们也能运行，建议 --nofollow-import-to，按大小排序
+    """
+    normalized_root = os.path.normcase(project_root) + os.sep
+    required = reachable(edges, (STATIC,))
+    with_dynamic = reachable(edges, (STATIC, DYNAMIC))
+    everything = reachable(edges, (STATIC, DYNAMIC, OPTIONAL, TYPING))
+
+    local_modules = []
+    packages = {}
+    for name in everything:
+        if name == "__main__":
+            continue
+        path = modules[name][0]
+        if path and os.path.normcase(os.path.abspath(path)).startswith(normalized_root):
+            local_modules.append(name)
+            continue
+        top = name.split(".")[0]
+        entry = packages.setdefault(top, {"modules": 0, "lines": 0, "required": False, "static": False})
+        entry["modules"] += 1
+        entry["lines"] += lines.get(name, 0)
+        entry["required"] = entry["required"] or name in with_dynamic
+        entry["static"] = entry["static"] or name in required
+
+    for top, entry in packages.items():
+        entry["size"] = get_package_size(top, search_paths)
+
+    include_packages = sorted(top for top, entry in packages.items()
+                              if entry["required"] and not entry["static"])
+    nofollow = sorted((top for top, entry in packages.items() if not entry["required"]),
+                      key=lambda top: packages[top]["size"], reverse=True)
+
+    return {
+        "script_path": script_path,
+        "local_modules": sorted(local_modules),
+        "packages": packages,
+        "stdlib": sorted(stdlib),
+        "missing": sorted(missing),
+        "dynamic_imports": sorted({target for _, target, kind in edges if kind == DYNAMIC}),
+        "include_packages": include_packages,
+        "nofollow_imports": nofollow,
+        # 供编译成本估算使用 (见 bloat_advisor)
+        "module_lines": {name: lines.get(name, 0) for name in everything},
+        "edges": [list(edge) for edge in edges]
+    }
+
+
+def format_report(report):
+    """分析报告的文本形式，用于控制台和命令行输出"""
+    lines = [f"入口脚本: {report['script_path']}",
+             f"项目内模块: {len(report['local_modules'])} 个，标准库: {len(report['stdlib'])} 个"]
+    lines.append("第三方包:")
+    for top, entry in sorted(report["packages"].items(), key=lambda item: item[1]["size"], reverse=True):
+        state = "必需" if entry["required"] else "可选"
+        lines.append(f"  {top:<30} {entry['size'] / (1024 * 1024):>8.1f} MB  {entry['modules']:>5} 个模块  {state}")
+    if report["missing"]:
+        lines.append("未找到的模块: " + ", ".join(report["missing"]))
+    lines.append("建议 --include-package: " + (", ".join(report["include_packages"]) or "无"))
+    lines.append("建议 --nofollow-import-to: " + (", ".join(report["nofollow_imports"]) or "无"))
+    return "\n".join(lines)
+
+
+def analyze_script(script_path):
+    """使用默认缓存目录分析入口脚本"""
+    return ImportGraph().analyze(script_path)
@@ -0,0 +1,98 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QPushButton, QCheckBox)
+from PyQt5.QtCore import Qt
+
+from bloat_advisor import HEAVY_RULES, format_option
+
+
+class ImportReportDialog(QDialog):
+    """显示导入分析和编译成本估算的结果，用户确认后把建议写入当前配置
+
+    勾选的建议会加入 --include-package、--nofollow-import-to 或 anti-bloat 选项列表，
+    由调用方通过 get_selected() 读取。
+    """
+
+    def __init__(self, report, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("导入分析")
+        self.resize(820, 560)
+        self.report = report
+        advice = report["advice"]
+
+        layout = QVBoxLayout(self)
+        source = "根据构建记录校准" if advice["calibrated"] else "未校准，使用默认系数"
+        layout.addWidget(QLabel(
+            f"入口脚本: {report['script_path']}\n"
+            f"项目内模块 {len(report['local_modules'])} 个，标准库 {len(report['stdlib'])} 个，"
+            f"第三方包 {len(report['packages'])} 个\n"
+            f"预计编译耗时: 约 {advice['total'] / 60:.1f} 分钟 ({source})"))
+
+        self.table = QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(["包", "大小 (MB)", "模块数", "代码行数", "预计耗时 (秒)", "状态"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        packages = sorted(report["packages"].items(),
+                          key=lambda item: advice["packages"].get(item[0], 0), reverse=True)
+        for top, entry in packages:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QTableWidgetItem(top))
+            values = [f"{entry['size'] / (1024 * 1024):.1f}", str(entry["modules"]), str(entry["lines"]),
+                      f"{advice['packages'].get(top, 0):.0f}"]
+            for column, value in enumerate(values, 1):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+            if not entry["required"]:
+                state = "仅可选导入"
+            elif not entry["static"]:
+                state = "仅动态导入"
+            else:
+                state = "必需"
+            self.table.setItem(row, 5, QTableWidgetItem(state))
+        layout.addWidget(self.table)
+
+        if report["missing"]:
+            missing_label = QLabel("未找到的模块: " + ", ".join(report["missing"]))
+            missing_label.setWordWrap(True)
+            layout.addWidget(missing_label)
+
+        layout.addWidget(QLabel("建议:"))
+        self.suggestion_checks = []
+        for package in report["include_packages"]:
+            check = QCheckBox(f"--include-package={package}  (只通过动态导入使用，Nuitka无法自动跟随)")
+            check.setChecked(True)
+            self.suggestion_checks.append((check, "include_packages", [package]))
+            layout.addWidget(check)
+        # 排除建议会让程序缺少部分模块，默认只勾选仅在可选导入中使用的包
+        heavy_names = {rule["name"] for rule in HEAVY_RULES}
+        for suggestion in advice["suggestions"]:
+            check = QCheckBox(f"{format_option(suggestion)}  —  {suggestion['description']}，"
+                              f"{suggestion['modules']} 个模块，预计节省约 {suggestion['seconds']:.0f} 秒")
+            check.setChecked(suggestion["name"] not in heavy_names)
+            if suggestion["noinclude"]:
+                self.suggestion_checks.append((check, "noinclude_modes", [suggestion["noinclude"]]))
+            else:
+                self.suggestion_checks.append((check, "nofollow_imports", suggestion["nofollow"]))
+            layout.addWidget(check)
+        if not self.suggestion_checks:
+            layout.addWidget(QLabel("当前配置无需调整"))
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        apply_button = QPushButton("应用建议")
+        apply_button.setEnabled(bool(self.suggestion_checks))
+        apply_button.clicked.connect(self.accept)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.reject)
+        button_layout.addWidget(apply_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def get_selected(self):
+        """返回勾选的建议 {"include_packages": [...], "nofollow_imports": [...], "noinclude_modes": [...]}"""
+        selected = {"include_packages": [], "nofollow_imports": [], "noinclude_modes": []}
+        for check, key, values in self.suggestion_checks:
+            if check.isChecked():
+                selected[key].extend(values)
+        return selected
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+from settings import get_data_dir
+from command_builder import get_artifact_paths
+
+
+def get_build_root(config, name=None):
+    """获取配置对应的持久构建目录，Nuitka的 .build 目录保存在其中并在多次打包间复用"""
+    script_path = os.path.abspath(config["script_path"])
+    stem = name or os.path.splitext(os.path.basename(script_path))[0]
+    digest = hashlib.sha1(f"{stem}\0{script_path}".encode()).hexdigest()[:12]
+    return os.path.join(get_data_dir(), "incremental", f"{stem}-{digest}")
+
+
+def prepare(build_root, nuitka_version, python_executable=None):
+    """准备增量构建目录
+
+    Nuitka版本或解释器变化时，旧的编译结果不能复用，会清空目录。
+    返回清空的原因，未清空时返回 None。
+    """
+    stamp = {
+        "nuitka_version": nuitka_version,
+        "python": python_executable or sys.executable
+    }
+    stamp_path = os.path.join(build_root, "stamp.json")
+
+    reason = None
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = None
+
+    if previous is not None:
+        if previous.get("python") != stamp["python"]:
+            reason = f"Python解释器已变化: {previous.get('python')} -> {stamp['python']}"
+        elif nuitka_version and previous.get("nuitka_version") not in (None, nuitka_version):
+            reason = f"Nuitka版本已变化: {previous.get('nuitka_version')} -> {nuitka_version}"
+
+    if reason:
+        clean(build_root)
+
+    if not nuitka_version and previous:
+        stamp["nuitka_version"] = previous.get("nuitka_version")
+
+    os.makedirs(build_root, exist_ok=True)
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        json.dump(stamp, f, indent=4)
+    return reason
+
+
+def clean(build_root):
+    """删除增量构建目录，下次打包将完整编译"""
+    shutil.rmtree(build_root, ignore_errors=True)
+
+
+def publish_artifacts(config, build_root, copy_function=shutil.copy2):
+    """把增量构建目录中的产物复制到配置的输出目录，返回复制的目标路径"""
+    build_config = dict(config, output_dir=build_root)
+    published = []
+    for source, target in zip(get_artifact_paths(build_config), get_artifact_paths(config)):
+        if not os.path.exists(source):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.isdir(source):
+            if os.path.isdir(target):
+                shutil.rmtree(target)
+            shutil.copytree(source, target, copy_function=copy_function)
+        else:
+            shutil.copy2(source, target)
+        published.append(target)
+    return published
@@ -0,0 +1,271 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+
+from settings import get_data_dir
+
+# 没有构建记录时假定的Nuitka进程自身的峰值内存 (MB)
+DEFAULT_NUITKA_MEMORY_MB = 1024
+# 每个C编译任务预留的内存 (MB)，大模块的编译可能更多
+JOB_MEMORY_MB = 1536
+# 按内存只能容纳的编译任务少于该值时启用 --low-memory
+LOW_MEMORY_JOBS = 2
+# 读取构建记录的条数
+TELEMETRY_RECORDS = 10
+# 登记时间超过该值 (秒) 的名额视为残留 (进程号可能已被复用)
+MAX_SLOT_AGE = 24 * 3600
+
+
+def is_auto(config):
+    """并行任务数设置为自动 (0 或 "auto")"""
+    return config.get("parallel", True) and config.get("parallel_count", 4) in (0, "auto")
+
+
+def get_cpu_count():
+    """当前进程可以使用的CPU核心数，考虑CPU亲和性和 cgroup v2 的配额 (容器中的CI)"""
+    if hasattr(os, "sched_getaffinity"):
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max", 'r') as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            count = min(count, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, count)
+
+
+def read_cgroup_memory():
+    """cgroup v2 的内存上限和当前用量 (MB)，没有限制时返回 (None, None)"""
+    try:
+        with open("/sys/fs/cgroup/memory.max", 'r') as f:
+            limit = f.read().strip()
+        if limit == "max":
+            return None, None
+        with open("/sys/fs/cgroup/memory.current", 'r') as f:
+            current = int(f.read().strip())
+        return int(limit) / (1024 * 1024), current / (1024 * 1024)
+    except (OSError, ValueError):
+        return None, None
+
+
+def get_memory_info():
+    """返回 (总内存, 可用内存)，单位MB，无法获取时为 (None, None)"""
+    total = available = None
+    if sys.platform.startswith("linux"):
+        try:
+            values = {}
+            with open("/proc/meminfo", 'r') as f:
+                for line in f:
+                    key, value = line.split(":", 1)
+                    values[key] = int(value.split()[0]) / 1024
+            total = values.get("MemTotal")
+            available = values.get("MemAvailable", values.get("MemFree"))
+        except (OSError, ValueError):
+            pass
+        limit, current = read_cgroup_memory()
+        if limit is not None:
+            total = min(total, limit) if total else limit
+            available = min(available, limit - current) if available else limit - current
+    elif sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            total = status.ullTotalPhys / (1024 * 1024)
+            available = status.ullAvailPhys / (1024 * 1024)
+    elif sys.platform == "darwin":
+        try:
+            total = int(subprocess.run(["sysctl", "-n", "hw.memsize"], capture_output=True,
+                                       text=True).stdout) / (1024 * 1024)
+            output = subprocess.run(["vm_stat"], capture_output=True, text=True).stdout
+            page_size = int(output.split("page size of ")[1].split()[0])
+            pages = {}
+            for line in output.splitlines()[1:]:
+                key, _, value = line.partition(":")
+                pages[key.strip()] = int(value.strip().rstrip(".") or 0)
+            free = pages.get("Pages free", 0) + pages.get("Pages inactive", 0) + pages.get("Pages speculative", 0)
+            available = free * page_size / (1024 * 1024)
+        except (OSError, ValueError, IndexError):
+            pass
+    return total, available
+
+
+def is_process_alive(pid):
+    if sys.platform == "win32":
+        # Windows 上 os.kill 会直接结束进程，只能查询进程的退出代码
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return exit_code.value == 259
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class JobSlot:
+    """在本机正在运行的打包任务中登记一个名额
+
+    GUI、命令行、批量打包和构建服务的每个任务在运行期间都在数据目录的 running 中保留一个文件，
+    记录进程号和使用的 --jobs。自动选择并行任务数时据此在同时运行的打包之间分配CPU核心。
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(get_data_dir(), "running")
+        self.path = None
+
+    def acquire(self, jobs=0):
+        os.makedirs(self.root, exist_ok=True)
+        self.path = os.path.join(self.root, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        self.started = time.time()
+        self.set_jobs(jobs)
+        return self
+
+    def set_jobs(self, jobs):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({"pid": os.getpid(), "jobs": jobs, "started": self.started}, f)
+        except OSError:
+            pass
+
+    def release(self):
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def get_others(self):
+        """其他正在运行的打包任务登记的信息，顺便清理已退出进程留下的文件"""
+        others = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return others
+        for name in names:
+            path = os.path.join(self.root, name)
+            if path == self.path or not name.endswith(".json"):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if time.time() - info.get("started", 0) > MAX_SLOT_AGE or not is_process_alive(info["pid"]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            others.append(info)
+        return others
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+def plan_jobs(cpu_count, total_mb, available_mb, others, records=()):
+    """按CPU核心、可用内存、同时运行的其他打包和历史构建记录选择 --jobs
+
+    - CPU: 在同时运行的打包之间平分核心，其他打包占用较少时使用空闲的核心
+    - 内存: 扣除Nuitka自身的峰值内存 (取最近记录中的最大值) 后，每个C编译任务预留 JOB_MEMORY_MB，
+      只够容纳不到 LOW_MEMORY_JOBS 个任务时启用 --low-memory
+    - 最近一次记录的C文件数量少于核心数时，多余的任务不会带来收益
+    """
+    concurrent = len(others) + 1
+    busy = sum(info.get("jobs") or 0 for info in others)
+    cores = max(1, cpu_count // concurrent, cpu_count - busy)
+    jobs = cores
+
+    peaks = [record["peak_memory_mb"] for record in records if record.get("peak_memory_mb")]
+    nuitka_memory_mb = max(peaks) if peaks else DEFAULT_NUITKA_MEMORY_MB
+    low_memory = False
+    memory_share = None
+    if available_mb is not None:
+        memory_share = available_mb if total_mb is None else min(available_mb, total_mb / concurrent)
+        by_memory = int((memory_share - nuitka_memory_mb) // JOB_MEMORY_MB)
+        low_memory = by_memory < LOW_MEMORY_JOBS
+        jobs = min(jobs, max(1, by_memory))
+
+    c_files = [record["c_file_count"] for record in records if record.get("c_file_count")]
+    if c_files:
+        jobs = min(jobs, max(1, c_files[-1]))
+
+    return {
+        "jobs": jobs,
+        "low_memory": low_memory,
+        "cpu_count": cpu_count,
+        "cores": cores,
+        "concurrent": concurrent,
+        "memory_share_mb": memory_share,
+        "nuitka_memory_mb": nuitka_memory_mb
+    }
+
+
+def load_records(name):
+    """读取同名配置最近的构建记录，失败时返回空列表"""
+    if not name:
+        return []
+    from build_history import BuildHistory
+    try:
+        return BuildHistory().get_trend(name, limit=TELEMETRY_RECORDS)
+    except (OSError, sqlite3.Error):
+        return []
+
+
+def tune_config(config, slot, records=()):
+    """返回 (实际使用的配置, 自动选择的方案或 None)，并在 slot 中登记使用的 --jobs
+
+    非自动的配置保持不变；不并行时Nuitka默认使用全部核心。
+    """
+    cpu_count = get_cpu_count()
+    if not is_auto(config):
+        jobs = config.get("parallel_count", 4) if config.get("parallel", True) else cpu_count
+        slot.set_jobs(jobs)
+        return config, None
+    total_mb, available_mb = get_memory_info()
+    plan = plan_jobs(cpu_count, total_mb, available_mb, slot.get_others(), records)
+    slot.set_jobs(plan["jobs"])
+    # 用户自己启用的 --low-memory 保持不变，只在内存不足时额外启用
+    low_memory = bool(config.get("low_memory")) or plan["low_memory"]
+    return dict(config, parallel_count=plan["jobs"], low_memory=low_memory), plan
+
+
+def format_plan(plan):
+    text = (f"自动选择 --jobs={plan['jobs']}: 可用核心 {plan['cores']}/{plan['cpu_count']}"
+            f" (同时运行 {plan['concurrent']} 个打包)")
+    if plan["memory_share_mb"] is not None:
+        text += f"，可用内存 {plan['memory_share_mb'] / 1024:.1f} GB"
+    if plan["low_memory"]:
+        text += "，内存不足，启用 --low-memory"
+    return text
@@ -0,0 +1,55 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+# 每次滚动到底部时读取的行数
+FETCH_BATCH = 200
+
+
+class LazyListModel(QAbstractListModel):
+    """按需分批读取数据的列表模型，用于配置和构建记录等可能很长的列表
+
+    count_func() 返回总行数，fetch_func(offset, limit) 返回一批行数据，
+    format_func(row) 返回显示文本。视图滚动到末尾时才读取下一批，
+    因此打开上万条记录的列表也只需要读取第一屏的数据。
+    行数据本身可以通过 Qt.UserRole 取得。
+    """
+
+    def __init__(self, count_func, fetch_func, format_func=str, parent=None):
+        super().__init__(parent)
+        self.count_func = count_func
+        self.fetch_func = fetch_func
+        self.format_func = format_func
+        self.rows = []
+        self.total = 0
+
+    def reload(self):
+        self.beginResetModel()
+        self.rows = []
+        self.total = self.count_func()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        rows = self.fetch_func(len(self.rows), FETCH_BATCH)
+        if not rows:
+            # 数据在两次读取之间减少了
+            self.total = len(self.rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        if role == Qt.DisplayRole:
+            return self.format_func(self.rows[index.row()])
+        if role == Qt.UserRole:
+            return self.rows[index.row()]
+        return None
@@ -0,0 +1,159 @@
+import os
+import re
+import sqlite3
+
+from settings import get_data_dir
+from config_store import build_match_query
+
+# 控制台写入日志时加在每段输出前的时间戳，索引时去掉，避免同一行因时间不同而重复
+TIMESTAMP_PATTERN = re.compile(r'^\[\d\d:\d\d:\d\d\] ')
+# 超过该长度的行只索引开头部分
+MAX_LINE_LENGTH = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    log TEXT NOT NULL UNIQUE,
+    config TEXT,
+    script_path TEXT,
+    nuitka_version TEXT,
+    started TEXT,
+    exit_code INTEGER
+);
+"""
+
+
+def get_index_path():
+    return os.path.join(get_data_dir(), "log_index.db")
+
+
+def normalize_line(line):
+    return TIMESTAMP_PATTERN.sub("", line).strip()[:MAX_LINE_LENGTH]
+
+
+class LogIndex:
+    """构建日志的全文索引，与配置库分开保存在 log_index.db 中
+
+    每条日志中内容相同的行只索引一次 (记录第一次出现的行号)，进度计数之类的重复输出不会让索引膨胀。
+    使用 SQLite FTS5，不支持时退回普通表和 LIKE 查找。
+    写入在构建日志的后台线程中进行，多个打包同时写入时依靠 WAL 模式和等待超时避免冲突。
+    一个实例只能在创建它的线程中使用。
+    """
+
+    def __init__(self, path=None):
+        self.connection = sqlite3.connect(path or get_index_path(), timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS log_lines USING fts5(text, log_id UNINDEXED, line UNINDEXED)")
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS log_lines (text TEXT, log_id INTEGER, line INTEGER)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS log_lines_log ON log_lines (log_id)")
+            self.fts_enabled = False
+        self.seen = {}
+
+    def begin(self, log, meta):
+        """登记一条日志，返回其编号；同一日志重复登记时返回原编号"""
+        row = self.connection.execute("SELECT id FROM logs WHERE log = ?", (log,)).fetchone()
+        if row:
+            return row[0]
+        log_id = self.connection.execute(
+            "INSERT INTO logs (log, config, script_path, nuitka_version, started, exit_code) VALUES (?, ?, ?, ?, ?, ?)",
+            (log, meta.get("name"), meta.get("script_path"), meta.get("nuitka_version"),
+             meta.get("started"), meta.get("exit_code"))).lastrowid
+        self.connection.commit()
+        self.seen[log_id] = set()
+        return log_id
+
+    def add_lines(self, log_id, first_line, text):
+        """索引从第 first_line 行开始的一段文本"""
+        seen = self.seen.setdefault(log_id, set())
+        rows = []
+        for number, line in enumerate(text.split("\n"), first_line):
+            line = normalize_line(line)
+            if line and line not in seen:
+                seen.add(line)
+                rows.append((line, log_id, number))
+        if rows:
+            self.connection.executemany("INSERT INTO log_lines (text, log_id, line) VALUES (?, ?, ?)", rows)
+            self.connection.commit()
+
+    def finish(self, log_id, meta):
+        self.seen.pop(log_id, None)
+        self.connection.execute("UPDATE logs SET exit_code = ? WHERE id = ?", (meta.get("exit_code"), log_id))
+        self.connection.commit()
+
+    def remove(self, logs):
+        """删除已被清理的日志的索引"""
+        for log in logs:
+            row = self.connection.execute("SELECT id FROM logs WHERE log = ?", (log,)).fetchone()
+            if row:
+                self.connection.execute("DELETE FROM log_lines WHERE log_id = ?", (row[0],))
+                self.connection.execute("DELETE FROM logs WHERE id = ?", (row[0],))
+        self.connection.commit()
+
+    def get_indexed_logs(self):
+        return {row[0] for row in self.connection.execute("SELECT log FROM logs")}
+
+    def index_file(self, path, meta=None):
+        """索引一个已经写完的日志文件 (升级前的日志或写入中断的日志)"""
+        from build_logs import BuildLogReader
+        reader = BuildLogReader(path)
+        meta = dict(reader.index, **(meta or {}))
+        log_id = self.begin(os.path.basename(path), meta)
+        for number in range(len(reader.blocks)):
+            self.add_lines(log_id, reader.blocks[number][2], "\n".join(reader.read_block(number)))
+        self.finish(log_id, meta)
+
+    def index_missing(self, log_paths):
+        """索引尚未建立索引的日志，返回新索引的数量"""
+        indexed = self.get_indexed_logs()
+        count = 0
+        for path in log_paths:
+            if os.path.basename(path) in indexed:
+                continue
+            try:
+                self.index_file(path)
+            except (OSError, ValueError, EOFError):
+                continue
+            count += 1
+        return count
+
+    def search(self, query, limit=200):
+        """查找包含搜索文本的日志行，最新的在前
+
+        返回 {"log", "config", "script_path", "nuitka_version", "started", "exit_code", "line", "text"} 列表。
+        """
+        if not query or not query.strip():
+            return []
+        columns = ("log", "config", "script_path", "nuitka_version", "started", "exit_code", "line", "text")
+        select = ("SELECT logs.log, logs.config, logs.script_path, logs.nuitka_version, logs.started, "
+                  "logs.exit_code, log_lines.line, log_lines.text FROM log_lines JOIN logs ON logs.id = log_lines.log_id")
+        order = "ORDER BY logs.started DESC, logs.id DESC, log_lines.line LIMIT ?"
+        try:
+            if self.fts_enabled:
+                rows = self.connection.execute(f"{select} WHERE log_lines MATCH ? {order}",
+                                               (build_match_query(query), limit)).fetchall()
+            else:
+                rows = self.connection.execute(f"{select} WHERE log_lines.text LIKE ? {order}",
+                                               (f"%{query.strip()}%", limit)).fetchall()
+        except sqlite3.OperationalError:
+            # 无法解析的搜索文本
+            return []
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        self.connection.close()
+
+
+def search_logs(query, limit=200):
+    """先为尚未索引的日志补建索引，再查找；供后台线程和命令行使用"""
+    from build_logs import list_logs
+    log_index = LogIndex()
+    try:
+        log_index.index_missing(list_logs())
+        return log_index.search(query, limit)
+    finally:
+        log_index.close()
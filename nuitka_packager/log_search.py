@@ -0,0 +1,125 @@
+import os
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QPushButton, QMessageBox)
+
+from background import BackgroundTask
+from build_logs import BuildLogReader, get_log_dir
+from console_view import ConsolePagerDialog
+from log_index import search_logs
+
+
+class LogSearchDialog(QDialog):
+    """在所有构建日志中查找出现过的错误或警告
+
+    查找在后台线程中进行，首次查找时为升级前保存的日志补建索引。
+    双击结果打开对应日志并定位到该行，"加载配置"载入产生该日志的配置。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("搜索构建日志")
+        self.resize(960, 560)
+        self.results = []
+        self.task = None
+
+        layout = QVBoxLayout(self)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("输入错误信息、模块名等，例如 ModuleNotFoundError")
+        self.search_edit.returnPressed.connect(self.search)
+        search_layout.addWidget(self.search_edit)
+        self.search_button = QPushButton("搜索")
+        self.search_button.clicked.connect(self.search)
+        search_layout.addWidget(self.search_button)
+        layout.addLayout(search_layout)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["时间", "配置", "Nuitka版本", "结果", "内容"])
+        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.doubleClicked.connect(self.open_selected_log)
+        layout.addWidget(self.table)
+
+        bottom_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom_layout.addWidget(self.status_label)
+        bottom_layout.addStretch()
+        open_button = QPushButton("打开日志")
+        open_button.clicked.connect(self.open_selected_log)
+        bottom_layout.addWidget(open_button)
+        load_button = QPushButton("加载配置")
+        load_button.clicked.connect(self.load_selected_config)
+        bottom_layout.addWidget(load_button)
+        layout.addLayout(bottom_layout)
+
+    def search(self):
+        query = self.search_edit.text().strip()
+        if not query or self.task is not None:
+            return
+        self.search_button.setEnabled(False)
+        self.status_label.setText("搜索中...")
+        self.task = BackgroundTask(search_logs, query, parent=self)
+        self.task.result_ready.connect(self.show_results)
+        self.task.start()
+
+    def show_results(self, results):
+        self.task = None
+        self.search_button.setEnabled(True)
+        if isinstance(results, Exception):
+            self.status_label.setText(f"搜索失败: {str(results)}")
+            return
+        self.results = results
+        self.table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            if result["exit_code"] is None:
+                status = "未完成"
+            else:
+                status = "成功" if result["exit_code"] == 0 else f"失败 ({result['exit_code']})"
+            values = [result["started"] or "", result["config"] or "", result["nuitka_version"] or "",
+                      status, result["text"]]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        self.table.resizeColumnsToContents()
+        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.status_label.setText(f"找到 {len(results)} 处" if results else "没有找到匹配的日志")
+
+    def get_selected(self):
+        row = self.table.currentRow()
+        if row < 0 or row >= len(self.results):
+            QMessageBox.warning(self, "警告", "请先选择一条结果!")
+            return None
+        return self.results[row]
+
+    def open_selected_log(self):
+        result = self.get_selected()
+        if not result:
+            return
+        path = os.path.join(get_log_dir(), result["log"])
+        try:
+            reader = BuildLogReader(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "错误", f"无法读取日志 (可能已按保留期限删除): {str(e)}")
+            return
+        dialog = ConsolePagerDialog(reader, self, title=f"构建日志 - {result['config']} {result['started']}")
+        dialog.show_line(result["line"])
+        dialog.show()
+
+    def load_selected_config(self):
+        result = self.get_selected()
+        if not result:
+            return
+        parent = self.parent()
+        if parent.config_manager.load_config(result["config"]) is None:
+            QMessageBox.warning(self, "警告", f"配置库中没有名为 {result['config']} 的配置")
+            return
+        parent.load_config(result["config"])
+        parent.tabs.setCurrentIndex(0)
+
+    def closeEvent(self, event):
+        if self.task is not None:
+            self.task.wait()
+        super().closeEvent(event)
@@ -0,0 +1,120 @@
+import re
+
+# 打包阶段及其在总进度中的权重，pattern 为Nuitka输出中标志该阶段开始的文本，
+# counter 为该阶段内可用的Nuitka计数器 (见 progress_tracker.COUNTER_PATTERNS)
+DEFAULT_STAGES = [
+    {"name": "初始化", "weight": 5, "pattern": "Initializing"},
+    {"name": "编译主模块", "weight": 30, "pattern": "Compiling module", "counter": "modules"},
+    {"name": "分析依赖", "weight": 15, "pattern": "Doing module dependency"},
+    {"name": "包含数据文件", "weight": 10, "pattern": "Including data files"},
+    {"name": "生成C代码", "weight": 15, "pattern": "Generating C source"},
+    {"name": "编译二进制", "weight": 20, "pattern": "Compiling C source", "counter": "c_files"},
+    {"name": "最终打包", "weight": 5, "pattern": "Creating binary"}
+]
+
+PROGRESS_MARKER = "Progress"
+OUTPUT_FILE_MARKER = "输出文件:"
+
+
+class OutputParser:
+    """把Nuitka输出逐块分类的预编译匹配器
+
+    所有阶段标志、输出文件标志和用户自定义规则被合并为一个正则表达式，
+    每块输出只扫描一遍，不再对每一行逐个阶段做子串查找。
+    固定文本的标志不使用捕获分组 (分组会让每个位置的匹配明显变慢)，
+    匹配后按匹配到的文本查表分类；只有自定义正则才使用命名分组。
+    几乎每行都会出现的进度标志不参与正则匹配，而是用 str.count 计数。
+
+    custom_patterns 来自配置中的 output_patterns，每项为 {"name": 名称, "pattern": 正则}；
+    名称与某个阶段相同时作为该阶段的额外标志，否则作为需要高亮的输出。
+    """
+
+    def __init__(self, stages=None, custom_patterns=None):
+        self.stages = stages or DEFAULT_STAGES
+        self.custom_patterns = []
+        stage_names = {stage["name"]: i for i, stage in enumerate(self.stages)}
+
+        # 固定文本 -> 事件，同一文本对应多个阶段时以靠前的阶段为准
+        self.literal_actions = {}
+        for i, stage in enumerate(self.stages):
+            self.literal_actions.setdefault(stage["pattern"], ("stage", i))
+
+        # 较长的文本放在前面，保证共享前缀时优先匹配更具体的标志；
+        # 输出文件标志连同行尾一起匹配，以便取出路径
+        alternatives = [re.escape(literal)
+                        for literal in sorted(self.literal_actions, key=len, reverse=True)
+                        if literal != OUTPUT_FILE_MARKER]
+        alternatives.append(re.escape(OUTPUT_FILE_MARKER) + r"[^\n]*")
+
+        self.group_actions = {}
+        for entry in custom_patterns or []:
+            try:
+                re.compile(entry["pattern"])
+            except (re.error, KeyError, TypeError):
+                continue
+            self.custom_patterns.append(entry)
+            if entry.get("name") in stage_names:
+                action = ("stage", stage_names[entry["name"]])
+            else:
+                action = ("custom", entry.get("name", ""))
+            group = f"custom{len(self.group_actions)}"
+            self.group_actions[group] = action
+            alternatives.append(f"(?P<{group}>{entry['pattern']})")
+
+        try:
+            self.regex = re.compile("|".join(alternatives))
+        except re.error:
+            # 自定义规则与其他规则冲突时 (如重名的命名分组) 忽略自定义规则
+            self.__init__(stages)
+
+    def parse(self, text):
+        """对一块输出做一次扫描，返回 (类型, 值) 事件列表
+
+        类型为 "stage" (值为阶段序号)、"output" (值为输出路径)、
+        "custom" (值为 (规则名称, 所在行)) 或 "progress" (值为最后一个阶段标志之后的进度行数)。
+        连续重复的同一阶段标志只产生一个事件。
+        """
+        events = []
+        progress_from = 0
+        for match in self.regex.finditer(text):
+            group = match.lastgroup
+            if group is None:
+                action = self.literal_actions.get(match.group())
+                if action is None:
+                    # 输出文件行，正则已匹配到行尾
+                    events.append(("output", match.group()[len(OUTPUT_FILE_MARKER):].strip()))
+                    continue
+            else:
+                action = self.group_actions[group]
+
+            if action[0] == "custom":
+                line_start = text.rfind("\n", 0, match.start()) + 1
+                line_end = text.find("\n", match.end())
+                line = text[line_start:line_end if line_end != -1 else len(text)]
+                events.append(("custom", (action[1], line)))
+                continue
+
+            if not events or events[-1] != action:
+                events.append(action)
+            progress_from = match.end()
+
+        # 进入新阶段时阶段进度归零，因此只统计最后一个阶段标志之后的进度行 (在C层面计数)
+        progress = text.count(PROGRESS_MARKER, progress_from)
+        if progress:
+            events.append(("progress", progress))
+        return events
+
+
+def parse_pattern_lines(text):
+    """把编辑框中 "名称=正则表达式" 形式的多行文本转换为规则列表"""
+    patterns = []
+    for line in text.splitlines():
+        name, sep, pattern = line.partition("=")
+        if sep and name.strip() and pattern.strip():
+            patterns.append({"name": name.strip(), "pattern": pattern.strip()})
+    return patterns
+
+
+def format_pattern_lines(patterns):
+    """把规则列表转换为编辑框中的多行文本"""
+    return "\n".join(f"{entry['name']}={entry['pattern']}" for entry in patterns or [])
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import sys
+
+from settings import get_data_dir
+from build_cache import iter_tree, SOURCE_SUFFIXES
+from command_builder import split_list
+from import_graph import ImportGraph, get_default_search_paths
+
+# 需要手动启用的Nuitka插件及触发它们的顶层模块
+PLUGIN_RULES = {
+    "tk-inter": ["tkinter"],
+    "pyqt5": ["PyQt5"],
+    "pyqt6": ["PyQt6"],
+    "pyside2": ["PySide2"],
+    "pyside6": ["PySide6"],
+    "pywebview": ["webview"],
+    "kivy": ["kivy"],
+    "pmw-freezer": ["Pmw"],
+    "gevent": ["gevent"],
+    "eventlet": ["eventlet"],
+    "spacy": ["spacy"],
+}
+
+# 同一个程序只能启用其中一个Qt绑定插件
+QT_PLUGINS = ["pyqt5", "pyside6", "pyqt6", "pyside2"]
+
+# 启用了也不会改变打包结果的插件及原因
+NO_EFFECT_PLUGINS = {
+    "pylint-warnings": "只让Nuitka识别源码中的 pylint 注释，不影响打包结果",
+    "anti-bloat": "Nuitka默认已启用",
+    "implicit-imports": "Nuitka默认已启用",
+    "dll-files": "Nuitka默认已启用",
+    "data-files": "Nuitka默认已启用",
+    "multiprocessing": "Nuitka默认已启用",
+    "numpy": "新版Nuitka已默认处理，无需单独启用",
+    "matplotlib": "新版Nuitka已默认处理，无需单独启用",
+}
+
+# 缓存文件中最多保留的项目数
+MAX_CACHE_ENTRIES = 32
+
+
+def get_cache_path():
+    return os.path.join(get_data_dir(), "plugin_scan.json")
+
+
+def get_project_fingerprint(script_path, search_paths):
+    """项目源码和已安装包的指纹 (只做 stat)
+
+    项目中任何源文件的修改时间或大小变化、以及 site-packages 等查找目录的修改时间变化
+    (安装或卸载了包) 都会改变指纹。
+    """
+    digest = hashlib.sha1(os.path.abspath(sys.executable).encode("utf-8", errors="replace"))
+    for path in iter_tree(os.path.dirname(script_path), SOURCE_SUFFIXES):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}\n".encode("utf-8", errors="replace"))
+    for path in search_paths[1:]:
+        try:
+            digest.update(f"{path}|{os.stat(path).st_mtime_ns}\n".encode("utf-8", errors="replace"))
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+def infer_plugins(report):
+    """根据导入分析报告推断需要启用的最少插件
+
+    返回 {"plugins": [插件], "reasons": {插件: 触发的模块}, "conflicts": [说明]}。
+    只在可选导入中出现的第三方包不会触发插件。
+    """
+    used = set(report["stdlib"])
+    used.update(top for top, entry in report["packages"].items() if entry["required"])
+
+    reasons = {}
+    for plugin, modules in PLUGIN_RULES.items():
+        for module in modules:
+            if module in used:
+                reasons[plugin] = module
+                break
+
+    conflicts = []
+    qt_plugins = [plugin for plugin in QT_PLUGINS if plugin in reasons]
+    if len(qt_plugins) > 1:
+        conflicts.append(f"同时用到了多个Qt绑定 ({', '.join(reasons[p] for p in qt_plugins)})，"
+                         f"Nuitka只能启用其中一个，建议保留 {qt_plugins[0]} 并对其余的使用 --nofollow-import-to")
+        for plugin in qt_plugins[1:]:
+            del reasons[plugin]
+
+    return {"plugins": sorted(reasons), "reasons": reasons, "conflicts": conflicts}
+
+
+def check_enabled_plugins(plugins_text, inference):
+    """检查已启用的插件，返回 [(插件, 原因)]，列出与当前项目无关的插件
+
+    不认识的插件不做判断。
+    """
+    warnings = []
+    for plugin in split_list(plugins_text):
+        if plugin in NO_EFFECT_PLUGINS:
+            warnings.append((plugin, NO_EFFECT_PLUGINS[plugin]))
+        elif plugin in PLUGIN_RULES and plugin not in inference["plugins"]:
+            modules = "、".join(PLUGIN_RULES[plugin])
+            warnings.append((plugin, f"项目中没有用到 {modules}"))
+    return warnings
+
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def scan_project(script_path, cache_path=None):
+    """推断项目需要的插件，结果按入口脚本缓存，项目和已安装的包没有变化时直接返回缓存
+
+    会遍历项目目录并可能解析大量源文件，不要在界面线程中调用。
+    """
+    script_path = os.path.abspath(script_path)
+    cache_path = cache_path or get_cache_path()
+    search_paths = get_default_search_paths(os.path.dirname(script_path))
+    fingerprint = get_project_fingerprint(script_path, search_paths)
+
+    cache = load_cache(cache_path)
+    entry = cache.get(script_path)
+    if entry and entry["fingerprint"] == fingerprint:
+        return entry["result"]
+
+    report = ImportGraph().analyze(script_path, search_paths)
+    result = infer_plugins(report)
+    result["script_path"] = script_path
+
+    cache.pop(script_path, None)
+    cache[script_path] = {"fingerprint": fingerprint, "result": result}
+    for key in list(cache)[:-MAX_CACHE_ENTRIES]:
+        del cache[key]
+    try:
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return result
@@ -0,0 +1,175 @@
+import re
+import time
+
+# Nuitka进度输出中的计数器: 计数器名 -> [(关键字, 正则)]
+# 只解析每块输出中最后一次出现的计数，避免逐行匹配
+COUNTER_PATTERNS = {
+    "modules": [
+        ("PASS", re.compile(r'PASS \d+:.*?(\d+)/(\d+)')),
+        ("Optimizing module", re.compile(r'Optimizing module.*?(\d+) modules of (\d+)'))
+    ],
+    "c_files": [
+        ("C compiling", re.compile(r'C compiling.*?(\d+)/(\d+)')),
+        ("Compiling C files", re.compile(r'Compiling C files.*?(\d+)/(\d+)'))
+    ]
+}
+
+# --show-memory 输出的内存占用，如 "Nuitka-Memory: ... RSS: 812.45 MB"
+MEMORY_MARKER = "RSS:"
+MEMORY_PATTERN = re.compile(r'RSS: ([\d.]+) ?([KMG])B')
+MEMORY_UNITS = {"K": 1 / 1024, "M": 1, "G": 1024}
+
+
+def find_last_line(text, keyword):
+    """返回 text 中最后一个包含 keyword 的行，找不到时返回 None"""
+    position = text.rfind(keyword)
+    if position == -1:
+        return None
+    line_start = text.rfind("\n", 0, position) + 1
+    line_end = text.find("\n", position)
+    return text[line_start:line_end if line_end != -1 else len(text)]
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}小时{seconds % 3600 // 60}分"
+    if seconds >= 60:
+        return f"{seconds // 60}分{seconds % 60}秒"
+    return f"{seconds}秒"
+
+
+class ProgressTracker:
+    """根据Nuitka自身输出的计数计算打包进度和剩余时间
+
+    阶段切换来自 OutputParser 的阶段事件；带有计数器的阶段 (阶段定义中的 "counter")
+    按已处理数/总数计算阶段内进度，并根据该阶段内的实际速度估算剩余时间。
+    只有收到新数据时进度才会变化。
+    同时记录各阶段耗时、峰值内存和模块/C文件数量，供构建记录使用 (见 telemetry)。
+    """
+
+    def __init__(self, stages, clock=time.monotonic):
+        self.stages = stages
+        self.clock = clock
+        self.counter_stages = {stage["counter"]: i for i, stage in enumerate(stages) if stage.get("counter")}
+        self.reset()
+
+    def reset(self):
+        self.current_stage = 0
+        self.stage_fraction = 0.0
+        self.counter = None
+        self.finished = False
+        now = self.clock()
+        self.started = now
+        self.stage_started = now
+        self.stage_times = {}
+        self.rate_origin = None
+        self.counter_totals = {}
+        self.peak_memory_mb = None
+
+    def enter_stage(self, index):
+        """进入新阶段，只允许向前推进，返回进度是否变化"""
+        if index <= self.current_stage:
+            return False
+        self.close_stage(self.clock())
+        self.current_stage = index
+        self.stage_fraction = 0.0
+        self.counter = None
+        self.rate_origin = None
+        return True
+
+    def close_stage(self, now):
+        """把当前阶段到 now 为止的耗时计入 stage_times"""
+        elapsed = now - self.stage_started
+        self.stage_times[self.current_stage] = self.stage_times.get(self.current_stage, 0) + elapsed
+        self.stage_started = now
+
+    def feed(self, text):
+        """从一块输出中读取计数器，返回进度是否变化"""
+        if MEMORY_MARKER in text:
+            for value, unit in MEMORY_PATTERN.findall(text):
+                memory = float(value) * MEMORY_UNITS[unit]
+                if self.peak_memory_mb is None or memory > self.peak_memory_mb:
+                    self.peak_memory_mb = memory
+
+        changed = False
+        for name, patterns in COUNTER_PATTERNS.items():
+            stage = self.counter_stages.get(name)
+            if stage is None or stage < self.current_stage:
+                continue
+            for keyword, regex in patterns:
+                line = find_last_line(text, keyword)
+                match = regex.search(line) if line else None
+                if match:
+                    done, total = int(match.group(1)), int(match.group(2))
+                    if total > 0:
+                        self.counter_totals[name] = max(total, self.counter_totals.get(name, 0))
+                        changed |= self.update_counter(stage, done, total)
+                    break
+        return changed
+
+    def update_counter(self, stage, done, total):
+        changed = self.enter_stage(stage)
+        fraction = min(1.0, done / total)
+        self.counter = (done, total)
+        now = self.clock()
+        if self.rate_origin is None:
+            self.rate_origin = (now, fraction)
+        # 多轮优化时计数会从头开始，阶段进度保持单调
+        if fraction > self.stage_fraction:
+            self.stage_fraction = fraction
+            changed = True
+        return changed
+
+    def finish(self):
+        if not self.finished:
+            self.close_stage(self.clock())
+        self.current_stage = len(self.stages) - 1
+        self.stage_fraction = 1.0
+        self.counter = None
+        self.rate_origin = None
+        self.finished = True
+
+    def percent(self):
+        """总进度百分比 (0-100)"""
+        if self.finished:
+            return 100
+        total_weight = sum(stage["weight"] for stage in self.stages) or 1
+        done = sum(stage["weight"] for stage in self.stages[:self.current_stage])
+        done += self.stages[self.current_stage]["weight"] * self.stage_fraction
+        return int(100 * done / total_weight)
+
+    def stage_eta(self):
+        """按当前阶段的实际处理速度估算阶段剩余秒数，数据不足时返回 None"""
+        if self.rate_origin is None:
+            return None
+        origin_time, origin_fraction = self.rate_origin
+        elapsed = self.clock() - origin_time
+        progressed = self.stage_fraction - origin_fraction
+        if elapsed <= 0 or progressed <= 0:
+            return None
+        return (1.0 - self.stage_fraction) * elapsed / progressed
+
+    def telemetry(self):
+        """本次打包的统计数据: 各阶段耗时 (秒)、峰值内存 (MB)、模块数量和C文件数量"""
+        if not self.finished:
+            self.close_stage(self.clock())
+        return {
+            "stage_times": {self.stages[i]["name"]: round(seconds, 2)
+                            for i, seconds in sorted(self.stage_times.items())},
+            "peak_memory_mb": round(self.peak_memory_mb, 1) if self.peak_memory_mb is not None else None,
+            "module_count": self.counter_totals.get("modules"),
+            "c_file_count": self.counter_totals.get("c_files")
+        }
+
+    def describe(self):
+        """当前阶段的说明文字，用于进度条"""
+        text = self.stages[self.current_stage]["name"]
+        if self.counter:
+            text += f" {self.counter[0]}/{self.counter[1]}"
+        eta = self.stage_eta()
+        if eta is not None:
+            text += f" · 阶段剩余约 {format_eta(eta)}"
+        return text
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+
+# Resource object code
+#
+# Created by: The Resource Compiler for PyQt5 (Qt v5.15.14)
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore
+
+qt_resource_data = b"\
+\x00\x00\x0a\x23\
+\x2f\
+\x2a\x20\xe4\xb8\xbb\xe7\xaa\x97\xe5\x8f\xa3\xe6\xa0\xb7\xe5\xbc\
+\x8f\x20\x2a\x2f\x0d\x0a\x51\x4d\x61\x69\x6e\x57\x69\x6e\x64\x6f\
+\x77\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\
+\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x66\x35\x66\x37\
+\x66\x61\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe6\x8c\x89\
+\xe9\x92\xae\xe6\xa0\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\x50\
+\x75\x73\x68\x42\x75\x74\x74\x6f\x6e\x20\x7b\x0d\x0a\x20\x20\x20\
+\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\
+\x72\x3a\x20\x23\x34\x61\x36\x66\x61\x35\x3b\x0d\x0a\x20\x20\x20\
+\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\
+\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x3a\x20\x6e\x6f\x6e\x65\
+\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x2d\x72\x61\
+\x64\x69\x75\x73\x3a\x20\x34\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\
+\x70\x61\x64\x64\x69\x6e\x67\x3a\x20\x38\x70\x78\x20\x31\x36\x70\
+\x78\x3b\x0d\x0a\x20\x20\x20\x20\x6d\x69\x6e\x2d\x77\x69\x64\x74\
+\x68\x3a\x20\x38\x30\x70\x78\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\
+\x50\x75\x73\x68\x42\x75\x74\x74\x6f\x6e\x3a\x68\x6f\x76\x65\x72\
+\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\
+\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x33\x61\x35\x61\x38\
+\x30\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\x50\x75\x73\x68\x42\x75\
+\x74\x74\x6f\x6e\x3a\x70\x72\x65\x73\x73\x65\x64\x20\x7b\x0d\x0a\
+\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\
+\x6f\x6c\x6f\x72\x3a\x20\x23\x32\x63\x34\x61\x36\x65\x3b\x0d\x0a\
+\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe7\x89\xb9\xe6\xae\x8a\xe6\x8c\
+\x89\xe9\x92\xae\xe6\xa0\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\
+\x50\x75\x73\x68\x42\x75\x74\x74\x6f\x6e\x23\x72\x75\x6e\x5f\x62\
+\x75\x74\x74\x6f\x6e\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\
+\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\
+\x34\x63\x61\x66\x35\x30\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\x50\
+\x75\x73\x68\x42\x75\x74\x74\x6f\x6e\x23\x72\x75\x6e\x5f\x62\x75\
+\x74\x74\x6f\x6e\x3a\x68\x6f\x76\x65\x72\x20\x7b\x0d\x0a\x20\x20\
+\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\
+\x6f\x72\x3a\x20\x23\x33\x64\x38\x62\x34\x30\x3b\x0d\x0a\x7d\x0d\
+\x0a\x0d\x0a\x51\x50\x75\x73\x68\x42\x75\x74\x74\x6f\x6e\x23\x73\
+\x74\x6f\x70\x5f\x62\x75\x74\x74\x6f\x6e\x20\x7b\x0d\x0a\x20\x20\
+\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\x6c\
+\x6f\x72\x3a\x20\x23\x66\x34\x34\x33\x33\x36\x3b\x0d\x0a\x7d\x0d\
+\x0a\x0d\x0a\x51\x50\x75\x73\x68\x42\x75\x74\x74\x6f\x6e\x23\x73\
+\x74\x6f\x70\x5f\x62\x75\x74\x74\x6f\x6e\x3a\x68\x6f\x76\x65\x72\
+\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\
+\x6e\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x64\x33\x32\x66\x32\
+\x66\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe6\xa0\x87\xe7\
+\xad\xbe\xe6\xa0\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\x4c\x61\
+\x62\x65\x6c\x20\x7b\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\
+\x3a\x20\x23\x33\x33\x33\x33\x33\x33\x3b\x0d\x0a\x20\x20\x20\x20\
+\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3a\x20\x32\x35\x70\x78\x3b\
+\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\x4c\x61\x62\x65\x6c\x23\x70\x6c\
+\x75\x67\x69\x6e\x5f\x68\x69\x6e\x74\x5f\x6c\x61\x62\x65\x6c\x20\
+\x7b\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x62\
+\x34\x35\x33\x30\x39\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\
+\xe8\xbe\x93\xe5\x85\xa5\xe6\xa1\x86\xe6\xa0\xb7\xe5\xbc\x8f\x20\
+\x2a\x2f\x0d\x0a\x51\x4c\x69\x6e\x65\x45\x64\x69\x74\x2c\x20\x51\
+\x43\x6f\x6d\x62\x6f\x42\x6f\x78\x2c\x20\x51\x53\x70\x69\x6e\x42\
+\x6f\x78\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\
+\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\x64\x31\x64\
+\x35\x64\x62\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\
+\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x34\x70\x78\x3b\x0d\x0a\x20\
+\x20\x20\x20\x70\x61\x64\x64\x69\x6e\x67\x3a\x20\x36\x70\x78\x3b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\
+\x4c\x69\x6e\x65\x45\x64\x69\x74\x3a\x66\x6f\x63\x75\x73\x2c\x20\
+\x51\x43\x6f\x6d\x62\x6f\x42\x6f\x78\x3a\x66\x6f\x63\x75\x73\x2c\
+\x20\x51\x53\x70\x69\x6e\x42\x6f\x78\x3a\x66\x6f\x63\x75\x73\x20\
+\x7b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x3a\x20\x31\
+\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\x34\x61\x36\x66\x61\x35\
+\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe5\xa4\x8d\xe9\x80\
+\x89\xe6\xa1\x86\xe6\xa0\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\
+\x43\x68\x65\x63\x6b\x42\x6f\x78\x20\x7b\x0d\x0a\x20\x20\x20\x20\
+\x73\x70\x61\x63\x69\x6e\x67\x3a\x20\x35\x70\x78\x3b\x0d\x0a\x7d\
+\x0d\x0a\x0d\x0a\x51\x43\x68\x65\x63\x6b\x42\x6f\x78\x3a\x3a\x69\
+\x6e\x64\x69\x63\x61\x74\x6f\x72\x20\x7b\x0d\x0a\x20\x20\x20\x20\
+\x77\x69\x64\x74\x68\x3a\x20\x31\x36\x70\x78\x3b\x0d\x0a\x20\x20\
+\x20\x20\x68\x65\x69\x67\x68\x74\x3a\x20\x31\x36\x70\x78\x3b\x0d\
+\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe5\x88\x86\xe7\xbb\x84\xe6\
+\xa1\x86\xe6\xa0\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\x47\x72\
+\x6f\x75\x70\x42\x6f\x78\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x6f\
+\x72\x64\x65\x72\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\
+\x23\x64\x31\x64\x35\x64\x62\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\
+\x72\x64\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x34\x70\x78\
+\x3b\x0d\x0a\x20\x20\x20\x20\x6d\x61\x72\x67\x69\x6e\x2d\x74\x6f\
+\x70\x3a\x20\x31\x30\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x70\x61\
+\x64\x64\x69\x6e\x67\x2d\x74\x6f\x70\x3a\x20\x32\x30\x70\x78\x3b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\
+\x47\x72\x6f\x75\x70\x42\x6f\x78\x3a\x3a\x74\x69\x74\x6c\x65\x20\
+\x7b\x0d\x0a\x20\x20\x20\x20\x73\x75\x62\x63\x6f\x6e\x74\x72\x6f\
+\x6c\x2d\x6f\x72\x69\x67\x69\x6e\x3a\x20\x6d\x61\x72\x67\x69\x6e\
+\x3b\x0d\x0a\x20\x20\x20\x20\x6c\x65\x66\x74\x3a\x20\x31\x30\x70\
+\x78\x3b\x0d\x0a\x20\x20\x20\x20\x70\x61\x64\x64\x69\x6e\x67\x3a\
+\x20\x30\x20\x33\x70\x78\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\
+\x20\xe6\xa0\x87\xe7\xad\xbe\xe9\xa1\xb5\xe6\xa0\xb7\xe5\xbc\x8f\
+\x20\x2a\x2f\x0d\x0a\x51\x54\x61\x62\x57\x69\x64\x67\x65\x74\x3a\
+\x3a\x70\x61\x6e\x65\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\
+\x64\x65\x72\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\
+\x64\x31\x64\x35\x64\x62\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\
+\x64\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x34\x70\x78\x3b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\
+\x54\x61\x62\x42\x61\x72\x3a\x3a\x74\x61\x62\x20\x7b\x0d\x0a\x20\
+\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x3a\x20\x23\
+\x65\x35\x65\x37\x65\x62\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\
+\x64\x65\x72\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\
+\x64\x31\x64\x35\x64\x62\x3b\x0d\x0a\x20\x20\x20\x20\x70\x61\x64\
+\x64\x69\x6e\x67\x3a\x20\x38\x70\x78\x20\x31\x36\x70\x78\x3b\x0d\
+\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x2d\x74\x6f\x70\x2d\
+\x6c\x65\x66\x74\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x34\x70\x78\
+\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x2d\x74\x6f\
+\x70\x2d\x72\x69\x67\x68\x74\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\
+\x34\x70\x78\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\x54\x61\x62\x42\
+\x61\x72\x3a\x3a\x74\x61\x62\x3a\x73\x65\x6c\x65\x63\x74\x65\x64\
+\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\
+\x6e\x64\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\x20\x20\x20\x20\
+\x62\x6f\x72\x64\x65\x72\x2d\x62\x6f\x74\x74\x6f\x6d\x2d\x63\x6f\
+\x6c\x6f\x72\x3a\x20\x77\x68\x69\x74\x65\x3b\x0d\x0a\x7d\x0d\x0a\
+\x0d\x0a\x2f\x2a\x20\xe8\xbf\x9b\xe5\xba\xa6\xe6\x9d\xa1\xe6\xa0\
+\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\x50\x72\x6f\x67\x72\x65\
+\x73\x73\x42\x61\x72\x20\x7b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\
+\x64\x65\x72\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\
+\x64\x31\x64\x35\x64\x62\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\
+\x64\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x34\x70\x78\x3b\
+\x0d\x0a\x20\x20\x20\x20\x74\x65\x78\x74\x2d\x61\x6c\x69\x67\x6e\
+\x3a\x20\x63\x65\x6e\x74\x65\x72\x3b\x0d\x0a\x20\x20\x20\x20\x62\
+\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x3a\x20\x77\x68\x69\x74\x65\
+\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x51\x50\x72\x6f\x67\x72\x65\x73\
+\x73\x42\x61\x72\x3a\x3a\x63\x68\x75\x6e\x6b\x20\x7b\x0d\x0a\x20\
+\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\x2d\x63\x6f\
+\x6c\x6f\x72\x3a\x20\x23\x34\x61\x36\x66\x61\x35\x3b\x0d\x0a\x20\
+\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x2d\x72\x61\x64\x69\x75\x73\
+\x3a\x20\x32\x70\x78\x3b\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\
+\xe7\x8a\xb6\xe6\x80\x81\xe6\xa0\x8f\xe6\xa0\xb7\xe5\xbc\x8f\x20\
+\x2a\x2f\x0d\x0a\x51\x53\x74\x61\x74\x75\x73\x42\x61\x72\x20\x7b\
+\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\x64\
+\x3a\x20\x23\x65\x35\x65\x37\x65\x62\x3b\x0d\x0a\x20\x20\x20\x20\
+\x62\x6f\x72\x64\x65\x72\x2d\x74\x6f\x70\x3a\x20\x31\x70\x78\x20\
+\x73\x6f\x6c\x69\x64\x20\x23\x64\x31\x64\x35\x64\x62\x3b\x0d\x0a\
+\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe5\x88\x97\xe8\xa1\xa8\xe6\xa0\
+\xb7\xe5\xbc\x8f\x20\x28\xe9\x85\x8d\xe7\xbd\xae\xe5\x8e\x86\xe5\
+\x8f\xb2\xe3\x80\x81\xe6\x9e\x84\xe5\xbb\xba\xe8\xae\xb0\xe5\xbd\
+\x95\xe3\x80\x81\xe6\x95\xb0\xe6\x8d\xae\xe6\x96\x87\xe4\xbb\xb6\
+\xe7\xad\x89\xe9\x83\xbd\xe6\x98\xaf\x20\x51\x4c\x69\x73\x74\x56\
+\x69\x65\x77\xef\xbc\x8c\x51\x4c\x69\x73\x74\x57\x69\x64\x67\x65\
+\x74\x20\xe6\x98\xaf\xe5\x85\xb6\xe5\xad\x90\xe7\xb1\xbb\x29\x20\
+\x2a\x2f\x0d\x0a\x51\x4c\x69\x73\x74\x56\x69\x65\x77\x20\x7b\x0d\
+\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x3a\x20\x31\x70\x78\
+\x20\x73\x6f\x6c\x69\x64\x20\x23\x64\x31\x64\x35\x64\x62\x3b\x0d\
+\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\x65\x72\x2d\x72\x61\x64\x69\
+\x75\x73\x3a\x20\x34\x70\x78\x3b\x0d\x0a\x20\x20\x20\x20\x62\x61\
+\x63\x6b\x67\x72\x6f\x75\x6e\x64\x3a\x20\x77\x68\x69\x74\x65\x3b\
+\x0d\x0a\x7d\x0d\x0a\x0d\x0a\x2f\x2a\x20\xe6\x8e\xa7\xe5\x88\xb6\
+\xe5\x8f\xb0\xe6\xa0\xb7\xe5\xbc\x8f\x20\x2a\x2f\x0d\x0a\x51\x54\
+\x65\x78\x74\x45\x64\x69\x74\x2c\x20\x51\x50\x6c\x61\x69\x6e\x54\
+\x65\x78\x74\x45\x64\x69\x74\x20\x7b\x0d\x0a\x20\x20\x20\x20\x66\
+\x6f\x6e\x74\x2d\x66\x61\x6d\x69\x6c\x79\x3a\x20\x27\x43\x6f\x6e\
+\x73\x6f\x6c\x61\x73\x27\x2c\x20\x27\x43\x6f\x75\x72\x69\x65\x72\
+\x20\x4e\x65\x77\x27\x2c\x20\x6d\x6f\x6e\x6f\x73\x70\x61\x63\x65\
+\x3b\x0d\x0a\x20\x20\x20\x20\x62\x61\x63\x6b\x67\x72\x6f\x75\x6e\
+\x64\x2d\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x31\x65\x31\x65\x31\x65\
+\x3b\x0d\x0a\x20\x20\x20\x20\x63\x6f\x6c\x6f\x72\x3a\x20\x23\x64\
+\x34\x64\x34\x64\x34\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\
+\x65\x72\x3a\x20\x31\x70\x78\x20\x73\x6f\x6c\x69\x64\x20\x23\x64\
+\x31\x64\x35\x64\x62\x3b\x0d\x0a\x20\x20\x20\x20\x62\x6f\x72\x64\
+\x65\x72\x2d\x72\x61\x64\x69\x75\x73\x3a\x20\x34\x70\x78\x3b\x0d\
+\x0a\x7d\
+\x00\x00\x00\x6e\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x32\x34\x20\x32\x34\x22\x20\x66\x69\x6c\x6c\x3d\
+\x22\x23\x30\x30\x30\x30\x30\x30\x22\x3e\x0a\x20\x20\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x38\x20\x35\x76\x31\x34\x6c\x31\x31\
+\x2d\x37\x7a\x22\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\
+\x00\x00\x01\xfb\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x36\x34\x20\x36\x34\x22\x3e\x0a\x20\x20\x3c\x72\
+\x65\x63\x74\x20\x77\x69\x64\x74\x68\x3d\x22\x36\x34\x22\x20\x68\
+\x65\x69\x67\x68\x74\x3d\x22\x36\x34\x22\x20\x72\x78\x3d\x22\x31\
+\x32\x22\x20\x66\x69\x6c\x6c\x3d\x22\x23\x33\x37\x37\x36\x61\x62\
+\x22\x2f\x3e\x0a\x20\x20\x3c\x70\x61\x74\x68\x20\x64\x3d\x22\x4d\
+\x33\x32\x20\x31\x32\x4c\x31\x36\x20\x33\x32\x6c\x31\x36\x20\x32\
+\x30\x20\x31\x36\x2d\x32\x30\x7a\x22\x20\x66\x69\x6c\x6c\x3d\x22\
+\x23\x66\x66\x64\x34\x33\x62\x22\x2f\x3e\x0a\x20\x20\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x33\x32\x20\x31\x32\x76\x34\x30\x6c\
+\x31\x36\x2d\x32\x30\x7a\x22\x20\x66\x69\x6c\x6c\x3d\x22\x23\x66\
+\x66\x64\x34\x33\x62\x22\x20\x6f\x70\x61\x63\x69\x74\x79\x3d\x22\
+\x30\x2e\x35\x22\x2f\x3e\x0a\x20\x20\x3c\x70\x61\x74\x68\x20\x64\
+\x3d\x22\x4d\x32\x34\x20\x33\x32\x61\x38\x20\x38\x20\x30\x20\x31\
+\x20\x30\x20\x31\x36\x20\x30\x20\x38\x20\x38\x20\x30\x20\x30\x20\
+\x30\x2d\x31\x36\x20\x30\x7a\x22\x20\x66\x69\x6c\x6c\x3d\x22\x23\
+\x33\x37\x37\x36\x61\x62\x22\x2f\x3e\x0a\x20\x20\x3c\x70\x61\x74\
+\x68\x20\x64\x3d\x22\x4d\x31\x32\x20\x33\x32\x6c\x38\x20\x38\x20\
+\x38\x2d\x38\x2d\x38\x2d\x38\x7a\x22\x20\x66\x69\x6c\x6c\x3d\x22\
+\x23\x66\x66\x64\x34\x33\x62\x22\x2f\x3e\x0a\x20\x20\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x33\x36\x20\x33\x32\x6c\x38\x20\x38\
+\x20\x38\x2d\x38\x2d\x38\x2d\x38\x7a\x22\x20\x66\x69\x6c\x6c\x3d\
+\x22\x23\x66\x66\x64\x34\x33\x62\x22\x2f\x3e\x0a\x20\x20\x3c\x74\
+\x65\x78\x74\x20\x78\x3d\x22\x33\x32\x22\x20\x79\x3d\x22\x35\x36\
+\x22\x20\x66\x6f\x6e\x74\x2d\x66\x61\x6d\x69\x6c\x79\x3d\x22\x41\
+\x72\x69\x61\x6c\x22\x20\x66\x6f\x6e\x74\x2d\x73\x69\x7a\x65\x3d\
+\x22\x38\x22\x20\x74\x65\x78\x74\x2d\x61\x6e\x63\x68\x6f\x72\x3d\
+\x22\x6d\x69\x64\x64\x6c\x65\x22\x20\x66\x69\x6c\x6c\x3d\x22\x77\
+\x68\x69\x74\x65\x22\x3e\x4e\x55\x49\x54\x4b\x41\x3c\x2f\x74\x65\
+\x78\x74\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\
+\x00\x00\x00\x7f\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x32\x34\x20\x32\x34\x22\x20\x66\x69\x6c\x6c\x3d\
+\x22\x23\x30\x30\x30\x30\x30\x30\x22\x3e\x0a\x20\x20\x3c\x72\x65\
+\x63\x74\x20\x78\x3d\x22\x36\x22\x20\x79\x3d\x22\x36\x22\x20\x77\
+\x69\x64\x74\x68\x3d\x22\x31\x32\x22\x20\x68\x65\x69\x67\x68\x74\
+\x3d\x22\x31\x32\x22\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\x3e\
+\x00\x00\x00\xc6\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x32\x34\x20\x32\x34\x22\x20\x66\x69\x6c\x6c\x3d\
+\x22\x23\x30\x30\x30\x30\x30\x30\x22\x3e\x0a\x20\x20\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x31\x39\x20\x36\x2e\x34\x31\x4c\x31\
+\x37\x2e\x35\x39\x20\x35\x20\x31\x32\x20\x31\x30\x2e\x35\x39\x20\
+\x36\x2e\x34\x31\x20\x35\x20\x35\x20\x36\x2e\x34\x31\x20\x31\x30\
+\x2e\x35\x39\x20\x31\x32\x20\x35\x20\x31\x37\x2e\x35\x39\x20\x36\
+\x2e\x34\x31\x20\x31\x39\x20\x31\x32\x20\x31\x33\x2e\x34\x31\x20\
+\x31\x37\x2e\x35\x39\x20\x31\x39\x20\x31\x39\x20\x31\x37\x2e\x35\
+\x39\x20\x31\x33\x2e\x34\x31\x20\x31\x32\x7a\x22\x2f\x3e\x0a\x3c\
+\x2f\x73\x76\x67\x3e\
+\x00\x00\x01\x32\
+\x3c\
+\x73\x76\x67\x20\x78\x6d\x6c\x6e\x73\x3d\x22\x68\x74\x74\x70\x3a\
+\x2f\x2f\x77\x77\x77\x2e\x77\x33\x2e\x6f\x72\x67\x2f\x32\x30\x30\
+\x30\x2f\x73\x76\x67\x22\x20\x76\x69\x65\x77\x42\x6f\x78\x3d\x22\
+\x30\x20\x30\x20\x32\x34\x20\x32\x34\x22\x20\x66\x69\x6c\x6c\x3d\
+\x22\x23\x30\x30\x30\x30\x30\x30\x22\x3e\x0a\x20\x20\x3c\x70\x61\
+\x74\x68\x20\x64\x3d\x22\x4d\x31\x32\x20\x34\x2e\x35\x43\x37\x20\
+\x34\x2e\x35\x20\x32\x2e\x37\x33\x20\x37\x2e\x36\x31\x20\x31\x20\
+\x31\x32\x63\x31\x2e\x37\x33\x20\x34\x2e\x33\x39\x20\x36\x20\x37\
+\x2e\x35\x20\x31\x31\x20\x37\x2e\x35\x73\x39\x2e\x32\x37\x2d\x33\
+\x2e\x31\x31\x20\x31\x31\x2d\x37\x2e\x35\x63\x2d\x31\x2e\x37\x33\
+\x2d\x34\x2e\x33\x39\x2d\x36\x2d\x37\x2e\x35\x2d\x31\x31\x2d\x37\
+\x2e\x35\x7a\x4d\x31\x32\x20\x31\x37\x63\x2d\x32\x2e\x37\x36\x20\
+\x30\x2d\x35\x2d\x32\x2e\x32\x34\x2d\x35\x2d\x35\x73\x32\x2e\x32\
+\x34\x2d\x35\x20\x35\x2d\x35\x20\x35\x20\x32\x2e\x32\x34\x20\x35\
+\x20\x35\x2d\x32\x2e\x32\x34\x20\x35\x2d\x35\x20\x35\x7a\x6d\x30\
+\x2d\x38\x63\x2d\x31\x2e\x36\x36\x20\x30\x2d\x33\x20\x31\x2e\x33\
+\x34\x2d\x33\x20\x33\x73\x31\x2e\x33\x34\x20\x33\x20\x33\x20\x33\
+\x20\x33\x2d\x31\x2e\x33\x34\x20\x33\x2d\x33\x2d\x31\x2e\x33\x34\
+\x2d\x33\x2d\x33\x2d\x33\x7a\x22\x2f\x3e\x0a\x3c\x2f\x73\x76\x67\
+\x3e\
+"
+
+qt_resource_name = b"\
+\x00\x05\
+\x00\x6f\xa6\x53\
+\x00\x69\
+\x00\x63\x00\x6f\x00\x6e\x00\x73\
+\x00\x0a\
+\x02\xcd\x00\xa3\
+\x00\x73\
+\x00\x74\x00\x79\x00\x6c\x00\x65\x00\x73\x00\x2e\x00\x71\x00\x73\x00\x73\
+\x00\x07\
+\x09\xc1\x5a\x27\
+\x00\x72\
+\x00\x75\x00\x6e\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0f\
+\x0b\x42\x66\x27\
+\x00\x6e\
+\x00\x75\x00\x69\x00\x74\x00\x6b\x00\x61\x00\x5f\x00\x69\x00\x63\x00\x6f\x00\x6e\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x08\
+\x0b\x63\x55\x87\
+\x00\x73\
+\x00\x74\x00\x6f\x00\x70\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x09\
+\x0b\x85\x8e\x87\
+\x00\x63\
+\x00\x6c\x00\x65\x00\x61\x00\x72\x00\x2e\x00\x73\x00\x76\x00\x67\
+\x00\x0b\
+\x0f\x29\x43\x47\
+\x00\x70\
+\x00\x72\x00\x65\x00\x76\x00\x69\x00\x65\x00\x77\x00\x2e\x00\x73\x00\x76\x00\x67\
+"
+
+qt_resource_struct_v1 = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x02\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x05\x00\x00\x00\x03\
+\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x00\x2a\x00\x00\x00\x00\x00\x01\x00\x00\x0a\x27\
+\x00\x00\x00\x3e\x00\x00\x00\x00\x00\x01\x00\x00\x0a\x99\
+\x00\x00\x00\x62\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x98\
+\x00\x00\x00\x78\x00\x00\x00\x00\x00\x01\x00\x00\x0d\x1b\
+\x00\x00\x00\x90\x00\x00\x00\x00\x00\x01\x00\x00\x0d\xe5\
+"
+
+qt_resource_struct_v2 = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x02\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x05\x00\x00\x00\x03\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x10\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x01\xa1\x50\xde\x36\xc3\
+\x00\x00\x00\x2a\x00\x00\x00\x00\x00\x01\x00\x00\x0a\x27\
+\x00\x00\x01\x96\xde\x04\x78\x08\
+\x00\x00\x00\x3e\x00\x00\x00\x00\x00\x01\x00\x00\x0a\x99\
+\x00\x00\x01\x96\xde\x04\x78\x08\
+\x00\x00\x00\x62\x00\x00\x00\x00\x00\x01\x00\x00\x0c\x98\
+\x00\x00\x01\x96\xde\x04\x78\x08\
+\x00\x00\x00\x78\x00\x00\x00\x00\x00\x01\x00\x00\x0d\x1b\
+\x00\x00\x01\x96\xde\x04\x78\x08\
+\x00\x00\x00\x90\x00\x00\x00\x00\x00\x01\x00\x00\x0d\xe5\
+\x00\x00\x01\x96\xde\x04\x78\x08\
+"
+
+qt_version = [int(v) for v in QtCore.qVersion().split('.')]
+if qt_version < [5, 8, 0]:
+    rcc_version = 1
+    qt_resource_struct = qt_resource_struct_v1
+else:
+    rcc_version = 2
+    qt_resource_struct = qt_resource_struct_v2
+
+def qInitResources():
+    QtCore.qRegisterResourceData(rcc_version, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+def qCleanupResources():
+    QtCore.qUnregisterResourceData(rcc_version, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+qInitResources()
@@ -0,0 +1,60 @@
+import json
+import os
+import sys
+
+# 工具级设置，对所有配置和所有打包任务生效
+DEFAULT_SETTINGS = {
+    "build_cache_enabled": True,
+    "build_cache_quota_mb": 4096,
+    "ccache_enabled": True,
+    "ccache_dir": "",
+    "ccache_max_size_gb": 10,
+    "console_max_lines": 5000,
+    # 数据文件按内容暂存后 reflink 或复制到产物中，暂存目录为空时使用数据目录下的 staging
+    "staging_enabled": True,
+    "staging_dir": "",
+    # 改用硬链接放置数据文件: 最快，但程序修改产物中的数据文件会改动暂存库中共享的内容
+    "staging_hardlinks": False,
+    # 有运行中的构建服务 (daemon 子命令) 时GUI把打包任务提交给服务
+    "use_build_daemon": False,
+    # 每次打包的完整输出压缩保存在数据目录的 logs 中，超过保留天数或总大小上限时删除最旧的
+    "build_logs_enabled": True,
+    "log_retention_days": 180,
+    "log_max_total_mb": 2048,
+    # 构建日志同时写入全文索引，可以在"历史记录"中查找出现过的错误
+    "log_index_enabled": True,
+    # 输出中出现特征库 (resources/failure_signatures.json) 中的致命错误时提前终止打包
+    "abort_on_fatal_failure": True
+}
+
+
+def get_data_dir():
+    """获取工具的本地数据目录 (缓存、历史等)"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        data_dir = os.path.join(base, "nuitka_packager")
+    else:
+        data_dir = os.path.join(os.path.expanduser("~"), ".nuitka_packager")
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+def get_settings_path():
+    return os.path.join(get_data_dir(), "settings.json")
+
+
+def load_settings():
+    """读取工具设置，缺失的项使用默认值"""
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(get_settings_path(), 'r', encoding='utf-8') as f:
+            settings.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return settings
+
+
+def save_settings(settings):
+    """保存工具设置"""
+    with open(get_settings_path(), 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=4)
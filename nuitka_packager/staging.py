@@ -0,0 +1,206 @@
+import os
+import shutil
+import stat
+import sys
+import threading
+
+from settings import get_data_dir
+from build_cache import FileHasher
+from data_files import iter_data_files
+
+# Linux 上请求写时复制克隆 (reflink) 的 ioctl，btrfs、XFS 等文件系统支持
+FICLONE = 0x40049409
+
+
+def get_staging_dir(settings):
+    return settings.get("staging_dir") or os.path.join(get_data_dir(), "staging")
+
+
+def supports_staging(config):
+    """只有 standalone 且非单文件模式的产物是普通目录，可以在打包后再放入数据文件"""
+    return config.get("standalone", True) and not config.get("onefile", False)
+
+
+def clone_file(source, target):
+    """尝试以 reflink 方式复制文件，文件系统不支持时返回 False"""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        return False
+
+
+def place_file(source, target, hardlink=False):
+    """把暂存的文件放到目标位置，返回使用的方式
+
+    默认优先 reflink，不支持时复制，产物中的文件与暂存库互不影响，程序可以修改自己的数据文件。
+    hardlink 为真时优先硬链接 (最快，但修改产物中的文件会改动暂存库中共享的内容)。
+    """
+    if hardlink:
+        try:
+            os.link(source, target)
+            return "linked"
+        except OSError:
+            pass
+    if clone_file(source, target):
+        return "cloned"
+    # 暂存库中的文件是只读的，不复制权限位
+    shutil.copyfile(source, target)
+    return "copied"
+
+
+class StagingStore:
+    """按内容哈希保存数据文件的暂存库
+
+    每个数据文件只在内容变化时复制进暂存库一次 (哈希按修改时间和大小缓存)，
+    之后每次打包都把库中的文件 reflink 或复制到产物目录，内容未变的文件不再重写。
+    hardlinks 为真时改为硬链接，多个产品共用同一份数据时几乎没有额外的读写；
+    库中的文件设为只读 (Windows 除外)，每次链接前按哈希核对，被改动的文件会重新暂存。
+    """
+
+    def __init__(self, root, hardlinks=False):
+        self.root = root
+        self.hardlinks = hardlinks
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.hasher = FileHasher(os.path.join(root, "file_hashes.json"))
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def verify_object(self, path):
+        """库中的文件名就是内容哈希；通过硬链接被改写过的文件与文件名不符"""
+        try:
+            return self.hasher.hash_file(path) == os.path.basename(path)
+        except OSError:
+            return False
+
+    def ingest(self, path):
+        """把文件放入暂存库，返回 (库中的路径, 新写入的字节数)"""
+        target = self.object_path(self.hasher.hash_file(path))
+        if os.path.exists(target):
+            if self.verify_object(target):
+                return target, 0
+            os.remove(target)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if not clone_file(path, tmp_path):
+            shutil.copyfile(path, tmp_path)
+        if os.name != "nt":
+            # Windows 上只读文件无法删除，会妨碍之后清理产物目录
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, target)
+        return target, os.path.getsize(target)
+
+    def is_placed(self, target, object_path):
+        """产物中的文件已经是库中文件的链接或内容相同的副本"""
+        if os.path.samefile(target, object_path):
+            # 不使用硬链接时，以前留下的硬链接 (只读、与库共享) 换成独立的副本
+            return self.hardlinks
+        if self.hardlinks:
+            return False
+        try:
+            return (bool(os.stat(target).st_mode & stat.S_IWUSR)
+                    and os.path.getsize(target) == os.path.getsize(object_path)
+                    and self.hasher.hash_file(target) == os.path.basename(object_path))
+        except OSError:
+            return False
+
+    def stage(self, config, dist_dir):
+        """把配置中包含的数据文件放入产物目录，返回各种放置方式的文件数和新写入暂存库的字节数"""
+        stats = {"files": 0, "unchanged": 0, "linked": 0, "cloned": 0, "copied": 0, "ingested_bytes": 0}
+        try:
+            for source, relative_path in iter_data_files(config.get("included_files", []),
+                                                         config.get("included_dirs", [])):
+                object_path, ingested = self.ingest(source)
+                stats["files"] += 1
+                stats["ingested_bytes"] += ingested
+                target = os.path.join(dist_dir, relative_path)
+                if os.path.lexists(target):
+                    if self.is_placed(target, object_path):
+                        stats["unchanged"] += 1
+                        continue
+                    os.remove(target)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                stats[place_file(object_path, target, self.hardlinks)] += 1
+        finally:
+            self.hasher.save()
+        return stats
+
+    def get_object_inodes(self):
+        """库中文件的 {(设备, inode): 路径}"""
+        inodes = {}
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                inodes[(info.st_dev, info.st_ino)] = path
+        return inodes
+
+    def make_copy_function(self):
+        """返回用于 shutil.copytree 的复制函数
+
+        使用硬链接时，暂存库中的文件 (硬链接) 核对哈希后直接再次链接，其余正常复制；
+        不使用硬链接时产物中没有库中的文件，直接返回 shutil.copy2。
+        """
+        if not self.hardlinks:
+            return shutil.copy2
+        inodes = self.get_object_inodes()
+
+        def copy_function(source, target):
+            info = os.stat(source)
+            object_path = inodes.get((info.st_dev, info.st_ino))
+            if object_path and self.verify_object(object_path):
+                try:
+                    os.link(source, target)
+                    return target
+                except OSError:
+                    pass
+            return shutil.copy2(source, target)
+
+        return copy_function
+
+    def prune(self):
+        """删除不再被任何产物目录或构建缓存引用 (没有其他硬链接) 的文件，返回释放的字节数
+
+        不使用硬链接时库中的文件都没有其他引用，会全部删除，之后的打包重新暂存。
+        """
+        freed = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    info = os.stat(path)
+                    if info.st_nlink == 1:
+                        os.remove(path)
+                        freed += info.st_size
+                except OSError:
+                    continue
+        return freed
+
+    def total_size(self):
+        total = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+        return total
+
+
+def format_stage_stats(stats):
+    return (f"数据文件 {stats['files']} 个: 硬链接 {stats['linked']}，reflink {stats['cloned']}，"
+            f"复制 {stats['copied']}，未变化 {stats['unchanged']}；"
+            f"新暂存 {stats['ingested_bytes'] / (1024 * 1024):.1f} MB")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 打包工具的模块以同级导入的方式互相引用 (与 main.py 运行时一致)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
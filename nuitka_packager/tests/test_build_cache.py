@@ -0,0 +1,97 @@
+import os
+import threading
+
+from build_cache import BuildCache, get_installed_distributions
+
+
+def make_project(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "main.py").write_text("import helper\n")
+    (source / "helper.py").write_text("VALUE = 1\n")
+    site_packages = tmp_path / "site-packages"
+    (site_packages / "requests-2.31.0.dist-info").mkdir(parents=True)
+    (site_packages / "requests").mkdir()
+    return {"script_path": str(source / "main.py"), "output_dir": str(tmp_path / "out")}, site_packages
+
+
+def test_installed_distributions(tmp_path):
+    _, site_packages = make_project(tmp_path)
+    (site_packages / "legacy-1.0-py3.11.egg-info").mkdir()
+    names = [name for name, _ in get_installed_distributions([str(site_packages), str(tmp_path / "missing")])]
+    assert names == ["legacy-1.0-py3.11.egg-info", "requests-2.31.0.dist-info"]
+
+
+def test_key_changes_with_installed_packages(tmp_path):
+    config, site_packages = make_project(tmp_path)
+    cache = BuildCache(str(tmp_path / "cache"))
+    search_paths = [str(site_packages)]
+    key = cache.compute_key(config, "2.4.8", search_paths=search_paths)
+    assert cache.compute_key(config, "2.4.8", search_paths=search_paths) == key
+
+    # 升级依赖
+    (site_packages / "requests-2.31.0.dist-info").rename(site_packages / "requests-2.32.0.dist-info")
+    upgraded = cache.compute_key(config, "2.4.8", search_paths=search_paths)
+    assert upgraded != key
+
+    # 只改变不影响产物的配置项时缓存键不变
+    assert cache.compute_key(dict(config, parallel_count=8), "2.4.8", search_paths=search_paths) == upgraded
+
+
+def test_key_changes_with_sources(tmp_path):
+    config, site_packages = make_project(tmp_path)
+    cache = BuildCache(str(tmp_path / "cache"))
+    key = cache.compute_key(config, "2.4.8", search_paths=[str(site_packages)])
+    (tmp_path / "src" / "helper.py").write_text("VALUE = 2\n")
+    assert cache.compute_key(config, "2.4.8", search_paths=[str(site_packages)]) != key
+
+
+def make_artifact(tmp_path, name, size=100):
+    dist = tmp_path / "out" / name
+    dist.mkdir(parents=True)
+    (dist / "app.bin").write_bytes(b"\0" * size)
+    return str(dist)
+
+
+def test_instances_do_not_drop_each_others_entries(tmp_path):
+    root = str(tmp_path / "cache")
+    first = BuildCache(root)
+    second = BuildCache(root)
+    assert first.store("a" * 64, [make_artifact(tmp_path, "a.dist")], 10 ** 6)
+    # second 在 first 存入之前读取了索引，保存时不能覆盖 first 的缓存项
+    assert second.store("b" * 64, [make_artifact(tmp_path, "b.dist")], 10 ** 6)
+    assert set(BuildCache(root).index) == {"a" * 64, "b" * 64}
+    assert first.total_size() == 200
+
+
+def test_eviction_removes_orphaned_entry_directories(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache"))
+    orphan = tmp_path / "cache" / ("c" * 64)
+    orphan.mkdir()
+    (orphan / "app.dist").mkdir()
+    cache.store("a" * 64, [make_artifact(tmp_path, "a.dist")], 10 ** 6)
+    assert not orphan.exists()
+    assert os.path.isdir(tmp_path / "cache" / ("a" * 64))
+
+
+def test_concurrent_stores_with_the_same_key(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache"))
+    artifact = make_artifact(tmp_path, "app.dist", 1024 * 1024)
+    errors = []
+
+    def store():
+        try:
+            cache.store("a" * 64, [artifact], 10 ** 9)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    restored = str(tmp_path / "restored" / "app.dist")
+    assert cache.restore("a" * 64, [restored])
+    assert os.path.getsize(os.path.join(restored, "app.bin")) == 1024 * 1024
+    assert [name for name in os.listdir(tmp_path / "cache") if name.endswith(".tmp")] == []
@@ -0,0 +1,74 @@
+from build_compare import ROOT_GROUP, diff_manifests, load_manifest, save_manifest
+
+
+BEFORE = {
+    "app.bin": 1000,
+    "numpy/core.so": 5000,
+    "numpy/linalg.so": 2000,
+    "PIL/image.so": 3000,
+    "old/module.so": 400,
+}
+AFTER = {
+    "app.bin": 1200,
+    "numpy/core.so": 9000,
+    "numpy/linalg.so": 2000,
+    "numpy/fft.so": 700,
+    "PIL/image.so": 2500,
+}
+
+
+def test_diff_counts_added_removed_and_changed_files():
+    report = diff_manifests(BEFORE, AFTER)
+    assert report["before_size"] == 11400
+    assert report["after_size"] == 15400
+    assert report["before_count"] == 5
+    assert report["after_count"] == 5
+    assert report["added"] == {"count": 1, "size": 700, "files": [["numpy/fft.so", 700]]}
+    assert report["removed"] == {"count": 1, "size": 400, "files": [["old/module.so", 400]]}
+    assert report["changed"]["count"] == 3
+    assert report["changed"]["size"] == 200 + 4000 - 500
+    # 按变化量的绝对值排序
+    assert report["changed"]["files"] == [["numpy/core.so", 5000, 9000], ["PIL/image.so", 3000, 2500],
+                                          ["app.bin", 1000, 1200]]
+
+
+def test_diff_groups_packages_by_delta():
+    packages = diff_manifests(BEFORE, AFTER)["packages"]
+    assert [package["name"] for package in packages] == ["numpy", ROOT_GROUP, "old", "PIL"]
+    numpy = packages[0]
+    assert (numpy["before"], numpy["after"], numpy["delta"]) == (7000, 11700, 4700)
+    assert (numpy["added"], numpy["removed"]) == (1, 0)
+    assert packages[2]["after"] == 0
+    assert packages[2]["removed"] == 1
+
+
+def test_diff_skips_unchanged_packages_and_limits_files():
+    before = {f"pkg/mod{i}.so": 10 for i in range(10)}
+    after = dict(before, **{f"new/mod{i}.so": i + 1 for i in range(10)})
+    report = diff_manifests(before, after, limit=3)
+    assert [package["name"] for package in report["packages"]] == ["new"]
+    assert report["added"]["count"] == 10
+    assert report["added"]["files"] == [["new/mod9.so", 10], ["new/mod8.so", 9], ["new/mod7.so", 8]]
+
+
+def test_save_and_load_manifest(tmp_path):
+    dist = tmp_path / "app.dist"
+    (dist / "pkg").mkdir(parents=True)
+    (dist / "app.bin").write_bytes(b"\0" * 10)
+    (dist / "pkg" / "mod.so").write_bytes(b"\0" * 20)
+    single = tmp_path / "tool.exe"
+    single.write_bytes(b"\0" * 5)
+    manifest_dir = tmp_path / "manifests"
+    manifest_dir.mkdir()
+
+    name, size = save_manifest([str(dist), str(single)], str(manifest_dir))
+    assert size == 35
+    assert load_manifest(name, str(manifest_dir)) == {"app.bin": 10, "pkg/mod.so": 20, "tool.exe": 5}
+
+
+def test_missing_or_broken_manifest(tmp_path):
+    assert save_manifest([str(tmp_path / "missing.dist")], str(tmp_path)) == (None, None)
+    assert load_manifest(None, str(tmp_path)) is None
+    assert load_manifest("missing.json.gz", str(tmp_path)) is None
+    (tmp_path / "broken.json.gz").write_bytes(b"not gzip")
+    assert load_manifest("broken.json.gz", str(tmp_path)) is None
@@ -0,0 +1,92 @@
+import gzip
+import json
+
+from build_logs import INDEX_SUFFIX, BuildLogReader, BuildLogWriter, load_index, rebuild_index
+
+
+def write_members(path, chunks):
+    """按写入器的格式生成日志: 每块一个独立的 gzip 成员"""
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            f.write(gzip.compress(chunk.encode("utf-8"), mtime=0))
+
+
+def make_lines(first, count):
+    return "".join(f"line {i}\n" for i in range(first, first + count))
+
+
+def test_rebuild_index_records_each_member(tmp_path):
+    path = str(tmp_path / "build.log.gz")
+    write_members(path, [make_lines(0, 3), make_lines(3, 5), "tail"])
+    index = rebuild_index(path)
+    assert index["lines"] == 8
+    assert index["partial"]
+    assert [block[2:] for block in index["blocks"]] == [[0, 3], [3, 5], [8, 0]]
+    assert index["size"] == len(make_lines(0, 8)) + 4
+    # 块的偏移和长度首尾相接，覆盖整个文件
+    assert index["blocks"][0][0] == 0
+    for block, following in zip(index["blocks"], index["blocks"][1:]):
+        assert block[0] + block[1] == following[0]
+
+
+def test_rebuild_index_ignores_truncated_member(tmp_path):
+    path = str(tmp_path / "build.log.gz")
+    write_members(path, [make_lines(0, 4), make_lines(4, 4)])
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-10])
+    index = rebuild_index(path)
+    assert index["lines"] == 4
+    assert len(index["blocks"]) == 1
+    assert not index["partial"]
+
+
+def test_load_index_rebuilds_and_saves_missing_index(tmp_path):
+    path = str(tmp_path / "build.log.gz")
+    write_members(path, [make_lines(0, 2)])
+    assert load_index(path)["lines"] == 2
+    with open(path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+        assert json.load(f)["lines"] == 2
+
+
+def test_reader_reads_lines_across_blocks(tmp_path):
+    path = str(tmp_path / "build.log.gz")
+    write_members(path, [make_lines(0, 10), make_lines(10, 10), make_lines(20, 5) + "partial"])
+    reader = BuildLogReader(path)
+    assert reader.total_lines() == 26
+    assert reader.read_lines(8, 4) == ["line 8", "line 9", "line 10", "line 11"]
+    assert reader.read_lines(23, 10) == ["line 23", "line 24", "partial"]
+    assert reader.read_lines(-5, 1) == ["line 0"]
+    assert reader.read_lines(26, 5) == []
+
+
+def test_reader_searches_backward(tmp_path):
+    path = str(tmp_path / "build.log.gz")
+    write_members(path, [make_lines(0, 10), "Nuitka-Warning: x\n" + make_lines(11, 9)])
+    reader = BuildLogReader(path)
+    assert reader.search_backward("nuitka-warning", reader.total_lines()) == 10
+    assert reader.search_backward("LINE 3", 10) == 3
+    # 只在 before_line 之前查找
+    assert reader.search_backward("line 15", 15) == -1
+    assert reader.search_backward("missing", reader.total_lines()) == -1
+
+
+def test_writer_output_matches_rebuilt_index(tmp_path):
+    path = str(tmp_path / "build.log.gz")
+    writer = BuildLogWriter(path, {"name": "build"})
+    writer.write(make_lines(0, 100))
+    writer.write("last line without newline")
+    writer.close(0, wait=True)
+
+    # 文件本身是普通的 gzip 文件
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert f.read() == make_lines(0, 100) + "last line without newline"
+    index = load_index(path)
+    assert index["exit_code"] == 0
+    rebuilt = rebuild_index(path)
+    for key in ("lines", "size", "blocks", "partial"):
+        assert index[key] == rebuilt[key]
+    reader = BuildLogReader(path)
+    assert reader.total_lines() == 101
+    assert reader.read_lines(99, 5) == ["line 99", "last line without newline"]
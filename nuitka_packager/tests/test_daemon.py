@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+import daemon
+from settings import DEFAULT_SETTINGS
+
+
+def make_daemon(tmp_path, monkeypatch, **settings):
+    # 构建记录、任务名额等都写入临时的数据目录
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    settings = dict(DEFAULT_SETTINGS, build_logs_enabled=False, build_cache_enabled=False, **settings)
+    return daemon.BuildDaemon(1, nuitka_path="nuitka", settings=settings)
+
+
+def test_job_finishes_when_setup_fails(tmp_path, monkeypatch):
+    def broken_store(*args):
+        raise OSError("暂存库不可用")
+
+    monkeypatch.setattr(daemon, "StagingStore", broken_store)
+    build_daemon = make_daemon(tmp_path, monkeypatch, staging_enabled=True)
+    job = build_daemon.submit({"script_path": str(tmp_path / "main.py")})
+    build_daemon.executor.shutdown(wait=True)
+
+    assert job.state == "failed"
+    assert job.exit_code == 1
+    assert job.events[-1]["type"] == "finished"
+    assert any("暂存库不可用" in event.get("text", "") for event in job.events)
+
+
+def test_event_stream_close_interrupts_read(tmp_path, monkeypatch):
+    build_daemon = make_daemon(tmp_path, monkeypatch)
+    server = daemon.DaemonServer(build_daemon, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        # 不提交给线程池，任务一直排队，事件流只会等待
+        job = daemon.BuildJob("main", {"script_path": "main.py"})
+        build_daemon.jobs[job.id] = job
+        client = daemon.DaemonClient(server.server_address[1], build_daemon.token)
+        stream = client.iter_events(job.id)
+        events = []
+        reader = threading.Thread(target=lambda: events.extend(stream))
+        reader.start()
+        time.sleep(0.2)
+        stream.close()
+        reader.join(5)
+        assert not reader.is_alive()
+        assert events == []
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("since", ["abc", "-1"])
+def test_events_reject_invalid_since(tmp_path, monkeypatch, since):
+    build_daemon = make_daemon(tmp_path, monkeypatch)
+    server = daemon.DaemonServer(build_daemon, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        job = daemon.BuildJob("main", {"script_path": "main.py"})
+        build_daemon.jobs[job.id] = job
+        client = daemon.DaemonClient(server.server_address[1], build_daemon.token)
+        with pytest.raises(HTTPError) as error:
+            client.request("GET", f"/jobs/{job.id}/events?since={since}")
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="用 /bin/sh 模拟Nuitka")
+def test_cancel_stops_child_processes(tmp_path, monkeypatch):
+    # 模拟Nuitka启动的 scons/编译器: 子进程继承输出管道，只终止Nuitka本身时读取会一直等待
+    nuitka = tmp_path / "nuitka"
+    nuitka.write_text("#!/bin/sh\necho started\nsleep 60 &\nsleep 60\n")
+    nuitka.chmod(0o755)
+    build_daemon = make_daemon(tmp_path, monkeypatch, staging_enabled=False)
+    build_daemon.nuitka_path = str(nuitka)
+    job = build_daemon.submit({"script_path": str(tmp_path / "main.py"), "output_dir": str(tmp_path / "out")})
+    with job.condition:
+        assert job.condition.wait_for(lambda: any(event.get("text") == "started\n" for event in job.events), 10)
+
+    started = time.monotonic()
+    build_daemon.cancel(job.id)
+    with job.condition:
+        assert job.condition.wait_for(lambda: job.done, 10)
+    assert time.monotonic() - started < 5
+    assert job.state == "cancelled"
+    build_daemon.executor.shutdown(wait=True)
@@ -0,0 +1,102 @@
+import fnmatch
+import glob
+import os
+
+from data_files import build_data_options, iter_data_files, make_dir_entry, walk_dir_entry
+
+
+def make_tree(root, paths):
+    for path in paths:
+        full_path = os.path.join(root, *path.split("/"))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as f:
+            f.write(b"x" * 10)
+
+
+def resolve_options(options):
+    """按Nuitka解析 --include-data-files/--noinclude-data-files 的方式得到产物中的相对路径"""
+    included = set()
+    excluded = []
+    for option in options:
+        name, _, value = option.partition("=")
+        if name == "--include-data-files":
+            source, target, pattern = value.split("=", 2)
+            for path in glob.glob(os.path.join(source, pattern), recursive=True):
+                if os.path.isfile(path):
+                    relative_path = os.path.relpath(path, source).replace(os.sep, "/")
+                    included.add(relative_path if target == "." else f"{target}/{relative_path}")
+        elif name == "--noinclude-data-files":
+            excluded.append(value)
+    return {path for path in included if not any(fnmatch.fnmatch(path, pattern) for pattern in excluded)}
+
+
+TREE = ["a.json", "b.png", "notes.txt", "sub/c.json", "sub/deep/d.json", "sub/e.psd",
+        "raw/f.json", "sub/raw/g.json", "top.psd"]
+
+
+def test_walk_dir_entry_applies_include_and_exclude(tmp_path):
+    make_tree(str(tmp_path), TREE)
+    entry = make_dir_entry(str(tmp_path), "assets", include=["*.json"], exclude=["raw"])
+    relative_paths = sorted(relative_path for _, relative_path, _ in walk_dir_entry(entry))
+    assert relative_paths == ["a.json", "sub/c.json", "sub/deep/d.json"]
+
+
+def test_walk_dir_entry_without_patterns_returns_everything(tmp_path):
+    make_tree(str(tmp_path), TREE)
+    results = list(walk_dir_entry(make_dir_entry(str(tmp_path))))
+    assert sorted(relative_path for _, relative_path, _ in results) == sorted(TREE)
+    assert all(size == 10 for _, _, size in results)
+
+
+def test_walk_dir_entry_path_patterns(tmp_path):
+    make_tree(str(tmp_path), TREE)
+    entry = make_dir_entry(str(tmp_path), include=["sub/*.json"], exclude=["sub/deep"])
+    # fnmatch 的 * 也匹配 /，sub/*.json 包含更深层的文件，排除的子目录整个跳过
+    assert sorted(relative_path for _, relative_path, _ in walk_dir_entry(entry)) == ["sub/c.json",
+                                                                                       "sub/raw/g.json"]
+
+
+def test_include_patterns_keep_subdirectories(tmp_path):
+    make_tree(str(tmp_path), TREE)
+    entry = make_dir_entry(str(tmp_path), "assets", include=["*.json", "*.png"])
+    options = build_data_options([], [entry])
+    source = str(tmp_path).replace(os.sep, "/")
+    assert options == [f"--include-data-files={source}=assets=**/*.json",
+                       f"--include-data-files={source}=assets=**/*.png"]
+    assert resolve_options(options) == {"assets/a.json", "assets/b.png", "assets/sub/c.json",
+                                        "assets/sub/deep/d.json", "assets/raw/f.json",
+                                        "assets/sub/raw/g.json"}
+
+
+def test_exclude_patterns_match_top_level_and_nested(tmp_path):
+    make_tree(str(tmp_path), TREE)
+    entry = make_dir_entry(str(tmp_path), "assets", include=["*.json", "*.psd"], exclude=["*.psd", "raw"])
+    options = build_data_options([], [entry])
+    assert "--noinclude-data-files=assets/*.psd" in options
+    assert "--noinclude-data-files=assets/raw/**" in options
+    assert "--noinclude-data-files=assets/**/raw/**" in options
+    expected = {os.path.join("assets", path).replace(os.sep, "/")
+                for path in (relative_path for _, relative_path, _ in walk_dir_entry(entry))}
+    assert resolve_options(options) == expected == {"assets/a.json", "assets/sub/c.json",
+                                                    "assets/sub/deep/d.json"}
+
+
+def test_options_match_iter_data_files(tmp_path):
+    make_tree(str(tmp_path), TREE)
+    entry = make_dir_entry(str(tmp_path), ".", include=["*.json"], exclude=["deep"])
+    options = build_data_options([], [entry])
+    expected = {os.path.normpath(relative_path).replace(os.sep, "/")
+                for _, relative_path in iter_data_files([], [entry])}
+    assert resolve_options(options) == expected
+
+
+def test_unfiltered_directory_and_whole_directory_files(tmp_path):
+    make_tree(str(tmp_path), ["data/x.txt", "data/y.txt", "other/z.txt", "other/w.txt"])
+    data = os.path.join(str(tmp_path), "data")
+    files = [os.path.join(str(tmp_path), "other", name) for name in ("z.txt", "w.txt")]
+    options = build_data_options(files, [make_dir_entry(data)])
+    assert options == [f"--include-data-dir={data}=data",
+                       f"--include-data-files={os.path.join(str(tmp_path), 'other').replace(os.sep, '/')}/*=./"]
+    # 只列出目录中的部分文件时逐个包含
+    options = build_data_options(files[:1], [])
+    assert options == [f"--include-data-file={files[0]}=z.txt"]
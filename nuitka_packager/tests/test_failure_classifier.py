@@ -0,0 +1,78 @@
+import json
+
+from failure_classifier import BUILTIN_SIGNATURES_PATH, FailureClassifier, load_knowledge_base
+
+# 成功构建中真实出现过的提示和警告行，不能被识别为致命错误
+INFO_LINES = [
+    "Nuitka-Plugins:pyqt5: Unwanted import of 'PySide6' that conflicts with 'PyQt5' encountered, "
+    "preventing its inclusion. As a result an \"ImportError\" might be given at run time.",
+    "Nuitka-Plugins:pyqt5: Support for PyQt5 is not perfect, e.g. Qt threading does not work, "
+    "so prefer PySide2 if you can.",
+    "Nuitka-Plugins:anti-bloat: Not including 'unittest' automatically in order to avoid bloat, "
+    "but this may cause: failure.",
+    "Nuitka-Options:WARNING: Failed to locate module 'win32api' you asked to include, ignoring it.",
+    "Nuitka:WARNING: The data file 'config/local.ini' does not exist, ignoring it.",
+    "Nuitka-Plugins:WARNING: pyside6: Conflicting plugin 'pyqt5' is only one of the Qt bindings.",
+    "Nuitka-Scons:WARNING: Python 3.13 support is not yet supported by ccache, not using it.",
+    "Nuitka: Found 'patchelf' required for standalone mode in '/usr/bin/patchelf'.",
+    "Nuitka-Scons: Backend C compiler: gcc (gcc 11.4).",
+    "Nuitka: Successfully created 'main.dist/main.bin'.",
+]
+
+
+def make_classifier():
+    return FailureClassifier(load_knowledge_base([BUILTIN_SIGNATURES_PATH]))
+
+
+def test_builtin_fatal_signatures_only_match_fatal_lines():
+    with open(BUILTIN_SIGNATURES_PATH, 'r', encoding='utf-8') as f:
+        signatures = json.load(f)["signatures"]
+    for signature in signatures:
+        if signature.get("fatal"):
+            assert signature.get("pattern", "").startswith("FATAL:"), signature["id"]
+
+
+def test_info_and_warning_lines_are_not_fatal():
+    classifier = make_classifier()
+    classifier.feed("\n".join(INFO_LINES) + "\n")
+    classifier.finish()
+    assert classifier.fatal is None
+    assert all(not result["fatal"] for result in classifier.matches)
+
+
+def test_fatal_line_is_reported():
+    classifier = make_classifier()
+    found = classifier.feed("Nuitka: Compiling module 'main' and following imports.\n"
+                            "Nuitka-Options:FATAL: Error, failed to locate module 'reqests' you asked to include.\n")
+    # 通用的 nuitka-fatal 也会匹配，但致命原因是具体的特征
+    assert "missing-module" in [result["id"] for result in found]
+    assert classifier.fatal["id"] == "missing-module"
+    assert "reqests" in classifier.fatal["suggestion"]
+
+
+def test_plugin_conflict_fatal_line():
+    classifier = make_classifier()
+    classifier.feed(INFO_LINES[0] + "\n")
+    assert classifier.fatal is None
+    classifier.feed("Nuitka-Plugins:FATAL: pyside6: Conflicts with plugin 'pyqt5', only one can be active.\n")
+    assert classifier.fatal["id"] == "plugin-conflict"
+
+
+def test_lines_split_across_chunks():
+    classifier = make_classifier()
+    assert classifier.feed("Nuitka:FATAL: Error, cannot locate suit") == []
+    found = classifier.feed("able C compiler.\nNuitka: done\n")
+    assert "missing-c-compiler" in [result["id"] for result in found]
+    assert classifier.diagnose()["id"] == "missing-c-compiler"
+
+
+def test_scan_reports_each_signature_once_in_output_order():
+    classifier = make_classifier()
+    found = classifier.scan("gcc: fatal error: Killed signal terminated program cc1\n"
+                            "/usr/bin/ld: cannot find -lffi\n"
+                            "gcc: fatal error: Killed signal terminated program cc1\n")
+    assert [result["id"] for result in found] == ["compiler-out-of-memory", "missing-library"]
+    assert classifier.scan("Killed signal terminated program cc1\n") == []
+    # 都不是致命特征时按优先级给出诊断
+    assert classifier.fatal is None
+    assert classifier.diagnose()["id"] == "compiler-out-of-memory"
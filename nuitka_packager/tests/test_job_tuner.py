@@ -0,0 +1,59 @@
+import job_tuner
+from job_tuner import JobSlot, plan_jobs, tune_config
+
+
+def test_plan_uses_all_cores_when_alone():
+    plan = plan_jobs(8, 32768, 30000, [])
+    assert plan["jobs"] == 8
+    assert plan["concurrent"] == 1
+    assert not plan["low_memory"]
+
+
+def test_plan_shares_cores_with_other_builds():
+    plan = plan_jobs(8, None, None, [{"jobs": 4}, {"jobs": 4}])
+    assert plan["concurrent"] == 3
+    assert plan["jobs"] == 2
+    # 其他打包只占用少量核心时使用空闲的核心
+    assert plan_jobs(8, None, None, [{"jobs": 1}])["jobs"] == 7
+
+
+def test_plan_limits_jobs_by_memory():
+    # 4 GB 可用，扣除默认的 Nuitka 峰值 1 GB 后只够 2 个编译任务
+    plan = plan_jobs(16, 8192, 4096, [])
+    assert plan["jobs"] == 2
+    assert not plan["low_memory"]
+    plan = plan_jobs(16, 8192, 2048, [])
+    assert plan["jobs"] == 1
+    assert plan["low_memory"]
+
+
+def test_plan_uses_build_records():
+    records = [{"peak_memory_mb": 3000, "c_file_count": 50}, {"peak_memory_mb": 2000, "c_file_count": 3}]
+    plan = plan_jobs(16, 65536, 60000, [], records)
+    assert plan["nuitka_memory_mb"] == 3000
+    # 最近一次只有 3 个C文件
+    assert plan["jobs"] == 3
+
+
+def test_tune_config_keeps_manual_settings(tmp_path):
+    slot = JobSlot(str(tmp_path)).acquire()
+    try:
+        config = {"parallel": True, "parallel_count": 6}
+        assert tune_config(config, slot) == (config, None)
+    finally:
+        slot.release()
+
+
+def test_tune_config_keeps_user_low_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_tuner, "get_cpu_count", lambda: 8)
+    monkeypatch.setattr(job_tuner, "get_memory_info", lambda: (65536, 60000))
+    slot = JobSlot(str(tmp_path)).acquire()
+    try:
+        config, plan = tune_config({"parallel": True, "parallel_count": "auto", "low_memory": True}, slot)
+        assert not plan["low_memory"]
+        assert config["low_memory"] is True
+        assert config["parallel_count"] == 8
+        config, _ = tune_config({"parallel": True, "parallel_count": 0}, slot)
+        assert config["low_memory"] is False
+    finally:
+        slot.release()
@@ -0,0 +1,66 @@
+import os
+import stat
+
+from data_files import make_dir_entry
+from staging import StagingStore
+
+
+def make_config(tmp_path):
+    data = tmp_path / "data"
+    (data / "sub").mkdir(parents=True)
+    (data / "a.txt").write_text("alpha")
+    (data / "sub" / "b.txt").write_text("beta")
+    return {"included_files": [], "included_dirs": [make_dir_entry(str(data), "data")]}
+
+
+def test_placed_files_are_independent_writable_copies(tmp_path):
+    config = make_config(tmp_path)
+    store = StagingStore(str(tmp_path / "staging"))
+    dist = tmp_path / "app.dist"
+    stats = store.stage(config, str(dist))
+    assert stats["files"] == 2 and stats["linked"] == 0
+    assert stats["cloned"] + stats["copied"] == 2
+
+    placed = dist / "data" / "sub" / "b.txt"
+    assert os.stat(str(placed)).st_mode & stat.S_IWUSR
+    placed.write_text("changed by the app")
+    object_path = store.object_path(store.hasher.hash_file(str(tmp_path / "data" / "sub" / "b.txt")))
+    with open(object_path, 'r') as f:
+        assert f.read() == "beta"
+
+    # 第二次打包: 未变化的文件不重写，被程序改过的文件恢复原内容
+    stats = store.stage(config, str(dist))
+    assert stats["unchanged"] == 1
+    assert placed.read_text() == "beta"
+
+
+def test_hardlinks_are_opt_in_and_verified(tmp_path):
+    config = make_config(tmp_path)
+    store = StagingStore(str(tmp_path / "staging"), hardlinks=True)
+    dist = tmp_path / "app.dist"
+    stats = store.stage(config, str(dist))
+    assert stats["linked"] == 2
+    assert store.stage(config, str(dist))["unchanged"] == 2
+
+    # 模拟 Windows 上 (库中的文件不是只读) 通过硬链接改写了共享的内容
+    placed = dist / "data" / "a.txt"
+    os.chmod(str(placed), 0o644)
+    placed.write_text("corrupted")
+    assert not store.verify_object(store.object_path(store.hasher.hash_file(str(tmp_path / "data" / "a.txt"))))
+
+    other = tmp_path / "other.dist"
+    store.stage(config, str(other))
+    assert (other / "data" / "a.txt").read_text() == "alpha"
+    copy_function = store.make_copy_function()
+    target = tmp_path / "copied.txt"
+    copy_function(str(placed), str(target))
+    assert not os.path.samefile(str(placed), str(target))
+
+
+def test_leftover_hardlinks_are_replaced_without_opt_in(tmp_path):
+    config = make_config(tmp_path)
+    dist = tmp_path / "app.dist"
+    StagingStore(str(tmp_path / "staging"), hardlinks=True).stage(config, str(dist))
+    stats = StagingStore(str(tmp_path / "staging")).stage(config, str(dist))
+    assert stats["unchanged"] == 0
+    assert os.stat(str(dist / "data" / "a.txt")).st_mode & stat.S_IWUSR
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+
+from settings import get_data_dir
+from command_builder import find_nuitka_path, parse_nuitka_version, detect_nuitka_version
+
+# 按优先顺序尝试的C编译器，环境变量 CC 优先
+if sys.platform == "win32":
+    C_COMPILERS = ["cl", "gcc", "clang"]
+else:
+    C_COMPILERS = ["gcc", "clang", "cc"]
+
+# 缓存文件中最多保留的条目数 (不同的解释器和PATH组合)
+MAX_CACHE_ENTRIES = 16
+
+
+def get_cache_path():
+    return os.path.join(get_data_dir(), "toolchain.json")
+
+
+def get_cache_key(python_executable, path_env):
+    """工具链缓存的键: 解释器路径 + PATH 的哈希"""
+    path_hash = hashlib.sha1(path_env.encode("utf-8", errors="replace")).hexdigest()
+    return f"{os.path.abspath(python_executable)}|{path_hash}"
+
+
+def get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def run_version(command):
+    """运行版本查询命令，返回输出的第一行，失败时返回 None"""
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # MSVC 的 cl 把版本信息写到标准错误
+    output = (result.stdout or result.stderr).strip()
+    return output.splitlines()[0] if output else None
+
+
+def find_c_compiler():
+    candidates = [os.environ["CC"]] if os.environ.get("CC") else []
+    for name in candidates + C_COMPILERS:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def probe_toolchain(python_executable=None):
+    """查找Nuitka、C编译器和ccache并读取各自的版本 (会启动子进程，不要在界面线程中调用)"""
+    python_executable = python_executable or sys.executable
+    toolchain = {
+        "python_executable": python_executable,
+        "python_version": platform.python_version(),
+        "nuitka_path": find_nuitka_path(),
+        "nuitka_version": None,
+        "nuitka_version_output": None,
+        "c_compiler": find_c_compiler(),
+        "c_compiler_version": None,
+        "ccache": shutil.which("ccache"),
+        "ccache_version": None
+    }
+
+    if toolchain["nuitka_path"]:
+        try:
+            result = subprocess.run([toolchain["nuitka_path"], "--version"], capture_output=True,
+                                    text=True, timeout=60)
+            if result.returncode == 0:
+                toolchain["nuitka_version_output"] = result.stdout.strip()
+                toolchain["nuitka_version"] = parse_nuitka_version(result.stdout.strip())
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+    if toolchain["c_compiler"]:
+        is_msvc = os.path.splitext(os.path.basename(toolchain["c_compiler"]))[0].lower() == "cl"
+        command = [toolchain["c_compiler"]] if is_msvc else [toolchain["c_compiler"], "--version"]
+        toolchain["c_compiler_version"] = run_version(command)
+
+    if toolchain["ccache"]:
+        toolchain["ccache_version"] = run_version([toolchain["ccache"], "--version"])
+
+    return toolchain
+
+
+def get_stamps(toolchain, path_env):
+    """用于判断缓存是否失效的文件修改时间
+
+    记录找到的各个可执行文件；有工具没有找到时还记录 PATH 中的各个目录，
+    以便之后安装了该工具时缓存失效。
+    """
+    paths = [toolchain["python_executable"]]
+    paths += [toolchain[key] for key in ("nuitka_path", "c_compiler", "ccache") if toolchain[key]]
+    if not all(toolchain[key] for key in ("nuitka_path", "c_compiler", "ccache")):
+        paths += [directory for directory in path_env.split(os.pathsep) if directory]
+    return {path: get_mtime(path) for path in paths}
+
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache_path, cache):
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=4)
+    os.replace(tmp_path, cache_path)
+
+
+def load_cached_toolchain(python_executable=None, path_env=None, cache_path=None):
+    """读取仍然有效的缓存结果，没有或已失效时返回 None (只做 stat，不启动子进程)"""
+    python_executable = python_executable or sys.executable
+    path_env = os.environ.get("PATH", "") if path_env is None else path_env
+    entry = load_cache(cache_path or get_cache_path()).get(get_cache_key(python_executable, path_env))
+    if not entry:
+        return None
+    for path, mtime in entry["stamps"].items():
+        if get_mtime(path) != mtime:
+            return None
+    return entry["toolchain"]
+
+
+def resolve_toolchain(refresh=False, python_executable=None, path_env=None, cache_path=None):
+    """返回工具链信息，优先使用磁盘缓存；refresh 为真时强制重新检测"""
+    python_executable = python_executable or sys.executable
+    path_env = os.environ.get("PATH", "") if path_env is None else path_env
+    cache_path = cache_path or get_cache_path()
+
+    if not refresh:
+        toolchain = load_cached_toolchain(python_executable, path_env, cache_path)
+        if toolchain is not None:
+            return toolchain
+
+    toolchain = probe_toolchain(python_executable)
+    cache = load_cache(cache_path)
+    cache.pop(get_cache_key(python_executable, path_env), None)
+    cache[get_cache_key(python_executable, path_env)] = {
+        "toolchain": toolchain,
+        "stamps": get_stamps(toolchain, path_env)
+    }
+    # 只保留最近写入的若干条
+    for key in list(cache)[:-MAX_CACHE_ENTRIES]:
+        del cache[key]
+    try:
+        save_cache(cache_path, cache)
+    except OSError:
+        pass
+    return toolchain
+
+
+def get_nuitka_version(nuitka_path):
+    """nuitka_path 的版本号，是自动查找到的Nuitka时使用缓存的检测结果"""
+    cached = load_cached_toolchain()
+    if cached and cached["nuitka_path"] == nuitka_path and cached["nuitka_version"]:
+        return cached["nuitka_version"]
+    return detect_nuitka_version(nuitka_path)
@@ -0,0 +1,131 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QWidget
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QPen, QColor, QPolygonF
+
+from build_history import TREND_METRICS, get_metric
+
+# 趋势图最多显示的最近构建次数
+TREND_LIMIT = 100
+
+
+class TrendChart(QWidget):
+    """按构建顺序绘制一个指标的折线图，失败的构建用红点标出"""
+
+    MARGIN = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = []
+        self.unit = ""
+        self.setMinimumSize(600, 300)
+
+    def set_points(self, points, unit):
+        """points 为 (标签, 数值, 是否成功) 列表，数值为 None 的点不绘制"""
+        self.points = [point for point in points if point[1] is not None]
+        self.unit = unit
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), Qt.white)
+
+        area = QRectF(self.MARGIN, 30, self.width() - self.MARGIN - 20, self.height() - self.MARGIN - 30)
+        painter.setPen(QPen(Qt.gray))
+        painter.drawRect(area)
+
+        if not self.points:
+            painter.drawText(area, Qt.AlignCenter, "没有可显示的数据")
+            return
+
+        values = [value for _, value, _ in self.points]
+        low, high = min(values), max(values)
+        if high == low:
+            low, high = low - 1, high + 1
+        low = max(0, low - (high - low) * 0.1)
+        high += (high - low) * 0.1
+
+        def position(index, value):
+            x = area.left() + (area.width() * index / max(1, len(self.points) - 1))
+            y = area.bottom() - area.height() * (value - low) / (high - low)
+            return QPointF(x, y)
+
+        # 纵轴刻度
+        for i in range(5):
+            value = low + (high - low) * i / 4
+            y = area.bottom() - area.height() * i / 4
+            painter.setPen(QPen(QColor(230, 230, 230)))
+            painter.drawLine(QPointF(area.left(), y), QPointF(area.right(), y))
+            painter.setPen(QPen(Qt.black))
+            painter.drawText(QRectF(0, y - 8, self.MARGIN - 4, 16), Qt.AlignRight | Qt.AlignVCenter,
+                             f"{value:.4g}")
+        painter.drawText(QRectF(4, 2, 200, 16), Qt.AlignLeft, self.unit)
+
+        # 横轴标注首尾两次构建的时间
+        painter.drawText(QRectF(area.left(), area.bottom() + 4, 200, 16), Qt.AlignLeft, self.points[0][0])
+        painter.drawText(QRectF(area.right() - 200, area.bottom() + 4, 200, 16), Qt.AlignRight,
+                         self.points[-1][0])
+
+        polyline = QPolygonF([position(i, value) for i, (_, value, _) in enumerate(self.points)])
+        painter.setPen(QPen(QColor(42, 130, 218), 2))
+        painter.drawPolyline(polyline)
+
+        for i, (_, value, succeeded) in enumerate(self.points):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(42, 130, 218) if succeeded else QColor(Qt.red))
+            painter.drawEllipse(position(i, value), 3.5, 3.5)
+
+
+class TrendChartDialog(QDialog):
+    """按配置查看构建记录中各项指标的变化趋势"""
+
+    def __init__(self, build_history, stages, config_name=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("构建趋势")
+        self.resize(800, 450)
+        self.build_history = build_history
+
+        layout = QVBoxLayout(self)
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel("配置:"))
+        self.config_combo = QComboBox()
+        self.config_combo.addItems(build_history.get_config_names())
+        if config_name:
+            self.config_combo.setCurrentText(config_name)
+        control_layout.addWidget(self.config_combo)
+
+        control_layout.addWidget(QLabel("指标:"))
+        self.metric_combo = QComboBox()
+        for metric, (label, unit) in TREND_METRICS.items():
+            self.metric_combo.addItem(label, (metric, unit))
+        for stage in stages:
+            self.metric_combo.addItem(f"阶段耗时: {stage['name']}", (f"stage:{stage['name']}", "秒"))
+        control_layout.addWidget(self.metric_combo)
+        control_layout.addStretch()
+        layout.addLayout(control_layout)
+
+        self.chart = TrendChart()
+        layout.addWidget(self.chart)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.config_combo.currentIndexChanged.connect(self.refresh)
+        self.metric_combo.currentIndexChanged.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        metric, unit = self.metric_combo.currentData()
+        records = self.build_history.get_trend(self.config_combo.currentText(), limit=TREND_LIMIT)
+        points = [(record.get("time", ""), get_metric(record, metric), record.get("exit_code") == 0)
+                  for record in records]
+        self.chart.set_points(points, unit)
+
+        # 最近一次成功构建与之前成功构建的中位数比较，便于发现性能退化
+        values = [value for _, value, succeeded in points if succeeded and value is not None]
+        if len(values) >= 2:
+            previous = sorted(values[:-1])[len(values[:-1]) // 2]
+            change = (values[-1] - previous) / previous * 100 if previous else 0
+            self.summary_label.setText(
+                f"最近一次: {values[-1]:.4g} {unit}，此前中位数: {previous:.4g} {unit} ({change:+.0f}%)")
+        else:
+            self.summary_label.setText(f"共 {len(records)} 次构建")
@@ -1,196 +1,121 @@
 import os
 import sys
+import shutil
+import sqlite3
 import subprocess
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QLabel, QLineEdit, QPushButton, QTextEdit, QFileDialog,
+                            QLabel, QLineEdit, QPushButton, QTextEdit, QPlainTextEdit, QFileDialog,
                             QGroupBox, QCheckBox, QComboBox, QSpinBox, QProgressBar,
                             QMessageBox, QTabWidget, QStyleFactory, QMenuBar, QMenu,
-                            QAction, QListWidget, QListWidgetItem, QDialog, QFormLayout,
+                            QAction, QListView, QDialog, QFormLayout,
                             QInputDialog, QStatusBar)
-from PyQt5.QtCore import Qt, QProcess, QTimer, QDateTime, QThread, pyqtSignal
-from PyQt5.QtGui import QIcon, QFont, QTextCursor, QColor, QTextCharFormat
+from PyQt5.QtCore import Qt, QProcess, QProcessEnvironment, QDateTime, QThread, QTimer, QFile, pyqtSignal
+from PyQt5.QtGui import QIcon, QFont
 from config_manager import ConfigManager
+from command_builder import (build_command, find_nuitka_path, format_command,
+                             get_artifact_paths, split_list)
+from settings import load_settings, save_settings
+from build_cache import BuildCache
+from build_history import BuildHistory
+from build_compare import save_manifest
+from lazy_list_model import LazyListModel
+from data_files import summarize_entries, format_size
+from data_files_model import DataFilesModel, DirEntryDialog
+from background import BackgroundTask, BackgroundStream
+import toolchain
+from console_view import ConsoleRenderer, ConsolePagerDialog
+from console_log import ConsoleLog
+from progress_tracker import ProgressTracker
+from output_parser import (DEFAULT_STAGES, OutputParser, parse_pattern_lines,
+                           format_pattern_lines)
+import incremental
+import compiler_cache
+import job_tuner
+from build_logs import open_build_log, BuildLogReader, get_log_dir
+from failure_classifier import FailureClassifier, format_match, format_diagnosis
+from staging import StagingStore, get_staging_dir, supports_staging, format_stage_stats
+
+try:
+    # pyrcc5 生成的资源包 (样式表和图标)，见项目根目录的 resources.qrc
+    import resources_rc
+except ImportError:
+    resources_rc = None
 
 class NuitkaPackager(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Nuitka 高级打包工具")
-        self.setWindowIcon(QIcon(self.get_resource_path("resources/icons/nuitka_icon.svg")))
+        self.setWindowIcon(self.get_icon("nuitka_icon.svg"))
         self.setGeometry(100, 100, 900, 700)
         
         self.config_manager = ConfigManager(self)
+        self.settings = load_settings()
+        self.build_cache = BuildCache()
+        self.build_history = BuildHistory()
+        self.current_config_name = None
+        self.ccache_before = None
+        self.detected_version = None
+        self.toolchain = None
+        self.background_tasks = set()
+        self.pending_cache_key = None
+        self.pending_cache_clean = False
+        self.pending_config = {}
+        self.pending_build_root = None
+        self.pending_stage_data = False
+        self.pending_build_record = None
+        self.staging_store = None
+        self.plugin_scan = None
+        # 脚本路径停止编辑一段时间后再在后台推断所需插件
+        self.plugin_scan_timer = QTimer(self)
+        self.plugin_scan_timer.setSingleShot(True)
+        self.plugin_scan_timer.setInterval(800)
+        self.plugin_scan_timer.timeout.connect(self.start_plugin_scan)
         self.init_ui()
         self.load_stylesheet()
         
         self.process = None
-        self.progress_timer = QTimer(self)
-        self.progress_timer.timeout.connect(self.update_progress)
-        self.current_stage = 0
-        self.stage_progress = 0
-        self.stages = [
-            {"name": "初始化", "weight": 5, "pattern": "Initializing"},
-            {"name": "编译主模块", "weight": 30, "pattern": "Compiling module"},
-            {"name": "分析依赖", "weight": 15, "pattern": "Doing module dependency"},
-            {"name": "包含数据文件", "weight": 10, "pattern": "Including data files"},
-            {"name": "生成C代码", "weight": 15, "pattern": "Generating C source"},
-            {"name": "编译二进制", "weight": 20, "pattern": "Compiling C source"},
-            {"name": "最终打包", "weight": 5, "pattern": "Creating binary"}
-        ]
-        
-        self.console_colors = {
-            "INFO": QColor(0, 0, 255),
-            "WARNING": QColor(255, 165, 0),
-            "ERROR": QColor(255, 0, 0),
-            "STAGE": QColor(0, 100, 0),
-            "COMMAND": QColor(128, 0, 128)
-        }
+        self.daemon_job = None
+        self.daemon_stream = None
+        self.job_slot = job_tuner.JobSlot()
+        self.build_log = None
+        self.stages = DEFAULT_STAGES
+        self.output_parser = OutputParser(self.stages)
+        self.progress_tracker = ProgressTracker(self.stages)
+        self.failure_classifier = FailureClassifier()
         
         self.init_statusbar()
-        self.load_history()
-        self.included_files = []
-        self.detect_nuitka_version()
+        self.data_summary_generation = 0
+        self.startup_finished = False
 
     def load_stylesheet(self):
-        qss = """
-        /* 主窗口样式 */
-        QMainWindow {
-            background-color: #f5f7fa;
-        }
-
-        /* 按钮样式 */
-        QPushButton {
-            background-color: #4a6fa5;
-            color: white;
-            border: none;
-            border-radius: 4px;
-            padding: 8px 16px;
-            min-width: 80px;
-        }
-
-        QPushButton:hover {
-            background-color: #3a5a80;
-        }
-
-        QPushButton:pressed {
-            background-color: #2c4a6e;
-        }
-
-        /* 特殊按钮样式 */
-        QPushButton#run_button {
-            background-color: #4caf50;
-        }
-
-        QPushButton#run_button:hover {
-            background-color: #3d8b40;
-        }
-
-        QPushButton#stop_button {
-            background-color: #f44336;
-        }
-
-        QPushButton#stop_button:hover {
-            background-color: #d32f2f;
-        }
-
-        /* 标签样式 */
-        QLabel {
-            color: #333333;
-            font-size: 25px;
-        }
-
-        /* 输入框样式 */
-        QLineEdit, QComboBox, QSpinBox {
-            border: 1px solid #d1d5db;
-            border-radius: 4px;
-            padding: 6px;
-            background: white;
-        }
-
-        QLineEdit:focus, QComboBox:focus, QSpinBox:focus {
-            border: 1px solid #4a6fa5;
-        }
-
-        /* 复选框样式 */
-        QCheckBox {
-            spacing: 5px;
-        }
-
-        QCheckBox::indicator {
-            width: 16px;
-            height: 16px;
-        }
-
-        /* 分组框样式 */
-        QGroupBox {
-            border: 1px solid #d1d5db;
-            border-radius: 4px;
-            margin-top: 10px;
-            padding-top: 20px;
-            background: white;
-        }
-
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 3px;
-        }
-
-        /* 标签页样式 */
-        QTabWidget::pane {
-            border: 1px solid #d1d5db;
-            border-radius: 4px;
-            background: white;
-        }
-
-        QTabBar::tab {
-            background: #e5e7eb;
-            border: 1px solid #d1d5db;
-            padding: 8px 16px;
-            border-top-left-radius: 4px;
-            border-top-right-radius: 4px;
-        }
-
-        QTabBar::tab:selected {
-            background: white;
-            border-bottom-color: white;
-        }
-
-        /* 进度条样式 */
-        QProgressBar {
-            border: 1px solid #d1d5db;
-            border-radius: 4px;
-            text-align: center;
-            background: white;
-        }
-
-        QProgressBar::chunk {
-            background-color: #4a6fa5;
-            border-radius: 2px;
-        }
+        """从资源包加载样式表，资源包不存在时读取项目根目录的 styles.qss"""
+        if resources_rc is not None:
+            qss_file = QFile(":/styles.qss")
+            if qss_file.open(QFile.ReadOnly):
+                self.setStyleSheet(bytes(qss_file.readAll()).decode("utf-8"))
+                qss_file.close()
+                return
+        try:
+            with open(self.get_resource_path("styles.qss"), 'r', encoding='utf-8') as f:
+                self.setStyleSheet(f.read())
+        except OSError:
+            pass
 
-        /* 状态栏样式 */
-        QStatusBar {
-            background: #e5e7eb;
-            border-top: 1px solid #d1d5db;
-        }
+    def get_icon(self, name):
+        """获取 resources/icons 下的图标，优先从资源包读取"""
+        if resources_rc is not None and QFile.exists(f":/icons/{name}"):
+            return QIcon(f":/icons/{name}")
+        return QIcon(self.get_resource_path(os.path.join("resources", "icons", name)))
 
-        /* 列表样式 */
-        QListWidget {
-            border: 1px solid #d1d5db;
-            border-radius: 4px;
-            background: white;
-        }
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.startup_finished:
+            self.startup_finished = True
+            # 首次绘制之后再启动需要子进程的检测
+            QTimer.singleShot(0, self.finish_startup)
 
-        /* 控制台样式 */
-        QTextEdit {
-            font-family: 'Consolas', 'Courier New', monospace;
-            background-color: #1e1e1e;
-            color: #d4d4d4;
-            border: 1px solid #d1d5db;
-            border-radius: 4px;
-        }
-        """
-        self.setStyleSheet(qss)
+    def finish_startup(self):
+        self.detect_toolchain()
 
     def init_statusbar(self):
         self.status_bar = QStatusBar()
@@ -199,82 +124,50 @@ class NuitkaPackager(QMainWindow):
         self.nuitka_version_label = QLabel("Nuitka: 检测中...")
         self.status_bar.addPermanentWidget(self.nuitka_version_label)
         
+        self.compiler_label = QLabel("C编译器: 检测中...")
+        self.status_bar.addPermanentWidget(self.compiler_label)
+        
         self.python_env_label = QLabel(f"Python: {sys.prefix}")
         self.status_bar.addPermanentWidget(self.python_env_label)
 
-    def detect_nuitka_version(self):
-        """更健壮的版本检测方法"""
-        try:
-            nuitka_path = self.get_nuitka_path()
-            if not nuitka_path:
-                self.nuitka_version_label.setText("Nuitka: 未找到")
-                return
+    def run_in_background(self, func, callback, *args):
+        """在后台线程中执行 func(*args)，完成后在界面线程中调用 callback(结果)"""
+        task = BackgroundTask(func, *args, parent=self)
+        task.result_ready.connect(callback)
+        task.finished.connect(lambda: self.background_tasks.discard(task))
+        self.background_tasks.add(task)
+        task.start()
 
-            # 使用QProcess替代subprocess实现后台运行
-            self.version_process = QProcess(self)
-            self.version_process.readyReadStandardOutput.connect(self.handle_version_output)
-            self.version_process.finished.connect(self.handle_version_finished)
-            self.version_process.start(nuitka_path, ["--version"])
-            
-        except Exception as e:
+    def detect_toolchain(self, refresh=False):
+        """在后台检测Nuitka、C编译器、ccache和Python版本
+
+        检测结果缓存在磁盘上 (见 toolchain.resolve_toolchain)，缓存有效时只需检查文件修改时间。
+        """
+        self.nuitka_version_label.setText("Nuitka: 检测中...")
+        self.run_in_background(toolchain.resolve_toolchain, self.handle_toolchain_result, refresh)
+
+    def handle_toolchain_result(self, result):
+        if isinstance(result, Exception):
             self.nuitka_version_label.setText("Nuitka: 检测异常")
-            error_msg = f"检测异常: {str(e)}\n"
-            error_msg += f"请尝试在命令行执行: {self.get_nuitka_path() or 'nuitka'} --version\n"
-            error_msg += "并将结果截图反馈给开发者"
-            
-    def handle_version_output(self):
-        """处理版本检测输出"""
-        output = self.version_process.readAllStandardOutput().data().decode().strip()
-        if output:
-            version = "未知版本"
-            for line in output.split('\n'):
-                if line.startswith("Nuitka") or line.startswith("nuitka"):
-                    # 更健壮的版本号提取逻辑
-                    version_match = re.search(r'(\d+\.\d+\.\d+)', line)
-                    if version_match:
-                        version = version_match.group(1)
-                        break
-                    # 处理不同格式的版本号输出
-                    version_match = re.search(r'version\s*([\d\.]+)', line, re.IGNORECASE)
-                    if version_match:
-                        version = version_match.group(1)
-                        break
-                    # 处理类似 "Nuitka v1.2.3" 格式
-                    version_match = re.search(r'v(\d+\.\d+\.\d+)', line, re.IGNORECASE)
-                    if version_match:
-                        version = version_match.group(1)
-                        break
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        version = parts[1].lstrip('v')
-                        break
-            
-            self.version_info = output
-            self.detected_version = version
-            
-    def handle_version_finished(self, exit_code):
-        """处理版本检测完成"""
-        if exit_code == 0:
+            self.append_to_console(f"工具链检测异常: {str(result)}\n", level="ERROR")
+            return
+        
+        self.toolchain = result
+        self.detected_version = result["nuitka_version"]
+        if not result["nuitka_path"]:
+            self.nuitka_version_label.setText("Nuitka: 未找到")
+        elif self.detected_version is None:
+            self.nuitka_version_label.setText("Nuitka: 检测失败")
+            self.append_to_console(f"版本检测失败，请尝试在命令行执行: {result['nuitka_path']} --version\n",
+                                   level="ERROR")
+        else:
             self.nuitka_version_label.setText(f"Nuitka: {self.detected_version}")
             self.append_to_console("\n=== Nuitka版本信息 ===\n", level="STAGE")
-            self.append_to_console(self.version_info + "\n", level="INFO")
-        else:
-            error = self.version_process.readAllStandardError().data().decode()
-            self.nuitka_version_label.setText("Nuitka: 检测失败")
-            self.append_to_console(f"版本检测失败:\n{error}", level="ERROR")
-            # 避免使用colorama的ANSI转义序列
-            if hasattr(self, 'console') and self.console:
-                self.append_to_console(error_msg, level="ERROR")
-                cursor = self.console.textCursor()
-                cursor.movePosition(QTextCursor.End)
-                
-                if "ERROR" in self.console_colors:
-                    char_format = QTextCharFormat()
-                    char_format.setForeground(self.console_colors["ERROR"])
-                    cursor.setCharFormat(char_format)
-                
-                cursor.insertText(error_msg)
-                self.console.setTextCursor(cursor)
+            self.append_to_console(result["nuitka_version_output"] + "\n", level="INFO")
+        
+        compiler = os.path.basename(result["c_compiler"]) if result["c_compiler"] else "未找到"
+        self.compiler_label.setText(f"C编译器: {compiler}")
+        self.python_env_label.setText(f"Python {result['python_version']}: {sys.prefix}")
 
     def get_resource_path(self, relative_path, custom_path=None):
         """将相对路径转换为绝对路径
@@ -314,44 +207,10 @@ class NuitkaPackager(QMainWindow):
         return os.path.abspath(resource_path)
         
     def get_nuitka_path(self):
-        """获取nuitka可执行文件路径"""
-        # 尝试标准路径
-        if sys.platform == "win32":
-            possible_paths = [
-                os.path.join(sys.prefix, "Scripts", "nuitka.exe"),
-                os.path.join(sys.prefix, "Scripts", "nuitka.cmd"),
-                os.path.join(sys.prefix, "Scripts", "nuitka-script.py"),
-                os.path.join(os.environ.get("APPDATA", ""), "Python", "Scripts", "nuitka.cmd"),
-                os.path.join(os.path.dirname(sys.executable), "Scripts", "nuitka.cmd")
-            ]
-        else:
-            possible_paths = [
-                os.path.join(sys.prefix, "bin", "nuitka"),
-                "/usr/local/bin/nuitka",
-                "/usr/bin/nuitka"
-            ]
-        
-        # 检查可能的路径
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        
-        # 尝试通过where/which命令查找
-        try:
-            cmd = "where nuitka" if sys.platform == "win32" else "which nuitka"
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                return result.stdout.strip().split('\n')[0]
-        except:
-            pass
-        
-            # 最后尝试直接调用nuitka（假设在PATH中）
-            return "nuitka"
+        """获取nuitka可执行文件路径，后台检测完成前退回只查找文件的 find_nuitka_path"""
+        if self.toolchain is not None:
+            return self.toolchain["nuitka_path"]
+        return find_nuitka_path()
 
     def init_ui(self):
         main_widget = QWidget()
@@ -360,24 +219,31 @@ class NuitkaPackager(QMainWindow):
         main_layout = QVBoxLayout(main_widget)
         self.create_menubar()
         
-        tabs = QTabWidget()
-        main_layout.addWidget(tabs)
+        self.tabs = QTabWidget()
+        main_layout.addWidget(self.tabs)
         
         basic_tab = QWidget()
-        tabs.addTab(basic_tab, "基本设置")
+        self.tabs.addTab(basic_tab, "基本设置")
         self.setup_basic_tab(basic_tab)
         
-        advanced_tab = QWidget()
-        tabs.addTab(advanced_tab, "高级设置")
-        self.setup_advanced_tab(advanced_tab)
-        
-        history_tab = QWidget()
-        tabs.addTab(history_tab, "历史记录")
-        self.setup_history_tab(history_tab)
+        # 高级设置和历史记录选项卡在第一次切换到时才创建
+        self.advanced_tab = QWidget()
+        self.tabs.addTab(self.advanced_tab, "高级设置")
+        self.history_tab = QWidget()
+        self.tabs.addTab(self.history_tab, "历史记录")
+        self.tab_builders = {
+            self.advanced_tab: self.setup_advanced_tab,
+            self.history_tab: self.setup_history_tab
+        }
+        self.tabs.currentChanged.connect(lambda index: self.ensure_tab_built(self.tabs.widget(index)))
         
-        self.console = QTextEdit()
+        self.console = QPlainTextEdit()
         self.console.setReadOnly(True)
         self.console.setFont(QFont("Courier New", 10))
+        self.console_log = ConsoleLog()
+        self.console_renderer = ConsoleRenderer(
+            self.console, log=self.console_log,
+            max_lines=self.settings["console_max_lines"], parent=self)
         main_layout.addWidget(self.console)
         
         self.progress = QProgressBar()
@@ -389,32 +255,48 @@ class NuitkaPackager(QMainWindow):
         
         self.run_button = QPushButton("开始打包")
         self.run_button.setObjectName("run_button")
-        self.run_button.setIcon(QIcon("resources/icons/run.svg"))
+        self.run_button.setIcon(self.get_icon("run.svg"))
         self.run_button.clicked.connect(self.start_packaging)
         
         self.preview_button = QPushButton("预览命令")
         self.preview_button.setObjectName("preview_button")
-        self.preview_button.setIcon(QIcon("resources/icons/preview.svg"))
+        self.preview_button.setIcon(self.get_icon("preview.svg"))
         self.preview_button.clicked.connect(self.show_command_preview)
         
         self.stop_button = QPushButton("停止")
         self.stop_button.setObjectName("stop_button")
-        self.stop_button.setIcon(QIcon("resources/icons/stop.svg"))
+        self.stop_button.setIcon(self.get_icon("stop.svg"))
         self.stop_button.clicked.connect(self.stop_packaging)
         self.stop_button.setEnabled(False)
         
+        self.clean_rebuild_button = QPushButton("清理重建")
+        self.clean_rebuild_button.setToolTip("清空增量构建目录和构建缓存后完整编译")
+        self.clean_rebuild_button.clicked.connect(self.clean_rebuild)
+        
+        self.full_log_button = QPushButton("完整日志")
+        self.full_log_button.setToolTip("控制台只保留最近的输出，完整日志保存在磁盘上")
+        self.full_log_button.clicked.connect(self.show_full_log)
+        
         self.clear_button = QPushButton("清空输出")
-        self.clear_button.setIcon(QIcon("resources/icons/clear.svg"))
+        self.clear_button.setIcon(self.get_icon("clear.svg"))
         self.clear_button.clicked.connect(self.clear_console)
         
         button_layout.addWidget(self.run_button)
         button_layout.addWidget(self.preview_button)
         button_layout.addWidget(self.stop_button)
+        button_layout.addWidget(self.clean_rebuild_button)
+        button_layout.addWidget(self.full_log_button)
         button_layout.addWidget(self.clear_button)
         button_layout.addStretch()
         
         main_layout.addLayout(button_layout)
 
+    def ensure_tab_built(self, tab):
+        """创建尚未创建的选项卡内容"""
+        builder = self.tab_builders.pop(tab, None)
+        if builder is not None:
+            builder(tab)
+
     def create_menubar(self):
         menubar = self.menuBar()
         
@@ -474,6 +356,7 @@ class NuitkaPackager(QMainWindow):
         script_layout.addWidget(QLabel("Python脚本:"))
         self.script_path = QLineEdit()
         self.script_path.setPlaceholderText("选择要打包的Python脚本")
+        self.script_path.textChanged.connect(self.plugin_scan_timer.start)
         script_layout.addWidget(self.script_path)
         script_browse = QPushButton("浏览...")
         script_browse.clicked.connect(lambda: self.browse_file(self.script_path, "Python文件 (*.py)"))
@@ -522,6 +405,9 @@ class NuitkaPackager(QMainWindow):
         self.remove_output_check = QCheckBox("打包后删除临时文件 (--remove-output)")
         options_layout.addWidget(self.remove_output_check)
         
+        self.incremental_check = QCheckBox("增量编译 (保留并复用构建目录，仅重新编译变化的部分)")
+        options_layout.addWidget(self.incremental_check)
+        
         self.show_progress_check = QCheckBox("显示进度 (--show-progress)")
         self.show_progress_check.setChecked(True)
         options_layout.addWidget(self.show_progress_check)
@@ -548,33 +434,67 @@ class NuitkaPackager(QMainWindow):
         self.include_packages_edit.setPlaceholderText("输入要包含的包名，多个用逗号分隔")
         optimize_layout.addWidget(self.include_packages_edit)
         
+        optimize_layout.addWidget(QLabel("不跟随导入 (--nofollow-import-to):"))
+        self.nofollow_imports_edit = QLineEdit()
+        self.nofollow_imports_edit.setPlaceholderText("输入不需要编译的包名，多个用逗号分隔")
+        optimize_layout.addWidget(self.nofollow_imports_edit)
+        
+        optimize_layout.addWidget(QLabel("排除重量级模块 (--noinclude-*-mode=nofollow):"))
+        self.noinclude_modes_edit = QLineEdit()
+        self.noinclude_modes_edit.setPlaceholderText("例如 pytest,setuptools,IPython，多个用逗号分隔")
+        optimize_layout.addWidget(self.noinclude_modes_edit)
+        
+        self.analyze_imports_button = QPushButton("分析导入")
+        self.analyze_imports_button.setToolTip("从主脚本出发静态分析实际用到的第三方包，估算编译耗时并给出包含和排除的建议")
+        self.analyze_imports_button.clicked.connect(self.analyze_imports)
+        optimize_layout.addWidget(self.analyze_imports_button)
+        
         self.enable_plugin_check = QCheckBox("启用插件 (--enable-plugin)")
         self.enable_plugin_check.setChecked(True)
         optimize_layout.addWidget(self.enable_plugin_check)
         
         self.plugins_edit = QLineEdit()
         self.plugins_edit.setPlaceholderText("输入要启用的插件，多个用逗号分隔")
-        self.plugins_edit.setText("tk-inter,pylint-warnings")
+        self.plugins_edit.textChanged.connect(self.update_plugin_hint)
         optimize_layout.addWidget(self.plugins_edit)
         
+        plugin_hint_layout = QHBoxLayout()
+        self.plugin_hint_label = QLabel()
+        self.plugin_hint_label.setObjectName("plugin_hint_label")
+        self.plugin_hint_label.setWordWrap(True)
+        plugin_hint_layout.addWidget(self.plugin_hint_label, 1)
+        self.apply_plugins_button = QPushButton("使用建议插件")
+        self.apply_plugins_button.clicked.connect(self.apply_plugin_suggestion)
+        plugin_hint_layout.addWidget(self.apply_plugins_button)
+        optimize_layout.addLayout(plugin_hint_layout)
+        
         optimize_group.setLayout(optimize_layout)
         layout.addWidget(optimize_group)
         
         file_include_group = QGroupBox("包含文件")
         file_include_layout = QVBoxLayout()
         
-        self.included_files_list = QListWidget()
+        self.data_files_model = DataFilesModel(self)
+        self.included_files_list = QListView()
+        self.included_files_list.setModel(self.data_files_model)
+        self.included_files_list.setUniformItemSizes(True)
+        self.included_files_list.setSelectionMode(QListView.ExtendedSelection)
         file_include_layout.addWidget(self.included_files_list)
+        self.data_summary_label = QLabel()
+        file_include_layout.addWidget(self.data_summary_label)
         
         file_buttons_layout = QHBoxLayout()
         add_file_button = QPushButton("添加文件")
         add_file_button.clicked.connect(self.add_include_file)
+        add_dir_button = QPushButton("添加目录")
+        add_dir_button.clicked.connect(self.add_include_dir)
         remove_file_button = QPushButton("移除选中")
         remove_file_button.clicked.connect(self.remove_include_file)
         clear_files_button = QPushButton("清空列表")
         clear_files_button.clicked.connect(self.clear_include_files)
         
         file_buttons_layout.addWidget(add_file_button)
+        file_buttons_layout.addWidget(add_dir_button)
         file_buttons_layout.addWidget(remove_file_button)
         file_buttons_layout.addWidget(clear_files_button)
         file_include_layout.addLayout(file_buttons_layout)
@@ -627,89 +547,557 @@ class NuitkaPackager(QMainWindow):
         parallel_count_layout = QHBoxLayout()
         parallel_count_layout.addWidget(QLabel("并行任务数:"))
         self.parallel_count = QSpinBox()
-        self.parallel_count.setRange(1, 32)
-        self.parallel_count.setValue(4)
+        self.parallel_count.setRange(0, 256)
+        # 0 表示按CPU核心、可用内存和同时运行的打包自动选择，内存紧张时同时启用 --low-memory
+        self.parallel_count.setSpecialValueText("自动")
+        self.parallel_count.setToolTip("自动: 按CPU核心、可用内存、同时运行的打包和历史记录选择")
+        self.parallel_count.setValue(0)
         parallel_count_layout.addWidget(self.parallel_count)
         parallel_count_layout.addStretch()
         other_layout.addLayout(parallel_count_layout)
         
+        other_layout.addWidget(QLabel("自定义输出匹配规则 (每行一条: 名称=正则表达式，名称与阶段同名时作为该阶段的标志):"))
+        self.output_patterns_edit = QPlainTextEdit()
+        self.output_patterns_edit.setPlaceholderText("例如: 缺少模块=ModuleNotFoundError|No module named")
+        self.output_patterns_edit.setMaximumHeight(80)
+        other_layout.addWidget(self.output_patterns_edit)
+        
         other_group.setLayout(other_layout)
         layout.addWidget(other_group)
         
+        cache_group = QGroupBox("构建缓存")
+        cache_layout = QVBoxLayout()
+        
+        self.build_cache_check = QCheckBox("输入未变化时跳过编译并恢复上次产物")
+        self.build_cache_check.setChecked(self.settings["build_cache_enabled"])
+        self.build_cache_check.toggled.connect(self.update_cache_settings)
+        cache_layout.addWidget(self.build_cache_check)
+        
+        cache_quota_layout = QHBoxLayout()
+        cache_quota_layout.addWidget(QLabel("缓存上限 (MB):"))
+        self.build_cache_quota = QSpinBox()
+        self.build_cache_quota.setRange(100, 1024 * 1024)
+        self.build_cache_quota.setSingleStep(512)
+        self.build_cache_quota.setValue(self.settings["build_cache_quota_mb"])
+        self.build_cache_quota.valueChanged.connect(self.update_cache_settings)
+        cache_quota_layout.addWidget(self.build_cache_quota)
+        clear_cache_button = QPushButton("清空构建缓存")
+        clear_cache_button.clicked.connect(self.clear_build_cache)
+        cache_quota_layout.addWidget(clear_cache_button)
+        cache_quota_layout.addStretch()
+        cache_layout.addLayout(cache_quota_layout)
+        
+        staging_layout = QHBoxLayout()
+        self.staging_check = QCheckBox("数据文件按内容暂存，打包后放入产物中 (单文件模式除外)")
+        self.staging_check.setChecked(self.settings["staging_enabled"])
+        self.staging_check.toggled.connect(self.update_cache_settings)
+        staging_layout.addWidget(self.staging_check)
+        self.staging_hardlinks_check = QCheckBox("使用硬链接")
+        self.staging_hardlinks_check.setToolTip("默认以 reflink 或复制的方式放置数据文件；硬链接最快，"
+                                                "但程序修改产物中的数据文件时会改动暂存库中共享的内容")
+        self.staging_hardlinks_check.setChecked(self.settings["staging_hardlinks"])
+        self.staging_hardlinks_check.toggled.connect(self.update_cache_settings)
+        staging_layout.addWidget(self.staging_hardlinks_check)
+        prune_staging_button = QPushButton("清理暂存库")
+        prune_staging_button.clicked.connect(self.prune_staging)
+        staging_layout.addWidget(prune_staging_button)
+        staging_layout.addStretch()
+        cache_layout.addLayout(staging_layout)
+        
+        log_layout = QHBoxLayout()
+        self.build_logs_check = QCheckBox("保存构建日志 (压缩)")
+        self.build_logs_check.setChecked(self.settings["build_logs_enabled"])
+        self.build_logs_check.toggled.connect(self.update_cache_settings)
+        log_layout.addWidget(self.build_logs_check)
+        self.log_index_check = QCheckBox("建立全文索引")
+        self.log_index_check.setToolTip("写入日志时同时建立索引，可以在历史记录中搜索所有日志")
+        self.log_index_check.setChecked(self.settings["log_index_enabled"])
+        self.log_index_check.toggled.connect(self.update_cache_settings)
+        log_layout.addWidget(self.log_index_check)
+        log_layout.addWidget(QLabel("保留天数:"))
+        self.log_retention_days = QSpinBox()
+        self.log_retention_days.setRange(0, 3650)
+        self.log_retention_days.setSpecialValueText("不限")
+        self.log_retention_days.setValue(self.settings["log_retention_days"])
+        self.log_retention_days.valueChanged.connect(self.update_cache_settings)
+        log_layout.addWidget(self.log_retention_days)
+        log_layout.addWidget(QLabel("总大小上限 (MB):"))
+        self.log_max_total = QSpinBox()
+        self.log_max_total.setRange(0, 1024 * 1024)
+        self.log_max_total.setSingleStep(256)
+        self.log_max_total.setSpecialValueText("不限")
+        self.log_max_total.setValue(self.settings["log_max_total_mb"])
+        self.log_max_total.valueChanged.connect(self.update_cache_settings)
+        log_layout.addWidget(self.log_max_total)
+        log_layout.addStretch()
+        cache_layout.addLayout(log_layout)
+        
+        self.build_daemon_check = QCheckBox("有运行中的构建服务 (daemon 子命令) 时提交给服务打包")
+        self.build_daemon_check.setChecked(self.settings["use_build_daemon"])
+        self.build_daemon_check.toggled.connect(self.update_cache_settings)
+        cache_layout.addWidget(self.build_daemon_check)
+        
+        self.abort_on_fatal_check = QCheckBox("输出中出现已知的致命错误时提前终止打包并给出修复建议")
+        self.abort_on_fatal_check.setToolTip("错误特征见 resources/failure_signatures.json，"
+                                             "可在数据目录的 failure_signatures.json 中补充")
+        self.abort_on_fatal_check.setChecked(self.settings["abort_on_fatal_failure"])
+        self.abort_on_fatal_check.toggled.connect(self.update_cache_settings)
+        cache_layout.addWidget(self.abort_on_fatal_check)
+        
+        cache_group.setLayout(cache_layout)
+        layout.addWidget(cache_group)
+        
+        ccache_group = QGroupBox("编译缓存 (ccache)")
+        ccache_layout = QVBoxLayout()
+        
+        self.ccache_check = QCheckBox("所有打包任务共用编译缓存")
+        self.ccache_check.setChecked(self.settings["ccache_enabled"])
+        self.ccache_check.toggled.connect(self.update_ccache_settings)
+        ccache_layout.addWidget(self.ccache_check)
+        
+        ccache_dir_layout = QHBoxLayout()
+        ccache_dir_layout.addWidget(QLabel("缓存目录:"))
+        self.ccache_dir_edit = QLineEdit()
+        self.ccache_dir_edit.setPlaceholderText(compiler_cache.get_cache_dir({}))
+        self.ccache_dir_edit.setText(self.settings["ccache_dir"])
+        self.ccache_dir_edit.editingFinished.connect(self.update_ccache_settings)
+        ccache_dir_layout.addWidget(self.ccache_dir_edit)
+        ccache_dir_browse = QPushButton("浏览...")
+        ccache_dir_browse.clicked.connect(lambda: (self.browse_directory(self.ccache_dir_edit),
+                                                   self.update_ccache_settings()))
+        ccache_dir_layout.addWidget(ccache_dir_browse)
+        ccache_layout.addLayout(ccache_dir_layout)
+        
+        ccache_size_layout = QHBoxLayout()
+        ccache_size_layout.addWidget(QLabel("缓存上限 (GB):"))
+        self.ccache_size = QSpinBox()
+        self.ccache_size.setRange(1, 1024)
+        self.ccache_size.setValue(self.settings["ccache_max_size_gb"])
+        self.ccache_size.valueChanged.connect(self.update_ccache_settings)
+        ccache_size_layout.addWidget(self.ccache_size)
+        ccache_stats_button = QPushButton("查看统计")
+        ccache_stats_button.clicked.connect(self.show_ccache_stats)
+        ccache_size_layout.addWidget(ccache_stats_button)
+        ccache_size_layout.addStretch()
+        ccache_layout.addLayout(ccache_size_layout)
+        
+        ccache_group.setLayout(ccache_layout)
+        layout.addWidget(ccache_group)
+        
         layout.addStretch()
+        self.update_plugin_hint()
+
+    def update_ccache_settings(self):
+        self.settings["ccache_enabled"] = self.ccache_check.isChecked()
+        self.settings["ccache_dir"] = self.ccache_dir_edit.text().strip()
+        self.settings["ccache_max_size_gb"] = self.ccache_size.value()
+        save_settings(self.settings)
+
+    def show_ccache_stats(self):
+        if not compiler_cache.find_ccache():
+            self.append_to_console("未找到ccache，Nuitka将无法使用编译缓存\n", level="WARNING")
+            return
+        
+        self.run_in_background(compiler_cache.read_stats, self.handle_ccache_stats, self.settings)
+
+    def handle_ccache_stats(self, stats):
+        if not isinstance(stats, dict):
+            self.append_to_console("无法读取编译缓存统计 (是否已启用编译缓存?)\n", level="WARNING")
+            return
+        
+        self.append_to_console("=== 编译缓存统计 ===\n", level="STAGE")
+        self.append_to_console(
+            f"目录: {compiler_cache.get_cache_dir(self.settings)}\n"
+            f"累计命中: {stats['hits']}, 累计未命中: {stats['misses']}, "
+            f"文件数: {stats['files']}, 占用: {stats['size_bytes'] / (1024 ** 3):.2f} GB\n",
+            level="INFO")
+
+    def update_cache_settings(self):
+        self.settings["build_cache_enabled"] = self.build_cache_check.isChecked()
+        self.settings["build_cache_quota_mb"] = self.build_cache_quota.value()
+        self.settings["staging_enabled"] = self.staging_check.isChecked()
+        self.settings["staging_hardlinks"] = self.staging_hardlinks_check.isChecked()
+        self.settings["use_build_daemon"] = self.build_daemon_check.isChecked()
+        self.settings["abort_on_fatal_failure"] = self.abort_on_fatal_check.isChecked()
+        self.settings["build_logs_enabled"] = self.build_logs_check.isChecked()
+        self.settings["log_index_enabled"] = self.log_index_check.isChecked()
+        self.settings["log_retention_days"] = self.log_retention_days.value()
+        self.settings["log_max_total_mb"] = self.log_max_total.value()
+        save_settings(self.settings)
+
+    def get_staging_store(self):
+        """数据文件暂存库，设置中关闭时返回 None"""
+        if not self.settings["staging_enabled"]:
+            return None
+        root = get_staging_dir(self.settings)
+        hardlinks = self.settings["staging_hardlinks"]
+        if self.staging_store is None or (self.staging_store.root, self.staging_store.hardlinks) != (root, hardlinks):
+            self.staging_store = StagingStore(root, hardlinks)
+        return self.staging_store
+
+    def get_copy_function(self):
+        """复制产物目录时使用的函数，使用硬链接时暂存库中的数据文件以硬链接代替复制"""
+        store = self.get_staging_store()
+        return store.make_copy_function() if store else shutil.copy2
+
+    def prune_staging(self):
+        store = self.get_staging_store() or StagingStore(get_staging_dir(self.settings),
+                                                          self.settings["staging_hardlinks"])
+        freed = store.prune() / (1024 * 1024)
+        self.status_bar.showMessage(f"已清理暂存库中不再使用的文件 ({freed:.1f} MB)", 3000)
+
+    def clear_build_cache(self):
+        size_mb = self.build_cache.total_size() / (1024 * 1024)
+        self.build_cache.clear()
+        self.status_bar.showMessage(f"已清空构建缓存 ({size_mb:.1f} MB)", 3000)
 
     def setup_history_tab(self, tab):
         layout = QVBoxLayout(tab)
         
-        self.history_list = QListWidget()
-        self.history_list.itemDoubleClicked.connect(self.load_config_from_history)
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("搜索配置 (名称、标签、脚本路径、包、插件...)")
+        self.history_search.setClearButtonEnabled(True)
+        self.history_search.textChanged.connect(self.load_history)
+        layout.addWidget(self.history_search)
+        
+        # 配置和构建记录都可能有上万条，使用按需读取的模型
+        self.history_model = LazyListModel(
+            lambda: self.config_manager.count_configs(self.history_search.text()),
+            lambda offset, limit: self.config_manager.list_configs(self.history_search.text(), offset, limit),
+            lambda row: f"{row[0]}  [{', '.join(row[1])}]" if row[1] else row[0],
+            self)
+        self.history_list = QListView()
+        self.history_list.setModel(self.history_model)
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.setSelectionMode(QListView.ExtendedSelection)
+        self.history_list.doubleClicked.connect(self.load_config_from_history)
         layout.addWidget(self.history_list)
         
         button_layout = QHBoxLayout()
         
         self.load_history_button = QPushButton("加载配置")
-        self.load_history_button.setIcon(QIcon("resources/icons/load.png"))
+        self.load_history_button.setIcon(self.get_icon("load.png"))
         self.load_history_button.clicked.connect(self.load_selected_config)
         button_layout.addWidget(self.load_history_button)
         
         self.delete_history_button = QPushButton("删除配置")
-        self.delete_history_button.setIcon(QIcon("resources/icons/delete.png"))
+        self.delete_history_button.setIcon(self.get_icon("delete.png"))
         self.delete_history_button.clicked.connect(self.delete_selected_config)
         button_layout.addWidget(self.delete_history_button)
         
         self.refresh_history_button = QPushButton("刷新列表")
-        self.refresh_history_button.setIcon(QIcon("resources/icons/refresh.png"))
+        self.refresh_history_button.setIcon(self.get_icon("refresh.png"))
         self.refresh_history_button.clicked.connect(self.load_history)
         button_layout.addWidget(self.refresh_history_button)
         
+        self.tag_history_button = QPushButton("设置标签")
+        self.tag_history_button.clicked.connect(self.edit_selected_tags)
+        button_layout.addWidget(self.tag_history_button)
+        
+        self.batch_build_button = QPushButton("构建选中")
+        self.batch_build_button.setIcon(self.get_icon("run.svg"))
+        self.batch_build_button.clicked.connect(self.build_selected_configs)
+        button_layout.addWidget(self.batch_build_button)
+        
         button_layout.addStretch()
         layout.addLayout(button_layout)
+        
+        records_layout = QHBoxLayout()
+        records_layout.addWidget(QLabel("构建记录:"))
+        records_layout.addStretch()
+        self.trend_button = QPushButton("趋势图")
+        self.trend_button.clicked.connect(self.show_build_trend)
+        records_layout.addWidget(self.trend_button)
+        self.compare_button = QPushButton("比较")
+        self.compare_button.setToolTip("比较选中的两条构建记录；只选一条时与同一配置的上一次构建比较")
+        self.compare_button.clicked.connect(self.show_build_compare)
+        records_layout.addWidget(self.compare_button)
+        self.build_log_button = QPushButton("查看日志")
+        self.build_log_button.setToolTip("查看选中构建记录的完整输出")
+        self.build_log_button.clicked.connect(self.show_selected_build_log)
+        records_layout.addWidget(self.build_log_button)
+        self.search_logs_button = QPushButton("搜索日志")
+        self.search_logs_button.setToolTip("在所有构建日志中查找错误信息")
+        self.search_logs_button.clicked.connect(self.show_log_search)
+        records_layout.addWidget(self.search_logs_button)
+        layout.addLayout(records_layout)
+        self.build_records_model = LazyListModel(
+            self.build_history.count,
+            lambda offset, limit: self.build_history.get_records(limit, offset),
+            self.format_build_record,
+            self)
+        self.build_records_list = QListView()
+        self.build_records_list.setModel(self.build_records_model)
+        self.build_records_list.setUniformItemSizes(True)
+        self.build_records_list.setSelectionMode(QListView.ExtendedSelection)
+        self.build_records_list.doubleClicked.connect(self.show_selected_build_log)
+        layout.addWidget(self.build_records_list)
+        
+        self.load_history()
+        self.load_build_records()
+
+    def load_build_records(self):
+        if self.history_tab in self.tab_builders:
+            return
+        self.build_records_model.reload()
+
+    def show_selected_build_log(self):
+        """只解压需要显示的部分，打开很长的旧日志也不会占用大量内存"""
+        index = self.build_records_list.currentIndex()
+        record = index.data(Qt.UserRole) if index.isValid() else None
+        if not record:
+            QMessageBox.warning(self, "警告", "请先选择一条构建记录!")
+            return
+        path = os.path.join(get_log_dir(), record.get("log") or "")
+        if not record.get("log") or not os.path.exists(path):
+            QMessageBox.information(self, "提示", "这次打包没有保存日志，或日志已按保留期限删除")
+            return
+        try:
+            reader = BuildLogReader(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "错误", f"无法读取日志: {str(e)}")
+            return
+        dialog = ConsolePagerDialog(reader, self, title=f"构建日志 - {record['config']} {record['time']}")
+        dialog.show()
+
+    def show_build_compare(self):
+        """列表中最新的记录在前，按行号倒序排列后较早的一条作为比较基准"""
+        indexes = sorted(self.build_records_list.selectionModel().selectedIndexes(),
+                         key=lambda index: index.row(), reverse=True)
+        records = [index.data(Qt.UserRole) for index in indexes]
+        records = [record for record in records if record]
+        if len(records) == 1:
+            trend = self.build_history.get_trend(records[0].get("config"))
+            position = max((i for i, record in enumerate(trend) if record == records[0]), default=0)
+            if position == 0:
+                QMessageBox.information(self, "提示", "这个配置没有更早的构建记录，请选择两条记录进行比较")
+                return
+            records.insert(0, trend[position - 1])
+        if len(records) != 2:
+            QMessageBox.warning(self, "警告", "请选择一条或两条构建记录!")
+            return
+        from compare_view import BuildCompareDialog
+        dialog = BuildCompareDialog(records[0], records[1], self)
+        dialog.show()
+
+    def show_log_search(self):
+        from log_search import LogSearchDialog
+        dialog = LogSearchDialog(self)
+        dialog.show()
+
+    def format_build_record(self, record):
+        status = "成功" if record["exit_code"] == 0 else f"失败 ({record['exit_code']})"
+        if record.get("failure"):
+            status += f": {record['failure']['title']}"
+        text = f"{record['time']}  {record['config']}  {status}  耗时 {record['elapsed']}秒"
+        if record.get("peak_memory_mb"):
+            text += f"  峰值内存 {record['peak_memory_mb']} MB"
+        if record.get("module_count"):
+            text += f"  模块 {record['module_count']}"
+        if record.get("artifact_size"):
+            text += f"  产物 {record['artifact_size'] / (1024 * 1024):.1f} MB"
+        if record.get("ccache"):
+            text += "  " + compiler_cache.format_stats(record["ccache"])
+        return text
+
+    def analyze_imports(self):
+        """在后台分析主脚本的导入关系并估算编译耗时，完成后显示建议
+
+        每个模块的编译耗时用当前配置最近的构建记录校准，没有记录时使用默认系数。
+        """
+        script_path = self.script_path.text().strip()
+        if not script_path or not os.path.isfile(script_path):
+            QMessageBox.warning(self, "警告", "请先选择要打包的Python脚本!")
+            return
+        import bloat_advisor
+        config = self.get_current_config()
+        if self.current_config_name:
+            records = self.build_history.get_trend(self.current_config_name,
+                                                   limit=bloat_advisor.CALIBRATION_RECORDS)
+        else:
+            records = self.build_history.get_records(bloat_advisor.CALIBRATION_RECORDS)
+        self.analyze_imports_button.setEnabled(False)
+        self.status_bar.showMessage("正在分析导入...")
+        self.run_in_background(bloat_advisor.analyze_and_advise, self.handle_import_report, script_path,
+                               config, bloat_advisor.get_seconds_per_module(records))
+
+    def handle_import_report(self, report):
+        self.analyze_imports_button.setEnabled(True)
+        self.status_bar.clearMessage()
+        if isinstance(report, Exception):
+            self.append_to_console(f"导入分析失败: {str(report)}\n", level="ERROR")
+            return
+        
+        import import_graph
+        import bloat_advisor
+        self.append_to_console("\n=== 导入分析 ===\n", level="STAGE")
+        self.append_to_console(import_graph.format_report(report) + "\n", level="INFO")
+        self.append_to_console(bloat_advisor.format_advice(report["advice"]) + "\n", level="INFO")
+        
+        from import_report import ImportReportDialog
+        dialog = ImportReportDialog(report, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        selected = dialog.get_selected()
+        for edit, key in ((self.include_packages_edit, "include_packages"),
+                          (self.nofollow_imports_edit, "nofollow_imports"),
+                          (self.noinclude_modes_edit, "noinclude_modes")):
+            packages = split_list(edit.text())
+            packages += [package for package in selected[key] if package not in packages]
+            edit.setText(",".join(packages))
+        if selected["include_packages"]:
+            self.include_packages_check.setChecked(True)
+        self.status_bar.showMessage("已应用导入分析建议", 3000)
+
+    def start_plugin_scan(self):
+        """在后台根据导入关系推断项目需要的Nuitka插件 (结果按项目缓存)"""
+        script_path = self.script_path.text().strip()
+        if not script_path or not os.path.isfile(script_path):
+            self.plugin_scan = None
+            self.update_plugin_hint()
+            return
+        import plugin_advisor
+        self.run_in_background(plugin_advisor.scan_project, self.handle_plugin_scan, script_path)
+
+    def handle_plugin_scan(self, result):
+        if isinstance(result, Exception):
+            self.append_to_console(f"插件推断失败: {str(result)}\n", level="WARNING")
+            return
+        # 扫描期间脚本路径又被修改过时丢弃旧结果
+        if result["script_path"] != os.path.abspath(self.script_path.text().strip()):
+            return
+        self.plugin_scan = result
+        self.update_plugin_hint()
+
+    def get_plugin_warnings(self):
+        """已启用但与当前项目无关的插件 [(插件, 原因)]，还没有推断结果时为空"""
+        if self.plugin_scan is None or not hasattr(self, 'plugins_edit'):
+            return []
+        import plugin_advisor
+        return plugin_advisor.check_enabled_plugins(self.plugins_edit.text(), self.plugin_scan)
+
+    def update_plugin_hint(self):
+        if not hasattr(self, 'plugin_hint_label'):
+            return
+        if self.plugin_scan is None:
+            self.plugin_hint_label.clear()
+            self.apply_plugins_button.setEnabled(False)
+            return
+        
+        reasons = self.plugin_scan["reasons"]
+        suggested = ", ".join(f"{plugin} ({reasons[plugin]})" for plugin in self.plugin_scan["plugins"])
+        lines = [f"建议启用: {suggested or '无需插件'}"]
+        lines += [f"{plugin}: {reason}" for plugin, reason in self.get_plugin_warnings()]
+        lines += self.plugin_scan["conflicts"]
+        self.plugin_hint_label.setText("\n".join(lines))
+        self.apply_plugins_button.setEnabled(
+            set(split_list(self.plugins_edit.text())) != set(self.plugin_scan["plugins"]))
+
+    def apply_plugin_suggestion(self):
+        """启用建议的插件并移除与项目无关的插件，不认识的插件保留"""
+        if self.plugin_scan is None:
+            return
+        unneeded = {plugin for plugin, _ in self.get_plugin_warnings()}
+        plugins = [plugin for plugin in split_list(self.plugins_edit.text()) if plugin not in unneeded]
+        plugins += [plugin for plugin in self.plugin_scan["plugins"] if plugin not in plugins]
+        if plugins:
+            self.enable_plugin_check.setChecked(True)
+        self.plugins_edit.setText(",".join(plugins))
+
+    def show_build_trend(self):
+        from trend_chart import TrendChartDialog
+        dialog = TrendChartDialog(self.build_history, self.stages, self.current_config_name, self)
+        dialog.show()
 
     def add_include_file(self):
         files, _ = QFileDialog.getOpenFileNames(self, "选择要包含的文件", "", "All Files (*)")
-        if files:
-            for file in files:
-                if file not in self.included_files:
-                    self.included_files.append(file)
-                    self.included_files_list.addItem(file)
+        if files and self.data_files_model.add_files(files):
+            self.refresh_data_summary()
 
-    def remove_include_file(self):
-        selected_items = self.included_files_list.selectedItems()
-        if not selected_items:
+    def add_include_dir(self):
+        directory = QFileDialog.getExistingDirectory(self, "选择要包含的目录")
+        if not directory:
             return
-            
-        for item in selected_items:
-            self.included_files.remove(item.text())
-            self.included_files_list.takeItem(self.included_files_list.row(item))
+        dialog = DirEntryDialog(directory, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        if self.data_files_model.add_dir(dialog.get_entry()):
+            self.refresh_data_summary()
+        else:
+            self.status_bar.showMessage("相同的目录已在列表中", 3000)
+
+    def remove_include_file(self):
+        rows = [index.row() for index in self.included_files_list.selectionModel().selectedRows()]
+        if rows:
+            self.data_files_model.remove_rows(rows)
+            self.refresh_data_summary()
 
     def clear_include_files(self):
-        self.included_files.clear()
-        self.included_files_list.clear()
+        self.data_files_model.clear()
+        self.refresh_data_summary()
+
+    def refresh_data_summary(self):
+        """在后台统计包含的文件数和总大小，只采用最后一次请求的结果"""
+        self.data_summary_generation += 1
+        model = self.data_files_model
+        if not model.rowCount():
+            self.data_summary_label.clear()
+            return
+        self.data_summary_label.setText("正在统计...")
+        generation = self.data_summary_generation
+        self.run_in_background(summarize_entries,
+                               lambda summary: self.handle_data_summary(summary, generation),
+                               model.get_included_files(), model.get_included_dirs())
+
+    def handle_data_summary(self, summary, generation):
+        if generation != self.data_summary_generation:
+            return
+        if isinstance(summary, Exception):
+            self.data_summary_label.setText(f"统计失败: {str(summary)}")
+            return
+        self.data_files_model.set_summary(summary)
+        model = self.data_files_model
+        self.data_summary_label.setText(
+            f"{len(model.dirs)} 个目录、{len(model.files)} 个文件，"
+            f"共包含 {summary['count']} 个文件，{format_size(summary['size'])}")
 
     def load_history(self):
-        self.history_list.clear()
-        configs = self.config_manager.get_saved_configs()
-        
-        for config in configs:
-            item = QListWidgetItem(config)
-            self.history_list.addItem(item)
+        if self.history_tab in self.tab_builders:
+            return
+        self.history_model.reload()
+
+    def get_selected_config_names(self):
+        indexes = sorted(self.history_list.selectionModel().selectedIndexes(), key=lambda index: index.row())
+        return [index.data(Qt.UserRole)[0] for index in indexes]
 
     def load_selected_config(self):
-        selected_items = self.history_list.selectedItems()
-        if not selected_items:
+        selected_names = self.get_selected_config_names()
+        if not selected_names:
+            QMessageBox.warning(self, "警告", "请先选择一个配置!")
+            return
+        
+        self.load_config(selected_names[0])
+
+    def edit_selected_tags(self):
+        selected_names = self.get_selected_config_names()
+        if not selected_names:
             QMessageBox.warning(self, "警告", "请先选择一个配置!")
             return
         
-        config_name = selected_items[0].text()
-        self.load_config(config_name)
+        config_name = selected_names[0]
+        tags, ok = QInputDialog.getText(
+            self, "设置标签", f"配置 '{config_name}' 的标签 (用逗号分隔):",
+            text=", ".join(self.config_manager.get_tags(config_name)))
+        if ok and self.config_manager.set_tags(config_name, [tag.strip() for tag in tags.split(",") if tag.strip()]):
+            self.load_history()
 
     def delete_selected_config(self):
-        selected_items = self.history_list.selectedItems()
-        if not selected_items:
+        selected_names = self.get_selected_config_names()
+        if not selected_names:
             QMessageBox.warning(self, "警告", "请先选择一个配置!")
             return
         
-        config_name = selected_items[0].text()
+        config_name = selected_names[0]
         
         reply = QMessageBox.question(
             self, "确认删除", 
@@ -723,11 +1111,36 @@ class NuitkaPackager(QMainWindow):
             else:
                 QMessageBox.warning(self, "错误", "删除配置失败!")
 
-    def load_config_from_history(self, item):
-        config_name = item.text()
-        self.load_config(config_name)
+    def build_selected_configs(self):
+        """把选中的多个配置放入批量打包队列"""
+        selected_names = self.get_selected_config_names()
+        if not selected_names:
+            QMessageBox.warning(self, "警告", "请先选择要打包的配置!")
+            return
+        
+        nuitka_path = self.get_nuitka_path()
+        if not nuitka_path:
+            QMessageBox.warning(self, "错误", "无法定位nuitka可执行文件")
+            return
+        
+        named_configs = []
+        for name in selected_names:
+            config_data = self.config_manager.load_config(name)
+            if config_data is None:
+                return
+            named_configs.append((name, config_data))
+        
+        from batch_build import BatchBuildDialog
+        staging_root = get_staging_dir(self.settings) if self.settings["staging_enabled"] else None
+        dialog = BatchBuildDialog(named_configs, self.stages, nuitka_path,
+                                  compiler_cache.build_env(self.settings), staging_root, self.settings, self)
+        dialog.show()
+
+    def load_config_from_history(self, index):
+        self.load_config(index.data(Qt.UserRole)[0])
 
     def load_config(self, name):
+        self.ensure_tab_built(self.advanced_tab)
         config_data = self.config_manager.load_config(name)
         if config_data is None:
             return
@@ -739,28 +1152,34 @@ class NuitkaPackager(QMainWindow):
         self.standalone_check.setChecked(config_data.get("standalone", True))
         self.onefile_check.setChecked(config_data.get("onefile", False))
         self.remove_output_check.setChecked(config_data.get("remove_output", False))
+        self.incremental_check.setChecked(config_data.get("incremental", False))
         self.show_progress_check.setChecked(config_data.get("show_progress", True))
         self.follow_imports_check.setChecked(config_data.get("follow_imports", False))
         self.include_packages_check.setChecked(config_data.get("include_packages", True))
         self.include_packages_edit.setText(config_data.get("include_packages_list", ""))
+        self.nofollow_imports_edit.setText(config_data.get("nofollow_imports_list", ""))
+        self.noinclude_modes_edit.setText(config_data.get("noinclude_modes_list", ""))
         self.enable_plugin_check.setChecked(config_data.get("enable_plugin", True))
-        self.plugins_edit.setText(config_data.get("plugins_list", "tk-inter,pylint-warnings"))
+        self.plugins_edit.setText(config_data.get("plugins_list", ""))
         self.icon_path.setText(config_data.get("icon_path", ""))
         self.company_name.setText(config_data.get("company_name", ""))
         self.product_name.setText(config_data.get("product_name", ""))
         self.version_edit.setText(config_data.get("version", ""))
         self.console_window_check.setChecked(config_data.get("console_window", True))
         self.parallel_check.setChecked(config_data.get("parallel", True))
-        self.parallel_count.setValue(config_data.get("parallel_count", 4))
+        parallel_count = config_data.get("parallel_count", 4)
+        self.parallel_count.setValue(0 if parallel_count == "auto" else parallel_count)
+        self.output_patterns_edit.setPlainText(format_pattern_lines(config_data.get("output_patterns", [])))
         
-        self.included_files = config_data.get("included_files", [])
-        self.included_files_list.clear()
-        for file in self.included_files:
-            self.included_files_list.addItem(file)
+        self.data_files_model.set_entries(config_data.get("included_files", []),
+                                          config_data.get("included_dirs", []))
+        self.refresh_data_summary()
         
+        self.current_config_name = name
         self.status_bar.showMessage(f"已加载配置: {name}", 3000)
 
     def get_current_config(self):
+        self.ensure_tab_built(self.advanced_tab)
         config_data = {
             "script_path": self.script_path.text(),
             "output_dir": self.output_dir.text(),
@@ -769,10 +1188,13 @@ class NuitkaPackager(QMainWindow):
             "standalone": self.standalone_check.isChecked(),
             "onefile": self.onefile_check.isChecked(),
             "remove_output": self.remove_output_check.isChecked(),
+            "incremental": self.incremental_check.isChecked(),
             "show_progress": self.show_progress_check.isChecked(),
             "follow_imports": self.follow_imports_check.isChecked(),
             "include_packages": self.include_packages_check.isChecked(),
             "include_packages_list": self.include_packages_edit.text(),
+            "nofollow_imports_list": self.nofollow_imports_edit.text(),
+            "noinclude_modes_list": self.noinclude_modes_edit.text(),
             "enable_plugin": self.enable_plugin_check.isChecked(),
             "plugins_list": self.plugins_edit.text(),
             "icon_path": self.icon_path.text(),
@@ -782,7 +1204,9 @@ class NuitkaPackager(QMainWindow):
             "console_window": self.console_window_check.isChecked(),
             "parallel": self.parallel_check.isChecked(),
             "parallel_count": self.parallel_count.value(),
-            "included_files": self.included_files.copy()
+            "output_patterns": parse_pattern_lines(self.output_patterns_edit.toPlainText()),
+            "included_files": self.data_files_model.get_included_files(),
+            "included_dirs": self.data_files_model.get_included_dirs()
         }
         
         return config_data
@@ -801,6 +1225,7 @@ class NuitkaPackager(QMainWindow):
         
         if ok and name:
             if self.config_manager.save_config(config_data, name):
+                self.current_config_name = name
                 self.status_bar.showMessage(f"配置已保存: {name}", 3000)
                 self.load_history()
             else:
@@ -814,12 +1239,14 @@ class NuitkaPackager(QMainWindow):
         
         if ok and name:
             if self.config_manager.save_config(config_data, name):
+                self.current_config_name = name
                 self.status_bar.showMessage(f"配置已另存为: {name}", 3000)
                 self.load_history()
             else:
                 QMessageBox.warning(self, "错误", "保存配置失败!")
 
     def new_config(self):
+        self.ensure_tab_built(self.advanced_tab)
         if any([
             self.script_path.text(),
             self.output_dir.text(),
@@ -827,12 +1254,14 @@ class NuitkaPackager(QMainWindow):
             self.onefile_check.isChecked(),
             self.follow_imports_check.isChecked(),
             self.include_packages_edit.text(),
-            self.plugins_edit.text() != "tk-inter,pylint-warnings",
+            self.nofollow_imports_edit.text(),
+            self.noinclude_modes_edit.text(),
+            self.plugins_edit.text(),
             self.icon_path.text(),
             self.company_name.text(),
             self.product_name.text(),
             self.version_edit.text(),
-            self.included_files
+            self.data_files_model.rowCount()
         ]):
             reply = QMessageBox.question(
                 self, "新建配置", 
@@ -851,21 +1280,26 @@ class NuitkaPackager(QMainWindow):
         self.standalone_check.setChecked(True)
         self.onefile_check.setChecked(False)
         self.remove_output_check.setChecked(False)
+        self.incremental_check.setChecked(False)
         self.show_progress_check.setChecked(True)
         self.follow_imports_check.setChecked(False)
         self.include_packages_check.setChecked(True)
         self.include_packages_edit.clear()
+        self.nofollow_imports_edit.clear()
+        self.noinclude_modes_edit.clear()
         self.enable_plugin_check.setChecked(True)
-        self.plugins_edit.setText("tk-inter,pylint-warnings")
+        self.plugins_edit.clear()
         self.icon_path.clear()
         self.company_name.clear()
         self.product_name.clear()
         self.version_edit.clear()
         self.console_window_check.setChecked(True)
         self.parallel_check.setChecked(True)
-        self.parallel_count.setValue(4)
+        self.parallel_count.setValue(0)
+        self.output_patterns_edit.clear()
         self.clear_include_files()
         
+        self.current_config_name = None
         self.status_bar.showMessage("已重置为新配置", 3000)
 
     def export_config(self):
@@ -881,6 +1315,7 @@ class NuitkaPackager(QMainWindow):
             QMessageBox.warning(self, "错误", "导出配置失败!")
 
     def import_config(self):
+        self.ensure_tab_built(self.advanced_tab)
         config_data = self.config_manager.import_config()
         if config_data is None:
             return
@@ -892,12 +1327,14 @@ class NuitkaPackager(QMainWindow):
             self.onefile_check.isChecked(),
             self.follow_imports_check.isChecked(),
             self.include_packages_edit.text(),
-            self.plugins_edit.text() != "tk-inter,pylint-warnings",
+            self.nofollow_imports_edit.text(),
+            self.noinclude_modes_edit.text(),
+            self.plugins_edit.text(),
             self.icon_path.text(),
             self.company_name.text(),
             self.product_name.text(),
             self.version_edit.text(),
-            self.included_files
+            self.data_files_model.rowCount()
         ]):
             reply = QMessageBox.question(
                 self, "导入配置", 
@@ -913,6 +1350,7 @@ class NuitkaPackager(QMainWindow):
         self.status_bar.showMessage("配置已导入", 3000)
 
     def load_config_from_data(self, config_data):
+        self.ensure_tab_built(self.advanced_tab)
         self.script_path.setText(config_data.get("script_path", ""))
         self.output_dir.setText(config_data.get("output_dir", ""))
         self.mode_combo.setCurrentText(config_data.get("mode", "单文件"))
@@ -920,24 +1358,28 @@ class NuitkaPackager(QMainWindow):
         self.standalone_check.setChecked(config_data.get("standalone", True))
         self.onefile_check.setChecked(config_data.get("onefile", False))
         self.remove_output_check.setChecked(config_data.get("remove_output", False))
+        self.incremental_check.setChecked(config_data.get("incremental", False))
         self.show_progress_check.setChecked(config_data.get("show_progress", True))
         self.follow_imports_check.setChecked(config_data.get("follow_imports", False))
         self.include_packages_check.setChecked(config_data.get("include_packages", True))
         self.include_packages_edit.setText(config_data.get("include_packages_list", ""))
+        self.nofollow_imports_edit.setText(config_data.get("nofollow_imports_list", ""))
+        self.noinclude_modes_edit.setText(config_data.get("noinclude_modes_list", ""))
         self.enable_plugin_check.setChecked(config_data.get("enable_plugin", True))
-        self.plugins_edit.setText(config_data.get("plugins_list", "tk-inter,pylint-warnings"))
+        self.plugins_edit.setText(config_data.get("plugins_list", ""))
         self.icon_path.setText(config_data.get("icon_path", ""))
         self.company_name.setText(config_data.get("company_name", ""))
         self.product_name.setText(config_data.get("product_name", ""))
         self.version_edit.setText(config_data.get("version", ""))
         self.console_window_check.setChecked(config_data.get("console_window", True))
         self.parallel_check.setChecked(config_data.get("parallel", True))
-        self.parallel_count.setValue(config_data.get("parallel_count", 4))
+        parallel_count = config_data.get("parallel_count", 4)
+        self.parallel_count.setValue(0 if parallel_count == "auto" else parallel_count)
+        self.output_patterns_edit.setPlainText(format_pattern_lines(config_data.get("output_patterns", [])))
         
-        self.included_files = config_data.get("included_files", [])
-        self.included_files_list.clear()
-        for file in self.included_files:
-            self.included_files_list.addItem(file)
+        self.data_files_model.set_entries(config_data.get("included_files", []),
+                                          config_data.get("included_dirs", []))
+        self.refresh_data_summary()
 
     def check_nuitka_update(self):
         self.status_bar.showMessage("正在检查Nuitka更新...")
@@ -973,6 +1415,8 @@ class NuitkaPackager(QMainWindow):
             f"系统平台: {sys.platform}",
             f"工作目录: {os.getcwd()}",
             f"Nuitka路径: {self.get_nuitka_path() or '未找到'}",
+            f"C编译器: {self.toolchain['c_compiler'] if self.toolchain and self.toolchain['c_compiler'] else '未找到'}",
+            f"ccache: {self.toolchain['ccache'] if self.toolchain and self.toolchain['ccache'] else '未找到'}",
             f"系统PATH环境变量:",
             *os.environ.get("PATH", "").split(os.pathsep)
         ]
@@ -981,9 +1425,12 @@ class NuitkaPackager(QMainWindow):
         QMessageBox.information(
             self,
             "环境诊断",
-            "\n".join(info[:6]) + "\n\nPATH变量已输出到控制台",
+            "\n".join(info[:8]) + "\n\nPATH变量已输出到控制台",
             QMessageBox.Ok
         )
+        
+        # 诊断时重新检测工具链，刷新磁盘缓存
+        self.detect_toolchain(refresh=True)
 
     def show_about(self):
         about_text = """
@@ -1007,86 +1454,22 @@ class NuitkaPackager(QMainWindow):
             line_edit.setText(dir_path)
 
     def generate_nuitka_command(self):
-        """生成Nuitka打包命令"""
-        command = ["nuitka"]
-        
-        # 添加基本参数
-        command.append("--standalone")
-        command.append("--follow-imports")
-        command.append("--remove-output")
-        command.append("--show-progress")
-        command.append("--show-memory")
-        
-        # 添加高级设置中的插件选项
-        if hasattr(self, 'enable_plugin_check') and self.enable_plugin_check.isChecked() and self.plugins_edit.text().strip():
-            plugins = [p.strip() for p in self.plugins_edit.text().split(',') if p.strip()]
-            for plugin in plugins:
-                command.append(f"--enable-plugin={plugin}")
-        
-        # 添加包含包选项
-        if hasattr(self, 'include_packages_check') and self.include_packages_check.isChecked() and self.include_packages_edit.text().strip():
-            packages = [p.strip() for p in self.include_packages_edit.text().split(',') if p.strip()]
-            for package in packages:
-                command.append(f"--include-package={package}")
-        
-        # 添加Qt插件路径
-        qt_plugin_path = os.path.join(
-            os.path.dirname(sys.executable),
-            "Lib\\site-packages\\PyQt5\\Qt5\\plugins"
-        )
-        command.append(f"--include-data-dir={qt_plugin_path}=PyQt5/Qt5/plugins")
-        
-        # 添加资源目录
-        resource_path = self.get_resource_path("resources")
-        if os.path.exists(resource_path):
-            command.append(f"--include-data-dir={resource_path}=resources")
-        
-        # 添加单文件模式参数
-        if self.onefile_check.isChecked():
-            command.append("--onefile")
-        
-        # 添加输出目录
-        output_dir = self.output_dir.text().strip()
-        if output_dir:
-            if not os.path.exists(output_dir):
-                try:
-                    os.makedirs(output_dir)
-                except Exception as e:
-                    self.append_to_console(f"错误: 无法创建输出目录 {output_dir}: {str(e)}\n", level="ERROR")
-                    return None
-            command.append(f"--output-dir={os.path.abspath(output_dir)}")
-        else:
-            default_dir = os.path.join(os.getcwd(), 'dist')
-            if not os.path.exists(default_dir):
-                os.makedirs(default_dir)
-            command.append(f"--output-dir={default_dir}")
-        
-        # 添加Windows特定参数
-        if sys.platform == "win32":
-            if self.icon_path.text().strip():
-                icon_path = os.path.abspath(self.icon_path.text().strip())
-                if os.path.exists(icon_path):
-                    command.append(f"--windows-icon-from-ico={icon_path}")
-                else:
-                    self.append_to_console(f"警告: 指定的图标文件 {icon_path} 不存在\n", level="WARNING")
-            command.append("--windows-disable-console")
-            command.append("--platform=windows")
-        
-        # 添加包含的文件
-        for file_path in self.included_files:
-            if os.path.isdir(file_path):
-                command.append(f"--include-data-dir={file_path}={os.path.basename(file_path)}")
-            else:
-                command.append(f"--include-data-file={file_path}={os.path.basename(file_path)}")
-        
-        # 添加主模块
-        command.append("main.py")
-        
-        return command
+        """生成预览用的Nuitka命令
+
+        与实际打包一样由 command_builder.build_command 生成，只是不创建任何目录:
+        增量模式下的构建目录只计算路径，自动选择的 --jobs 在启动时才确定，预览中不包含。
+        """
+        config = self.get_current_config()
+        build_root = None
+        if config.get("incremental"):
+            build_root = incremental.get_build_root(config, self.current_config_name)
+        stage_data = self.settings["staging_enabled"] and supports_staging(config)
+        return build_command(config, self.get_nuitka_path() or "nuitka", output_dir=build_root,
+                             stage_data=stage_data)
     
     def show_command_preview(self):
         """显示将要执行的打包命令"""
-        command = " ".join(self.generate_nuitka_command())
+        command = format_command(self.generate_nuitka_command())
         dialog = QDialog(self)
         dialog.setWindowTitle("命令预览")
         dialog.resize(800, 600)  # 设置对话框初始大小
@@ -1111,80 +1494,53 @@ class NuitkaPackager(QMainWindow):
             QMessageBox.warning(self, "错误", "请选择要打包的Python脚本!")
             return
         
-        self.console.clear()
-        self.current_stage = 0
-        self.stage_progress = 0
-        self.progress.setValue(0)
+        self.console_renderer.clear()
+        self.progress_tracker.reset()
+        self.failure_classifier.reset()
+        self.update_progress()
         
         try:
             nuitka_path = self.get_nuitka_path()
             if not nuitka_path:
                 raise FileNotFoundError("无法定位nuitka可执行文件")
             
-            command = [nuitka_path]
-            
-            if self.standalone_check.isChecked():
-                command.append("--standalone")
-            
-            if self.onefile_check.isChecked():
-                command.append("--onefile")
-            
-            if self.remove_output_check.isChecked():
-                command.append("--remove-output")
-            
-            if self.show_progress_check.isChecked():
-                command.append("--show-progress")
-            
-            if self.output_dir.text():
-                command.append(f"--output-dir={self.output_dir.text()}")
-            
-            for file_path in self.included_files:
-                command.append(f"--include-data-file={file_path}={os.path.basename(file_path)}")
+            config = self.get_current_config()
+            self.output_parser = OutputParser(self.stages, config.get("output_patterns"))
             
-            platform_map = {
-                "Windows": "win",
-                "Linux": "linux",
-                "macOS": "macos"
-            }
-            if self.platform_combo.currentIndex() > 0:
-                platform = platform_map[self.platform_combo.currentText()]
-                command.append(f"--assume-platform={platform}")
+            if config.get("enable_plugin", True):
+                for plugin, reason in self.get_plugin_warnings():
+                    self.append_to_console(f"插件 {plugin} 可能不需要: {reason}\n", level="WARNING")
             
-            if self.follow_imports_check.isChecked():
-                command.append("--follow-imports")
-            
-            if self.include_packages_check.isChecked() and self.include_packages_edit.text():
-                packages = self.include_packages_edit.text().split(",")
-                for pkg in packages:
-                    command.append(f"--include-package={pkg.strip()}")
-            
-            if self.enable_plugin_check.isChecked() and self.plugins_edit.text():
-                plugins = self.plugins_edit.text().split(",")
-                for plugin in plugins:
-                    command.append(f"--enable-plugin={plugin.strip()}")
-            
-            if self.icon_path.text():
-                command.append(f"--windows-icon-from-ico={self.icon_path.text()}")
-            
-            if self.company_name.text():
-                command.append(f"--windows-company-name={self.company_name.text()}")
-            
-            if self.product_name.text():
-                command.append(f"--windows-product-name={self.product_name.text()}")
-            
-            if self.version_edit.text():
-                command.append(f"--windows-product-version={self.version_edit.text()}")
-            
-            if not self.console_window_check.isChecked():
-                command.append("--windows-disable-console")
+            if self.settings["use_build_daemon"] and self.submit_to_daemon(config):
+                return
             
-            if self.parallel_check.isChecked():
-                command.append(f"--jobs={self.parallel_count.value()}")
+            self.start_build_log(config)
+            self.pending_cache_key = None
+            self.pending_config = config
+            if self.settings["build_cache_enabled"] and self.detected_version not in (None, "未知版本"):
+                # 计算缓存键要哈希源码树和数据文件，恢复产物要复制整个目录，都在后台进行
+                clean, self.pending_cache_clean = self.pending_cache_clean, False
+                self.run_button.setEnabled(False)
+                self.run_in_background(self.restore_from_cache,
+                                       lambda result: self.handle_cache_result(result, config, nuitka_path),
+                                       config, self.detected_version, self.get_copy_function(), clean)
+                return
+            self.launch_build(config, nuitka_path)
             
-            command.append(self.script_path.text())
+        except Exception as e:
+            self.report_start_failure(e)
+
+    def launch_build(self, config, nuitka_path):
+        """构建缓存未命中时启动Nuitka进程"""
+        try:
+            self.pending_build_root = self.prepare_incremental_build(config)
+            config = self.tune_jobs(config)
+            self.pending_stage_data = self.get_staging_store() is not None and supports_staging(config)
+            command = build_command(config, nuitka_path, output_dir=self.pending_build_root,
+                                    stage_data=self.pending_stage_data)
             
             self.append_to_console("=== 执行命令 ===\n", level="STAGE")
-            self.append_to_console(" ".join(command).replace("\\", "/") + "\n\n", level="COMMAND")
+            self.append_to_console(format_command(command) + "\n\n", level="COMMAND")
             
             # 使用QProcess执行打包命令
             try:
@@ -1193,15 +1549,26 @@ class NuitkaPackager(QMainWindow):
                 self.process.readyReadStandardOutput.connect(self.handle_process_output)
                 self.process.readyReadStandardError.connect(self.handle_process_output)
                 self.process.finished.connect(self.process_finished)
+                self.process.errorOccurred.connect(self.process_error)
+                
+                # 所有打包任务共用同一个编译缓存
+                env = QProcessEnvironment.systemEnvironment()
+                for key, value in compiler_cache.build_env(self.settings).items():
+                    env.insert(key, value)
+                self.process.setProcessEnvironment(env)
+                self.ccache_before = None
+                self.run_in_background(compiler_cache.read_stats, self.set_ccache_before, self.settings)
                 
                 # 设置工作目录
-                if self.output_dir.text():
+                working_dir = self.pending_build_root or self.output_dir.text()
+                if working_dir:
                     try:
-                        os.makedirs(self.output_dir.text(), exist_ok=True)
-                        self.process.setWorkingDirectory(self.output_dir.text())
+                        os.makedirs(working_dir, exist_ok=True)
+                        self.process.setWorkingDirectory(working_dir)
                     except Exception as e:
                         error_msg = f"无法创建输出目录: {str(e)}\n"
                         self.append_to_console(error_msg, level="ERROR")
+                        self.job_slot.release()
                         self.run_button.setEnabled(True)
                         self.stop_button.setEnabled(False)
                         return
@@ -1210,7 +1577,6 @@ class NuitkaPackager(QMainWindow):
                 
                 self.run_button.setEnabled(False)
                 self.stop_button.setEnabled(True)
-                self.progress_timer.start(80)
                 
                 self.start_time = QDateTime.currentDateTime()
                 self.append_to_console(f"打包开始于: {self.start_time.toString('yyyy-MM-dd hh:mm:ss')}\n", 
@@ -1219,90 +1585,293 @@ class NuitkaPackager(QMainWindow):
             except Exception as e:
                 error_msg = f"启动进程失败: {str(e)}\n"
                 self.append_to_console(error_msg, level="ERROR")
+                self.job_slot.release()
                 self.run_button.setEnabled(True)
                 self.stop_button.setEnabled(False)
             
         except Exception as e:
-            error_msg = f"""
-            启动失败详细诊断:
-            - 错误类型: {type(e).__name__}
-            - 错误信息: {str(e)}
-            - Nuitka路径: {self.get_nuitka_path() or '未找到'}
-            - Python路径: {sys.executable}
-            - 工作目录: {os.getcwd()}
-            """
-            # 避免使用colorama的ANSI转义序列
-            error_msg = error_msg.replace("\\", "/")
-            plain_message = error_msg
-            
-            if hasattr(self, 'console') and self.console:
-                cursor = self.console.textCursor()
-                cursor.movePosition(QTextCursor.End)
-            
-            if "ERROR" in self.console_colors:
-                char_format = QTextCharFormat()
-                char_format.setForeground(self.console_colors["ERROR"])
-                cursor.setCharFormat(char_format)
-            
-                cursor.insertText(plain_message)
-                self.console.setTextCursor(cursor)
-                self.progress.setValue(0)
-                self.run_button.setEnabled(True)
-                self.stop_button.setEnabled(False)
+            self.report_start_failure(e)
+
+    def report_start_failure(self, e):
+        """启动打包失败时输出诊断信息并恢复界面"""
+        error_msg = f"""
+        启动失败详细诊断:
+        - 错误类型: {type(e).__name__}
+        - 错误信息: {str(e)}
+        - Nuitka路径: {self.get_nuitka_path() or '未找到'}
+        - Python路径: {sys.executable}
+        - 工作目录: {os.getcwd()}
+        """
+        # 避免使用colorama的ANSI转义序列
+        error_msg = error_msg.replace("\\", "/")
+        self.append_to_console(error_msg, level="ERROR")
+        self.job_slot.release()
+        self.progress.setValue(0)
+        self.run_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def submit_to_daemon(self, config):
+        """有运行中的构建服务时把任务交给服务执行并接收其输出，返回是否已提交"""
+        from daemon import DaemonClient
+        client = DaemonClient.connect()
+        if client is None:
+            self.append_to_console("没有运行中的构建服务，在本程序中打包\n", level="WARNING")
+            return False
+        try:
+            job = client.submit(config, name=self.current_config_name)
+        except OSError as e:
+            self.append_to_console(f"提交到构建服务失败: {str(e)}，在本程序中打包\n", level="WARNING")
+            return False
+        
+        self.pending_config = config
+        self.daemon_job = (client, job["id"])
+        self.daemon_stream = BackgroundStream(client.iter_events, job["id"], parent=self)
+        self.daemon_stream.item_ready.connect(self.handle_daemon_event)
+        self.daemon_stream.failed.connect(self.handle_daemon_error)
+        self.daemon_stream.start()
+        
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.start_time = QDateTime.currentDateTime()
+        self.append_to_console(f"已提交到构建服务，任务 {job['id']}\n", level="INFO")
+        return True
+
+    def handle_daemon_event(self, event):
+        if event["type"] == "log":
+            if event["text"].strip():
+                self.handle_build_output(event["text"])
+        elif event["type"] == "finished":
+            self.daemon_job_finished(event)
+
+    def daemon_job_finished(self, event):
+        """构建服务中的任务结束，构建记录由服务写入"""
+        self.daemon_job = None
+        elapsed = self.start_time.secsTo(QDateTime.currentDateTime())
+        if event["state"] == "succeeded":
+            self.progress_tracker.finish()
+            self.update_progress()
+            self.append_to_console("\n=== 打包成功 ===\n", level="STAGE")
+            for path in event["artifacts"]:
+                self.append_to_console(f"产物: {path}\n", level="INFO")
+        elif event["state"] == "cancelled":
+            self.append_to_console("\n构建服务中的任务已取消\n", level="WARNING")
+        else:
+            self.progress.setValue(0)
+            self.progress.setFormat(f"%p% - 失败于: {self.stages[self.progress_tracker.current_stage]['name']}")
+            self.append_to_console("\n=== 打包失败 ===\n", level="ERROR")
+            self.append_to_console(f"进程退出代码: {event['exit_code']}\n", level="ERROR")
+        self.append_to_console(f"耗时: {elapsed}秒\n", level="INFO")
+        self.run_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def handle_daemon_error(self, error):
+        self.daemon_job = None
+        self.append_to_console(f"与构建服务的连接中断: {str(error)}\n", level="ERROR")
+        self.run_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def start_build_log(self, config):
+        """开始把本次打包的输出另存为压缩的构建日志 (构建服务中的任务由服务保存)"""
+        self.finish_build_log()
+        name = self.current_config_name or os.path.splitext(os.path.basename(config["script_path"]))[0]
+        self.build_log = open_build_log(name, self.settings, {"script_path": config["script_path"],
+                                                              "nuitka_version": self.detected_version})
+        self.console_renderer.build_log = self.build_log
+
+    def finish_build_log(self, exit_code=None):
+        """结束构建日志，返回日志文件名；写入和压缩在后台线程中完成"""
+        log, self.build_log = self.build_log, None
+        self.console_renderer.build_log = None
+        if log is None:
+            return None
+        log.close(exit_code)
+        return log.name
+
+    def tune_jobs(self, config):
+        """在本机运行中的打包里登记名额，并发数为自动时按机器状况选择 --jobs"""
+        self.job_slot.release()
+        self.job_slot.acquire()
+        records = []
+        if job_tuner.is_auto(config):
+            name = self.current_config_name or os.path.splitext(os.path.basename(config["script_path"]))[0]
+            records = job_tuner.load_records(name)
+        config, plan = job_tuner.tune_config(config, self.job_slot, records)
+        if plan:
+            self.append_to_console(job_tuner.format_plan(plan) + "\n", level="INFO")
+        return config
+
+    def restore_from_cache(self, config, nuitka_version, copy_function, clean=False):
+        """在后台线程中计算缓存键，命中时恢复产物，返回 (缓存键, 是否已恢复)；clean 为真时删除该缓存项"""
+        key = self.build_cache.compute_key(config, nuitka_version)
+        if clean:
+            self.build_cache.remove(key)
+            return key, False
+        return key, self.build_cache.restore(key, get_artifact_paths(config), copy_function)
+
+    def handle_cache_result(self, result, config, nuitka_path):
+        if isinstance(result, Exception):
+            self.append_to_console(f"构建缓存不可用: {str(result)}\n", level="WARNING")
+            self.launch_build(config, nuitka_path)
+            return
+        
+        key, restored = result
+        if restored:
+            self.append_to_console("=== 命中构建缓存 ===\n", level="STAGE")
+            self.append_to_console("脚本、数据文件、配置、Nuitka版本、解释器和已安装的第三方包均未变化，"
+                                   "已恢复上次的打包产物\n", level="INFO")
+            self.progress_tracker.finish()
+            self.update_progress()
+            self.finish_build_log(0)
+            self.run_button.setEnabled(True)
+            return
+        
+        self.pending_cache_key = key
+        self.launch_build(config, nuitka_path)
+
+    def prepare_incremental_build(self, config):
+        """增量模式下准备持久构建目录，返回目录路径；未启用增量模式时返回 None"""
+        if not config.get("incremental"):
+            return None
+        
+        build_root = incremental.get_build_root(config, self.current_config_name)
+        is_new = not os.path.isdir(build_root)
+        version = self.detected_version if self.detected_version != "未知版本" else None
+        reason = incremental.prepare(build_root, version)
+        if reason:
+            self.append_to_console(f"{reason}，已清空增量构建目录，本次将完整编译\n", level="WARNING")
+        elif is_new:
+            self.append_to_console(f"创建增量构建目录，本次将完整编译: {build_root}\n", level="INFO")
+        else:
+            self.append_to_console(f"增量编译，复用构建目录: {build_root}\n", level="INFO")
+        return build_root
+
+    def clean_rebuild(self):
+        """清空当前配置的增量构建目录后重新打包"""
+        if not self.script_path.text():
+            QMessageBox.warning(self, "错误", "请选择要打包的Python脚本!")
+            return
+        
+        if not self.run_button.isEnabled():
+            return
+        
+        config = self.get_current_config()
+        incremental.clean(incremental.get_build_root(config, self.current_config_name))
+        # 缓存项在计算缓存键的后台任务中删除
+        self.pending_cache_clean = True
+        self.start_packaging()
+
+    def publish_incremental_artifacts(self):
+        """把增量构建目录中的产物复制到输出目录"""
+        build_root, self.pending_build_root = self.pending_build_root, None
+        if not build_root:
+            return
+        
+        try:
+            for path in incremental.publish_artifacts(self.pending_config, build_root,
+                                                      self.get_copy_function()):
+                self.append_to_console(f"产物已复制到: {path}\n", level="INFO")
+        except OSError as e:
+            self.append_to_console(f"复制增量构建产物失败: {str(e)}\n", level="ERROR")
+
+    def store_in_build_cache(self, key, config):
+        """在后台把本次成功打包的产物复制到构建缓存，返回是否已开始；完成前不能开始下一次打包"""
+        if not key:
+            return False
+        
+        quota_bytes = self.settings["build_cache_quota_mb"] * 1024 * 1024
+        self.run_button.setEnabled(False)
+        self.run_in_background(self.build_cache.store, self.handle_cache_stored,
+                               key, get_artifact_paths(config), quota_bytes, self.get_copy_function())
+        return True
+
+    def handle_cache_stored(self, stored):
+        if isinstance(stored, Exception):
+            self.append_to_console(f"写入构建缓存失败: {str(stored)}\n", level="WARNING")
+        elif stored:
+            self.append_to_console("打包产物已加入构建缓存\n", level="INFO")
+        self.run_button.setEnabled(True)
+
+    def handle_stage_result(self, stats, key, config):
+        """数据文件放置完成: 写入构建记录和构建缓存，之后才允许开始下一次打包"""
+        self.pending_stage_data = False
+        if self.pending_build_record:
+            self.collect_build_record(*self.pending_build_record)
+            self.pending_build_record = None
+        if isinstance(stats, Exception):
+            self.append_to_console(f"放置数据文件失败: {str(stats)}\n", level="ERROR")
+            self.run_button.setEnabled(True)
+            return
+        self.append_to_console(format_stage_stats(stats) + "\n", level="INFO")
+        if not self.store_in_build_cache(key, config):
+            self.run_button.setEnabled(True)
 
     def handle_process_output(self):
         """处理打包进程的输出"""
         if not self.process:
             return
             
-        # 读取标准输出
-        output = self.process.readAllStandardOutput().data().decode().strip()
-        if output:
-            self.append_to_console(output, level="INFO")
-            
-            # 更新进度条状态
-            for line in output.split('\n'):
-                for stage in self.stages:
-                    if stage["pattern"] in line:
-                        self.current_stage = self.stages.index(stage)
-                        self.stage_progress = 0
-                        self.append_to_console(f"\n=== 进入阶段: {stage['name']} ===\n", level="STAGE")
-                        break
-                
-                # 简单模拟进度更新
-                if "Progress" in line:
-                    self.stage_progress = min(self.stage_progress + 5, 100)
-                
-                # 检测到输出文件行时才标记为完成
-                if "输出文件:" in line:
-                    self.current_stage = len(self.stages) - 1
-                    self.stage_progress = 100
-                    # 只在检测到输出文件行后显示完成弹窗
-                    QMessageBox.information(self, "打包完成", "Nuitka打包已完成！")
-                    # 打开输出目录
-                    output_dir = line.split(":")[1].strip()
-                    if os.path.exists(output_dir):
-                        from PyQt5.QtGui import QDesktopServices
-                        from PyQt5.QtCore import QUrl
-                        QDesktopServices.openUrl(QUrl.fromLocalFile(output_dir))
-                    
-            # 计算总进度
-            total_progress = 0
-            for i, stage in enumerate(self.stages):
-                if i < self.current_stage:
-                    total_progress += stage["weight"]
-                elif i == self.current_stage:
-                    total_progress += stage["weight"] * (self.stage_progress / 100)
-                    
-            self.progress.setValue(int(total_progress))
+        # 读取标准输出，保留换行，失败诊断按完整的行识别
+        output = self.process.readAllStandardOutput().data().decode(errors="replace")
+        if output.strip():
+            self.handle_build_output(output)
             
         # 读取错误输出
         error = self.process.readAllStandardError().data().decode().strip()
         if error:
             self.append_to_console(error, level="ERROR")
+
+    def handle_build_output(self, output):
+        """显示一段打包输出并据此更新阶段和进度，本地进程和构建服务的输出都经过这里"""
+        self.append_to_console(output, level="INFO")
+        # 一次扫描整块输出，阶段标志和Nuitka的计数器有新数据时才更新进度条
+        changed = False
+        for kind, value in self.output_parser.parse(output):
+            if kind == "stage":
+                if self.progress_tracker.enter_stage(value):
+                    self.append_to_console(f"\n=== 进入阶段: {self.stages[value]['name']} ===\n",
+                                           level="STAGE")
+                    changed = True
+            elif kind == "custom":
+                name, line = value
+                self.append_to_console(f"\n[{name}] {line}\n", level="WARNING")
+            elif kind == "output":
+                # 检测到输出文件行时才标记为完成
+                self.progress_tracker.finish()
+                self.update_progress()
+                # 只在检测到输出文件行后显示完成弹窗
+                QMessageBox.information(self, "打包完成", "Nuitka打包已完成！")
+                # 打开输出目录
+                if os.path.exists(value):
+                    from PyQt5.QtGui import QDesktopServices
+                    from PyQt5.QtCore import QUrl
+                    QDesktopServices.openUrl(QUrl.fromLocalFile(value))
+
+        if self.progress_tracker.feed(output) or changed:
+            self.update_progress()
+        # 构建服务中的任务由服务自己诊断，诊断结果已包含在输出中
+        if not self.daemon_job:
+            self.classify_output(output)
+
+    def classify_output(self, output):
+        """识别输出中的已知失败原因，出现致命错误时按设置提前终止打包"""
+        for result in self.failure_classifier.feed(output):
+            self.append_to_console(f"\n[诊断] {format_match(result)}\n",
+                                   level="ERROR" if result["fatal"] else "WARNING")
+            if (result is self.failure_classifier.fatal and self.settings["abort_on_fatal_failure"]
+                    and self.process and self.process.state() != QProcess.NotRunning):
+                self.append_to_console("=== 检测到无法恢复的错误，提前终止打包 ===\n", level="ERROR")
+                self.process.terminate()
     
     def stop_packaging(self):
         """停止打包进程"""
+        if self.daemon_job:
+            client, job_id = self.daemon_job
+            try:
+                client.cancel(job_id)
+                self.append_to_console("\n已请求构建服务取消任务\n", level="WARNING")
+            except OSError as e:
+                self.append_to_console(f"无法取消构建服务中的任务: {str(e)}\n", level="ERROR")
+        
         if self.process and self.process.state() == QProcess.Running:
             self.process.terminate()
             self.append_to_console("\n打包过程已终止\n", level="WARNING")
@@ -1310,45 +1879,16 @@ class NuitkaPackager(QMainWindow):
         if hasattr(self, 'output_thread'):
             self.output_thread.terminate()
         
-        self.progress_timer.stop()
         self.run_button.setEnabled(True)
         self.stop_button.setEnabled(False)
 
-    def update_progress(self, output_line=None):
-        if output_line:
-            # 根据Nuitka的实际输出更新进度
-            for i, stage in enumerate(self.stages):
-                if stage["pattern"] in output_line:
-                    if i > self.current_stage:
-                        # 进入新阶段时重置进度
-                        self.current_stage = i
-                        self.stage_progress = 0
-                        self.progress.setValue(0)
-                    break
-        
-        if self.current_stage < len(self.stages):
-            # 缓慢增加当前阶段的进度
-            self.stage_progress = min(self.stage_progress + 2, 100)
-            
-            # 显示当前阶段进度
-            self.progress.setValue(self.stage_progress)
-            
-            # 当前阶段完成后自动进入下一阶段
-            if self.stage_progress >= 100:
-                if self.current_stage < len(self.stages) - 1:
-                    self.current_stage += 1
-                    self.stage_progress = 0
-                else:
-                    # 所有阶段完成
-                    self.progress_timer.stop()
-        else:
-            # 打包失败处理
-            self.progress_timer.stop()
-            QMessageBox.warning(self, "错误", "打包过程中出现错误！")
+    def update_progress(self):
+        """按 ProgressTracker 的状态刷新进度条和阶段说明"""
+        self.progress.setValue(self.progress_tracker.percent())
+        self.progress.setFormat(f"%p% - {self.progress_tracker.describe()}")
 
     def process_finished(self, exit_code, exit_status):
-        self.progress_timer.stop()
-        
+        self.job_slot.release()
         if hasattr(self, 'output_thread'):
             self.output_thread.terminate()
         
@@ -1358,10 +1898,26 @@ class NuitkaPackager(QMainWindow):
         # 确保所有输出都已处理完毕
         QApplication.processEvents()
         
+        # 本次打包的缓存键和配置，后台放置数据文件期间不受其他操作影响
+        key, self.pending_cache_key = self.pending_cache_key, None
+        config = self.pending_config
+        staging = exit_code == 0 and self.pending_stage_data
+        storing = False
         if exit_code == 0:
-            self.progress.setValue(100)
+            self.progress_tracker.finish()
+            self.update_progress()
             self.append_to_console("\n=== 打包成功 ===\n", level="STAGE")
             self.append_to_console(f"耗时: {elapsed}秒\n", level="INFO")
+            self.publish_incremental_artifacts()
+            if staging:
+                # 首次暂存大量数据文件可能很慢，在后台进行，完成后再写入构建缓存；
+                # 在此之前不能开始下一次打包，否则会改写正在放置数据文件的产物目录
+                self.append_to_console("正在放置数据文件...\n", level="INFO")
+                self.run_in_background(self.get_staging_store().stage,
+                                       lambda stats: self.handle_stage_result(stats, key, config),
+                                       config, get_artifact_paths(config)[0])
+            else:
+                storing = self.store_in_build_cache(key, config)
             
             # 显示输出路径信息但不强制检查文件是否存在
             if self.output_dir.text():
@@ -1375,43 +1931,115 @@ class NuitkaPackager(QMainWindow):
                 self.append_to_console(f"预期输出文件: {output_path}\n", level="INFO")
         else:
             self.progress.setValue(0)
+            self.progress.setFormat(f"%p% - 失败于: {self.stages[self.progress_tracker.current_stage]['name']}")
             self.append_to_console("\n=== 打包失败 ===\n", level="ERROR")
             self.append_to_console(f"进程退出代码: {exit_code}\n", level="ERROR")
+            self.failure_classifier.finish()
+            self.append_to_console(format_diagnosis(self.failure_classifier.diagnose()) + "\n", level="ERROR")
             self.append_to_console(f"耗时: {elapsed}秒\n", level="INFO")
         
+        self.record_build(exit_code, elapsed, self.finish_build_log(exit_code))
+        
         # 确保UI状态更新完成
         QApplication.processEvents()
         
+        self.run_button.setEnabled(not (staging or storing))
+        self.stop_button.setEnabled(False)
+
+    def process_error(self, error):
+        """Nuitka进程无法启动时不会发出 finished，在这里释放名额并恢复界面"""
+        if error != QProcess.FailedToStart:
+            return
+        self.job_slot.release()
+        self.pending_cache_key = None
+        self.pending_stage_data = False
+        self.pending_build_root = None
+        self.append_to_console(f"启动Nuitka进程失败: {self.process.errorString()}\n", level="ERROR")
+        self.finish_build_log()
+        self.progress.setValue(0)
         self.run_button.setEnabled(True)
         self.stop_button.setEnabled(False)
 
+    def set_ccache_before(self, stats):
+        self.ccache_before = stats if isinstance(stats, dict) else None
+
+    def record_build(self, exit_code, elapsed, log_name=None):
+        """把本次打包结果写入构建记录，ccache统计在后台读取完成后再写入"""
+        script_path = self.pending_config.get("script_path", "")
+        record = {
+            "time": QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss"),
+            "config": self.current_config_name or os.path.splitext(os.path.basename(script_path))[0],
+            "script_path": script_path,
+            "exit_code": exit_code,
+            "elapsed": elapsed,
+            "nuitka_version": self.detected_version,
+            "log": log_name,
+            # 配置快照和产物清单用于比较两次构建 (见 build_compare)
+            "build_config": self.pending_config
+        }
+        record.update(self.progress_tracker.telemetry())
+        if exit_code != 0:
+            record["failure"] = self.failure_classifier.summarize()
+        artifact_paths = get_artifact_paths(self.pending_config) if exit_code == 0 else []
+        
+        ccache_before = self.ccache_before
+        if exit_code == 0 and self.pending_stage_data:
+            # 数据文件还在后台放置，放置完成后再扫描产物
+            self.pending_build_record = (record, ccache_before, artifact_paths)
+            return
+        self.collect_build_record(record, ccache_before, artifact_paths)
+
+    def collect_build_record(self, record, ccache_before, artifact_paths):
+        self.run_in_background(self.collect_build_outputs,
+                               lambda result: self.finish_build_record(record, ccache_before, result),
+                               artifact_paths)
+
+    def collect_build_outputs(self, artifact_paths):
+        """在后台线程中读取ccache统计并扫描产物保存清单 (产物可能有数万个文件)，不访问界面"""
+        ccache_after = compiler_cache.read_stats(self.settings)
+        try:
+            manifest, artifact_size = save_manifest(artifact_paths)
+        except OSError:
+            manifest = artifact_size = None
+        return ccache_after, manifest, artifact_size
+
+    def finish_build_record(self, record, ccache_before, result):
+        ccache_after = None
+        if isinstance(result, tuple):
+            ccache_after, record["manifest"], record["artifact_size"] = result
+        ccache_delta = None
+        if isinstance(ccache_after, dict):
+            ccache_delta = compiler_cache.diff_stats(ccache_before, ccache_after)
+        if ccache_delta:
+            self.append_to_console(compiler_cache.format_stats(ccache_delta) + "\n", level="INFO")
+        record["ccache"] = ccache_delta
+        try:
+            self.build_history.append(record)
+        except (OSError, sqlite3.Error) as e:
+            self.append_to_console(f"无法写入构建记录: {str(e)}\n", level="WARNING")
+            return
+        self.load_build_records()
+
     def append_to_console(self, text, color=None, level="INFO"):
-        """更安全的控制台输出方法，避免使用colorama"""
-        timestamp = QDateTime.currentDateTime().toString("[hh:mm:ss] ")
-        
-        # 使用Qt原生颜色代替colorama
-        self.console.moveCursor(QTextCursor.End)
-        self.console.setTextColor(Qt.gray)
-        self.console.insertPlainText(timestamp)
-        
-        if level == "INFO":
-            self.console.setTextColor(Qt.blue)
-        elif level == "WARNING":
-            self.console.setTextColor(QColor(255, 165, 0))  # 橙色
-        elif level == "ERROR":
-            self.console.setTextColor(Qt.red)
-        elif level == "STAGE":
-            self.console.setTextColor(Qt.darkGreen)
-        elif level == "COMMAND":
-            self.console.setTextColor(QColor(128, 0, 128))  # 紫色
-        else:
-            self.console.setTextColor(Qt.black)
-            
-        self.console.insertPlainText(text)
-        self.console.ensureCursorVisible()
+        """写入控制台，实际绘制由 ConsoleRenderer 按帧批量完成"""
+        self.console_renderer.append(text, level)
 
     def clear_console(self):
-        self.console.clear()
+        self.console_renderer.clear()
+
+    def show_full_log(self):
+        self.console_renderer.flush()
+        dialog = ConsolePagerDialog(self.console_log, self)
+        dialog.show()
+
+    def closeEvent(self, event):
+        # 构建服务中的任务在窗口关闭后继续运行，只断开事件流
+        if self.daemon_stream and self.daemon_stream.isRunning():
+            self.daemon_stream.stop()
+            self.daemon_stream.wait()
+        self.finish_build_log()
+        self.console_log.close()
+        super().closeEvent(event)
 
 class OutputThread(QThread):
     output_signal = pyqtSignal(str, str)
@@ -1436,8 +2064,6 @@ class OutputThread(QThread):
                 break
             if output:
                 self.output_signal.emit(output, "INFO")
-                if self.parent:
-                    self.parent.update_progress(output)
         
         if hasattr(self.process, 'stderr') and self.process.stderr:
             error = self.process.stderr.read()